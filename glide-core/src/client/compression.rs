@@ -0,0 +1,392 @@
+/**
+ * Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+ */
+// Transparent compression of large values.
+//
+// Compressed values are stored with the following header:
+// `MAGIC (3 bytes) | backend id (1 byte) | uncompressed length (4 bytes, big endian) | payload`.
+// The first magic byte, `0xFF`, can't start a valid UTF-8 string or a protobuf message, so values written by clients
+// without compression (JSON, protobuf, plain strings) are never mistaken for compressed ones and are returned as-is.
+//
+// Only the values of the commands accepted by `is_value_arg` are compressed. Other commands see the compressed bytes:
+// APPEND, SETRANGE, GETRANGE, STRLEN and HSTRLEN operate on them, so mixing SET with SETRANGE or APPEND on a key
+// corrupts its value, and LREM, LPOS and the pivot of LINSERT compare the caller's uncompressed value with them, so
+// they never match a compressed element.
+use super::types::{CompressionBackend, CompressionConfig};
+use logger_core::log_warn;
+use redis::{Arg, Cmd, Pipeline, Value};
+use std::io::{Read, Write};
+
+const MAGIC: &[u8] = &[0xFF, b'G', b'Z'];
+const HEADER_LEN: usize = MAGIC.len() + 1 + 4;
+const ZLIB_ID: u8 = 1;
+const ZSTD_ID: u8 = 2;
+/// The maximal size of a decompressed value, which is the default maximal size of a string in the server. Values
+/// aren't compressed above it, and decompression stops at it, so a corrupt or hostile value can't exhaust the memory.
+const MAX_DECOMPRESSED_LEN: usize = 512 * 1024 * 1024;
+
+impl CompressionBackend {
+    fn id(&self) -> u8 {
+        match self {
+            CompressionBackend::Zlib => ZLIB_ID,
+            CompressionBackend::Zstd => ZSTD_ID,
+        }
+    }
+
+    fn from_id(id: u8) -> Option<Self> {
+        match id {
+            ZLIB_ID => Some(CompressionBackend::Zlib),
+            ZSTD_ID => Some(CompressionBackend::Zstd),
+            _ => None,
+        }
+    }
+
+    fn compress(&self, value: &[u8], level: Option<i32>, output: &mut Vec<u8>) -> bool {
+        match self {
+            CompressionBackend::Zlib => {
+                let level = level.map_or(flate2::Compression::default(), |level| {
+                    flate2::Compression::new(level.clamp(0, 9) as u32)
+                });
+                let mut encoder = flate2::write::ZlibEncoder::new(output, level);
+                encoder.write_all(value).is_ok() && encoder.finish().is_ok()
+            }
+            CompressionBackend::Zstd => {
+                let level = level.unwrap_or(zstd::DEFAULT_COMPRESSION_LEVEL);
+                zstd::stream::copy_encode(value, output, level).is_ok()
+            }
+        }
+    }
+
+    /// Decompresses `payload` into `output`, stopping after `limit` bytes.
+    fn decompress(&self, payload: &[u8], limit: u64, output: &mut Vec<u8>) -> std::io::Result<()> {
+        match self {
+            CompressionBackend::Zlib => {
+                flate2::read::ZlibDecoder::new(payload)
+                    .take(limit)
+                    .read_to_end(output)?;
+            }
+            CompressionBackend::Zstd => {
+                zstd::stream::read::Decoder::with_buffer(payload)?
+                    .take(limit)
+                    .read_to_end(output)?;
+            }
+        }
+        Ok(())
+    }
+}
+
+/// Returns true if the argument at `idx` of `command` is a value that is stored by the server.
+/// Keys, fields and options are never compressed, so the routing and the semantics of the command are unchanged.
+fn is_value_arg(command: &[u8], idx: usize) -> bool {
+    match command {
+        b"SET" | b"GETSET" => idx == 2,
+        b"SETEX" | b"PSETEX" | b"HSETNX" | b"LSET" => idx == 3,
+        b"MSET" | b"MSETNX" => idx >= 2 && idx % 2 == 0,
+        b"HSET" | b"HMSET" => idx >= 3 && idx % 2 == 1,
+        b"LPUSH" | b"RPUSH" | b"LPUSHX" | b"RPUSHX" => idx >= 2,
+        _ => false,
+    }
+}
+
+/// Returns true if `command` has arguments accepted by `is_value_arg`.
+fn has_value_args(command: &[u8]) -> bool {
+    matches!(
+        command,
+        b"SET"
+            | b"GETSET"
+            | b"SETEX"
+            | b"PSETEX"
+            | b"HSETNX"
+            | b"LSET"
+            | b"MSET"
+            | b"MSETNX"
+            | b"HSET"
+            | b"HMSET"
+            | b"LPUSH"
+            | b"RPUSH"
+            | b"LPUSHX"
+            | b"RPUSHX"
+    )
+}
+
+fn push_arg(cmd: &mut Cmd, arg: Arg<&[u8]>) {
+    match arg {
+        Arg::Simple(bytes) => {
+            cmd.arg(bytes);
+        }
+        Arg::Cursor => {
+            cmd.cursor_arg(0);
+        }
+    }
+}
+
+/// Returns true if the reply of `cmd` may contain values that were written by a command accepted by `is_value_arg`.
+pub(crate) fn returns_stored_values(cmd: &Cmd) -> bool {
+    let Some(command) = cmd.command() else {
+        return false;
+    };
+    matches!(
+        command.as_slice(),
+        b"GET"
+            | b"GETDEL"
+            | b"GETEX"
+            | b"GETSET"
+            | b"SET"
+            | b"MGET"
+            | b"HGET"
+            | b"HMGET"
+            | b"HGETALL"
+            | b"HVALS"
+            | b"HRANDFIELD"
+            | b"LPOP"
+            | b"RPOP"
+            | b"BLPOP"
+            | b"BRPOP"
+            | b"LMPOP"
+            | b"BLMPOP"
+            | b"LRANGE"
+            | b"LINDEX"
+            | b"LMOVE"
+            | b"BLMOVE"
+            | b"RPOPLPUSH"
+            | b"BRPOPLPUSH"
+    )
+}
+
+impl CompressionConfig {
+    /// Compresses `value` if it is large enough and compression reduces its size.
+    pub(crate) fn compress(&self, value: &[u8]) -> Option<Vec<u8>> {
+        if value.len() < self.min_compression_size || value.len() > MAX_DECOMPRESSED_LEN {
+            return None;
+        }
+        let mut output = Vec::with_capacity(value.len() / 2 + HEADER_LEN);
+        output.extend_from_slice(MAGIC);
+        output.push(self.backend.id());
+        output.extend_from_slice(&(value.len() as u32).to_be_bytes());
+        if !self
+            .backend
+            .compress(value, self.compression_level, &mut output)
+        {
+            return None;
+        }
+        (output.len() < value.len()).then_some(output)
+    }
+
+    /// Returns a copy of `cmd` with its large values compressed, or `None` if no argument was compressed.
+    /// `cmd` is copied only once one of its arguments was compressed.
+    pub(crate) fn compress_cmd(&self, cmd: &Cmd) -> Option<Cmd> {
+        let command = cmd.command()?;
+        if !has_value_args(&command) {
+            return None;
+        }
+        let mut compressed_cmd: Option<Cmd> = None;
+        for (idx, arg) in cmd.args_iter().enumerate() {
+            let compressed = match arg {
+                Arg::Simple(bytes) if is_value_arg(&command, idx) => self.compress(bytes),
+                _ => None,
+            };
+            match compressed_cmd {
+                Some(ref mut new_cmd) => match compressed {
+                    Some(compressed) => {
+                        new_cmd.arg(compressed);
+                    }
+                    None => push_arg(new_cmd, arg),
+                },
+                None => {
+                    if let Some(compressed) = compressed {
+                        let mut new_cmd = Cmd::new();
+                        for previous_arg in cmd.args_iter().take(idx) {
+                            push_arg(&mut new_cmd, previous_arg);
+                        }
+                        new_cmd.arg(compressed);
+                        compressed_cmd = Some(new_cmd);
+                    }
+                }
+            }
+        }
+        compressed_cmd
+    }
+
+    /// Returns a copy of `pipeline` with the large values of its commands compressed, or `None` if no argument was
+    /// compressed.
+    pub(crate) fn compress_pipeline(&self, pipeline: &Pipeline) -> Option<Pipeline> {
+        let mut compressed_pipeline = Pipeline::with_capacity(pipeline.cmd_iter().count());
+        if pipeline.is_transaction() {
+            compressed_pipeline.atomic();
+        }
+        let mut compressed_any = false;
+        for cmd in pipeline.cmd_iter() {
+            match self.compress_cmd(cmd) {
+                Some(compressed_cmd) => {
+                    compressed_any = true;
+                    compressed_pipeline.add_command(compressed_cmd);
+                }
+                None => {
+                    compressed_pipeline.add_command(cmd.clone());
+                }
+            }
+        }
+        compressed_any.then_some(compressed_pipeline)
+    }
+}
+
+/// Decompresses a value that was compressed by `CompressionConfig::compress`.
+/// Values without a valid header are returned unchanged.
+fn decompress(value: Vec<u8>) -> Vec<u8> {
+    if value.len() < HEADER_LEN || !value.starts_with(MAGIC) {
+        return value;
+    }
+    let Some(backend) = CompressionBackend::from_id(value[MAGIC.len()]) else {
+        return value;
+    };
+    let mut length = [0_u8; 4];
+    length.copy_from_slice(&value[MAGIC.len() + 1..HEADER_LEN]);
+    let length = u32::from_be_bytes(length) as usize;
+    if length > MAX_DECOMPRESSED_LEN {
+        log_warn(
+            "compression",
+            "Value has a compression header with a length above the limit, returning it as-is",
+        );
+        return value;
+    }
+
+    // The length is only a hint, it isn't trusted for large allocations before the payload is decoded.
+    let mut output = Vec::with_capacity(length.min(value.len().saturating_mul(32)));
+    // A payload that decodes to more than the length of the header is corrupt, so decoding stops right after it
+    match backend.decompress(&value[HEADER_LEN..], length as u64 + 1, &mut output) {
+        Ok(()) if output.len() == length => output,
+        _ => {
+            log_warn(
+                "compression",
+                "Value has a compression header but couldn't be decompressed, returning it as-is",
+            );
+            value
+        }
+    }
+}
+
+/// Recursively decompresses every bulk string in `value`.
+pub(crate) fn decompress_value(value: Value) -> Value {
+    match value {
+        Value::BulkString(bytes) => Value::BulkString(decompress(bytes)),
+        Value::Array(values) => Value::Array(values.into_iter().map(decompress_value).collect()),
+        Value::Map(map) => Value::Map(
+            map.into_iter()
+                .map(|(key, value)| (decompress_value(key), decompress_value(value)))
+                .collect(),
+        ),
+        value => value,
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn config(backend: CompressionBackend) -> CompressionConfig {
+        CompressionConfig {
+            backend,
+            min_compression_size: 64,
+            compression_level: None,
+        }
+    }
+
+    fn compressible_value() -> Vec<u8> {
+        br#"{"name": "glide", "tags": ["a", "b", "c"]}"#.repeat(100)
+    }
+
+    #[test]
+    fn test_compress_and_decompress_roundtrip() {
+        for backend in [CompressionBackend::Zlib, CompressionBackend::Zstd] {
+            let value = compressible_value();
+            let compressed = config(backend).compress(&value).unwrap();
+            assert!(compressed.starts_with(MAGIC));
+            assert!(compressed.len() < value.len());
+            assert_eq!(decompress(compressed), value);
+        }
+    }
+
+    #[test]
+    fn test_small_and_incompressible_values_are_not_compressed() {
+        let config = config(CompressionBackend::Zlib);
+        assert!(config.compress(b"short value").is_none());
+        let random: Vec<u8> = (0..1024).map(|_| rand::random::<u8>()).collect();
+        assert!(config.compress(&random).is_none());
+    }
+
+    #[test]
+    fn test_legacy_values_are_returned_as_is() {
+        let legacy = compressible_value();
+        assert_eq!(decompress(legacy.clone()), legacy);
+
+        let mut corrupted = config(CompressionBackend::Zlib)
+            .compress(&compressible_value())
+            .unwrap();
+        corrupted.truncate(HEADER_LEN + 2);
+        assert_eq!(decompress(corrupted.clone()), corrupted);
+    }
+
+    #[test]
+    fn test_decompressed_size_is_bounded() {
+        for backend in [CompressionBackend::Zlib, CompressionBackend::Zstd] {
+            // A payload that decodes to more than the length of its header is returned as-is
+            let mut understated = config(backend).compress(&compressible_value()).unwrap();
+            understated[MAGIC.len() + 1..HEADER_LEN].copy_from_slice(&100_u32.to_be_bytes());
+            assert_eq!(decompress(understated.clone()), understated);
+
+            let mut oversized = config(backend).compress(&compressible_value()).unwrap();
+            oversized[MAGIC.len() + 1..HEADER_LEN].copy_from_slice(&u32::MAX.to_be_bytes());
+            assert_eq!(decompress(oversized.clone()), oversized);
+        }
+    }
+
+    #[test]
+    fn test_compress_cmd_only_compresses_values() {
+        let value = compressible_value();
+        let mut cmd = redis::cmd("HSET");
+        cmd.arg("key").arg(&value).arg(&value);
+        let compressed = config(CompressionBackend::Zlib).compress_cmd(&cmd).unwrap();
+        assert_eq!(compressed.arg_idx(1), Some(&b"key"[..]));
+        assert_eq!(compressed.arg_idx(2), Some(value.as_slice()));
+        assert!(compressed.arg_idx(3).unwrap().starts_with(MAGIC));
+
+        let mut cmd = redis::cmd("GET");
+        cmd.arg(&value);
+        assert!(config(CompressionBackend::Zlib)
+            .compress_cmd(&cmd)
+            .is_none());
+
+        // Commands whose values are all too small to compress aren't copied
+        let mut cmd = redis::cmd("SET");
+        cmd.arg("key").arg("value");
+        assert!(config(CompressionBackend::Zlib)
+            .compress_cmd(&cmd)
+            .is_none());
+
+        let mut cmd = redis::cmd("MSET");
+        cmd.arg("key1").arg("value").arg("key2").arg(&value);
+        let compressed = config(CompressionBackend::Zlib).compress_cmd(&cmd).unwrap();
+        assert_eq!(compressed.arg_idx(0), Some(&b"MSET"[..]));
+        assert_eq!(compressed.arg_idx(1), Some(&b"key1"[..]));
+        assert_eq!(compressed.arg_idx(2), Some(&b"value"[..]));
+        assert_eq!(compressed.arg_idx(3), Some(&b"key2"[..]));
+        assert!(compressed.arg_idx(4).unwrap().starts_with(MAGIC));
+    }
+
+    #[test]
+    fn test_decompress_value_in_nested_reply() {
+        let value = compressible_value();
+        let compressed = config(CompressionBackend::Zstd).compress(&value).unwrap();
+        let reply = Value::Map(vec![(
+            Value::BulkString(b"field".to_vec()),
+            Value::BulkString(compressed),
+        )]);
+        assert_eq!(
+            decompress_value(reply),
+            Value::Map(vec![(
+                Value::BulkString(b"field".to_vec()),
+                Value::BulkString(value),
+            )])
+        );
+    }
+}
@@ -1,17 +1,25 @@
 /**
  * Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
  */
+mod compression;
+mod pubsub;
 mod types;
 
+use self::compression::{decompress_value, returns_stored_values};
+use self::pubsub::{
+    get_subscription_slot, start_cluster_resubscription_task, PubSubSubscriptions,
+    SubscriptionCommand,
+};
 use crate::cluster_scan_container::insert_cluster_scan_cursor;
 use crate::scripts_container::get_script;
-use futures::FutureExt;
+use futures::{future, FutureExt};
 use logger_core::log_info;
 use redis::aio::ConnectionLike;
 use redis::cluster_async::ClusterConnection;
-use redis::cluster_routing::{Routable, RoutingInfo, SingleNodeRoutingInfo};
+use redis::cluster_routing::{Routable, Route, RoutingInfo, SingleNodeRoutingInfo, SlotAddr};
 use redis::{Cmd, ErrorKind, ObjectType, PushInfo, RedisError, RedisResult, ScanStateRC, Value};
 pub use standalone_client::StandaloneClient;
+use std::collections::HashMap;
 use std::io;
 use std::time::Duration;
 pub use types::*;
@@ -30,6 +38,9 @@ pub const DEFAULT_PERIODIC_CHECKS_INTERVAL: Duration = Duration::from_secs(60);
 pub const INTERNAL_CONNECTION_TIMEOUT: Duration = Duration::from_millis(250);
 pub const FINISHED_SCAN_CURSOR: &str = "finished";
 
+/// Non-atomic pipelines by the slot of the primary they're sent to, with the indices of their commands in the batch.
+type SlotPipelines = HashMap<u16, (Vec<usize>, redis::Pipeline)>;
+
 pub(super) fn get_port(address: &NodeAddress) -> u16 {
     const DEFAULT_PORT: u16 = 6379;
     if address.port == 0 {
@@ -96,6 +107,10 @@ pub enum ClientWrapper {
 pub struct Client {
     internal_client: ClientWrapper,
     request_timeout: Duration,
+    // Replaces `request_timeout`, and the timeouts of blocking commands, for the requests of this client handle.
+    request_timeout_override: Option<Duration>,
+    compression: Option<CompressionConfig>,
+    pubsub_subscriptions: PubSubSubscriptions,
 }
 
 async fn run_with_timeout<T>(
@@ -103,6 +118,10 @@ async fn run_with_timeout<T>(
     future: impl futures::Future<Output = RedisResult<T>> + Send,
 ) -> redis::RedisResult<T> {
     match timeout {
+        // A zero timeout is a deadline that already passed, so the request isn't sent at all
+        Some(duration) if duration.is_zero() => {
+            Err(io::Error::from(io::ErrorKind::TimedOut).into())
+        }
         Some(duration) => tokio::time::timeout(duration, future)
             .await
             .map_err(|_| io::Error::from(io::ErrorKind::TimedOut).into())
@@ -218,19 +237,43 @@ fn get_request_timeout(cmd: &Cmd, default_timeout: Duration) -> RedisResult<Opti
 }
 
 impl Client {
+    /// Overrides the request timeout of the client, including the timeouts of blocking commands, for the requests
+    /// sent with this client handle. Requests are sent with clones of the client, so this sets the timeout of a single
+    /// request. A zero timeout fails the request with a timeout error without sending it.
+    pub fn set_request_timeout(&mut self, request_timeout: Duration) {
+        self.request_timeout_override = Some(request_timeout);
+    }
+
+    fn batch_request_timeout(&self) -> Duration {
+        self.request_timeout_override
+            .unwrap_or(self.request_timeout)
+    }
+
     pub fn send_command<'a>(
         &'a mut self,
         cmd: &'a Cmd,
         routing: Option<RoutingInfo>,
     ) -> redis::RedisFuture<'a, Value> {
         let expected_type = expected_type_for_cmd(cmd);
-        let request_timeout = match get_request_timeout(cmd, self.request_timeout) {
-            Ok(request_timeout) => request_timeout,
-            Err(err) => {
-                return async { Err(err) }.boxed();
-            }
+        let request_timeout = match self.request_timeout_override {
+            Some(request_timeout) => Some(request_timeout),
+            None => match get_request_timeout(cmd, self.request_timeout) {
+                Ok(request_timeout) => request_timeout,
+                Err(err) => {
+                    return async { Err(err) }.boxed();
+                }
+            },
         };
+        if let Some(subscription_command) = SubscriptionCommand::from_cmd(cmd) {
+            return self.send_subscription_command(subscription_command, request_timeout);
+        }
+        let compressed_cmd = self
+            .compression
+            .as_ref()
+            .and_then(|compression| compression.compress_cmd(cmd));
+        let decompress = self.compression.is_some() && returns_stored_values(cmd);
         run_with_timeout(request_timeout, async move {
+            let cmd = compressed_cmd.as_ref().unwrap_or(cmd);
             match self.internal_client {
                 ClientWrapper::Standalone(ref mut client) => client.send_command(cmd).await,
 
@@ -242,6 +285,79 @@ impl Client {
                 }
             }
             .and_then(|value| convert_to_expected_type(value, expected_type))
+            .map(|value| {
+                if decompress {
+                    decompress_value(value)
+                } else {
+                    value
+                }
+            })
+        })
+        .boxed()
+    }
+
+    // Subscription commands are split into a command per channel, since every channel is answered by its own
+    // notification, and a command is expected to have a single reply. The commands are pipelined, and in cluster mode
+    // grouped by the slot they are sent to, like `publish_batch`. The subscriptions are tracked before the commands are
+    // sent, so that they are restored on reconnects even if the connection was lost while subscribing, and the changes
+    // of a pipeline that failed, or that wasn't sent before the timeout, are reverted so that they can be retried.
+    fn send_subscription_command(
+        &mut self,
+        subscription_command: SubscriptionCommand,
+        request_timeout: Option<Duration>,
+    ) -> redis::RedisFuture<'_, Value> {
+        let mut change = self.pubsub_subscriptions.apply(&subscription_command);
+        let group_by_slot = matches!(self.internal_client, ClientWrapper::Cluster { .. });
+        let mut pipelines = SlotPipelines::new();
+        for (index, channel) in change.channels().iter().enumerate() {
+            let slot = if group_by_slot {
+                get_subscription_slot(&subscription_command.kind, channel)
+            } else {
+                0
+            };
+            let (indices, pipeline) = pipelines
+                .entry(slot)
+                .or_insert_with(|| (Vec::new(), redis::Pipeline::new()));
+            indices.push(index);
+            pipeline.add_command(subscription_command.single_channel_cmd(channel));
+        }
+        let requests: Vec<_> = pipelines
+            .into_iter()
+            .map(|(slot, (indices, pipeline))| {
+                let mut internal_client = self.internal_client.clone();
+                async move {
+                    let result = match internal_client {
+                        ClientWrapper::Standalone(ref mut client) => {
+                            client.send_pubsub_pipeline(&pipeline, indices.len()).await
+                        }
+                        ClientWrapper::Cluster { ref mut client } => {
+                            let route = SingleNodeRoutingInfo::SpecificNode(Route::new(
+                                slot,
+                                SlotAddr::Master,
+                            ));
+                            client
+                                .route_pipeline(&pipeline, 0, indices.len(), route)
+                                .await
+                        }
+                    };
+                    (indices, result)
+                }
+            })
+            .collect();
+        run_with_timeout(request_timeout, async move {
+            let mut first_error = None;
+            for (indices, result) in future::join_all(requests).await {
+                match result {
+                    Ok(_) => indices.into_iter().for_each(|index| change.confirm(index)),
+                    Err(err) => {
+                        first_error.get_or_insert(err);
+                    }
+                }
+            }
+            match first_error {
+                Some(err) => Err(err),
+                None => Ok(Value::Okay),
+            }
         })
         .boxed()
     }
@@ -304,6 +420,7 @@ impl Client {
         mut values: Vec<Value>,
         command_count: usize,
         offset: usize,
+        decompress: bool,
     ) -> RedisResult<Value> {
         assert_eq!(values.len(), 1);
         let value = values.pop();
@@ -332,18 +449,31 @@ impl Client {
                     .into());
             }
         };
-        Self::convert_transaction_values_to_expected_types(pipeline, values, command_count)
+        Self::convert_transaction_values_to_expected_types(
+            pipeline,
+            values,
+            command_count,
+            decompress,
+        )
     }
 
     fn convert_transaction_values_to_expected_types(
         pipeline: &redis::Pipeline,
         values: Vec<Value>,
         command_count: usize,
+        decompress: bool,
     ) -> RedisResult<Value> {
         let values = values
             .into_iter()
-            .zip(pipeline.cmd_iter().map(expected_type_for_cmd))
-            .map(|(value, expected_type)| convert_to_expected_type(value, expected_type))
+            .zip(pipeline.cmd_iter())
+            .map(|(value, cmd)| {
+                let value = convert_to_expected_type(value, expected_type_for_cmd(cmd))?;
+                Ok(if decompress && returns_stored_values(cmd) {
+                    decompress_value(value)
+                } else {
+                    value
+                })
+            })
             .try_fold(
                 Vec::with_capacity(command_count),
                 |mut acc, result| -> RedisResult<_> {
@@ -361,7 +491,13 @@ impl Client {
     ) -> redis::RedisFuture<'a, Value> {
         let command_count = pipeline.cmd_iter().count();
         let offset = command_count + 1;
-        run_with_timeout(Some(self.request_timeout), async move {
+        let compressed_pipeline = self
+            .compression
+            .as_ref()
+            .and_then(|compression| compression.compress_pipeline(pipeline));
+        let decompress = self.compression.is_some();
+        run_with_timeout(Some(self.batch_request_timeout()), async move {
+            let pipeline = compressed_pipeline.as_ref().unwrap_or(pipeline);
             let values = match self.internal_client {
                 ClientWrapper::Standalone(ref mut client) => {
                     client.send_pipeline(pipeline, offset, 1).await
@@ -375,11 +511,136 @@ impl Client {
                 },
             }?;
 
-            Self::get_transaction_values(pipeline, values, command_count, offset)
+            Self::get_transaction_values(pipeline, values, command_count, offset, decompress)
         })
         .boxed()
     }
 
+    /// Publishes `messages[i]` on `channels[i]`, and returns the number of receivers of every message.
+    /// The publishes are sent in pipelines. In cluster mode, sharded publishes are grouped by slot and sent to the
+    /// primaries that own them. Other publishes are propagated by the cluster, so they are all sent to the primary of
+    /// slot 0, which keeps them in order across batches.
+    pub async fn publish_batch<T: AsRef<[u8]>>(
+        &mut self,
+        channels: &[T],
+        messages: &[T],
+        sharded: bool,
+    ) -> RedisResult<Value> {
+        if channels.len() != messages.len() {
+            return Err(RedisError::from((
+                ErrorKind::ClientError,
+                "Every published message requires a channel",
+                format!(
+                    "Received {} channels and {} messages.",
+                    channels.len(),
+                    messages.len()
+                ),
+            )));
+        }
+        let group_by_slot =
+            sharded && matches!(self.internal_client, ClientWrapper::Cluster { .. });
+        let command_name = if sharded { "SPUBLISH" } else { "PUBLISH" };
+        let mut pipelines = SlotPipelines::new();
+        for (index, (channel, message)) in channels.iter().zip(messages).enumerate() {
+            let slot = if group_by_slot {
+                redis::cluster_topology::get_slot(channel.as_ref())
+            } else {
+                0
+            };
+            let (indices, pipeline) = pipelines
+                .entry(slot)
+                .or_insert_with(|| (Vec::new(), redis::Pipeline::new()));
+            indices.push(index);
+            pipeline
+                .cmd(command_name)
+                .arg(channel.as_ref())
+                .arg(message.as_ref());
+        }
+        let values = self.send_slot_pipelines(pipelines, channels.len()).await?;
+        Ok(Value::Array(values))
+    }
+
+    /// Sends `commands` in non-atomic pipelines, and returns the response of every command, in order.
+    /// In cluster mode, the commands are grouped by the slot of their first argument, which must be their key, and
+    /// every group is sent to the primary that owns its slot. The commands of a slot are executed in order, but commands
+    /// of different slots are sent concurrently.
+    pub async fn send_pipeline_batch(&mut self, commands: &[Cmd]) -> RedisResult<Value> {
+        let group_by_slot = matches!(self.internal_client, ClientWrapper::Cluster { .. });
+        let mut pipelines = SlotPipelines::new();
+        for (index, cmd) in commands.iter().enumerate() {
+            let slot = match cmd.arg_idx(1) {
+                Some(key) if group_by_slot => redis::cluster_topology::get_slot(key),
+                _ => 0,
+            };
+            let compressed_cmd = self
+                .compression
+                .as_ref()
+                .and_then(|compression| compression.compress_cmd(cmd));
+            let (indices, pipeline) = pipelines
+                .entry(slot)
+                .or_insert_with(|| (Vec::new(), redis::Pipeline::new()));
+            indices.push(index);
+            pipeline.add_command(compressed_cmd.unwrap_or_else(|| cmd.clone()));
+        }
+        let values = self.send_slot_pipelines(pipelines, commands.len()).await?;
+        let decompress = self.compression.is_some();
+        let values = values
+            .into_iter()
+            .zip(commands)
+            .map(|(value, cmd)| {
+                let value = convert_to_expected_type(value, expected_type_for_cmd(cmd))?;
+                Ok(if decompress && returns_stored_values(cmd) {
+                    decompress_value(value)
+                } else {
+                    value
+                })
+            })
+            .collect::<RedisResult<Vec<_>>>()?;
+        Ok(Value::Array(values))
+    }
+
+    /// Sends the pipelines concurrently, each to the primary of its slot, and returns the responses of all the commands
+    /// ordered by their indices. In standalone mode, the slots are ignored.
+    async fn send_slot_pipelines(
+        &mut self,
+        pipelines: SlotPipelines,
+        command_count: usize,
+    ) -> RedisResult<Vec<Value>> {
+        let requests: Vec<_> = pipelines
+            .into_iter()
+            .map(|(slot, (indices, pipeline))| {
+                let mut internal_client = self.internal_client.clone();
+                async move {
+                    let values = match internal_client {
+                        ClientWrapper::Standalone(ref mut client) => {
+                            client.send_pipeline(&pipeline, 0, indices.len()).await
+                        }
+                        ClientWrapper::Cluster { ref mut client } => {
+                            let route = SingleNodeRoutingInfo::SpecificNode(Route::new(
+                                slot,
+                                SlotAddr::Master,
+                            ));
+                            client
+                                .route_pipeline(&pipeline, 0, indices.len(), route)
+                                .await
+                        }
+                    }?;
+                    RedisResult::Ok(indices.into_iter().zip(values))
+                }
+            })
+            .collect();
+        run_with_timeout(Some(self.batch_request_timeout()), async move {
+            let mut results = vec![Value::Nil; command_count];
+            for batch in future::try_join_all(requests).await? {
+                for (index, value) in batch {
+                    results[index] = value;
+                }
+            }
+            Ok(results)
+        })
+        .await
+    }
+
     pub async fn invoke_script<'a>(
         &'a mut self,
         hash: &'a str,
@@ -588,8 +849,14 @@ fn sanitized_request_string(request: &ConnectionRequest) -> String {
         .map(|pubsub_subscriptions| format!("\nPubsub subscriptions: {pubsub_subscriptions:?}"))
         .unwrap_or_default();
 
+    let compression = request
+        .compression
+        .as_ref()
+        .map(|compression| format!("\nCompression: {compression:?}"))
+        .unwrap_or_default();
+
     format!(
-        "\nAddresses: {addresses}{tls_mode}{cluster_mode}{request_timeout}{rfr_strategy}{connection_retry_strategy}{database_id}{protocol}{client_name}{periodic_checks}{pubsub_subscriptions}",
+        "\nAddresses: {addresses}{tls_mode}{cluster_mode}{request_timeout}{rfr_strategy}{connection_retry_strategy}{database_id}{protocol}{client_name}{periodic_checks}{pubsub_subscriptions}{compression}",
     )
 }
 
@@ -605,23 +872,47 @@ impl Client {
             sanitized_request_string(&request),
         );
         let request_timeout = to_duration(request.request_timeout, DEFAULT_RESPONSE_TIMEOUT);
+        let compression = request.compression;
         tokio::time::timeout(DEFAULT_CLIENT_CREATION_TIMEOUT, async move {
-            let internal_client = if request.cluster_mode_enabled {
-                let client = create_cluster_client(request, push_sender)
+            let (internal_client, pubsub_subscriptions) = if request.cluster_mode_enabled {
+                let pubsub_subscriptions =
+                    PubSubSubscriptions::new(request.pubsub_subscriptions.as_ref());
+                let (cluster_push_sender, push_forwarding) = match push_sender {
+                    Some(push_sender) => {
+                        let (cluster_push_sender, push_receiver) = mpsc::unbounded_channel();
+                        (
+                            Some(cluster_push_sender),
+                            Some((push_receiver, push_sender)),
+                        )
+                    }
+                    None => (None, None),
+                };
+                let client = create_cluster_client(request, cluster_push_sender)
                     .await
                     .map_err(ConnectionError::Cluster)?;
-                ClientWrapper::Cluster { client }
+                if let Some((push_receiver, push_sender)) = push_forwarding {
+                    start_cluster_resubscription_task(
+                        client.clone(),
+                        pubsub_subscriptions.clone(),
+                        push_receiver,
+                        push_sender,
+                    );
+                }
+                (ClientWrapper::Cluster { client }, pubsub_subscriptions)
             } else {
-                ClientWrapper::Standalone(
-                    StandaloneClient::create_client(request, push_sender)
-                        .await
-                        .map_err(ConnectionError::Standalone)?,
-                )
+                let client = StandaloneClient::create_client(request, push_sender)
+                    .await
+                    .map_err(ConnectionError::Standalone)?;
+                let pubsub_subscriptions = client.pubsub_subscriptions().clone();
+                (ClientWrapper::Standalone(client), pubsub_subscriptions)
             };
 
             Ok(Self {
                 internal_client,
                 request_timeout,
+                request_timeout_override: None,
+                compression,
+                pubsub_subscriptions,
             })
         })
         .await
@@ -665,11 +956,21 @@ mod tests {
     use redis::Cmd;
 
     use crate::client::{
-        get_request_timeout, RequestTimeoutOption, TimeUnit, BLOCKING_CMD_TIMEOUT_EXTENSION,
+        get_request_timeout, run_with_timeout, RequestTimeoutOption, TimeUnit,
+        BLOCKING_CMD_TIMEOUT_EXTENSION,
     };
 
     use super::get_timeout_from_cmd_arg;
 
+    #[test]
+    fn test_run_with_zero_timeout_fails_without_sending_the_request() {
+        let request = futures::future::lazy(|_| -> redis::RedisResult<()> {
+            panic!("The request shouldn't be sent")
+        });
+        let result = futures::executor::block_on(run_with_timeout(Some(Duration::ZERO), request));
+        assert!(result.unwrap_err().is_timeout());
+    }
+
     #[test]
     fn test_get_timeout_from_cmd_returns_correct_duration_int() {
         let mut cmd = Cmd::new();
@@ -0,0 +1,529 @@
+/**
+ * Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+ */
+use logger_core::log_warn;
+use redis::cluster_async::ClusterConnection;
+use redis::cluster_routing::{Route, RoutingInfo, SingleNodeRoutingInfo, SlotAddr};
+use redis::{Cmd, PubSubSubscriptionInfo, PubSubSubscriptionKind, PushInfo, PushKind, Value};
+use std::collections::HashSet;
+use std::sync::{Arc, Mutex};
+use std::time::Duration;
+use tokio::sync::mpsc;
+
+/// A subscription command that was sent by the user, e.g. `SUBSCRIBE ch1 ch2` or `PUNSUBSCRIBE`.
+#[derive(Debug)]
+pub(crate) struct SubscriptionCommand {
+    pub(crate) kind: PubSubSubscriptionKind,
+    pub(crate) is_subscribe: bool,
+    /// The channels or patterns of the command. Empty for an unsubscribe from all channels of `kind`.
+    pub(crate) channels: Vec<Vec<u8>>,
+}
+
+impl SubscriptionCommand {
+    /// Returns the subscription command in `cmd`, or `None` if `cmd` isn't a subscription command.
+    pub(crate) fn from_cmd(cmd: &Cmd) -> Option<Self> {
+        let command = cmd.command()?;
+        let (kind, is_subscribe) = match command.as_slice() {
+            b"SUBSCRIBE" => (PubSubSubscriptionKind::Exact, true),
+            b"PSUBSCRIBE" => (PubSubSubscriptionKind::Pattern, true),
+            b"SSUBSCRIBE" => (PubSubSubscriptionKind::Sharded, true),
+            b"UNSUBSCRIBE" => (PubSubSubscriptionKind::Exact, false),
+            b"PUNSUBSCRIBE" => (PubSubSubscriptionKind::Pattern, false),
+            b"SUNSUBSCRIBE" => (PubSubSubscriptionKind::Sharded, false),
+            _ => return None,
+        };
+        let channels = cmd.args_iter().skip(1).filter_map(arg_bytes).collect();
+        Some(Self {
+            kind,
+            is_subscribe,
+            channels,
+        })
+    }
+
+    /// Returns the command that subscribes to, or unsubscribes from, a single channel or pattern.
+    pub(crate) fn single_channel_cmd(&self, channel: &[u8]) -> Cmd {
+        let name = match (&self.kind, self.is_subscribe) {
+            (PubSubSubscriptionKind::Exact, true) => "SUBSCRIBE",
+            (PubSubSubscriptionKind::Pattern, true) => "PSUBSCRIBE",
+            (PubSubSubscriptionKind::Sharded, true) => "SSUBSCRIBE",
+            (PubSubSubscriptionKind::Exact, false) => "UNSUBSCRIBE",
+            (PubSubSubscriptionKind::Pattern, false) => "PUNSUBSCRIBE",
+            (PubSubSubscriptionKind::Sharded, false) => "SUNSUBSCRIBE",
+        };
+        let mut cmd = redis::cmd(name);
+        cmd.arg(channel);
+        cmd
+    }
+}
+
+fn arg_bytes(arg: redis::Arg<&[u8]>) -> Option<Vec<u8>> {
+    match arg {
+        redis::Arg::Simple(bytes) => Some(bytes.to_vec()),
+        redis::Arg::Cursor => None,
+    }
+}
+
+#[derive(Default)]
+struct SubscriptionsState {
+    /// The subscriptions the client is currently subscribed to.
+    current: PubSubSubscriptionInfo,
+    /// The subscriptions the client was created with.
+    initial: PubSubSubscriptionInfo,
+}
+
+/// The subscriptions of a client, kept up to date with the subscription commands sent at runtime, so that they can be
+/// restored after reconnects and slot migrations.
+#[derive(Clone, Default)]
+pub(crate) struct PubSubSubscriptions {
+    state: Arc<Mutex<SubscriptionsState>>,
+}
+
+impl std::fmt::Debug for PubSubSubscriptions {
+    fn fmt(&self, f: &mut std::fmt::Formatter<'_>) -> std::fmt::Result {
+        write!(f, "{:?}", self.state.lock().unwrap().current)
+    }
+}
+
+impl PubSubSubscriptions {
+    pub(crate) fn new(initial: Option<&PubSubSubscriptionInfo>) -> Self {
+        let initial = initial.cloned().unwrap_or_default();
+        Self {
+            state: Arc::new(Mutex::new(SubscriptionsState {
+                current: initial.clone(),
+                initial,
+            })),
+        }
+    }
+
+    /// Returns the subscriptions the client is currently subscribed to.
+    pub(crate) fn current(&self) -> PubSubSubscriptionInfo {
+        self.state.lock().unwrap().current.clone()
+    }
+
+    /// Returns the current subscriptions that the client wasn't created with.
+    pub(crate) fn added_at_runtime(&self) -> PubSubSubscriptionInfo {
+        let state = self.state.lock().unwrap();
+        let mut added = PubSubSubscriptionInfo::new();
+        for (kind, channels) in state.current.iter() {
+            let initial_channels = state.initial.get(kind);
+            let channels: HashSet<_> = channels
+                .iter()
+                .filter(|channel| {
+                    initial_channels.map_or(true, |initial| !initial.contains(*channel))
+                })
+                .cloned()
+                .collect();
+            if !channels.is_empty() {
+                added.insert(kind.clone(), channels);
+            }
+        }
+        added
+    }
+
+    pub(crate) fn contains(&self, kind: &PubSubSubscriptionKind, channel: &[u8]) -> bool {
+        self.state
+            .lock()
+            .unwrap()
+            .current
+            .get(kind)
+            .is_some_and(|channels| channels.contains(channel))
+    }
+
+    /// Returns whether the client was created with a subscription to `channel` and unsubscribed from it at runtime.
+    pub(crate) fn removed_at_runtime(&self, kind: &PubSubSubscriptionKind, channel: &[u8]) -> bool {
+        let state = self.state.lock().unwrap();
+        let contains = |subscriptions: &PubSubSubscriptionInfo| {
+            subscriptions
+                .get(kind)
+                .is_some_and(|channels| channels.contains(channel))
+        };
+        contains(&state.initial) && !contains(&state.current)
+    }
+
+    /// Applies `command` to the tracked subscriptions, and returns the change, which holds the channels or patterns
+    /// whose subscription changed. Channels that are already subscribed are skipped, and an unsubscribe without channels
+    /// is expanded to all the tracked channels of its kind.
+    ///
+    /// The subscriptions are updated before the command is sent, so that the unsubscribe notifications of the command
+    /// aren't mistaken for unsubscribes initiated by the server. Channels that aren't confirmed with
+    /// [`SubscriptionChange::confirm`] are reverted once the change is dropped, so that a failed command can be retried.
+    pub(crate) fn apply(&self, command: &SubscriptionCommand) -> SubscriptionChange {
+        let mut state = self.state.lock().unwrap();
+        let channels = state.current.entry(command.kind.clone()).or_default();
+        let changed = if command.is_subscribe {
+            command
+                .channels
+                .iter()
+                .filter(|channel| channels.insert((*channel).clone()))
+                .cloned()
+                .collect()
+        } else if command.channels.is_empty() {
+            channels.drain().collect()
+        } else {
+            command
+                .channels
+                .iter()
+                .filter(|channel| channels.remove(*channel))
+                .cloned()
+                .collect()
+        };
+        SubscriptionChange {
+            subscriptions: self.clone(),
+            kind: command.kind.clone(),
+            is_subscribe: command.is_subscribe,
+            confirmed: vec![false; changed.len()],
+            channels: changed,
+        }
+    }
+}
+
+/// The channels or patterns whose subscription was changed by [`PubSubSubscriptions::apply`]. Dropping the change
+/// reverts the channels that weren't confirmed.
+pub(crate) struct SubscriptionChange {
+    subscriptions: PubSubSubscriptions,
+    kind: PubSubSubscriptionKind,
+    is_subscribe: bool,
+    channels: Vec<Vec<u8>>,
+    confirmed: Vec<bool>,
+}
+
+impl SubscriptionChange {
+    pub(crate) fn channels(&self) -> &[Vec<u8>] {
+        &self.channels
+    }
+
+    /// Keeps the change of `self.channels()[index]`, once its command succeeded.
+    pub(crate) fn confirm(&mut self, index: usize) {
+        self.confirmed[index] = true;
+    }
+}
+
+impl Drop for SubscriptionChange {
+    fn drop(&mut self) {
+        let mut state = self.subscriptions.state.lock().unwrap();
+        let channels = state.current.entry(self.kind.clone()).or_default();
+        for (channel, confirmed) in self.channels.drain(..).zip(&self.confirmed) {
+            if *confirmed {
+                continue;
+            }
+            if self.is_subscribe {
+                channels.remove(&channel);
+            } else {
+                channels.insert(channel);
+            }
+        }
+    }
+}
+
+/// Returns the slot whose primary a subscription command is sent to in cluster mode. Sharded channels are subscribed
+/// on the primary that owns their slot, and other channels and patterns are subscribed on the primary of slot 0.
+pub(crate) fn get_subscription_slot(kind: &PubSubSubscriptionKind, channel: &[u8]) -> u16 {
+    match kind {
+        PubSubSubscriptionKind::Sharded => redis::cluster_topology::get_slot(channel),
+        _ => 0,
+    }
+}
+
+fn get_subscription_routing(kind: &PubSubSubscriptionKind, channel: &[u8]) -> RoutingInfo {
+    RoutingInfo::SingleNode(SingleNodeRoutingInfo::SpecificNode(Route::new(
+        get_subscription_slot(kind, channel),
+        SlotAddr::Master,
+    )))
+}
+
+fn single_channel_command(
+    kind: PubSubSubscriptionKind,
+    is_subscribe: bool,
+    channel: Vec<u8>,
+) -> SubscriptionCommand {
+    SubscriptionCommand {
+        kind,
+        is_subscribe,
+        channels: vec![channel],
+    }
+}
+
+/// Returns the single channel commands that bring the subscriptions of the server back in line with `subscriptions`
+/// after `push` was received.
+fn get_resubscriptions(
+    subscriptions: &PubSubSubscriptions,
+    push: &PushInfo,
+) -> Vec<SubscriptionCommand> {
+    let pushed_channel = match push.data.first() {
+        Some(Value::BulkString(channel)) => Some(channel),
+        _ => None,
+    };
+    match push.kind {
+        // The cluster client restores the subscriptions it was created with, but not the ones added at runtime.
+        PushKind::Disconnection => subscriptions
+            .added_at_runtime()
+            .into_iter()
+            .flat_map(|(kind, channels)| {
+                channels
+                    .into_iter()
+                    .map(move |channel| single_channel_command(kind.clone(), true, channel))
+            })
+            .collect(),
+        // The cluster client also restores the subscriptions it was created with that were unsubscribed at runtime,
+        // so they are unsubscribed again once the server confirms them.
+        PushKind::Subscribe | PushKind::PSubscribe | PushKind::SSubscribe => {
+            let kind = match push.kind {
+                PushKind::Subscribe => PubSubSubscriptionKind::Exact,
+                PushKind::PSubscribe => PubSubSubscriptionKind::Pattern,
+                _ => PubSubSubscriptionKind::Sharded,
+            };
+            match pushed_channel {
+                Some(channel) if subscriptions.removed_at_runtime(&kind, channel) => {
+                    vec![single_channel_command(kind, false, channel.clone())]
+                }
+                _ => Vec::new(),
+            }
+        }
+        // The server unsubscribes sharded channels when their slot is migrated to another node.
+        PushKind::SUnsubscribe => match pushed_channel {
+            Some(channel) if subscriptions.contains(&PubSubSubscriptionKind::Sharded, channel) => {
+                vec![single_channel_command(
+                    PubSubSubscriptionKind::Sharded,
+                    true,
+                    channel.clone(),
+                )]
+            }
+            _ => Vec::new(),
+        },
+        _ => Vec::new(),
+    }
+}
+
+/// Returns the delays between attempts to restore a subscription, which are retried until they succeed.
+fn resubscription_retry_iterator() -> impl Iterator<Item = Duration> {
+    const MAX_DURATION: Duration = Duration::from_secs(5);
+    crate::retry_strategies::get_exponential_backoff(
+        crate::retry_strategies::EXPONENT_BASE,
+        crate::retry_strategies::FACTOR,
+        crate::retry_strategies::NUMBER_OF_RETRIES,
+    )
+    .get_iterator()
+    .chain(std::iter::repeat(MAX_DURATION))
+}
+
+/// Sends the single channel `command` until it succeeds. Retries stop once the command no longer matches the tracked
+/// subscriptions, because the user changed them in the meantime, or once the client is dropped.
+async fn resubscribe(
+    mut client: ClusterConnection,
+    subscriptions: PubSubSubscriptions,
+    command: SubscriptionCommand,
+    push_sender: mpsc::UnboundedSender<PushInfo>,
+) {
+    let Some(channel) = command.channels.first() else {
+        return;
+    };
+    let cmd = command.single_channel_cmd(channel);
+    let mut retry_delays = resubscription_retry_iterator();
+    loop {
+        if push_sender.is_closed()
+            || subscriptions.contains(&command.kind, channel) != command.is_subscribe
+        {
+            return;
+        }
+        let routing = get_subscription_routing(&command.kind, channel);
+        let Err(err) = client.route_command(&cmd, routing).await else {
+            return;
+        };
+        let delay = retry_delays.next().unwrap_or(Duration::from_secs(5));
+        log_warn(
+            "pubsub",
+            format!(
+                "Failed to restore a subscription of {:?}, retrying in {delay:?}: {err}",
+                command.kind
+            ),
+        );
+        tokio::time::sleep(delay).await;
+    }
+}
+
+/// Forwards the push notifications of a cluster client to `push_sender`, and restores the subscriptions that were
+/// lost to disconnects and slot migrations. The task stops once the receiver of `push_sender` is dropped.
+pub(crate) fn start_cluster_resubscription_task(
+    client: ClusterConnection,
+    subscriptions: PubSubSubscriptions,
+    mut push_receiver: mpsc::UnboundedReceiver<PushInfo>,
+    push_sender: mpsc::UnboundedSender<PushInfo>,
+) {
+    tokio::spawn(async move {
+        loop {
+            let push = tokio::select! {
+                push = push_receiver.recv() => push,
+                _ = push_sender.closed() => None,
+            };
+            let Some(push) = push else {
+                return;
+            };
+            let resubscriptions = get_resubscriptions(&subscriptions, &push);
+            if push_sender.send(push).is_err() {
+                return;
+            }
+            for command in resubscriptions {
+                tokio::spawn(resubscribe(
+                    client.clone(),
+                    subscriptions.clone(),
+                    command,
+                    push_sender.clone(),
+                ));
+            }
+        }
+    });
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn apply(subscriptions: &PubSubSubscriptions, cmd: &Cmd) -> Vec<Vec<u8>> {
+        let command = SubscriptionCommand::from_cmd(cmd).unwrap();
+        let mut change = subscriptions.apply(&command);
+        for index in 0..change.channels().len() {
+            change.confirm(index);
+        }
+        let mut changed = change.channels().to_vec();
+        changed.sort();
+        changed
+    }
+
+    #[test]
+    fn test_subscription_command_parsing() {
+        assert!(SubscriptionCommand::from_cmd(redis::cmd("GET").arg("key")).is_none());
+
+        let command =
+            SubscriptionCommand::from_cmd(redis::cmd("PSUBSCRIBE").arg("a*").arg("b*")).unwrap();
+        assert_eq!(command.kind, PubSubSubscriptionKind::Pattern);
+        assert!(command.is_subscribe);
+        assert_eq!(command.channels, vec![b"a*".to_vec(), b"b*".to_vec()]);
+
+        let command = SubscriptionCommand::from_cmd(&redis::cmd("SUNSUBSCRIBE")).unwrap();
+        assert_eq!(command.kind, PubSubSubscriptionKind::Sharded);
+        assert!(!command.is_subscribe);
+        assert!(command.channels.is_empty());
+    }
+
+    #[test]
+    fn test_subscriptions_are_tracked() {
+        let mut initial = PubSubSubscriptionInfo::new();
+        initial.insert(
+            PubSubSubscriptionKind::Exact,
+            HashSet::from([b"initial".to_vec()]),
+        );
+        let subscriptions = PubSubSubscriptions::new(Some(&initial));
+
+        assert_eq!(
+            apply(
+                &subscriptions,
+                redis::cmd("SUBSCRIBE").arg("initial").arg("added")
+            ),
+            vec![b"added".to_vec()]
+        );
+        assert!(subscriptions.contains(&PubSubSubscriptionKind::Exact, b"initial"));
+        assert!(subscriptions.contains(&PubSubSubscriptionKind::Exact, b"added"));
+        assert_eq!(
+            subscriptions.added_at_runtime()[&PubSubSubscriptionKind::Exact],
+            HashSet::from([b"added".to_vec()])
+        );
+
+        assert_eq!(
+            apply(&subscriptions, redis::cmd("UNSUBSCRIBE").arg("missing")),
+            Vec::<Vec<u8>>::new()
+        );
+        assert_eq!(
+            apply(&subscriptions, &redis::cmd("UNSUBSCRIBE")),
+            vec![b"added".to_vec(), b"initial".to_vec()]
+        );
+        assert!(!subscriptions.contains(&PubSubSubscriptionKind::Exact, b"initial"));
+        assert!(subscriptions.added_at_runtime().is_empty());
+    }
+
+    #[test]
+    fn test_failed_subscription_changes_are_reverted() {
+        let subscriptions = PubSubSubscriptions::new(None);
+        let command =
+            SubscriptionCommand::from_cmd(redis::cmd("SUBSCRIBE").arg("a").arg("b")).unwrap();
+
+        // The command of "a" succeeded, and the command of "b" failed
+        let mut change = subscriptions.apply(&command);
+        let index = change
+            .channels()
+            .iter()
+            .position(|channel| channel == b"a")
+            .unwrap();
+        change.confirm(index);
+        drop(change);
+        assert!(subscriptions.contains(&PubSubSubscriptionKind::Exact, b"a"));
+        assert!(!subscriptions.contains(&PubSubSubscriptionKind::Exact, b"b"));
+
+        // Retrying the subscription sends the command of "b" again
+        let change = subscriptions.apply(&command);
+        assert_eq!(change.channels(), [b"b".to_vec()]);
+        drop(change);
+        assert!(!subscriptions.contains(&PubSubSubscriptionKind::Exact, b"b"));
+        assert_eq!(
+            apply(&subscriptions, redis::cmd("SUBSCRIBE").arg("a").arg("b")),
+            vec![b"b".to_vec()]
+        );
+        assert!(subscriptions.contains(&PubSubSubscriptionKind::Exact, b"b"));
+
+        // A failed unsubscribe keeps the channels subscribed, so that they are still restored on reconnects
+        let change = subscriptions
+            .apply(&SubscriptionCommand::from_cmd(&redis::cmd("UNSUBSCRIBE")).unwrap());
+        assert_eq!(change.channels().len(), 2);
+        assert!(!subscriptions.contains(&PubSubSubscriptionKind::Exact, b"a"));
+        drop(change);
+        assert!(subscriptions.contains(&PubSubSubscriptionKind::Exact, b"a"));
+        assert!(subscriptions.contains(&PubSubSubscriptionKind::Exact, b"b"));
+    }
+
+    #[test]
+    fn test_resubscriptions_follow_runtime_changes() {
+        let mut initial = PubSubSubscriptionInfo::new();
+        initial.insert(
+            PubSubSubscriptionKind::Exact,
+            HashSet::from([b"initial".to_vec(), b"removed".to_vec()]),
+        );
+        let subscriptions = PubSubSubscriptions::new(Some(&initial));
+        apply(&subscriptions, redis::cmd("SUBSCRIBE").arg("added"));
+        apply(&subscriptions, redis::cmd("UNSUBSCRIBE").arg("removed"));
+        let push = |kind, channel: &str| PushInfo {
+            kind,
+            data: vec![
+                Value::BulkString(channel.as_bytes().to_vec()),
+                Value::Int(1),
+            ],
+        };
+
+        // Only the subscriptions added at runtime are restored after a disconnect
+        let resubscriptions = get_resubscriptions(
+            &subscriptions,
+            &PushInfo {
+                kind: PushKind::Disconnection,
+                data: Vec::new(),
+            },
+        );
+        assert_eq!(resubscriptions.len(), 1);
+        assert!(resubscriptions[0].is_subscribe);
+        assert_eq!(resubscriptions[0].channels, vec![b"added".to_vec()]);
+
+        // The subscriptions the client was created with and unsubscribed from are undone once they are restored
+        let resubscriptions =
+            get_resubscriptions(&subscriptions, &push(PushKind::Subscribe, "removed"));
+        assert_eq!(resubscriptions.len(), 1);
+        assert_eq!(resubscriptions[0].kind, PubSubSubscriptionKind::Exact);
+        assert!(!resubscriptions[0].is_subscribe);
+        assert_eq!(resubscriptions[0].channels, vec![b"removed".to_vec()]);
+        assert!(
+            get_resubscriptions(&subscriptions, &push(PushKind::Subscribe, "initial")).is_empty()
+        );
+        assert!(
+            get_resubscriptions(&subscriptions, &push(PushKind::Subscribe, "added")).is_empty()
+        );
+        assert!(
+            get_resubscriptions(&subscriptions, &push(PushKind::PSubscribe, "removed")).is_empty()
+        );
+    }
+}
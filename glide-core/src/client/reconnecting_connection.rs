@@ -1,6 +1,7 @@
 /**
  * Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
  */
+use super::pubsub::PubSubSubscriptions;
 use super::{NodeAddress, TlsMode};
 use crate::retry_strategies::RetryStrategy;
 use futures_intrusive::sync::ManualResetEvent;
@@ -26,6 +27,20 @@ struct ConnectionBackend {
     connection_info: redis::Client,
     /// Once this flag is set, the internal connection needs no longer try to reconnect to the server, because all the outer clients were dropped.
     client_dropped_flagged: AtomicBool,
+    /// The pubsub subscriptions of the connection, which are restored when it reconnects.
+    pubsub_subscriptions: Option<PubSubSubscriptions>,
+}
+
+impl ConnectionBackend {
+    /// Returns the client to reconnect with, which subscribes to the current pubsub subscriptions of the connection.
+    fn get_reconnection_client(&self) -> redis::Client {
+        let Some(pubsub_subscriptions) = &self.pubsub_subscriptions else {
+            return self.connection_info.clone();
+        };
+        let mut connection_info = self.connection_info.get_connection_info().clone();
+        connection_info.redis.pubsub_subscriptions = Some(pubsub_subscriptions.current());
+        redis::Client::open(connection_info).unwrap() // can unwrap, because [open] doesn't fail on a ConnectionInfo.
+    }
 }
 
 /// State of the current connection. Allows the user to use a connection only when a reconnect isn't in progress or has failed.
@@ -150,6 +165,7 @@ impl ReconnectingConnection {
         redis_connection_info: RedisConnectionInfo,
         tls_mode: TlsMode,
         push_sender: Option<mpsc::UnboundedSender<PushInfo>>,
+        pubsub_subscriptions: Option<PubSubSubscriptions>,
     ) -> Result<ReconnectingConnection, (ReconnectingConnection, RedisError)> {
         log_debug(
             "connection creation",
@@ -161,6 +177,7 @@ impl ReconnectingConnection {
             connection_info,
             connection_available_signal: ManualResetEvent::new(true),
             client_dropped_flagged: AtomicBool::new(false),
+            pubsub_subscriptions,
         };
         create_connection(backend, connection_retry_strategy, push_sender).await
     }
@@ -224,7 +241,7 @@ impl ReconnectingConnection {
         // The reconnect task is spawned instead of awaited here, so that the reconnect attempt will continue in the
         // background, regardless of whether the calling task is dropped or not.
         task::spawn(async move {
-            let client = &connection_clone.inner.backend.connection_info;
+            let client = connection_clone.inner.backend.get_reconnection_client();
             for sleep_duration in internal_retry_iterator() {
                 if connection_clone.is_dropped() {
                     log_debug(
@@ -234,7 +251,7 @@ impl ReconnectingConnection {
                     // Client was dropped, reconnection attempts can stop
                     return;
                 }
-                match get_multiplexed_connection(client, push_sender.clone()).await {
+                match get_multiplexed_connection(&client, push_sender.clone()).await {
                     Ok(mut connection) => {
                         if connection
                             .send_packed_command(&redis::cmd("PING"))
@@ -2,6 +2,7 @@
  * Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
  */
 use super::get_redis_connection_info;
+use super::pubsub::PubSubSubscriptions;
 use super::reconnecting_connection::ReconnectingConnection;
 use super::{ConnectionRequest, NodeAddress, TlsMode};
 use crate::retry_strategies::RetryStrategy;
@@ -30,8 +31,11 @@ enum ReadFrom {
 struct DropWrapper {
     /// Connection to the primary node in the client.
     primary_index: usize,
+    /// Connection to the node that the client subscribes through.
+    pubsub_node_index: usize,
     nodes: Vec<ReconnectingConnection>,
     read_from: ReadFrom,
+    pubsub_subscriptions: PubSubSubscriptions,
 }
 
 impl Drop for DropWrapper {
@@ -105,6 +109,8 @@ impl StandaloneClient {
         }
         let mut redis_connection_info = get_redis_connection_info(&connection_request);
         let pubsub_connection_info = redis_connection_info.clone();
+        let pubsub_subscriptions =
+            PubSubSubscriptions::new(redis_connection_info.pubsub_subscriptions.as_ref());
         redis_connection_info.pubsub_subscriptions = None;
         let retry_strategy = RetryStrategy::new(connection_request.connection_retry_strategy);
 
@@ -115,26 +121,33 @@ impl StandaloneClient {
         let pubsub_addr = &connection_request.addresses[pubsub_node_index];
         let mut stream = stream::iter(connection_request.addresses.iter())
             .map(|address| async {
-                get_connection_and_replication_info(
+                let is_pubsub_node = address.to_string() == pubsub_addr.to_string();
+                let result = get_connection_and_replication_info(
                     address,
                     &retry_strategy,
-                    if address.to_string() != pubsub_addr.to_string() {
-                        &redis_connection_info
-                    } else {
+                    if is_pubsub_node {
                         &pubsub_connection_info
+                    } else {
+                        &redis_connection_info
                     },
                     tls_mode.unwrap_or(TlsMode::NoTls),
                     &push_sender,
+                    is_pubsub_node.then(|| pubsub_subscriptions.clone()),
                 )
                 .await
-                .map_err(|err| (format!("{}:{}", address.host, address.port), err))
+                .map_err(|err| (format!("{}:{}", address.host, address.port), err));
+                (is_pubsub_node, result)
             })
             .buffer_unordered(node_count);
 
         let mut nodes = Vec::with_capacity(node_count);
         let mut addresses_and_errors = Vec::with_capacity(node_count);
         let mut primary_index = None;
-        while let Some(result) = stream.next().await {
+        let mut pubsub_node_index = 0;
+        while let Some((is_pubsub_node, result)) = stream.next().await {
+            if is_pubsub_node {
+                pubsub_node_index = nodes.len();
+            }
             match result {
                 Ok((connection, replication_status)) => {
                     nodes.push(connection);
@@ -193,8 +206,10 @@ impl StandaloneClient {
         Ok(Self {
             inner: Arc::new(DropWrapper {
                 primary_index,
+                pubsub_node_index,
                 nodes,
                 read_from,
+                pubsub_subscriptions,
             }),
         })
     }
@@ -342,13 +357,35 @@ impl StandaloneClient {
             .await
     }
 
+    pub(super) fn pubsub_subscriptions(&self) -> &PubSubSubscriptions {
+        &self.inner.pubsub_subscriptions
+    }
+
+    /// Sends a pipeline of subscription commands to the node that the client subscribes through.
+    pub(super) async fn send_pubsub_pipeline(
+        &mut self,
+        pipeline: &redis::Pipeline,
+        count: usize,
+    ) -> RedisResult<Vec<Value>> {
+        let reconnecting_connection = &self.inner.nodes[self.inner.pubsub_node_index];
+        Self::send_pipeline_to(pipeline, 0, count, reconnecting_connection).await
+    }
+
     pub async fn send_pipeline(
         &mut self,
         pipeline: &redis::Pipeline,
         offset: usize,
         count: usize,
     ) -> RedisResult<Vec<Value>> {
-        let reconnecting_connection = self.get_primary_connection();
+        Self::send_pipeline_to(pipeline, offset, count, self.get_primary_connection()).await
+    }
+
+    async fn send_pipeline_to(
+        pipeline: &redis::Pipeline,
+        offset: usize,
+        count: usize,
+        reconnecting_connection: &ReconnectingConnection,
+    ) -> RedisResult<Vec<Value>> {
         let mut connection = reconnecting_connection.get_connection().await?;
         let result = connection
             .send_packed_commands(pipeline, offset, count)
@@ -409,6 +446,7 @@ async fn get_connection_and_replication_info(
     connection_info: &redis::RedisConnectionInfo,
     tls_mode: TlsMode,
     push_sender: &Option<mpsc::UnboundedSender<PushInfo>>,
+    pubsub_subscriptions: Option<PubSubSubscriptions>,
 ) -> Result<(ReconnectingConnection, Value), (ReconnectingConnection, RedisError)> {
     let result = ReconnectingConnection::new(
         address,
@@ -416,6 +454,7 @@ async fn get_connection_and_replication_info(
         connection_info.clone(),
         tls_mode,
         push_sender.clone(),
+        pubsub_subscriptions,
     )
     .await;
     let reconnecting_connection = match result {
@@ -23,6 +23,7 @@ pub struct ConnectionRequest {
     pub connection_retry_strategy: Option<ConnectionRetryStrategy>,
     pub periodic_checks: Option<PeriodicCheck>,
     pub pubsub_subscriptions: Option<redis::PubSubSubscriptionInfo>,
+    pub compression: Option<CompressionConfig>,
 }
 
 pub struct AuthenticationInfo {
@@ -65,6 +66,22 @@ pub enum TlsMode {
     SecureTls,
 }
 
+#[derive(PartialEq, Eq, Clone, Copy, Default, Debug)]
+pub enum CompressionBackend {
+    #[default]
+    Zlib,
+    Zstd,
+}
+
+#[derive(Clone, Copy, Debug)]
+pub struct CompressionConfig {
+    pub backend: CompressionBackend,
+    /// Values shorter than this number of bytes are sent as-is.
+    pub min_compression_size: usize,
+    /// The backend's default level is used when not set.
+    pub compression_level: Option<i32>,
+}
+
 pub struct ConnectionRetryStrategy {
     pub exponent_base: u32,
     pub factor: u32,
@@ -187,6 +204,19 @@ impl From<protobuf::ConnectionRequest> for ConnectionRequest {
             pubsub_subscriptions = Some(redis_pubsub);
         }
 
+        let compression = value.compression.0.map(|compression| CompressionConfig {
+            backend: match compression.backend.enum_value_or_default() {
+                protobuf::CompressionBackend::Zlib => CompressionBackend::Zlib,
+                protobuf::CompressionBackend::Zstd => CompressionBackend::Zstd,
+            },
+            min_compression_size: compression.min_compression_size as usize,
+            compression_level: if compression.compression_level == 0 {
+                None
+            } else {
+                Some(compression.compression_level)
+            },
+        });
+
         ConnectionRequest {
             read_from,
             client_name,
@@ -200,6 +230,7 @@ impl From<protobuf::ConnectionRequest> for ConnectionRequest {
             connection_retry_strategy,
             periodic_checks,
             pubsub_subscriptions,
+            compression,
         }
     }
 }
@@ -223,6 +223,12 @@ pub enum RequestType {
     PubSubNumSub = 212,
     PubSubSChannels = 213,
     PubSubSNumSub = 214,
+    Subscribe = 215,
+    PSubscribe = 216,
+    SSubscribe = 217,
+    Unsubscribe = 218,
+    PUnsubscribe = 219,
+    SUnsubscribe = 220,
 }
 
 fn get_two_word_command(first: &str, second: &str) -> Cmd {
@@ -449,6 +455,12 @@ impl From<::protobuf::EnumOrUnknown<ProtobufRequestType>> for RequestType {
             ProtobufRequestType::PubSubNumPat => RequestType::PubSubNumPat,
             ProtobufRequestType::PubSubSChannels => RequestType::PubSubSChannels,
             ProtobufRequestType::PubSubSNumSub => RequestType::PubSubSNumSub,
+            ProtobufRequestType::Subscribe => RequestType::Subscribe,
+            ProtobufRequestType::PSubscribe => RequestType::PSubscribe,
+            ProtobufRequestType::SSubscribe => RequestType::SSubscribe,
+            ProtobufRequestType::Unsubscribe => RequestType::Unsubscribe,
+            ProtobufRequestType::PUnsubscribe => RequestType::PUnsubscribe,
+            ProtobufRequestType::SUnsubscribe => RequestType::SUnsubscribe,
         }
     }
 }
@@ -673,6 +685,12 @@ impl RequestType {
             RequestType::PubSubNumPat => Some(get_two_word_command("PUBSUB", "NUMPAT")),
             RequestType::PubSubSChannels => Some(get_two_word_command("PUBSUB", "SHARDCHANNELS")),
             RequestType::PubSubSNumSub => Some(get_two_word_command("PUBSUB", "SHARDNUMSUB")),
+            RequestType::Subscribe => Some(cmd("SUBSCRIBE")),
+            RequestType::PSubscribe => Some(cmd("PSUBSCRIBE")),
+            RequestType::SSubscribe => Some(cmd("SSUBSCRIBE")),
+            RequestType::Unsubscribe => Some(cmd("UNSUBSCRIBE")),
+            RequestType::PUnsubscribe => Some(cmd("PUNSUBSCRIBE")),
+            RequestType::SUnsubscribe => Some(cmd("SUNSUBSCRIBE")),
         }
     }
 }
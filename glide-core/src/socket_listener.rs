@@ -5,7 +5,8 @@ use super::rotating_buffer::RotatingBuffer;
 use crate::client::Client;
 use crate::cluster_scan_container::get_cluster_scan_cursor;
 use crate::command_request::{
-    command, command_request, ClusterScan, Command, CommandRequest, Routes, SlotTypes, Transaction,
+    command, command_request, ClusterScan, Command, CommandRequest, Pipeline, PublishBatch, Routes,
+    SlotTypes, Transaction,
 };
 use crate::connection_request::ConnectionRequest;
 use crate::errors::{error_message, error_type, RequestErrorType};
@@ -15,15 +16,22 @@ use crate::retry_strategies::get_fixed_interval_backoff;
 use bytes::Bytes;
 use directories::BaseDirs;
 use dispose::{Disposable, Dispose};
+use futures::channel::oneshot;
+use futures::future::{self, Either};
 use logger_core::{log_debug, log_error, log_info, log_trace, log_warn};
+use once_cell::sync::OnceCell;
 use protobuf::{Chars, Message};
 use redis::cluster_routing::{
     MultipleNodeRoutingInfo, Route, RoutingInfo, SingleNodeRoutingInfo, SlotAddr,
 };
 use redis::cluster_routing::{ResponsePolicy, Routable};
 use redis::{Cmd, PushInfo, RedisError, ScanStateRC, Value};
-use std::cell::Cell;
+use std::cell::{Cell, RefCell};
+use std::collections::HashMap;
 use std::rc::Rc;
+use std::sync::atomic::{AtomicU64, AtomicUsize, Ordering};
+use std::sync::Arc;
+use std::time::Duration;
 use std::{env, str};
 use std::{io, thread};
 use thiserror::Error;
@@ -46,6 +54,10 @@ const SOCKET_FILE_NAME: &str = "glide-socket";
 /// strings instead of a pointer
 pub const MAX_REQUEST_ARGS_LENGTH: usize = 2_i32.pow(12) as usize; // TODO: find the right number
 
+/// The maximum length of a string response to be sent inline in the response
+/// message instead of as a pointer to a leaked value
+pub const MAX_INLINE_RESPONSE_LENGTH: usize = 2_i32.pow(8) as usize;
+
 pub const STRING: &str = "string";
 pub const LIST: &str = "list";
 pub const SET: &str = "set";
@@ -57,6 +69,42 @@ pub const STREAM: &str = "stream";
 struct SocketListener {
     socket_path: String,
     cleanup_socket: bool,
+    worker_threads: usize,
+}
+
+/// Metrics of a worker thread of the socket listener. Every client is served by a single worker thread.
+#[derive(Debug, Clone, Copy, Default, PartialEq, Eq)]
+pub struct WorkerStats {
+    /// The number of clients that the worker serves.
+    pub active_clients: usize,
+    /// The number of requests that the worker received from its clients.
+    pub received_requests: u64,
+}
+
+#[derive(Default)]
+struct WorkerCounters {
+    active_clients: AtomicUsize,
+    received_requests: AtomicU64,
+}
+
+/// The counters of the workers of the first socket listener that was started in the process.
+static WORKER_COUNTERS: OnceCell<Arc<[WorkerCounters]>> = OnceCell::new();
+
+/// Returns the metrics of every worker thread of the socket listener of the process, or an empty list if the socket
+/// listener wasn't started.
+pub fn worker_stats() -> Vec<WorkerStats> {
+    WORKER_COUNTERS
+        .get()
+        .map(|workers| {
+            workers
+                .iter()
+                .map(|worker| WorkerStats {
+                    active_clients: worker.active_clients.load(Ordering::Relaxed),
+                    received_requests: worker.received_requests.load(Ordering::Relaxed),
+                })
+                .collect()
+        })
+        .unwrap_or_default()
 }
 
 impl Dispose for SocketListener {
@@ -79,6 +127,8 @@ struct Writer {
     lock: Mutex<()>,
     accumulated_outputs: Cell<Vec<u8>>,
     closing_sender: Sender<ClosingReason>,
+    /// The maximum length of a string response to send inline, as requested by the wrapper. 0 disables inline responses.
+    inline_response_max_size: Cell<usize>,
 }
 
 enum PipeListeningResult<TRequest: Message> {
@@ -190,6 +240,29 @@ async fn write_closing_error(
     write_to_writer(response, writer).await
 }
 
+/// Returns the response value of small scalars, which are cheaper to copy into the response than to pass as a pointer.
+/// Other values are given back to the caller.
+fn inline_response_value(
+    value: Value,
+    max_size: usize,
+) -> Result<response::response::Value, Value> {
+    if max_size == 0 {
+        return Err(value);
+    }
+    match value {
+        Value::Int(num) => Ok(response::response::Value::IntResponse(num)),
+        Value::Double(num) => Ok(response::response::Value::DoubleResponse(num)),
+        Value::Boolean(boolean) => Ok(response::response::Value::BoolResponse(boolean)),
+        Value::BulkString(data) if data.len() <= max_size => {
+            Ok(response::response::Value::BytesResponse(data.into()))
+        }
+        Value::SimpleString(text) if text.len() <= max_size => Ok(
+            response::response::Value::BytesResponse(text.into_bytes().into()),
+        ),
+        value => Err(value),
+    }
+}
+
 /// Create response and write it to the writer
 async fn write_result(
     resp_result: ClientUsageResult<Value>,
@@ -206,10 +279,15 @@ async fn write_result(
         Ok(value) => {
             if value != Value::Nil {
                 // Since null values don't require any additional data, they can be sent without any extra effort.
-                // Move the value to the heap and leak it. The wrapper should use `Box::from_raw` to recreate the box, use the value, and drop the allocation.
-                let pointer = Box::leak(Box::new(value));
-                let raw_pointer = pointer as *mut redis::Value;
-                Some(response::response::Value::RespPointer(raw_pointer as u64))
+                match inline_response_value(value, writer.inline_response_max_size.get()) {
+                    Ok(inline_value) => Some(inline_value),
+                    Err(value) => {
+                        // Move the value to the heap and leak it. The wrapper should use `Box::from_raw` to recreate the box, use the value, and drop the allocation.
+                        let pointer = Box::leak(Box::new(value));
+                        let raw_pointer = pointer as *mut redis::Value;
+                        Some(response::response::Value::RespPointer(raw_pointer as u64))
+                    }
+                }
             } else {
                 None
             }
@@ -220,6 +298,18 @@ async fn write_result(
                 error_message.into(),
             ))
         }
+        Err(ClientUsageError::Cancelled) => {
+            log_debug(
+                "request cancelled",
+                format!("for callback {}", callback_index),
+            );
+            let request_error = response::RequestError {
+                type_: response::RequestErrorType::Unspecified.into(),
+                message: ClientUsageError::Cancelled.to_string().into(),
+                ..Default::default()
+            };
+            Some(response::response::Value::RequestError(request_error))
+        }
         Err(ClientUsageError::User(error_message)) => {
             log_error("user error", &error_message);
             let request_error = response::RequestError {
@@ -405,6 +495,25 @@ async fn send_transaction(
         .map_err(|err| err.into())
 }
 
+async fn send_pipeline(request: Pipeline, mut client: Client) -> ClientUsageResult<Value> {
+    let commands = request
+        .commands
+        .iter()
+        .map(get_redis_command)
+        .collect::<ClientUsageResult<Vec<_>>>()?;
+    client
+        .send_pipeline_batch(&commands)
+        .await
+        .map_err(|err| err.into())
+}
+
+async fn publish_batch(request: PublishBatch, mut client: Client) -> ClientUsageResult<Value> {
+    client
+        .publish_batch(&request.channels, &request.messages, request.sharded)
+        .await
+        .map_err(|err| err.into())
+}
+
 fn get_slot_addr(slot_type: &protobuf::EnumOrUnknown<SlotTypes>) -> ClientUsageResult<SlotAddr> {
     slot_type
         .enum_value()
@@ -476,71 +585,98 @@ fn get_route(
     }
 }
 
-fn handle_request(request: CommandRequest, client: Client, writer: Rc<Writer>) {
-    task::spawn_local(async move {
-        let result = match request.command {
-            Some(action) => match action {
-                command_request::Command::ClusterScan(cluster_scan_command) => {
-                    cluster_scan(cluster_scan_command, client).await
-                }
-                command_request::Command::SingleCommand(command) => {
-                    match get_redis_command(&command) {
-                        Ok(cmd) => match get_route(request.route.0, Some(&cmd)) {
-                            Ok(routes) => send_command(cmd, client, routes).await,
-                            Err(e) => Err(e),
-                        },
-                        Err(e) => Err(e),
-                    }
-                }
-                command_request::Command::Transaction(transaction) => {
-                    match get_route(request.route.0, None) {
-                        Ok(routes) => send_transaction(transaction, client, routes).await,
-                        Err(e) => Err(e),
-                    }
+async fn send_request(request: CommandRequest, client: Client) -> ClientUsageResult<Value> {
+    match request.command {
+        Some(action) => match action {
+            command_request::Command::ClusterScan(cluster_scan_command) => {
+                cluster_scan(cluster_scan_command, client).await
+            }
+            command_request::Command::SingleCommand(command) => match get_redis_command(&command) {
+                Ok(cmd) => match get_route(request.route.0, Some(&cmd)) {
+                    Ok(routes) => send_command(cmd, client, routes).await,
+                    Err(e) => Err(e),
+                },
+                Err(e) => Err(e),
+            },
+            command_request::Command::PublishBatch(batch) => publish_batch(batch, client).await,
+            command_request::Command::Pipeline(pipeline) => send_pipeline(pipeline, client).await,
+            command_request::Command::CancelRequest(_) => Err(ClientUsageError::Internal(
+                "Received a cancellation as a request".to_string(),
+            )),
+            command_request::Command::Transaction(transaction) => {
+                match get_route(request.route.0, None) {
+                    Ok(routes) => send_transaction(transaction, client, routes).await,
+                    Err(e) => Err(e),
                 }
-                command_request::Command::ScriptInvocation(script) => {
-                    match get_route(request.route.0, None) {
-                        Ok(routes) => {
-                            invoke_script(
-                                script.hash,
-                                Some(script.keys),
-                                Some(script.args),
-                                client,
-                                routes,
-                            )
-                            .await
-                        }
-                        Err(e) => Err(e),
+            }
+            command_request::Command::ScriptInvocation(script) => {
+                match get_route(request.route.0, None) {
+                    Ok(routes) => {
+                        invoke_script(
+                            script.hash,
+                            Some(script.keys),
+                            Some(script.args),
+                            client,
+                            routes,
+                        )
+                        .await
                     }
+                    Err(e) => Err(e),
                 }
-                command_request::Command::ScriptInvocationPointers(script) => {
-                    let keys = script
-                        .keys_pointer
-                        .map(|pointer| *unsafe { Box::from_raw(pointer as *mut Vec<Bytes>) });
-                    let args = script
-                        .args_pointer
-                        .map(|pointer| *unsafe { Box::from_raw(pointer as *mut Vec<Bytes>) });
-                    match get_route(request.route.0, None) {
-                        Ok(routes) => invoke_script(script.hash, keys, args, client, routes).await,
-                        Err(e) => Err(e),
-                    }
+            }
+            command_request::Command::ScriptInvocationPointers(script) => {
+                let keys = script
+                    .keys_pointer
+                    .map(|pointer| *unsafe { Box::from_raw(pointer as *mut Vec<Bytes>) });
+                let args = script
+                    .args_pointer
+                    .map(|pointer| *unsafe { Box::from_raw(pointer as *mut Vec<Bytes>) });
+                match get_route(request.route.0, None) {
+                    Ok(routes) => invoke_script(script.hash, keys, args, client, routes).await,
+                    Err(e) => Err(e),
                 }
-            },
-            None => {
-                log_debug(
-                    "received error",
-                    format!(
-                        "Received empty request for callback {}",
-                        request.callback_idx
-                    ),
-                );
-                Err(ClientUsageError::Internal(
-                    "Received empty request".to_string(),
-                ))
             }
-        };
+        },
+        None => {
+            log_debug(
+                "received error",
+                format!(
+                    "Received empty request for callback {}",
+                    request.callback_idx
+                ),
+            );
+            Err(ClientUsageError::Internal(
+                "Received empty request".to_string(),
+            ))
+        }
+    }
+}
 
-        let _res = write_result(result, request.callback_idx, &writer).await;
+fn handle_request(
+    request: CommandRequest,
+    mut client: Client,
+    writer: Rc<Writer>,
+    in_flight_requests: InFlightRequests,
+) {
+    if let Some(timeout_ms) = request.timeout_ms {
+        client.set_request_timeout(Duration::from_millis(timeout_ms.into()));
+    }
+    let callback_idx = request.callback_idx;
+    let (cancel_sender, cancel_receiver) = oneshot::channel();
+    in_flight_requests
+        .borrow_mut()
+        .insert(callback_idx, cancel_sender);
+    task::spawn_local(async move {
+        // The request is polled before the cancellation, so that it takes ownership of the arguments passed by pointers
+        // even if it's cancelled before it's sent. Only sending is cancelled, so a cancelled request is still answered.
+        let request = send_request(request, client);
+        futures::pin_mut!(request);
+        let result = match future::select(request, cancel_receiver).await {
+            Either::Left((result, _)) => result,
+            Either::Right(_) => Err(ClientUsageError::Cancelled),
+        };
+        in_flight_requests.borrow_mut().remove(&callback_idx);
+        let _res = write_result(result, callback_idx, &writer).await;
     });
 }
 
@@ -548,9 +684,25 @@ async fn handle_requests(
     received_requests: Vec<CommandRequest>,
     client: &Client,
     writer: &Rc<Writer>,
+    in_flight_requests: &InFlightRequests,
 ) {
     for request in received_requests {
-        handle_request(request, client.clone(), writer.clone())
+        if let Some(command_request::Command::CancelRequest(_)) = request.command {
+            // A request that already completed isn't in flight, and its response was already written
+            if let Some(cancel_sender) = in_flight_requests
+                .borrow_mut()
+                .remove(&request.callback_idx)
+            {
+                let _ = cancel_sender.send(());
+            }
+            continue;
+        }
+        handle_request(
+            request,
+            client.clone(),
+            writer.clone(),
+            in_flight_requests.clone(),
+        )
     }
     // Yield to ensure that the subtasks aren't starved.
     task::yield_now().await;
@@ -566,11 +718,16 @@ async fn create_client(
     request: ConnectionRequest,
     push_tx: Option<mpsc::UnboundedSender<PushInfo>>,
 ) -> Result<Client, ClientCreationError> {
+    let inline_response_max_size =
+        (request.inline_response_max_size as usize).min(MAX_INLINE_RESPONSE_LENGTH);
     let client = match Client::new(request.into(), push_tx).await {
         Ok(client) => client,
         Err(err) => return Err(ClientCreationError::ConnectionError(err)),
     };
     write_result(Ok(Value::Okay), 0, writer).await?;
+    writer
+        .inline_response_max_size
+        .set(inline_response_max_size);
     Ok(client)
 }
 
@@ -598,14 +755,19 @@ async fn read_values_loop(
     mut client_listener: UnixStreamListener,
     client: &Client,
     writer: Rc<Writer>,
+    worker: &WorkerCounters,
 ) -> ClosingReason {
+    let in_flight_requests = InFlightRequests::default();
     loop {
         match client_listener.next_values().await {
             Closed(reason) => {
                 return reason;
             }
             ReceivedValues(received_requests) => {
-                handle_requests(received_requests, client, &writer).await;
+                worker
+                    .received_requests
+                    .fetch_add(received_requests.len() as u64, Ordering::Relaxed);
+                handle_requests(received_requests, client, &writer, &in_flight_requests).await;
             }
         }
     }
@@ -640,7 +802,7 @@ async fn push_manager_loop(mut push_rx: mpsc::UnboundedReceiver<PushInfo>, write
     }
 }
 
-async fn listen_on_client_stream(socket: UnixStream) {
+async fn listen_on_client_stream(socket: UnixStream, worker: &WorkerCounters) {
     let socket = Rc::new(socket);
     // Spawn a new task to listen on this client's stream
     let write_lock = Mutex::new(());
@@ -653,6 +815,7 @@ async fn listen_on_client_stream(socket: UnixStream) {
         lock: write_lock,
         accumulated_outputs,
         closing_sender: sender,
+        inline_response_max_size: Cell::new(0),
     });
     let client_creation = wait_for_connection_configuration_and_create_client(
         &mut client_listener,
@@ -697,7 +860,7 @@ async fn listen_on_client_stream(socket: UnixStream) {
     };
     log_info("connection", "new connection started");
     tokio::select! {
-            reader_closing = read_values_loop(client_listener, &client, writer.clone()) => {
+            reader_closing = read_values_loop(client_listener, &client, writer.clone(), worker) => {
                 if let ClosingReason::UnhandledError(err) = reader_closing {
                     let _res = write_closing_error(ClosingError{err_message: err.to_string()}, u32::MAX, &writer, "client closing").await;
                 };
@@ -727,11 +890,12 @@ enum SocketCreationResult {
 }
 
 impl SocketListener {
-    fn new(socket_path: String) -> Self {
+    fn new(socket_path: String, worker_threads: usize) -> Self {
         SocketListener {
             socket_path,
             // Don't cleanup the socket resources unless we know that the socket is in use, and owned by this listener.
             cleanup_socket: false,
+            worker_threads,
         }
     }
 
@@ -802,11 +966,32 @@ impl SocketListener {
 
         self.cleanup_socket = true;
         init_callback(Ok(self.socket_path.clone()));
-        let local_set_pool = LocalPoolHandle::new(num_cpus::get());
+        // Every worker thread runs its own current-thread runtime, and every client is pinned to a single worker, since
+        // the state of a client isn't `Send`.
+        let local_set_pool = LocalPoolHandle::new(self.worker_threads);
+        let workers: Arc<[WorkerCounters]> = (0..self.worker_threads)
+            .map(|_| WorkerCounters::default())
+            .collect();
+        let _ = WORKER_COUNTERS.set(workers.clone());
         loop {
             match listener.accept().await {
                 Ok((stream, _addr)) => {
-                    local_set_pool.spawn_pinned(move || listen_on_client_stream(stream));
+                    // New clients are assigned to the worker that serves the fewest clients
+                    let (worker_idx, worker) = workers
+                        .iter()
+                        .enumerate()
+                        .min_by_key(|(_, worker)| worker.active_clients.load(Ordering::Relaxed))
+                        .expect("The socket listener has at least one worker");
+                    worker.active_clients.fetch_add(1, Ordering::Relaxed);
+                    let workers = workers.clone();
+                    local_set_pool.spawn_pinned_by_idx(
+                        move || async move {
+                            let worker = &workers[worker_idx];
+                            listen_on_client_stream(stream, worker).await;
+                            worker.active_clients.fetch_sub(1, Ordering::Relaxed);
+                        },
+                        worker_idx,
+                    );
                 }
                 Err(err) => {
                     log_debug(
@@ -861,10 +1046,16 @@ enum ClientUsageError {
     /// An error that stems from wrong behavior of the user.
     #[error("User error: {0}")]
     User(String),
+    /// The wrapper cancelled the request, and no longer waits for its response.
+    #[error("The request was cancelled")]
+    Cancelled,
 }
 
 type ClientUsageResult<T> = Result<T, ClientUsageError>;
 
+/// Cancels the requests of a client that are being sent, by their callback indices.
+type InFlightRequests = Rc<RefCell<HashMap<u32, oneshot::Sender<()>>>>;
+
 /// Defines errors caused the connection to close.
 #[derive(Debug, Clone)]
 struct ClosingError {
@@ -906,6 +1097,7 @@ pub fn get_socket_path() -> String {
 pub fn start_socket_listener_internal<InitCallback>(
     init_callback: InitCallback,
     socket_path: Option<String>,
+    worker_threads: Option<usize>,
 ) where
     InitCallback: FnOnce(Result<String, String>) + Send + 'static,
 {
@@ -915,8 +1107,12 @@ pub fn start_socket_listener_internal<InitCallback>(
             let runtime = Builder::new_current_thread().enable_all().build();
             match runtime {
                 Ok(runtime) => {
+                    let worker_threads = worker_threads
+                        .filter(|threads| *threads > 0)
+                        .unwrap_or_else(num_cpus::get);
                     let mut listener = Disposable::new(SocketListener::new(
                         socket_path.unwrap_or_else(get_socket_path),
+                        worker_threads,
                     ));
                     runtime.block_on(listener.listen_on_socket(init_callback));
                 }
@@ -935,5 +1131,21 @@ pub fn start_socket_listener<InitCallback>(init_callback: InitCallback)
 where
     InitCallback: FnOnce(Result<String, String>) + Send + 'static,
 {
-    start_socket_listener_internal(init_callback, None);
+    start_socket_listener_internal(init_callback, None, None);
+}
+
+/// Like [start_socket_listener], with `worker_threads` threads serving the clients instead of one thread per CPU.
+/// Every client is served by the worker thread that serves the fewest clients when it connects. The split of the
+/// clients between the threads is reported by [worker_stats].
+///
+/// # Arguments
+/// * `init_callback` - called when the socket listener fails to initialize, with the reason for the failure.
+/// * `worker_threads` - the number of threads serving the clients. `None` or 0 use the number of CPUs.
+pub fn start_socket_listener_with_worker_threads<InitCallback>(
+    init_callback: InitCallback,
+    worker_threads: Option<usize>,
+) where
+    InitCallback: FnOnce(Result<String, String>) + Send + 'static,
+{
+    start_socket_listener_internal(init_callback, None, worker_threads);
 }
@@ -24,7 +24,7 @@ mod socket_listener {
     use super::*;
     use command_request::{CommandRequest, RequestType};
     use glide_core::command_request::command::{Args, ArgsArray};
-    use glide_core::command_request::{Command, Transaction};
+    use glide_core::command_request::{CancelRequest, Command, Transaction};
     use glide_core::response::{response, ConstantResponse, Response};
     use glide_core::scripts_container::add_script;
     use protobuf::{EnumOrUnknown, Message};
@@ -354,10 +354,11 @@ mod socket_listener {
         socket: &UnixStream,
         use_tls: Tls,
         cluster_mode: ClusterMode,
+        inline_response_max_size: u32,
     ) {
         // Send the server address
         const CALLBACK_INDEX: u32 = 0;
-        let connection_request = create_connection_request(
+        let mut connection_request = create_connection_request(
             addresses,
             &TestConfiguration {
                 use_tls: use_tls.to_bool(),
@@ -366,6 +367,7 @@ mod socket_listener {
                 ..Default::default()
             },
         );
+        connection_request.inline_response_max_size = inline_response_max_size;
         let approx_message_length =
             APPROX_RESP_HEADER_LEN + connection_request.compute_size() as usize;
         let mut buffer = Vec::with_capacity(approx_message_length);
@@ -380,6 +382,16 @@ mod socket_listener {
         socket_path: Option<String>,
         addresses: &[ConnectionAddr],
         cluster_mode: ClusterMode,
+    ) -> UnixStream {
+        setup_socket_with_inline_response_max_size(use_tls, socket_path, addresses, cluster_mode, 0)
+    }
+
+    fn setup_socket_with_inline_response_max_size(
+        use_tls: Tls,
+        socket_path: Option<String>,
+        addresses: &[ConnectionAddr],
+        cluster_mode: ClusterMode,
+        inline_response_max_size: u32,
     ) -> UnixStream {
         let socket_listener_state: Arc<ManualResetEvent> =
             Arc::new(ManualResetEvent::new(EventState::Unset));
@@ -394,16 +406,30 @@ mod socket_listener {
                 cloned_state.set();
             },
             socket_path,
+            None,
         );
         socket_listener_state.wait();
         let path = path_arc.lock().unwrap();
         let path = path.as_ref().expect("Didn't get any socket path");
         let socket = std::os::unix::net::UnixStream::connect(path).unwrap();
-        connect_to_redis(addresses, &socket, use_tls, cluster_mode);
+        connect_to_redis(
+            addresses,
+            &socket,
+            use_tls,
+            cluster_mode,
+            inline_response_max_size,
+        );
         socket
     }
 
     fn setup_mocked_test_basics(socket_path: Option<String>) -> ServerTestBasicsWithMock {
+        setup_mocked_test_basics_with_inline_response_max_size(socket_path, 0)
+    }
+
+    fn setup_mocked_test_basics_with_inline_response_max_size(
+        socket_path: Option<String>,
+        inline_response_max_size: u32,
+    ) -> ServerTestBasicsWithMock {
         let mut responses = std::collections::HashMap::new();
         responses.insert(
             "*2\r\n$4\r\nINFO\r\n$11\r\nREPLICATION\r\n".to_string(),
@@ -411,11 +437,12 @@ mod socket_listener {
         );
         let server_mock = ServerMock::new(responses);
         let addresses = server_mock.get_addresses();
-        let socket = setup_socket(
+        let socket = setup_socket_with_inline_response_max_size(
             Tls::NoTls,
             socket_path,
             addresses.as_slice(),
             ClusterMode::Disabled,
+            inline_response_max_size,
         );
         ServerTestBasicsWithMock {
             server_mock,
@@ -833,6 +860,128 @@ mod socket_listener {
         assert_eq!(test_basics.server_mock.get_number_of_received_commands(), 0);
     }
 
+    #[rstest]
+    #[timeout(SHORT_STANDALONE_TEST_TIMEOUT)]
+    fn test_socket_inline_responses(#[values(0, 1000)] inline_response_max_size: u32) {
+        let mut test_basics =
+            setup_mocked_test_basics_with_inline_response_max_size(None, inline_response_max_size);
+        let key = generate_random_string(KEY_LENGTH);
+        let inline_value = "a".repeat(MAX_INLINE_RESPONSE_LENGTH);
+        let long_value = "a".repeat(MAX_INLINE_RESPONSE_LENGTH + 1);
+        let mut incr = Cmd::new();
+        incr.arg("INCR").arg(key.clone());
+        test_basics
+            .server_mock
+            .add_response(&incr, ":5\r\n".to_string());
+        let mut get_inline = Cmd::new();
+        get_inline.arg("GET").arg(format!("{key}inline"));
+        test_basics.server_mock.add_response(
+            &get_inline,
+            format!("${}\r\n{inline_value}\r\n", inline_value.len()),
+        );
+        let mut get_long = Cmd::new();
+        get_long.arg("GET").arg(format!("{key}long"));
+        test_basics.server_mock.add_response(
+            &get_long,
+            format!("${}\r\n{long_value}\r\n", long_value.len()),
+        );
+        let mut buffer = Vec::with_capacity(1000);
+
+        write_command_request(
+            &mut buffer,
+            &mut test_basics.socket,
+            1,
+            vec![key.clone().into()],
+            RequestType::Incr.into(),
+            false,
+        );
+        let response = get_response(&mut buffer, Some(&mut test_basics.socket));
+        assert_eq!(response.callback_idx, 1);
+        if inline_response_max_size == 0 {
+            // Wrappers that didn't opt in always receive pointers
+            assert_value(response.resp_pointer(), Some(Value::Int(5)));
+        } else {
+            assert_eq!(response.int_response(), 5);
+        }
+
+        // Strings are sent inline up to the size limit, which is capped at `MAX_INLINE_RESPONSE_LENGTH`
+        buffer.clear();
+        write_get(
+            &mut buffer,
+            &mut test_basics.socket,
+            2,
+            &format!("{key}inline"),
+            false,
+        );
+        buffer.resize(1000, 0_u8);
+        let size = test_basics.socket.read(&mut buffer).unwrap();
+        buffer.truncate(size);
+        let response = get_response(&mut buffer, None);
+        assert_eq!(response.callback_idx, 2);
+        if inline_response_max_size == 0 {
+            assert_value(
+                response.resp_pointer(),
+                Some(Value::BulkString(inline_value.into_bytes())),
+            );
+        } else {
+            assert_eq!(response.bytes_response(), inline_value.as_bytes());
+        }
+
+        buffer.clear();
+        write_get(
+            &mut buffer,
+            &mut test_basics.socket,
+            3,
+            &format!("{key}long"),
+            false,
+        );
+        assert_value_response(
+            &mut buffer,
+            Some(&mut test_basics.socket),
+            3,
+            Value::BulkString(long_value.into_bytes()),
+        );
+    }
+
+    #[rstest]
+    #[serial_test::serial]
+    #[timeout(SHORT_STANDALONE_TEST_TIMEOUT)]
+    fn test_socket_cancel_request(#[values(false, true)] use_arg_pointer: bool) {
+        const CALLBACK_INDEX: u32 = 99;
+        let mut test_basics =
+            setup_test_basics(Tls::NoTls, TestServer::Shared, RedisType::Standalone);
+        let key = generate_random_string(KEY_LENGTH);
+        let mut buffer = Vec::with_capacity(100);
+        // A BLPOP without a timeout is still being sent when it's cancelled
+        write_command_request(
+            &mut buffer,
+            &mut test_basics.socket,
+            CALLBACK_INDEX,
+            vec![key.into(), "0".into()],
+            RequestType::BLPop.into(),
+            use_arg_pointer,
+        );
+
+        buffer.clear();
+        let mut request = CommandRequest::new();
+        request.callback_idx = CALLBACK_INDEX;
+        request.command = Some(command_request::command_request::Command::CancelRequest(
+            CancelRequest::new(),
+        ));
+        write_request(&mut buffer, &mut test_basics.socket, request);
+
+        let response = assert_error_response(
+            &mut buffer,
+            &mut test_basics.socket,
+            CALLBACK_INDEX,
+            ResponseType::RequestError,
+        );
+        assert_eq!(
+            &*response.request_error().message,
+            "The request was cancelled"
+        );
+    }
+
     #[rstest]
     #[serial_test::serial]
     #[timeout(SHORT_CLUSTER_TEST_TIMEOUT)]
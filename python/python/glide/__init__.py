@@ -55,6 +55,7 @@ from glide.async_commands.stream import (
     MinId,
     StreamAddOptions,
     StreamClaimOptions,
+    StreamColumns,
     StreamGroupOptions,
     StreamPendingOptions,
     StreamRangeBound,
@@ -68,16 +69,21 @@ from glide.async_commands.transaction import ClusterTransaction, Transaction
 from glide.config import (
     BackoffStrategy,
     BaseClientConfiguration,
+    CompressionBackend,
+    CompressionConfiguration,
     GlideClientConfiguration,
     GlideClusterClientConfiguration,
     NodeAddress,
     PeriodicChecksManualInterval,
     PeriodicChecksStatus,
     ProtocolVersion,
+    PubSubCallbackDispatch,
+    PubSubQueuePolicy,
     ReadFrom,
     ServerCredentials,
 )
 from glide.constants import OK
+from glide.core_runtime import CoreWorkerStats
 from glide.exceptions import (
     ClosingError,
     ConfigurationError,
@@ -99,6 +105,7 @@ from glide.routes import (
     SlotKeyRoute,
     SlotType,
 )
+from glide.timeouts import deadline, request_timeout
 
 from .glide import ClusterScanCursor, Script
 
@@ -115,10 +122,14 @@ __all__ = [
     "GlideClientConfiguration",
     "GlideClusterClientConfiguration",
     "BackoffStrategy",
+    "CompressionBackend",
+    "CompressionConfiguration",
     "ReadFrom",
     "ServerCredentials",
     "NodeAddress",
     "ProtocolVersion",
+    "PubSubCallbackDispatch",
+    "PubSubQueuePolicy",
     "PeriodicChecksManualInterval",
     "PeriodicChecksStatus",
     # Response
@@ -173,6 +184,7 @@ __all__ = [
     "MinId",
     "StreamAddOptions",
     "StreamClaimOptions",
+    "StreamColumns",
     "StreamGroupOptions",
     "StreamPendingOptions",
     "StreamReadGroupOptions",
@@ -196,6 +208,11 @@ __all__ = [
     "RandomNode",
     "SlotKeyRoute",
     "SlotIdRoute",
+    # Core runtime
+    "CoreWorkerStats",
+    # Timeouts
+    "deadline",
+    "request_timeout",
     # Exceptions
     "ClosingError",
     "ConfigurationError",
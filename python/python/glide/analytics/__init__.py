@@ -0,0 +1,5 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+"""In-process analytics on data fetched from the server, for computations the server can't run across hash slots.
+
+`glide.analytics.bitmaps` requires the `numpy` package.
+"""
@@ -0,0 +1,26 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+
+from typing import List, Tuple
+
+from glide.constants import TEncodable
+from glide.glide_client import TGlideClient
+from glide.protobuf.command_request_pb2 import RequestType
+
+
+async def store_in_chunks(
+    client: TGlideClient, key: TEncodable, value: memoryview, chunk_size: int
+) -> None:
+    """
+    Replaces the value at `key` with `value`, using `DEL` followed by `SETRANGE` commands of up to `chunk_size` bytes
+    each, starting at offset 0, in a single pipeline.
+
+    `SET` isn't used even for the first chunk, since a client with compression enabled would compress its value, and
+    the `SETRANGE` commands that follow would then corrupt the compressed value. An empty `value` deletes `key`.
+    """
+    commands: List[Tuple[RequestType.ValueType, List[TEncodable]]] = [
+        (RequestType.Del, [key])
+    ]
+    for start in range(0, len(value), chunk_size):
+        chunk = value[start : start + chunk_size].tobytes()
+        commands.append((RequestType.SetRange, [key, str(start), chunk]))
+    await client._execute_pipeline(commands)
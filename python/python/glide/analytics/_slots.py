@@ -0,0 +1,17 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+
+from typing import Iterable
+
+from glide.constants import TEncodable
+from glide.glide import get_slot
+from glide.glide_client import GlideClusterClient, TGlideClient
+
+
+def keys_span_slots(client: TGlideClient, keys: Iterable[TEncodable]) -> bool:
+    """
+    Returns whether `keys` map to more than one hash slot, which is only possible with a cluster client.
+    """
+    if not isinstance(client, GlideClusterClient):
+        return False
+    slots = {get_slot(key.encode() if isinstance(key, str) else key) for key in keys}
+    return len(slots) > 1
@@ -0,0 +1,234 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+"""Bitmap analytics across hash slots.
+
+`BITOP` requires all of its keys to map to the same hash slot in cluster mode. This module fetches bitmaps from any
+slots as NumPy uint8 arrays, combines and counts them in-process with vectorized operations, and writes results back.
+
+    Examples:
+
+        >>> from glide.analytics import bitmaps
+        >>> day1, day2 = await bitmaps.fetch(client, ["active:2024-01-01", "active:2024-01-02"])
+        >>> bitmaps.popcount(bitmaps.bitop(BitwiseOperation.AND, [day1, day2]))
+            5321  # Users that were active on both days.
+        >>> await bitmaps.bitop_store(client, BitwiseOperation.OR, "active:week1", week1_keys)
+            12500000
+"""
+
+from typing import Any, List, Sequence, Tuple, Union, cast
+
+from glide.analytics._chunks import store_in_chunks
+from glide.async_commands.bitmap import BitwiseOperation
+from glide.constants import TEncodable
+from glide.glide_client import TGlideClient
+from glide.protobuf.command_request_pb2 import RequestType
+
+try:
+    import numpy
+except ImportError as e:
+    raise ImportError(
+        "glide.analytics.bitmaps requires the `numpy` package. Install it with `pip install numpy`."
+    ) from e
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+"""The default maximum number of bytes fetched by a single `GETRANGE`, or written by a single `SETRANGE`."""
+
+_POPCOUNT_TABLE = numpy.array(
+    [bin(byte).count("1") for byte in range(256)], numpy.uint8
+)
+
+
+def _validate_chunk_size(chunk_size: int) -> None:
+    if chunk_size <= 0:
+        raise ValueError("`chunk_size` must be a positive number.")
+
+
+def _to_bytes(value: Union[str, bytes, None]) -> bytes:
+    if value is None:
+        return b""
+    # Clients configured with `decode_responses` return bitmaps that are valid UTF-8 as `str`
+    return value.encode() if isinstance(value, str) else value
+
+
+async def fetch(
+    client: TGlideClient,
+    keys: List[TEncodable],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[Any]:
+    """
+    Fetches the bitmaps stored at `keys`, which may map to different hash slots.
+
+    The lengths of the bitmaps are fetched first. Bitmaps of up to `chunk_size` bytes are then fetched with `GET`,
+    and larger bitmaps with `GETRANGE` commands of `chunk_size` bytes each. All the commands are pipelined, and in
+    cluster mode the pipelines of different slots are sent concurrently.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        keys (List[TEncodable]): The keys of the bitmaps.
+        chunk_size (int): The maximum number of bytes fetched by a single command.
+
+    Returns:
+        List[numpy.ndarray]: A uint8 array of every bitmap, in the same order as `keys`. Arrays of bitmaps that were
+            fetched with a single `GET` are read-only views of the response, without copies. Missing keys are
+            returned as empty arrays.
+
+    Examples:
+        >>> await bitmaps.fetch(client, ["bitmap1", "bitmap2"])
+            [array([255, 1], dtype=uint8), array([], dtype=uint8)]
+    """
+    _validate_chunk_size(chunk_size)
+    if not keys:
+        return []
+    lengths = cast(
+        List[int],
+        await client._execute_pipeline([(RequestType.Strlen, [key]) for key in keys]),
+    )
+
+    commands: List[Tuple[RequestType.ValueType, List[TEncodable]]] = []
+    for key, length in zip(keys, lengths):
+        if length <= chunk_size:
+            commands.append((RequestType.Get, [key]))
+            continue
+        for start in range(0, length, chunk_size):
+            end = min(start + chunk_size, length) - 1
+            commands.append((RequestType.GetRange, [key, str(start), str(end)]))
+    values = cast(
+        List[Union[str, bytes, None]], await client._execute_pipeline(commands)
+    )
+
+    bitmaps = []
+    index = 0
+    for length in lengths:
+        if length <= chunk_size:
+            bitmaps.append(numpy.frombuffer(_to_bytes(values[index]), numpy.uint8))
+            index += 1
+            continue
+        buffer = bytearray(length)
+        for start in range(0, length, chunk_size):
+            chunk = _to_bytes(values[index])
+            # The bitmap may have been truncated between the commands, its missing bytes are left as zeros
+            buffer[start : start + len(chunk)] = chunk
+            index += 1
+        bitmaps.append(numpy.frombuffer(buffer, numpy.uint8))
+    return bitmaps
+
+
+def bitop(operation: BitwiseOperation, bitmaps: Sequence[Any]) -> Any:
+    """
+    Performs a bitwise operation between `bitmaps`, with the semantics of `BITOP`: bitmaps that are shorter than the
+    longest one are treated as if they were padded with zero bytes.
+
+    Args:
+        operation (BitwiseOperation): The bitwise operation to perform.
+        bitmaps (Sequence[numpy.ndarray]): The uint8 arrays of the bitmaps. `BitwiseOperation.NOT` takes exactly one
+            bitmap.
+
+    Returns:
+        numpy.ndarray: A new uint8 array with the result of the operation, as long as the longest bitmap.
+
+    Examples:
+        >>> bitmaps.bitop(BitwiseOperation.OR, [numpy.array([1], numpy.uint8), numpy.array([2, 4], numpy.uint8)])
+            array([3, 4], dtype=uint8)
+    """
+    if operation == BitwiseOperation.NOT:
+        if len(bitmaps) != 1:
+            raise ValueError("`BitwiseOperation.NOT` takes exactly one bitmap.")
+        return numpy.invert(bitmaps[0])
+    if not bitmaps:
+        raise ValueError("At least one bitmap is required.")
+
+    ufunc = {
+        BitwiseOperation.AND: numpy.bitwise_and,
+        BitwiseOperation.OR: numpy.bitwise_or,
+        BitwiseOperation.XOR: numpy.bitwise_xor,
+    }[operation]
+    result = numpy.zeros(max(len(bitmap) for bitmap in bitmaps), numpy.uint8)
+    result[: len(bitmaps[0])] = bitmaps[0]
+    for bitmap in bitmaps[1:]:
+        length = len(bitmap)
+        ufunc(result[:length], bitmap, out=result[:length])
+        if operation == BitwiseOperation.AND:
+            result[length:] = 0
+    return result
+
+
+def popcount(bitmap: Any) -> int:
+    """
+    Returns the number of set bits in `bitmap`, like `BITCOUNT` without a range.
+
+    Args:
+        bitmap (numpy.ndarray): The uint8 array of the bitmap.
+
+    Returns:
+        int: The number of set bits.
+
+    Examples:
+        >>> bitmaps.popcount(numpy.array([255, 1], numpy.uint8))
+            9
+    """
+    if hasattr(numpy, "bitwise_count"):
+        # Available since NumPy 2.0
+        return int(numpy.bitwise_count(bitmap).sum(dtype=numpy.int64))
+    return int(_POPCOUNT_TABLE[bitmap].sum(dtype=numpy.int64))
+
+
+async def store(
+    client: TGlideClient,
+    key: TEncodable,
+    bitmap: Any,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Stores `bitmap` at `key`, replacing its current value.
+
+    `key` is deleted, and the bitmap is then written with `SETRANGE` commands of `chunk_size` bytes each, starting at
+    offset 0, in a single pipeline. `SET` isn't used, so that clients with compression enabled store the bitmap
+    uncompressed. The pipeline isn't atomic, so readers may observe a partially written bitmap. An empty bitmap deletes
+    `key`, like `BITOP` does when its result is empty.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        key (TEncodable): The key to store the bitmap at.
+        bitmap (numpy.ndarray): The uint8 array of the bitmap.
+        chunk_size (int): The maximum number of bytes written by a single command.
+
+    Returns:
+        int: The length of the stored bitmap, in bytes.
+
+    Examples:
+        >>> await bitmaps.store(client, "bitmap", numpy.array([255, 1], numpy.uint8))
+            2
+    """
+    _validate_chunk_size(chunk_size)
+    await store_in_chunks(client, key, numpy.ascontiguousarray(bitmap).data, chunk_size)
+    return len(bitmap)
+
+
+async def bitop_store(
+    client: TGlideClient,
+    operation: BitwiseOperation,
+    destination: TEncodable,
+    keys: List[TEncodable],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Performs a bitwise operation between the bitmaps stored at `keys`, and stores the result at `destination`.
+    Equivalent to `BITOP`, except that the keys and the destination may map to different hash slots.
+
+    See `fetch`, `bitop` and `store` for more details.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        operation (BitwiseOperation): The bitwise operation to perform.
+        destination (TEncodable): The key to store the result at.
+        keys (List[TEncodable]): The keys of the bitmaps to perform the operation on.
+        chunk_size (int): The maximum number of bytes fetched or written by a single command.
+
+    Returns:
+        int: The length of the stored bitmap, in bytes.
+
+    Examples:
+        >>> await bitmaps.bitop_store(client, BitwiseOperation.AND, "active:both", ["active:day1", "active:day2"])
+            12500000
+    """
+    result = bitop(operation, await fetch(client, keys, chunk_size))
+    return await store(client, destination, result, chunk_size)
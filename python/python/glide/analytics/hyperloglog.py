@@ -0,0 +1,97 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+"""HyperLogLog analytics across hash slots.
+
+`PFCOUNT` and `PFMERGE` require all of their keys to map to the same hash slot in cluster mode. This module fetches
+the HyperLogLog values from any slots, merges their registers in-process, and estimates the cardinality of their
+union with the estimator of the server.
+
+    Examples:
+
+        >>> from glide.analytics import hyperloglog
+        >>> await hyperloglog.count(client, ["visitors:2024-01-01", "visitors:2024-01-02"])
+            5321  # The estimated number of unique visitors on both days.
+        >>> await hyperloglog.count(client, week1_keys, destination="visitors:week1")
+            12500
+"""
+
+from typing import List, Optional, Union, cast
+
+from glide.analytics._chunks import store_in_chunks
+from glide.constants import TEncodable
+from glide.glide import HyperLogLog
+from glide.glide_client import TGlideClient
+from glide.protobuf.command_request_pb2 import RequestType
+
+
+async def fetch(client: TGlideClient, keys: List[TEncodable]) -> HyperLogLog:
+    """
+    Fetches the HyperLogLog values stored at `keys`, which may map to different hash slots, and merges them.
+
+    The values are fetched with pipelined `GET` commands, and in cluster mode the pipelines of different slots are
+    sent concurrently. Both the sparse and the dense encodings of the server are supported.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        keys (List[TEncodable]): The keys of the HyperLogLog values. Missing keys are treated as empty HyperLogLogs.
+
+    Returns:
+        HyperLogLog: The union of the HyperLogLog values.
+
+    Raises:
+        ValueError: If one of the values isn't a valid HyperLogLog string.
+
+    Examples:
+        >>> merged = await hyperloglog.fetch(client, ["visitors:day1", "visitors:day2"])
+        >>> merged.count()
+            5321
+    """
+    merged = HyperLogLog()
+    if not keys:
+        return merged
+    values = cast(
+        List[Union[str, bytes, None]],
+        await client._execute_pipeline([(RequestType.Get, [key]) for key in keys]),
+    )
+    for value in values:
+        if value is None:
+            continue
+        # Clients configured with `decode_responses` return values that are valid UTF-8 as `str`
+        merged.merge(value.encode() if isinstance(value, str) else value)
+    return merged
+
+
+async def count(
+    client: TGlideClient,
+    keys: List[TEncodable],
+    destination: Optional[TEncodable] = None,
+) -> int:
+    """
+    Estimates the cardinality of the union of the HyperLogLog values stored at `keys`. Equivalent to `PFCOUNT`, or to
+    `PFMERGE` followed by `PFCOUNT` if `destination` is set, except that the keys may map to different hash slots.
+
+    See `fetch` for more details.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        keys (List[TEncodable]): The keys of the HyperLogLog values.
+        destination (Optional[TEncodable]): If set, the merged HyperLogLog is stored at this key in the dense
+            encoding, replacing its current value. Unlike `PFMERGE`, the current value isn't merged. The value is
+            written with `DEL` and `SETRANGE` rather than `SET`, so that clients with compression enabled store it
+            uncompressed.
+
+    Returns:
+        int: The estimated cardinality of the union.
+
+    Raises:
+        ValueError: If one of the values isn't a valid HyperLogLog string.
+
+    Examples:
+        >>> await hyperloglog.count(client, ["visitors:day1", "visitors:day2"], destination="visitors:both")
+            5321
+    """
+    merged = await fetch(client, keys)
+    if destination is not None:
+        value = merged.to_bytes()
+        # The dense encoding is about 12 KiB, so it's written with a single `SETRANGE`
+        await store_in_chunks(client, destination, memoryview(value), len(value))
+    return merged.count()
@@ -0,0 +1,294 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+"""Set algebra across hash slots.
+
+`SUNION`, `SINTER`, `SDIFF` and their `STORE` variants require all of their keys to map to the same hash slot in
+cluster mode. The functions of this module run these commands on the server when their keys map to a single slot, and
+otherwise compute them in-process: the members of the sets are streamed with `SSCAN` into a Python set, and results
+are written back with pipelined `SADD` commands.
+
+    Examples:
+
+        >>> from glide.analytics import sets
+        >>> await sets.sinter(client, ["user:1:follows", "user:2:follows"])
+            {b"user:3", b"user:7"}  # The users followed by both users.
+        >>> await sets.sunionstore(client, "tags:all", ["tags:2024-01-01", "tags:2024-01-02"])
+            1250
+"""
+
+import asyncio
+from typing import AsyncIterator, List, Set, Tuple, cast
+
+from glide.analytics._slots import keys_span_slots
+from glide.constants import TEncodable
+from glide.glide_client import TGlideClient
+from glide.protobuf.command_request_pb2 import RequestType
+
+SCAN_COUNT = 1000
+"""The `COUNT` hint of the `SSCAN` commands that fetch the members of the sets."""
+
+SET_ADD_BATCH_SIZE = 1000
+"""The maximum number of members added by a single `SADD` command of `store`."""
+
+
+async def scan(
+    client: TGlideClient, key: TEncodable, count: int = SCAN_COUNT
+) -> AsyncIterator[List[bytes]]:
+    """
+    Iterates over the members of the set stored at `key` with `SSCAN`, one batch of members at a time.
+
+    Like `SSCAN`, a member that is added or removed during the iteration may or may not be returned, and a member may
+    be returned more than once.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        key (TEncodable): The key of the set.
+        count (int): The `COUNT` hint of the `SSCAN` commands.
+
+    Returns:
+        AsyncIterator[List[bytes]]: The batches of members returned by the `SSCAN` commands.
+
+    Examples:
+        >>> async for members in sets.scan(client, "my_set"):
+        ...     print(members)
+            [b'member1', b'member2']
+    """
+    cursor: TEncodable = "0"
+    while True:
+        cursor, members = cast(
+            Tuple[bytes, List[bytes]], await client.sscan(key, cursor, count=count)
+        )
+        yield members
+        if cursor in (b"0", "0"):
+            return
+
+
+async def _union(client: TGlideClient, keys: List[TEncodable]) -> Set[bytes]:
+    result: Set[bytes] = set()
+
+    async def add(key: TEncodable) -> None:
+        async for members in scan(client, key):
+            result.update(members)
+
+    await asyncio.gather(*(add(key) for key in keys))
+    return result
+
+
+async def _intersection(client: TGlideClient, keys: List[TEncodable]) -> Set[bytes]:
+    cardinalities = cast(
+        List[int],
+        await client._execute_pipeline([(RequestType.SCard, [key]) for key in keys]),
+    )
+    # Only the members of the smallest set are held in memory, and every other set only filters them
+    ordered_keys = [
+        keys[index] for index in sorted(range(len(keys)), key=cardinalities.__getitem__)
+    ]
+    result: Set[bytes] = set()
+    if min(cardinalities) == 0:
+        return result
+    async for members in scan(client, ordered_keys[0]):
+        result.update(members)
+
+    for key in ordered_keys[1:]:
+        found: Set[bytes] = set()
+        async for members in scan(client, key):
+            found.update(result.intersection(members))
+            if len(found) == len(result):
+                break
+        result = found
+        if not result:
+            break
+    return result
+
+
+async def _difference(client: TGlideClient, keys: List[TEncodable]) -> Set[bytes]:
+    result: Set[bytes] = set()
+    async for members in scan(client, keys[0]):
+        result.update(members)
+
+    async def remove(key: TEncodable) -> None:
+        async for members in scan(client, key):
+            result.difference_update(members)
+            if not result:
+                return
+
+    if result:
+        await asyncio.gather(*(remove(key) for key in keys[1:]))
+    return result
+
+
+async def store(client: TGlideClient, key: TEncodable, members: Set[bytes]) -> int:
+    """
+    Stores `members` as the set at `key`, replacing its current value.
+
+    The current value is deleted, and the members are added with `SADD` commands of up to `SET_ADD_BATCH_SIZE`
+    members each, in a single pipeline. The pipeline isn't atomic, so readers may observe a partially written set. An
+    empty set of members leaves `key` deleted, like the `STORE` commands of sets do when their result is empty.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        key (TEncodable): The key to store the set at.
+        members (Set[bytes]): The members of the set.
+
+    Returns:
+        int: The number of members in the stored set.
+
+    Examples:
+        >>> await sets.store(client, "my_set", {b"member1", b"member2"})
+            2
+    """
+    commands: List[Tuple[RequestType.ValueType, List[TEncodable]]] = [
+        (RequestType.Del, [key])
+    ]
+    batch: List[TEncodable] = []
+    for member in members:
+        batch.append(member)
+        if len(batch) == SET_ADD_BATCH_SIZE:
+            commands.append((RequestType.SAdd, [key, *batch]))
+            batch = []
+    if batch:
+        commands.append((RequestType.SAdd, [key, *batch]))
+    await client._execute_pipeline(commands)
+    return len(members)
+
+
+async def sunion(client: TGlideClient, keys: List[TEncodable]) -> Set[bytes]:
+    """
+    Gets the union of all the given sets. Equivalent to `SUNION`, except that the keys may map to different hash
+    slots, in which case the sets are scanned concurrently.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        keys (List[TEncodable]): The keys of the sets.
+
+    Returns:
+        Set[bytes]: A set of members which are present in at least one of the given sets.
+
+    Examples:
+        >>> await sets.sunion(client, ["my_set1", "my_set2"])
+            {b"member1", b"member2", b"member3"}
+    """
+    if not keys_span_slots(client, keys):
+        return await client.sunion(keys)
+    return await _union(client, keys)
+
+
+async def sinter(client: TGlideClient, keys: List[TEncodable]) -> Set[bytes]:
+    """
+    Gets the intersection of all the given sets. Equivalent to `SINTER`, except that the keys may map to different
+    hash slots, in which case the smallest set is scanned first, and every other set is scanned to filter its members,
+    from the smallest to the largest.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        keys (List[TEncodable]): The keys of the sets.
+
+    Returns:
+        Set[bytes]: A set of members which are present in all the given sets.
+
+    Examples:
+        >>> await sets.sinter(client, ["my_set1", "my_set2"])
+            {b"member2"}
+    """
+    if not keys_span_slots(client, keys):
+        return await client.sinter(keys)
+    return await _intersection(client, keys)
+
+
+async def sdiff(client: TGlideClient, keys: List[TEncodable]) -> Set[bytes]:
+    """
+    Gets the difference between the first set and all the successive sets. Equivalent to `SDIFF`, except that the
+    keys may map to different hash slots, in which case the first set is scanned, and then the successive sets are
+    scanned concurrently to remove their members.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        keys (List[TEncodable]): The keys of the sets.
+
+    Returns:
+        Set[bytes]: A set of members which are present in the first set but not in any of the successive sets.
+
+    Examples:
+        >>> await sets.sdiff(client, ["my_set1", "my_set2"])
+            {b"member1"}
+    """
+    if not keys_span_slots(client, keys):
+        return await client.sdiff(keys)
+    return await _difference(client, keys)
+
+
+async def sunionstore(
+    client: TGlideClient, destination: TEncodable, keys: List[TEncodable]
+) -> int:
+    """
+    Stores the union of all the given sets at `destination`. Equivalent to `SUNIONSTORE`, except that the keys and
+    the destination may map to different hash slots.
+
+    See `sunion` and `store` for more details.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        destination (TEncodable): The key of the destination set.
+        keys (List[TEncodable]): The keys of the sets.
+
+    Returns:
+        int: The number of members in the resulting set.
+
+    Examples:
+        >>> await sets.sunionstore(client, "my_union", ["my_set1", "my_set2"])
+            3
+    """
+    if not keys_span_slots(client, [destination, *keys]):
+        return await client.sunionstore(destination, keys)
+    return await store(client, destination, await _union(client, keys))
+
+
+async def sinterstore(
+    client: TGlideClient, destination: TEncodable, keys: List[TEncodable]
+) -> int:
+    """
+    Stores the intersection of all the given sets at `destination`. Equivalent to `SINTERSTORE`, except that the keys
+    and the destination may map to different hash slots.
+
+    See `sinter` and `store` for more details.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        destination (TEncodable): The key of the destination set.
+        keys (List[TEncodable]): The keys of the sets.
+
+    Returns:
+        int: The number of members in the resulting set.
+
+    Examples:
+        >>> await sets.sinterstore(client, "my_intersection", ["my_set1", "my_set2"])
+            1
+    """
+    if not keys_span_slots(client, [destination, *keys]):
+        return await client.sinterstore(destination, keys)
+    return await store(client, destination, await _intersection(client, keys))
+
+
+async def sdiffstore(
+    client: TGlideClient, destination: TEncodable, keys: List[TEncodable]
+) -> int:
+    """
+    Stores the difference between the first set and all the successive sets at `destination`. Equivalent to
+    `SDIFFSTORE`, except that the keys and the destination may map to different hash slots.
+
+    See `sdiff` and `store` for more details.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        destination (TEncodable): The key of the destination set.
+        keys (List[TEncodable]): The keys of the sets.
+
+    Returns:
+        int: The number of members in the resulting set.
+
+    Examples:
+        >>> await sets.sdiffstore(client, "my_difference", ["my_set1", "my_set2"])
+            1
+    """
+    if not keys_span_slots(client, [destination, *keys]):
+        return await client.sdiffstore(destination, keys)
+    return await store(client, destination, await _difference(client, keys))
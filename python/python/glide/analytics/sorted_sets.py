@@ -0,0 +1,430 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+"""Sorted set unions and intersections across hash slots.
+
+`ZUNION`, `ZINTER` and their `STORE` variants require all of their keys to map to the same hash slot in cluster mode.
+The functions of this module run these commands on the server when their keys map to a single slot, and otherwise
+compute them in-process: the sorted sets are fetched with concurrent `ZRANGE ... WITHSCORES` commands of up to
+`chunk_size` members each, and the weighted scores of every chunk are aggregated with vectorized NumPy operations as
+soon as it arrives. The whole union, or the members of the smallest set for an intersection, is held in memory, even
+when only the first members of the result are requested. Results are returned as a list of members and a NumPy
+float64 array of their scores, like `zrange_withscores_arrays`, and can be written back with chunked `ZADD` commands.
+
+    Examples:
+
+        >>> from glide.analytics import sorted_sets
+        >>> await sorted_sets.zunion(client, ["scores:eu", "scores:us"], limit=3, reverse=True)
+            ([b'player7', b'player2', b'player9'], array([98.5, 97. , 91.5]))  # The top 3 players in both regions.
+        >>> await sorted_sets.zinterstore(client, "scores:both", [("scores:eu", 1.0), ("scores:us", 2.0)])
+            1250
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
+
+from glide.analytics._slots import keys_span_slots
+from glide.async_commands.core import _to_sorted_set_arrays
+from glide.async_commands.sorted_set import (
+    AggregationType,
+    RangeByIndex,
+    _create_zinter_zunion_cmd_args,
+)
+from glide.constants import TEncodable
+from glide.glide_client import TGlideClient
+from glide.protobuf.command_request_pb2 import RequestType
+
+try:
+    import numpy
+except ImportError as e:
+    raise ImportError(
+        "glide.analytics.sorted_sets requires the `numpy` package. Install it with `pip install numpy`."
+    ) from e
+
+DEFAULT_CHUNK_SIZE = 10000
+"""The default maximum number of members fetched by a single `ZRANGE` command."""
+
+_AGGREGATIONS = {
+    AggregationType.SUM: numpy.add,
+    AggregationType.MIN: numpy.minimum,
+    AggregationType.MAX: numpy.maximum,
+}
+
+
+def _zero_padded(array: Any, capacity: int) -> Any:
+    padded = numpy.zeros(capacity, array.dtype)
+    padded[: len(array)] = array
+    return padded
+
+
+class _Aggregation:
+    """
+    The members of the sorted sets that were fetched so far, with their aggregated scores, the number of sets they
+    were found in, and for every set, whether they were already found in it.
+    """
+
+    def __init__(self, aggregation_type: Optional[AggregationType], sets: int):
+        self.ufunc = _AGGREGATIONS[aggregation_type or AggregationType.SUM]
+        self.positions: Dict[TEncodable, int] = {}
+        self.members: List[TEncodable] = []
+        self.scores = numpy.zeros(0)
+        self.counts = numpy.zeros(0, numpy.int64)
+        self.found_in = [numpy.zeros(0, bool) for _ in range(sets)]
+
+    def _grow(self) -> None:
+        capacity = len(self.scores)
+        if len(self.members) <= capacity:
+            return
+        capacity = max(len(self.members), capacity * 2)
+        self.scores = numpy.resize(self.scores, capacity)
+        self.counts = _zero_padded(self.counts, capacity)
+        self.found_in = [_zero_padded(found, capacity) for found in self.found_in]
+
+    def _insert(self, member: TEncodable) -> int:
+        position = self.positions.get(member)
+        if position is None:
+            position = self.positions[member] = len(self.members)
+            self.members.append(member)
+        return position
+
+    def add(
+        self, index: int, members: List[TEncodable], scores: Any, insert: bool
+    ) -> None:
+        """
+        Aggregates the weighted `scores` of `members` of the set at `index`. Members that weren't found in the
+        previous sets are only added if `insert` is set.
+        """
+        if insert:
+            positions = numpy.fromiter(
+                (self._insert(member) for member in members), numpy.int64, len(members)
+            )
+            self._grow()
+        else:
+            positions = numpy.fromiter(
+                (self.positions.get(member, -1) for member in members),
+                numpy.int64,
+                len(members),
+            )
+            found = positions >= 0
+            positions, scores = positions[found], scores[found]
+
+        # The chunks of a set are fetched concurrently by index, so if the set changes in the meantime a member may
+        # be returned by two chunks. Only its first score is aggregated. Within a chunk, every position appears once.
+        found_in = self.found_in[index]
+        first = ~found_in[positions]
+        positions, scores = positions[first], scores[first]
+        found_in[positions] = True
+
+        with numpy.errstate(invalid="ignore"):
+            combined = self.ufunc(self.scores[positions], scores)
+        combined[numpy.isnan(combined)] = 0
+        self.scores[positions] = numpy.where(
+            self.counts[positions] == 0, scores, combined
+        )
+        self.counts[positions] += 1
+
+    def result(self, min_count: int) -> Tuple[List[TEncodable], Any]:
+        size = len(self.members)
+        scores = self.scores[:size]
+        if min_count <= 1:
+            return self.members, scores
+        (positions,) = numpy.nonzero(self.counts[:size] >= min_count)
+        return [self.members[position] for position in positions], scores[positions]
+
+
+def _separate_weights(
+    keys: Union[List[TEncodable], List[Tuple[TEncodable, float]]]
+) -> Tuple[List[TEncodable], List[float]]:
+    if keys and isinstance(keys[0], tuple):
+        weighted_keys = cast(List[Tuple[TEncodable, float]], keys)
+        return [key for key, _ in weighted_keys], [
+            float(weight) for _, weight in weighted_keys
+        ]
+    return cast(List[TEncodable], keys), [1.0] * len(keys)
+
+
+def _select(
+    members: List[TEncodable], scores: Any, limit: Optional[int], reverse: bool
+) -> Tuple[List[TEncodable], Any]:
+    """
+    Sorts the members by their scores, and then lexicographically, like `ZRANGE`, and keeps the first `limit` of them.
+    Only the members that may be among the first `limit` are sorted, but all of them are already in memory.
+    """
+    candidates = numpy.arange(len(members))
+    if limit is not None and limit < len(members):
+        if limit <= 0:
+            return [], scores[:0]
+        if reverse:
+            threshold = numpy.partition(scores, len(scores) - limit)[
+                len(scores) - limit
+            ]
+            (candidates,) = numpy.nonzero(scores >= threshold)
+        else:
+            threshold = numpy.partition(scores, limit - 1)[limit - 1]
+            (candidates,) = numpy.nonzero(scores <= threshold)
+    candidate_members = numpy.empty(len(candidates), dtype=object)
+    candidate_members[:] = [members[candidate] for candidate in candidates]
+    order = numpy.lexsort((candidate_members, scores[candidates]))
+    if reverse:
+        order = order[::-1]
+    order = candidates[order[:limit]]
+    return [members[position] for position in order], scores[order]
+
+
+async def _aggregate(
+    client: TGlideClient,
+    keys: List[TEncodable],
+    weights: List[float],
+    aggregation_type: Optional[AggregationType],
+    intersect: bool,
+    chunk_size: int,
+) -> Tuple[List[TEncodable], Any]:
+    if chunk_size <= 0:
+        raise ValueError("`chunk_size` must be a positive number.")
+    cardinalities = cast(
+        List[int],
+        await client._execute_pipeline([(RequestType.ZCard, [key]) for key in keys]),
+    )
+    aggregation = _Aggregation(aggregation_type, len(keys))
+
+    async def fetch_set(index: int, insert: bool) -> None:
+        async def fetch_chunk(start: int) -> None:
+            members, scores = await client.zrange_withscores_arrays(
+                keys[index], RangeByIndex(start, start + chunk_size - 1)
+            )
+            with numpy.errstate(invalid="ignore"):
+                weighted = scores * weights[index]
+            # Like the server, a score that is NaN after its weight is applied is treated as 0
+            weighted[numpy.isnan(weighted)] = 0
+            aggregation.add(index, cast(List[TEncodable], members), weighted, insert)
+
+        await asyncio.gather(
+            *(
+                fetch_chunk(start)
+                for start in range(0, cardinalities[index], chunk_size)
+            )
+        )
+
+    if not intersect:
+        await asyncio.gather(*(fetch_set(index, True) for index in range(len(keys))))
+        return aggregation.result(1)
+    if min(cardinalities) == 0:
+        return [], numpy.zeros(0)
+    # Only the members of the smallest set are held in memory, and the members of the other sets that aren't in it
+    # are dropped as soon as their chunks arrive
+    smallest = min(range(len(keys)), key=cardinalities.__getitem__)
+    await fetch_set(smallest, True)
+    await asyncio.gather(
+        *(fetch_set(index, False) for index in range(len(keys)) if index != smallest)
+    )
+    return aggregation.result(len(keys))
+
+
+async def store(
+    client: TGlideClient, key: TEncodable, members: List[TEncodable], scores: Any
+) -> int:
+    """
+    Stores `members` with their `scores` as the sorted set at `key`, replacing its current value.
+
+    The current value is deleted, and the members are added with `zadd_arrays`. The commands aren't atomic, so readers
+    may observe a partially written sorted set. Empty `members` leave `key` deleted, like the `STORE` commands of
+    sorted sets do when their result is empty.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        key (TEncodable): The key to store the sorted set at.
+        members (List[TEncodable]): The members of the sorted set.
+        scores (numpy.ndarray): The float64 array of the scores of the members, in the same order as `members`.
+
+    Returns:
+        int: The number of members in the stored sorted set.
+
+    Examples:
+        >>> await sorted_sets.store(client, "my_sorted_set", [b"member1", b"member2"], numpy.array([1.0, 2.0]))
+            2
+    """
+    await client.delete([key])
+    if not members:
+        return 0
+    return await client.zadd_arrays(key, members, scores)
+
+
+async def _server_aggregate(
+    client: TGlideClient,
+    request_type: RequestType.ValueType,
+    keys: Union[List[TEncodable], List[Tuple[TEncodable, float]]],
+    aggregation_type: Optional[AggregationType],
+) -> Tuple[List[TEncodable], Any]:
+    args = _create_zinter_zunion_cmd_args(keys, aggregation_type)
+    args.append("WITHSCORES")
+    return cast(
+        Tuple[List[TEncodable], Any],
+        await client._execute_command(
+            request_type, args, response_converter=_to_sorted_set_arrays
+        ),
+    )
+
+
+async def zunion(
+    client: TGlideClient,
+    keys: Union[List[TEncodable], List[Tuple[TEncodable, float]]],
+    aggregation_type: Optional[AggregationType] = None,
+    limit: Optional[int] = None,
+    reverse: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Tuple[List[TEncodable], Any]:
+    """
+    Computes the union of the sorted sets given by `keys`. Equivalent to `zunion_withscores`, except that the keys
+    may map to different hash slots, in which case all the sorted sets are fetched concurrently.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        keys (Union[List[TEncodable], List[Tuple[TEncodable, float]]]): The keys of the sorted sets with possible formats:
+            List[TEncodable] - for keys only.
+            List[Tuple[TEncodable, float]] - for weighted keys with score multipliers.
+        aggregation_type (Optional[AggregationType]): Specifies the aggregation strategy to apply when combining the
+            scores of elements. See `AggregationType`.
+        limit (Optional[int]): If set, only the first `limit` members are returned. When the keys map to different
+            hash slots, the whole result is still computed and held in memory, since the score of any member may
+            depend on every set; only the members that may be among the first `limit` are sorted.
+        reverse (bool): If True, the members are ordered from the highest score to the lowest.
+        chunk_size (int): The maximum number of members fetched by a single command.
+
+    Returns:
+        Tuple[List[bytes], numpy.ndarray]: The members of the union, ordered by their scores and then
+            lexicographically, and a float64 array of their scores.
+
+    Examples:
+        >>> await sorted_sets.zunion(client, ["key1", "key2"], AggregationType.MAX)
+            ([b'member2', b'member1'], array([ 8.2, 10.5]))
+    """
+    only_keys, weights = _separate_weights(keys)
+    if keys_span_slots(client, only_keys):
+        members, scores = await _aggregate(
+            client, only_keys, weights, aggregation_type, False, chunk_size
+        )
+    else:
+        members, scores = await _server_aggregate(
+            client, RequestType.ZUnion, keys, aggregation_type
+        )
+    return _select(members, scores, limit, reverse)
+
+
+async def zinter(
+    client: TGlideClient,
+    keys: Union[List[TEncodable], List[Tuple[TEncodable, float]]],
+    aggregation_type: Optional[AggregationType] = None,
+    limit: Optional[int] = None,
+    reverse: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Tuple[List[TEncodable], Any]:
+    """
+    Computes the intersection of the sorted sets given by `keys`. Equivalent to `zinter_withscores`, except that the
+    keys may map to different hash slots, in which case the smallest sorted set is fetched first, and then the other
+    sorted sets are fetched concurrently to filter its members.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        keys (Union[List[TEncodable], List[Tuple[TEncodable, float]]]): The keys of the sorted sets with possible formats:
+            List[TEncodable] - for keys only.
+            List[Tuple[TEncodable, float]] - for weighted keys with score multipliers.
+        aggregation_type (Optional[AggregationType]): Specifies the aggregation strategy to apply when combining the
+            scores of elements. See `AggregationType`.
+        limit (Optional[int]): If set, only the first `limit` members are returned. When the keys map to different
+            hash slots, the whole result is still computed and held in memory, since the score of any member may
+            depend on every set; only the members that may be among the first `limit` are sorted.
+        reverse (bool): If True, the members are ordered from the highest score to the lowest.
+        chunk_size (int): The maximum number of members fetched by a single command.
+
+    Returns:
+        Tuple[List[bytes], numpy.ndarray]: The members of the intersection, ordered by their scores and then
+            lexicographically, and a float64 array of their scores.
+
+    Examples:
+        >>> await sorted_sets.zinter(client, ["key1", "key2"])
+            ([b'member1'], array([20.]))
+    """
+    only_keys, weights = _separate_weights(keys)
+    if keys_span_slots(client, only_keys):
+        members, scores = await _aggregate(
+            client, only_keys, weights, aggregation_type, True, chunk_size
+        )
+    else:
+        members, scores = await _server_aggregate(
+            client, RequestType.ZInter, keys, aggregation_type
+        )
+    return _select(members, scores, limit, reverse)
+
+
+async def zunionstore(
+    client: TGlideClient,
+    destination: TEncodable,
+    keys: Union[List[TEncodable], List[Tuple[TEncodable, float]]],
+    aggregation_type: Optional[AggregationType] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Computes the union of the sorted sets given by `keys`, and stores the result at `destination`. Equivalent to
+    `zunionstore`, except that the keys and the destination may map to different hash slots.
+
+    See `zunion` and `store` for more details.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        destination (TEncodable): The key of the destination sorted set.
+        keys (Union[List[TEncodable], List[Tuple[TEncodable, float]]]): The keys of the sorted sets, optionally with
+            weights. See `zunion`.
+        aggregation_type (Optional[AggregationType]): Specifies the aggregation strategy to apply when combining the
+            scores of elements. See `AggregationType`.
+        chunk_size (int): The maximum number of members fetched by a single command.
+
+    Returns:
+        int: The number of elements in the resulting sorted set stored at `destination`.
+
+    Examples:
+        >>> await sorted_sets.zunionstore(client, "my_sorted_set", ["key1", "key2"])
+            2
+    """
+    only_keys, weights = _separate_weights(keys)
+    if not keys_span_slots(client, [destination, *only_keys]):
+        return await client.zunionstore(destination, keys, aggregation_type)
+    members, scores = await _aggregate(
+        client, only_keys, weights, aggregation_type, False, chunk_size
+    )
+    return await store(client, destination, members, scores)
+
+
+async def zinterstore(
+    client: TGlideClient,
+    destination: TEncodable,
+    keys: Union[List[TEncodable], List[Tuple[TEncodable, float]]],
+    aggregation_type: Optional[AggregationType] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Computes the intersection of the sorted sets given by `keys`, and stores the result at `destination`. Equivalent
+    to `zinterstore`, except that the keys and the destination may map to different hash slots.
+
+    See `zinter` and `store` for more details.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        destination (TEncodable): The key of the destination sorted set.
+        keys (Union[List[TEncodable], List[Tuple[TEncodable, float]]]): The keys of the sorted sets, optionally with
+            weights. See `zinter`.
+        aggregation_type (Optional[AggregationType]): Specifies the aggregation strategy to apply when combining the
+            scores of elements. See `AggregationType`.
+        chunk_size (int): The maximum number of members fetched by a single command.
+
+    Returns:
+        int: The number of elements in the resulting sorted set stored at `destination`.
+
+    Examples:
+        >>> await sorted_sets.zinterstore(client, "my_sorted_set", ["key1", "key2"])
+            1
+    """
+    only_keys, weights = _separate_weights(keys)
+    if not keys_span_slots(client, [destination, *only_keys]):
+        return await client.zinterstore(destination, keys, aggregation_type)
+    members, scores = await _aggregate(
+        client, only_keys, weights, aggregation_type, True, chunk_size
+    )
+    return await store(client, destination, members, scores)
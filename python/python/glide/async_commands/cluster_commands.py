@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Mapping, Optional, Set, Union, cast
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple, Union, cast
 
 from glide.async_commands.command_args import Limit, ObjectType, OrderBy
 from glide.async_commands.core import (
@@ -85,6 +85,7 @@ class ClusterCommands(CoreCommands):
         self,
         transaction: ClusterTransaction,
         route: Optional[TSingleNodeRoute] = None,
+        timeout: Optional[int] = None,
     ) -> Optional[List[TResult]]:
         """
         Execute a transaction by processing the queued commands.
@@ -95,6 +96,8 @@ class ClusterCommands(CoreCommands):
             route (Optional[TSingleNodeRoute]): If `route` is not provided, the transaction will be routed to the slot owner of the
                 first key found in the transaction. If no key is found, the command will be sent to a random node.
                 If `route` is provided, the client will route the command to the nodes defined by `route`.
+            timeout (Optional[int]): The timeout of the transaction in milliseconds, instead of the `request_timeout` of
+                the client. See `glide.timeouts` for scoped timeouts and deadlines.
 
         Returns:
             Optional[List[TResult]]: A list of results corresponding to the execution of each command
@@ -103,7 +106,7 @@ class ClusterCommands(CoreCommands):
                 If the transaction failed due to a WATCH command, `exec` will return `None`.
         """
         commands = transaction.commands[:]
-        return await self._execute_transaction(commands, route)
+        return await self._execute_transaction(commands, route, timeout)
 
     async def config_resetstat(
         self,
@@ -920,6 +923,34 @@ class ClusterCommands(CoreCommands):
         )
         return cast(int, result)
 
+    async def publish_many(
+        self,
+        channels_and_messages: List[Tuple[TEncodable, TEncodable]],
+        sharded: bool = False,
+    ) -> List[int]:
+        """
+        Publishes many messages, each on its own pubsub channel.
+        The messages are pipelined in batches, which is considerably faster than awaiting `publish` for every message.
+        In sharded mode, the messages are grouped by the slot of their channel, and every group is pipelined to the
+        primary that owns the slot. Other messages are propagated by the cluster, so they are pipelined to a single node.
+        The messages of a channel are published in the order they were given.
+        See https://valkey.io/commands/publish and https://valkey.io/commands/spublish for more details.
+
+        Args:
+            channels_and_messages (List[Tuple[TEncodable, TEncodable]]): Pairs of the channel to publish on and the
+                message to publish.
+            sharded (bool): Use sharded pubsub mode. Available since Valkey version 7.0.
+
+        Returns:
+            List[int]: The number of subscriptions in the node that received every message, in the order of
+                `channels_and_messages`.
+
+        Examples:
+            >>> await client.publish_many([("orders:{eu}", "created"), ("orders:{us}", "paid")], sharded=True)
+                [1, 2]
+        """
+        return await self._execute_publish_batch(channels_and_messages, sharded)
+
     async def pubsub_shardchannels(
         self, pattern: Optional[TEncodable] = None
     ) -> List[bytes]:
@@ -982,6 +1013,52 @@ class ClusterCommands(CoreCommands):
             ),
         )
 
+    async def ssubscribe(self, channels: Set[TEncodable]) -> TOK:
+        """
+        Subscribes the client to the given sharded channels, in addition to the channels it was configured with.
+        Every channel is subscribed on the primary that owns its slot, and is subscribed again when its slot migrates
+        to another node or the client reconnects.
+
+        See https://valkey.io/commands/ssubscribe for more details.
+
+        Note:
+            Requires RESP3 protocol. Available since Valkey version 7.0.
+
+        Args:
+            channels (Set[TEncodable]): The sharded channels to subscribe to.
+
+        Returns:
+            TOK: A simple OK response.
+
+        Examples:
+            >>> await client.ssubscribe({"orders:{eu}", "orders:{us}"})
+                'OK'
+        """
+        return await self._execute_subscription_command(
+            RequestType.SSubscribe, channels
+        )
+
+    async def sunsubscribe(self, channels: Optional[Set[TEncodable]] = None) -> TOK:
+        """
+        Unsubscribes the client from the given sharded channels, including channels the client was configured with.
+
+        See https://valkey.io/commands/sunsubscribe for more details.
+
+        Args:
+            channels (Optional[Set[TEncodable]]): The sharded channels to unsubscribe from.
+                If not provided, the client is unsubscribed from all sharded channels.
+
+        Returns:
+            TOK: A simple OK response.
+
+        Examples:
+            >>> await client.sunsubscribe({"orders:{eu}"})
+                'OK'
+        """
+        return await self._execute_subscription_command(
+            RequestType.SUnsubscribe, channels
+        )
+
     async def flushall(
         self, flush_mode: Optional[FlushMode] = None, route: Optional[Route] = None
     ) -> TOK:
@@ -1,13 +1,19 @@
 # Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
-from dataclasses import dataclass
+import heapq
 from datetime import datetime, timedelta
 from enum import Enum
+from itertools import chain, islice
 from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
     Dict,
+    Iterable,
     List,
     Mapping,
     Optional,
     Protocol,
+    Sequence,
     Set,
     Tuple,
     Type,
@@ -47,6 +53,7 @@ from glide.async_commands.sorted_set import (
 from glide.async_commands.stream import (
     StreamAddOptions,
     StreamClaimOptions,
+    StreamColumns,
     StreamGroupOptions,
     StreamPendingOptions,
     StreamRangeBound,
@@ -56,16 +63,27 @@ from glide.async_commands.stream import (
     _create_xpending_range_args,
 )
 from glide.constants import (
+    SORTED_SET_ADD_BATCH_SIZE,
+    SORTED_SET_ADD_PIPELINE_SIZE,
+    STREAM_ADD_BATCH_SIZE,
     TOK,
     TEncodable,
     TResult,
     TXInfoStreamFullResponse,
     TXInfoStreamResponse,
 )
+from glide.exceptions import RequestError
 from glide.protobuf.command_request_pb2 import RequestType
 from glide.routes import Route
-
-from ..glide import ClusterScanCursor, Script
+from typing_extensions import TypeAlias
+
+from ..glide import (
+    ClusterScanCursor,
+    PubSubMsg,
+    Script,
+    sorted_set_arrays_from_pointer,
+    stream_columns_from_pointer,
+)
 
 
 class ConditionalChange(Enum):
@@ -362,18 +380,93 @@ def _build_sort_args(
     return args
 
 
+def _create_zadd_options_args(
+    existing_options: Optional[ConditionalChange],
+    update_condition: Optional[UpdateOptions],
+    changed: bool,
+) -> List[TEncodable]:
+    args: List[TEncodable] = []
+    if existing_options:
+        args.append(existing_options.value)
+
+    if update_condition:
+        args.append(update_condition.value)
+
+    if changed:
+        args.append("CH")
+
+    if existing_options and update_condition:
+        if existing_options == ConditionalChange.ONLY_IF_DOES_NOT_EXIST:
+            raise ValueError(
+                "The GT, LT and NX options are mutually exclusive. "
+                f"Cannot choose both {update_condition.value} and NX."
+            )
+    return args
+
+
+def _import_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "Array results require `numpy`. Install it with `pip install numpy`."
+        ) from e
+    return numpy
+
+
+def _native_to_stream_columns(
+    native: Tuple[bytes, Dict[bytes, Tuple[str, Any]]]
+) -> StreamColumns:
+    numpy = _import_numpy()
+    ids, native_columns = native
+    columns: Dict[bytes, Any] = {}
+    for field, (dtype, values) in native_columns.items():
+        if dtype == "bytes":
+            columns[field] = numpy.array(values, dtype=object)
+        else:
+            columns[field] = numpy.frombuffer(values, dtype=dtype)
+    return StreamColumns(
+        numpy.frombuffer(ids, dtype=numpy.int64).reshape(-1, 2), columns
+    )
+
+
+def _to_stream_columns(pointer: int, decode_responses: bool) -> Optional[StreamColumns]:
+    native = stream_columns_from_pointer(pointer, decode_responses=decode_responses)
+    return None if native is None else _native_to_stream_columns(native)
+
+
+def _to_streams_columns(
+    pointer: int, decode_responses: bool
+) -> Optional[Dict[bytes, StreamColumns]]:
+    native = stream_columns_from_pointer(
+        pointer, multiple_streams=True, decode_responses=decode_responses
+    )
+    if native is None:
+        return None
+    return {key: _native_to_stream_columns(stream) for key, stream in native.items()}
+
+
+def _to_sorted_set_arrays(
+    pointer: int, decode_responses: bool
+) -> Tuple[List[TEncodable], Any]:
+    members, scores = sorted_set_arrays_from_pointer(pointer, decode_responses)
+    return members, _import_numpy().frombuffer(scores, dtype="float64")
+
+
 class CoreCommands(Protocol):
     async def _execute_command(
         self,
         request_type: RequestType.ValueType,
         args: List[TEncodable],
         route: Optional[Route] = ...,
+        response_converter: Optional[Callable[[int, bool], Any]] = ...,
     ) -> TResult: ...
 
     async def _execute_transaction(
         self,
         commands: List[Tuple[RequestType.ValueType, List[TEncodable]]],
         route: Optional[Route] = None,
+        timeout: Optional[int] = None,
     ) -> List[TResult]: ...
 
     async def _execute_script(
@@ -392,6 +485,24 @@ class CoreCommands(Protocol):
         type: Optional[ObjectType] = ...,
     ) -> TResult: ...
 
+    async def _execute_publish_batch(
+        self,
+        channels_and_messages: List[Tuple[TEncodable, TEncodable]],
+        sharded: bool,
+    ) -> List[int]: ...
+
+    async def _execute_pipeline(
+        self,
+        commands: List[Tuple[RequestType.ValueType, List[TEncodable]]],
+        response_converter: Optional[Callable[[int, bool], Any]] = ...,
+    ) -> List[TResult]: ...
+
+    async def _execute_subscription_command(
+        self,
+        request_type: RequestType.ValueType,
+        channels_or_patterns: Optional[Set[TEncodable]],
+    ) -> TOK: ...
+
     async def set(
         self,
         key: TEncodable,
@@ -2662,6 +2773,120 @@ class CoreCommands(Protocol):
             Optional[bytes], await self._execute_command(RequestType.XAdd, args)
         )
 
+    async def xadd_many(
+        self,
+        key: TEncodable,
+        entries: List[List[Tuple[TEncodable, TEncodable]]],
+        options: Optional[StreamAddOptions] = None,
+    ) -> List[Optional[bytes]]:
+        """
+        Adds the given entries to the stream stored at `key`, in order, with generated IDs.
+
+        The entries are sent in pipelines of up to `STREAM_ADD_BATCH_SIZE` entries, which is much faster than
+        calling `xadd` for every entry. If `options.trim` is set, the stream is trimmed once per pipeline, by
+        its last entry, rather than by every entry. Approximate trimming is the most efficient, see `StreamTrimOptions`.
+
+        Note:
+            The pipelines aren't atomic. If adding an entry fails, e.g. because `key` holds a value that isn't a
+            stream, an error is raised and no IDs are returned, but the entries before and after it may have been
+            added. Use `xrange` to check which entries were added before retrying, to avoid duplicating them.
+
+        See https://valkey.io/commands/xadd for more details.
+
+        Args:
+            key (TEncodable): The key of the stream.
+            entries (List[List[Tuple[TEncodable, TEncodable]]]): The field-value pairs of every entry to add.
+            options (Optional[StreamAddOptions]): Additional options for adding the entries. `options.id` must not be
+                set, since every entry is added with a generated ID. See `StreamAddOptions`.
+
+        Returns:
+            List[Optional[bytes]]: The IDs of the added entries, in the same order as `entries`. None is returned for
+                every entry if `options.make_stream` is set to False and no stream with the matching `key` exists.
+
+        Example:
+            >>> await client.xadd_many("mystream", [[("field", "a")], [("field", "b")]], StreamAddOptions(trim=TrimByMaxLen(exact=False, threshold=1000)))
+                [b"1615957011958-0", b"1615957011958-1"]
+        """
+        return (await self._xadd_streams([(key, entries)], options))[0]
+
+    async def xadd_many_streams(
+        self,
+        entries_by_stream: Mapping[
+            TEncodable, List[List[Tuple[TEncodable, TEncodable]]]
+        ],
+        options: Optional[StreamAddOptions] = None,
+    ) -> Dict[TEncodable, List[Optional[bytes]]]:
+        """
+        Adds entries to multiple streams, in order, with generated IDs. See `xadd_many` for more details.
+
+        Note:
+            In cluster mode, the entries are grouped by the hash slot of their stream, and every group is sent to the
+            node that owns its slot. The entries of every stream are added in order, but streams of different slots
+            are written concurrently.
+
+            The pipelines aren't atomic. If adding an entry to any stream fails, an error is raised and no IDs are
+            returned, but the other entries, of that stream and of the other streams, may have been added.
+
+        Args:
+            entries_by_stream (Mapping[TEncodable, List[List[Tuple[TEncodable, TEncodable]]]]): A map of stream keys to
+                the field-value pairs of every entry to add to the stream.
+            options (Optional[StreamAddOptions]): Additional options for adding the entries, applied to every stream.
+                `options.id` must not be set. See `StreamAddOptions`.
+
+        Returns:
+            Dict[TEncodable, List[Optional[bytes]]]: A map of the stream keys to the IDs of the entries added to them,
+                in the same order as their entries.
+
+        Example:
+            >>> await client.xadd_many_streams({"stream1": [[("field", "a")]], "stream2": [[("field", "b")], [("field", "c")]]})
+                {"stream1": [b"1615957011958-0"], "stream2": [b"1615957011958-0", b"1615957011958-1"]}
+        """
+        ids = await self._xadd_streams(list(entries_by_stream.items()), options)
+        return dict(zip(entries_by_stream.keys(), ids))
+
+    async def _xadd_streams(
+        self,
+        streams: List[Tuple[TEncodable, List[List[Tuple[TEncodable, TEncodable]]]]],
+        options: Optional[StreamAddOptions],
+    ) -> List[List[Optional[bytes]]]:
+        if options is not None and options.id:
+            raise ValueError(
+                "`options.id` can't be set when adding multiple entries, since every entry is added with a generated ID."
+            )
+        options_args: List[TEncodable] = []
+        trim_args: List[TEncodable] = []
+        if options is not None:
+            if not options.make_stream:
+                options_args.append("NOMKSTREAM")
+            if options.trim:
+                trim_args.extend(options.trim.to_args())
+
+        ids: List[List[Optional[bytes]]] = [[] for _ in streams]
+        max_entries = max((len(entries) for _, entries in streams), default=0)
+        # The pipelines are sent one after the other, so that the entries of every stream are added in order
+        for start in range(0, max_entries, STREAM_ADD_BATCH_SIZE):
+            commands: List[Tuple[RequestType.ValueType, List[TEncodable]]] = []
+            batch_sizes = []
+            for key, entries in streams:
+                batch = entries[start : start + STREAM_ADD_BATCH_SIZE]
+                for index, values in enumerate(batch):
+                    args: List[TEncodable] = [key, *options_args]
+                    if index == len(batch) - 1:
+                        args.extend(trim_args)
+                    args.append("*")
+                    args.extend([field for pair in values for field in pair])
+                    commands.append((RequestType.XAdd, args))
+                batch_sizes.append(len(batch))
+
+            batch_ids = cast(
+                List[Optional[bytes]], await self._execute_pipeline(commands)
+            )
+            offset = 0
+            for stream_ids, batch_size in zip(ids, batch_sizes):
+                stream_ids.extend(batch_ids[offset : offset + batch_size])
+                offset += batch_size
+        return ids
+
     async def xdel(self, key: TEncodable, ids: List[TEncodable]) -> int:
         """
         Removes the specified entries by id from a stream, and returns the number of entries deleted.
@@ -2835,6 +3060,91 @@ class CoreCommands(Protocol):
             await self._execute_command(RequestType.XRevRange, args),
         )
 
+    async def xrange_columns(
+        self,
+        key: TEncodable,
+        start: StreamRangeBound,
+        end: StreamRangeBound,
+        count: Optional[int] = None,
+    ) -> Optional[StreamColumns]:
+        """
+        Returns stream entries matching a given range of IDs, in a columnar layout. Equivalent to `xrange`, but the
+        entries are converted to NumPy arrays instead of Python objects, which makes reading large ranges much cheaper.
+        Requires `numpy`.
+
+        See https://valkey.io/commands/xrange for more details.
+
+        Args:
+            key (TEncodable): The key of the stream.
+            start (StreamRangeBound): The starting stream ID bound for the range. See `xrange`.
+            end (StreamRangeBound): The ending stream ID bound for the range. See `xrange`.
+            count (Optional[int]): An optional argument specifying the maximum count of stream entries to return.
+                If `count` is not provided, all stream entries in the range will be returned.
+
+        Returns:
+            Optional[StreamColumns]: The IDs and the fields of the entries, see `StreamColumns`. Returns None if the
+                range arguments are not applicable.
+
+        Examples:
+            >>> await client.xadd("mystream", [("temperature", "21.5"), ("sensor", "a")], StreamAddOptions(id="0-1"))
+            >>> await client.xadd("mystream", [("temperature", "22"), ("sensor", "b")], StreamAddOptions(id="0-2"))
+            >>> entries = await client.xrange_columns("mystream", MinId(), MaxId())
+            >>> entries.ids
+                array([[0, 1], [0, 2]])
+            >>> entries.columns
+                {b"temperature": array([21.5, 22. ]), b"sensor": array([b"a", b"b"], dtype=object)}
+        """
+        args: List[TEncodable] = [key, start.to_arg(), end.to_arg()]
+        if count is not None:
+            args.extend(["COUNT", str(count)])
+
+        return cast(
+            Optional[StreamColumns],
+            await self._execute_command(
+                RequestType.XRange, args, response_converter=_to_stream_columns
+            ),
+        )
+
+    async def xrevrange_columns(
+        self,
+        key: TEncodable,
+        end: StreamRangeBound,
+        start: StreamRangeBound,
+        count: Optional[int] = None,
+    ) -> Optional[StreamColumns]:
+        """
+        Returns stream entries matching a given range of IDs in reverse order, in a columnar layout. Equivalent to
+        `xrevrange`, but the entries are converted to NumPy arrays. See `xrange_columns` for more details.
+
+        See https://valkey.io/commands/xrevrange for more details.
+
+        Args:
+            key (TEncodable): The key of the stream.
+            end (StreamRangeBound): The ending stream ID bound for the range. See `xrevrange`.
+            start (StreamRangeBound): The starting stream ID bound for the range. See `xrevrange`.
+            count (Optional[int]): An optional argument specifying the maximum count of stream entries to return.
+                If `count` is not provided, all stream entries in the range will be returned.
+
+        Returns:
+            Optional[StreamColumns]: The IDs and the fields of the entries, in reverse order. See `StreamColumns`.
+                Returns None if the range arguments are not applicable.
+
+        Examples:
+            >>> entries = await client.xrevrange_columns("mystream", MaxId(), MinId())
+            >>> entries.ids
+                array([[0, 2], [0, 1]])
+        """
+        args: List[TEncodable] = [key, end.to_arg(), start.to_arg()]
+        if count is not None:
+            args.extend(["COUNT", str(count)])
+
+        return cast(
+            Optional[StreamColumns],
+            await self._execute_command(
+                RequestType.XRevRange, args, response_converter=_to_stream_columns
+            ),
+        )
+
     async def xread(
         self,
         keys_and_ids: Mapping[TEncodable, TEncodable],
@@ -2883,6 +3193,46 @@ class CoreCommands(Protocol):
             await self._execute_command(RequestType.XRead, args),
         )
 
+    async def xread_columns(
+        self,
+        keys_and_ids: Mapping[TEncodable, TEncodable],
+        options: Optional[StreamReadOptions] = None,
+    ) -> Optional[Mapping[bytes, StreamColumns]]:
+        """
+        Reads entries from the given streams, in a columnar layout. Equivalent to `xread`, but the entries of every
+        stream are converted to NumPy arrays. See `xrange_columns` for more details.
+
+        See https://valkey.io/commands/xread for more details.
+
+        Note:
+            When in cluster mode, all keys in `keys_and_ids` must map to the same hash slot.
+
+        Args:
+            keys_and_ids (Mapping[TEncodable, TEncodable]): A mapping of keys and entry IDs to read from. The mapping is composed of a
+                stream's key and the ID of the entry after which the stream will be read.
+            options (Optional[StreamReadOptions]): Options detailing how to read the stream.
+
+        Returns:
+            Optional[Mapping[bytes, StreamColumns]]: A mapping of stream keys to the IDs and the fields of their
+                entries, see `StreamColumns`. None is returned under the same conditions as `xread`.
+
+        Examples:
+            >>> result = await client.xread_columns({"mystream": "0-0"}, StreamReadOptions(count=1000))
+            >>> result[b"mystream"].columns[b"temperature"]
+                array([21.5, 22. ])
+        """
+        args: List[TEncodable] = [] if options is None else options.to_args()
+        args.append("STREAMS")
+        args.extend([key for key in keys_and_ids.keys()])
+        args.extend([value for value in keys_and_ids.values()])
+
+        return cast(
+            Optional[Mapping[bytes, StreamColumns]],
+            await self._execute_command(
+                RequestType.XRead, args, response_converter=_to_streams_columns
+            ),
+        )
+
     async def xgroup_create(
         self,
         key: TEncodable,
@@ -3924,6 +4274,126 @@ class CoreCommands(Protocol):
             await self._execute_command(RequestType.GeoSearch, args),
         )
 
+    async def geosearch_many(
+        self,
+        keys: List[TEncodable],
+        search_from: Union[str, bytes, GeospatialData],
+        search_by: Union[GeoSearchByRadius, GeoSearchByBox],
+        order_by: Optional[OrderBy] = None,
+        count: Optional[GeoSearchCount] = None,
+        with_coord: bool = False,
+        with_dist: bool = False,
+        with_hash: bool = False,
+    ) -> List[Union[bytes, List[Union[bytes, float, int, List[float]]]]]:
+        """
+        Searches for members within a circular or rectangular area in all the sorted sets stored at `keys`, which
+        represent shards of the same geospatial index. Equivalent to calling `geosearch` on every key and merging the
+        results, except that the keys may map to different hash slots, and the searches run in a single pipeline,
+        with the searches of different slots sent concurrently in cluster mode.
+
+        The results of the keys are merged by their distance from the center, so `order_by` and `count` apply to the
+        merged results: with `count`, only the `count` nearest members across all the keys are returned. Every key is
+        searched with the same `count`, so no more than `count` results are fetched from each key. A member that
+        appears in more than one key is returned once per key.
+
+        See https://valkey.io/commands/geosearch/ for more details.
+
+        Args:
+            keys (List[TEncodable]): The keys of the sorted sets representing geospatial data.
+            search_from (Union[str, bytes, GeospatialData]): The location to search from. Can be specified either as a member
+                of one of the sorted sets or as a geospatial data (see `GeospatialData`). The position of a member is
+                fetched with `GEOPOS` first, from the first key that contains it.
+            search_by (Union[GeoSearchByRadius, GeoSearchByBox]): The search criteria.
+                For circular area search, see `GeoSearchByRadius`.
+                For rectangular area search, see `GeoSearchByBox`.
+            order_by (Optional[OrderBy]): Specifies the order in which the results should be returned.
+                    - `ASC`: Sorts items from the nearest to the farthest, relative to the center point.
+                    - `DESC`: Sorts items from the farthest to the nearest, relative to the center point.
+                If not specified, the results are sorted from the nearest to the farthest if `count` is specified
+                without `any_option`, and are otherwise unsorted.
+            count (Optional[GeoSearchCount]): Specifies the maximum number of results to return across all the keys.
+                See `GeoSearchCount`. If not specified, return all results.
+            with_coord (bool): Whether to include coordinates of the returned items. Defaults to False.
+            with_dist (bool): Whether to include distance from the center in the returned items.
+                The distance is returned in the same unit as specified for the `search_by` arguments. Defaults to False.
+            with_hash (bool): Whether to include geohash of the returned items. Defaults to False.
+
+        Returns:
+            List[Union[bytes, List[Union[bytes, float, int, List[float]]]]]: The results, in the format of `geosearch`.
+
+        Examples:
+            >>> await client.geoadd("places:{eu}", {"Palermo": GeospatialData(13.361389, 38.115556)})
+            >>> await client.geoadd("places:{us}", {"Catania": GeospatialData(15.087269, 37.502669)})
+            >>> await client.geosearch_many(
+            ...     ["places:{eu}", "places:{us}"],
+            ...     GeospatialData(15, 37),
+            ...     GeoSearchByRadius(200, GeoUnit.KILOMETERS),
+            ...     count=GeoSearchCount(1),
+            ...     with_dist=True,
+            ... )
+                [[b"Catania", [56.4413]]]  # The nearest location to the center, in any of the keys.
+
+        Since: Valkey version 6.2.0.
+        """
+        if not keys:
+            return []
+        if isinstance(search_from, (str, bytes)):
+            positions = cast(
+                List[List[Optional[List[float]]]],
+                await self._execute_pipeline(
+                    [(RequestType.GeoPos, [key, search_from]) for key in keys]
+                ),
+            )
+            position = next(
+                (position[0] for position in positions if position[0] is not None),
+                None,
+            )
+            if position is None:
+                raise RequestError(
+                    f"The member {search_from!r} was not found in any of the keys."
+                )
+            search_from = GeospatialData(position[0], position[1])
+
+        # The results of the keys are merged by their distances, so ordered searches always fetch the distances
+        ordered = order_by is not None or (count is not None and not count.any_option)
+        results = cast(
+            List[List[Any]],
+            await self._execute_pipeline(
+                [
+                    (
+                        RequestType.GeoSearch,
+                        _create_geosearch_args(
+                            [key],
+                            search_from,
+                            search_by,
+                            (order_by or OrderBy.ASC) if ordered else None,
+                            count,
+                            with_coord,
+                            with_dist or ordered,
+                            with_hash,
+                        ),
+                    )
+                    for key in keys
+                ]
+            ),
+        )
+        merged: Iterable[Any]
+        if ordered:
+            merged = heapq.merge(
+                *results,
+                key=lambda item: item[1][0],
+                reverse=order_by == OrderBy.DESC,
+            )
+        else:
+            merged = chain.from_iterable(results)
+        if count is not None:
+            merged = islice(merged, count.count)
+        if not ordered or with_dist:
+            return list(merged)
+        if not with_coord and not with_hash:
+            return [member for member, _ in merged]
+        return [[member, info[1:]] for member, info in merged]
+
     async def geosearchstore(
         self,
         destination: TEncodable,
@@ -4026,21 +4496,9 @@ class CoreCommands(Protocol):
                 2  # Updates the scores of two existing members in the sorted set "existing_sorted_set."
         """
         args = [key]
-        if existing_options:
-            args.append(existing_options.value)
-
-        if update_condition:
-            args.append(update_condition.value)
-
-        if changed:
-            args.append("CH")
-
-        if existing_options and update_condition:
-            if existing_options == ConditionalChange.ONLY_IF_DOES_NOT_EXIST:
-                raise ValueError(
-                    "The GT, LT and NX options are mutually exclusive. "
-                    f"Cannot choose both {update_condition.value} and NX."
-                )
+        args.extend(
+            _create_zadd_options_args(existing_options, update_condition, changed)
+        )
 
         members_scores_list = [
             str(item) for pair in members_scores.items() for item in pair[::-1]
@@ -4052,6 +4510,71 @@ class CoreCommands(Protocol):
             await self._execute_command(RequestType.ZAdd, args),
         )
 
+    async def zadd_arrays(
+        self,
+        key: TEncodable,
+        members: Sequence[TEncodable],
+        scores: Sequence[float],
+        existing_options: Optional[ConditionalChange] = None,
+        update_condition: Optional[UpdateOptions] = None,
+        changed: bool = False,
+    ) -> int:
+        """
+        Adds `members[i]` with the score `scores[i]` to the sorted set stored at `key`, for every `i`.
+        If a member is already a part of the sorted set, its score is updated.
+
+        Unlike `zadd`, the members and scores are given as parallel sequences, such as a list and a NumPy float64
+        array, so no mapping of all the members has to be built. The members are added with `ZADD` commands of up to
+        `SORTED_SET_ADD_BATCH_SIZE` members, which are sent in pipelines of up to `SORTED_SET_ADD_PIPELINE_SIZE`
+        commands. The pipelines are sent one after the other, so a member that appears more than once gets its last
+        score.
+
+        See https://valkey.io/commands/zadd/ for more details.
+
+        Args:
+            key (TEncodable): The key of the sorted set.
+            members (Sequence[TEncodable]): The members to add.
+            scores (Sequence[float]): The scores of the members, in the same order as `members`.
+            existing_options (Optional[ConditionalChange]): Options for handling existing members. See `zadd`.
+            update_condition (Optional[UpdateOptions]): Options for updating scores. See `zadd`.
+            changed (bool): Modify the return value to return the number of changed elements, instead of the number of new elements added.
+
+        Returns:
+            int: The number of elements added to the sorted set.
+            If `changed` is set, returns the number of elements updated in the sorted set.
+
+        Examples:
+            >>> await client.zadd_arrays("leaderboard", ["player1", "player2"], numpy.array([10.5, 8.2]))
+                2  # Indicates that two elements have been added to the sorted set "leaderboard".
+        """
+        if len(members) != len(scores):
+            raise ValueError(
+                f"`members` and `scores` must have the same length, got {len(members)} and {len(scores)}."
+            )
+        options_args = _create_zadd_options_args(
+            existing_options, update_condition, changed
+        )
+        pipeline_size = SORTED_SET_ADD_BATCH_SIZE * SORTED_SET_ADD_PIPELINE_SIZE
+
+        count = 0
+        for pipeline_start in range(0, len(members), pipeline_size):
+            commands: List[Tuple[RequestType.ValueType, List[TEncodable]]] = []
+            pipeline_end = min(pipeline_start + pipeline_size, len(members))
+            for start in range(pipeline_start, pipeline_end, SORTED_SET_ADD_BATCH_SIZE):
+                end = min(start + SORTED_SET_ADD_BATCH_SIZE, pipeline_end)
+                batch_scores = scores[start:end]
+                # NumPy arrays are converted to Python floats in bulk, rather than one element at a time
+                to_list = getattr(batch_scores, "tolist", None)
+                if to_list is not None:
+                    batch_scores = to_list()
+                args: List[TEncodable] = [key, *options_args]
+                for member, score in zip(members[start:end], batch_scores):
+                    args.append(str(score))
+                    args.append(member)
+                commands.append((RequestType.ZAdd, args))
+            count += sum(cast(List[int], await self._execute_pipeline(commands)))
+        return count
+
     async def zadd_incr(
         self,
         key: TEncodable,
@@ -4421,6 +4944,44 @@ class CoreCommands(Protocol):
             Mapping[bytes, float], await self._execute_command(RequestType.ZRange, args)
         )
 
+    async def zrange_withscores_arrays(
+        self,
+        key: TEncodable,
+        range_query: Union[RangeByIndex, RangeByScore],
+        reverse: bool = False,
+    ) -> Tuple[List[bytes], Any]:
+        """
+        Returns the specified range of elements with their scores in the sorted set stored at `key`, as a list of the
+        members and a NumPy float64 array of their scores. Equivalent to `zrange_withscores`, but the scores are
+        converted to a single array instead of a map of Python floats. Requires `numpy`.
+
+        See https://valkey.io/commands/zrange/ for more details.
+
+        Args:
+            key (TEncodable): The key of the sorted set.
+            range_query (Union[RangeByIndex, RangeByScore]): The range query object representing the type of range query to perform.
+                - For range queries by index (rank), use RangeByIndex.
+                - For range queries by score, use RangeByScore.
+            reverse (bool): If True, reverses the sorted set, with index 0 as the element with the highest score.
+
+        Returns:
+            Tuple[List[bytes], numpy.ndarray]: The members within the specified range, in order, and a read-only
+                float64 array of their scores. If `key` does not exist, it is treated as an empty sorted set, and the
+                command returns an empty list and an empty array.
+
+        Examples:
+            >>> await client.zrange_withscores_arrays("my_sorted_set", RangeByIndex(0, -1))
+                ([b'member2', b'member1'], array([ 8.2, 10.5]))
+        """
+        args = _create_zrange_args(key, range_query, reverse, with_scores=True)
+
+        return cast(
+            Tuple[List[bytes], Any],
+            await self._execute_command(
+                RequestType.ZRange, args, response_converter=_to_sorted_set_arrays
+            ),
+        )
+
     async def zrangestore(
         self,
         destination: TEncodable,
@@ -6352,20 +6913,9 @@ class CoreCommands(Protocol):
             await self._execute_command(RequestType.Watch, keys),
         )
 
-    @dataclass
-    class PubSubMsg:
-        """
-        Describes the incoming pubsub message
-
-        Attributes:
-            message (TEncodable): Incoming message.
-            channel (TEncodable): Name of an channel that triggered the message.
-            pattern (Optional[TEncodable]): Pattern that triggered the message.
-        """
-
-        message: TEncodable
-        channel: TEncodable
-        pattern: Optional[TEncodable]
+    # Implemented natively, so incoming messages are built without intermediate Python objects.
+    # The alias keeps `CoreCommands.PubSubMsg` available, even though protocols don't declare aliases.
+    PubSubMsg: TypeAlias = PubSubMsg  # type: ignore[misc]
 
     async def get_pubsub_message(self) -> PubSubMsg:
         """
@@ -6401,6 +6951,167 @@ class CoreCommands(Protocol):
         """
         ...
 
+    async def get_pubsub_messages(self, max_count: int) -> List[PubSubMsg]:
+        """
+        Returns up to `max_count` pubsub messages, waiting until at least one message is available.
+        Throws WrongConfiguration in cases:
+        1. No pubsub subscriptions are configured for the client
+        2. Callback is configured with the pubsub subsciptions
+
+        See https://valkey.io/docs/topics/pubsub/ for more details.
+
+        Args:
+            max_count (int): The maximum number of messages to return.
+
+        Returns:
+            List[PubSubMsg]: The next pubsub messages, in the order they were received.
+
+        Examples:
+            >>> for pubsub_msg in await listening_client.get_pubsub_messages(100):
+            ...     handle(pubsub_msg)
+        """
+        ...
+
+    def pubsub_messages(self, batch_size: int = 128) -> AsyncIterator[PubSubMsg]:
+        """
+        Returns an asynchronous iterator over the incoming pubsub messages.
+        Messages are taken from the client's queue in batches of up to `batch_size` messages.
+        The iteration stops when the client is closed.
+        Throws WrongConfiguration in cases:
+        1. No pubsub subscriptions are configured for the client
+        2. Callback is configured with the pubsub subsciptions
+
+        See https://valkey.io/docs/topics/pubsub/ for more details.
+
+        Args:
+            batch_size (int): The maximum number of messages taken from the queue at once. Defaults to 128.
+
+        Returns:
+            AsyncIterator[PubSubMsg]: The incoming pubsub messages.
+
+        Examples:
+            >>> async for pubsub_msg in listening_client.pubsub_messages():
+            ...     handle(pubsub_msg)
+        """
+        ...
+
+    def get_dropped_pubsub_messages_count(self) -> int:
+        """
+        Returns the number of pubsub messages that were dropped because the client's message queue was full.
+        See `PubSubQueuePolicy` for more details.
+
+        Returns:
+            int: The number of dropped messages.
+
+        Examples:
+            >>> listening_client.get_dropped_pubsub_messages_count()
+                0
+        """
+        ...
+
+    def get_queued_pubsub_messages_count(self) -> int:
+        """
+        Returns the number of pubsub messages that are waiting in the client's message queue, either to be consumed
+        or to be passed to a callback that isn't invoked inline. See `PubSubCallbackDispatch` for more details.
+
+        Returns:
+            int: The number of queued messages.
+
+        Examples:
+            >>> listening_client.get_queued_pubsub_messages_count()
+                12
+        """
+        ...
+
+    async def subscribe(self, channels: Set[TEncodable]) -> TOK:
+        """
+        Subscribes the client to the given channels, in addition to the channels it was configured with.
+        The subscriptions are restored when the client reconnects.
+        Messages are passed to the configured callback, or can be retrieved with `get_pubsub_message`.
+
+        See https://valkey.io/commands/subscribe for more details.
+
+        Note:
+            Requires RESP3 protocol.
+
+        Args:
+            channels (Set[TEncodable]): The channels to subscribe to.
+
+        Returns:
+            TOK: A simple OK response.
+
+        Examples:
+            >>> await client.subscribe({"news", "sports"})
+                'OK'
+        """
+        return await self._execute_subscription_command(RequestType.Subscribe, channels)
+
+    async def psubscribe(self, patterns: Set[TEncodable]) -> TOK:
+        """
+        Subscribes the client to the channels that match the given glob-style patterns, in addition to the patterns it
+        was configured with. The subscriptions are restored when the client reconnects.
+
+        See https://valkey.io/commands/psubscribe for more details.
+
+        Note:
+            Requires RESP3 protocol.
+
+        Args:
+            patterns (Set[TEncodable]): The patterns to subscribe to.
+
+        Returns:
+            TOK: A simple OK response.
+
+        Examples:
+            >>> await client.psubscribe({"news.*"})
+                'OK'
+        """
+        return await self._execute_subscription_command(
+            RequestType.PSubscribe, patterns
+        )
+
+    async def unsubscribe(self, channels: Optional[Set[TEncodable]] = None) -> TOK:
+        """
+        Unsubscribes the client from the given channels, including channels the client was configured with.
+
+        See https://valkey.io/commands/unsubscribe for more details.
+
+        Args:
+            channels (Optional[Set[TEncodable]]): The channels to unsubscribe from.
+                If not provided, the client is unsubscribed from all channels.
+
+        Returns:
+            TOK: A simple OK response.
+
+        Examples:
+            >>> await client.unsubscribe({"news"})
+                'OK'
+        """
+        return await self._execute_subscription_command(
+            RequestType.Unsubscribe, channels
+        )
+
+    async def punsubscribe(self, patterns: Optional[Set[TEncodable]] = None) -> TOK:
+        """
+        Unsubscribes the client from the given patterns, including patterns the client was configured with.
+
+        See https://valkey.io/commands/punsubscribe for more details.
+
+        Args:
+            patterns (Optional[Set[TEncodable]]): The patterns to unsubscribe from.
+                If not provided, the client is unsubscribed from all patterns.
+
+        Returns:
+            TOK: A simple OK response.
+
+        Examples:
+            >>> await client.punsubscribe({"news.*"})
+                'OK'
+        """
+        return await self._execute_subscription_command(
+            RequestType.PUnsubscribe, patterns
+        )
+
     async def lcs(
         self,
         key1: TEncodable,
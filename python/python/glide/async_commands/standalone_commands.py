@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Mapping, Optional, Set, Union, cast
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple, Union, cast
 
 from glide.async_commands.command_args import Limit, ObjectType, OrderBy
 from glide.async_commands.core import (
@@ -67,6 +67,7 @@ class StandaloneCommands(CoreCommands):
     async def exec(
         self,
         transaction: Transaction,
+        timeout: Optional[int] = None,
     ) -> Optional[List[TResult]]:
         """
         Execute a transaction by processing the queued commands.
@@ -74,6 +75,8 @@ class StandaloneCommands(CoreCommands):
 
         Args:
             transaction (Transaction): A `Transaction` object containing a list of commands to be executed.
+            timeout (Optional[int]): The timeout of the transaction in milliseconds, instead of the `request_timeout` of
+                the client. See `glide.timeouts` for scoped timeouts and deadlines.
 
         Returns:
             Optional[List[TResult]]: A list of results corresponding to the execution of each command
@@ -82,7 +85,7 @@ class StandaloneCommands(CoreCommands):
                 If the transaction failed due to a WATCH command, `exec` will return `None`.
         """
         commands = transaction.commands[:]
-        return await self._execute_transaction(commands)
+        return await self._execute_transaction(commands, timeout=timeout)
 
     async def select(self, index: int) -> TOK:
         """
@@ -748,6 +751,29 @@ class StandaloneCommands(CoreCommands):
             int, await self._execute_command(RequestType.Publish, [channel, message])
         )
 
+    async def publish_many(
+        self, channels_and_messages: List[Tuple[TEncodable, TEncodable]]
+    ) -> List[int]:
+        """
+        Publishes many messages, each on its own pubsub channel.
+        The messages are pipelined in batches, which is considerably faster than awaiting `publish` for every message.
+        The messages of a channel are published in the order they were given.
+        See https://valkey.io/commands/publish for more details.
+
+        Args:
+            channels_and_messages (List[Tuple[TEncodable, TEncodable]]): Pairs of the channel to publish on and the
+                message to publish.
+
+        Returns:
+            List[int]: The number of subscriptions in primary node that received every message, in the order of
+                `channels_and_messages`.
+
+        Examples:
+            >>> await client.publish_many([("news", "Hi all!"), ("sports", "Goal!")])
+                [1, 0]
+        """
+        return await self._execute_publish_batch(channels_and_messages, False)
+
     async def flushall(self, flush_mode: Optional[FlushMode] = None) -> TOK:
         """
         Deletes all the keys of all the existing databases. This command never fails.
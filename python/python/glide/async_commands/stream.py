@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 from glide.constants import TEncodable
 
@@ -423,6 +423,35 @@ class StreamClaimOptions:
         return args
 
 
+class StreamColumns:
+    """
+    Stream entries in a columnar layout, as returned by `xrange_columns`, `xrevrange_columns` and `xread_columns`.
+    Requires `numpy`.
+
+    Attributes:
+        ids (numpy.ndarray): An int64 array of shape `(entries count, 2)`, with the (milliseconds, sequence number)
+            pair of every entry ID.
+        columns (Dict[bytes, numpy.ndarray]): A map of every field name to the values of the field in all the entries.
+            The values are parsed while the response is converted:
+            - int64 arrays are returned for fields that all the entries have, with integer values.
+            - float64 arrays are returned for fields with numeric values. Entries without the field are NaN.
+            - Object arrays of `bytes` are returned for other fields. Entries without the field are None.
+            The numeric arrays are read-only views of the converted response. If a field appears more than once in an
+            entry, its last value is kept. Field names and `bytes` values are decoded if the client is configured
+            with `decode_responses`.
+    """
+
+    def __init__(self, ids: Any, columns: Dict[bytes, Any]):
+        self.ids = ids
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __repr__(self) -> str:
+        return f"StreamColumns(entries={len(self)}, fields={list(self.columns.keys())})"
+
+
 def _create_xpending_range_args(
     key: TEncodable,
     group_name: TEncodable,
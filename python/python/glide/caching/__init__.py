@@ -0,0 +1,5 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+
+from glide.caching.near_cache import CachePolicy, NearCache, NearCacheStats
+
+__all__ = ["CachePolicy", "NearCache", "NearCacheStats"]
@@ -0,0 +1,371 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+"""An in-process cache of keys that are immutable or change rarely, such as configuration blobs and feature flags.
+
+Examples:
+
+    >>> from glide.caching import CachePolicy, NearCache
+    >>> cache = NearCache(
+    ...     client,
+    ...     [CachePolicy("config:", ttl_ms=60000), CachePolicy("flags:", ttl_ms=5000)],
+    ... )
+    >>> await cache.get("config:limits")
+        b'{"rate": 100}'  # Fetched from the server.
+    >>> await cache.get("config:limits")
+        b'{"rate": 100}'  # Served from the cache for the next minute.
+    >>> cache.stats.hits
+        1
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+)
+
+from glide.constants import TEncodable
+from glide.glide_client import TGlideClient
+
+DEFAULT_MAX_ENTRIES = 10000
+
+_GET = "get"
+_HGETALL = "hgetall"
+_SMEMBERS = "smembers"
+
+_EntryKey = Tuple[str, bytes]
+# The keys fetched by `mget`, with their positions in the keys, and their futures and TTLs if they are cached
+_MGetFetches = Dict[bytes, Tuple[List[int], Optional[asyncio.Future], float]]
+
+
+def _to_bytes(key: TEncodable) -> bytes:
+    return key.encode() if isinstance(key, str) else key
+
+
+def _copy(value: Any) -> Any:
+    # Cached hashes and sets are shared between callers, so every caller gets its own copy to mutate
+    if isinstance(value, (dict, set)):
+        return value.copy()
+    return value
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    Caches the keys that start with `prefix` for `ttl_ms` milliseconds.
+
+    Attributes:
+        prefix (TEncodable): The prefix of the cached keys. An empty prefix matches every key.
+        ttl_ms (int): The time in milliseconds after which a cached value is fetched again.
+    """
+
+    prefix: TEncodable
+    ttl_ms: int
+
+    def __post_init__(self):
+        if self.ttl_ms < 1:
+            raise ValueError("`ttl_ms` must be a positive number.")
+
+
+@dataclass
+class NearCacheStats:
+    """
+    Metrics of a `NearCache`.
+
+    Attributes:
+        hits (int): Number of values that were served from the cache.
+        misses (int): Number of values that were fetched from the server, because they weren't cached or had expired.
+        coalesced (int): Number of values that weren't cached, and were served by a fetch of the same value that was
+            already in flight instead of a fetch of their own.
+        evictions (int): Number of cached values that were evicted to keep the cache within its size bound.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+
+
+class NearCache:
+    """
+    A size-bounded LRU cache in front of the `GET`, `MGET`, `HGETALL` and `SMEMBERS` commands of a client, for keys
+    that are read much more often than they change.
+
+    - Only the keys that match one of `policies` are cached, for the TTL of the policy with the longest matching
+      prefix. Other keys are always fetched from the server.
+    - Missing keys are cached too, as `None`, an empty dict or an empty set.
+    - At most `max_entries` values are cached. The least recently used values are evicted first.
+    - A value that isn't cached is fetched once, however many callers request it concurrently: the callers that
+      request it while it is being fetched wait for that fetch, which protects the server from stampedes when a
+      popular key expires.
+
+    The cache isn't invalidated by the server, so a cached value may be stale for up to the TTL of its key. Use
+    `invalidate` after writing a cached key from this process. It works with both `GlideClient` and
+    `GlideClusterClient`.
+
+    Args:
+        client (TGlideClient): The client used to fetch the values.
+        policies (List[CachePolicy]): The prefixes of the keys to cache, and their TTLs.
+        max_entries (int): The maximum number of cached values. Defaults to 10000.
+    """
+
+    def __init__(
+        self,
+        client: TGlideClient,
+        policies: List[CachePolicy],
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        if max_entries < 1:
+            raise ValueError("`max_entries` must be a positive number.")
+
+        self.client = client
+        self.stats = NearCacheStats()
+        self._max_entries = max_entries
+        # Longest prefixes first, so that the first match is the most specific policy
+        self._policies = sorted(
+            ((_to_bytes(policy.prefix), policy.ttl_ms / 1000) for policy in policies),
+            key=lambda policy: len(policy[0]),
+            reverse=True,
+        )
+        self._entries: OrderedDict[_EntryKey, Tuple[float, Any]] = OrderedDict()
+        self._in_flight: Dict[_EntryKey, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: TEncodable) -> Optional[bytes]:
+        """
+        Gets the value of `key`, from the cache if the key is cached. See `TGlideClient.get`.
+
+        Args:
+            key (TEncodable): The key to retrieve.
+
+        Returns:
+            Optional[bytes]: The value of `key`, or `None` if it doesn't exist.
+        """
+        return cast(
+            Optional[bytes],
+            await self._load(_GET, key, lambda: self.client.get(key)),
+        )
+
+    async def mget(self, keys: List[TEncodable]) -> List[Optional[bytes]]:
+        """
+        Gets the values of `keys`, from the cache for the keys that are cached, and with a single `MGET` of the rest.
+        See `TGlideClient.mget`.
+
+        Args:
+            keys (List[TEncodable]): The keys to retrieve.
+
+        Returns:
+            List[Optional[bytes]]: The values of `keys` in the same order, with `None` for keys that don't exist.
+        """
+        values: List[Optional[bytes]] = [None] * len(keys)
+        fetched, waiting = self._partition_mget(keys, values)
+        if fetched:
+            await self._fetch_mget(fetched, values)
+        if waiting:
+            # The keys that are being fetched by other calls wait for those fetches
+            results = await asyncio.gather(
+                *(self.get(keys[index]) for index in waiting)
+            )
+            for index, result in zip(waiting, results):
+                values[index] = result
+        return values
+
+    async def hgetall(self, key: TEncodable) -> Dict[bytes, bytes]:
+        """
+        Gets all the fields and values of the hash stored at `key`, from the cache if the key is cached. See
+        `TGlideClient.hgetall`.
+
+        Args:
+            key (TEncodable): The key of the hash.
+
+        Returns:
+            Dict[bytes, bytes]: The fields and values of the hash, or an empty dict if `key` doesn't exist.
+        """
+        return cast(
+            Dict[bytes, bytes],
+            await self._load(_HGETALL, key, lambda: self.client.hgetall(key)),
+        )
+
+    async def smembers(self, key: TEncodable) -> Set[bytes]:
+        """
+        Gets all the members of the set stored at `key`, from the cache if the key is cached. See
+        `TGlideClient.smembers`.
+
+        Args:
+            key (TEncodable): The key of the set.
+
+        Returns:
+            Set[bytes]: The members of the set, or an empty set if `key` doesn't exist.
+        """
+        return cast(
+            Set[bytes],
+            await self._load(_SMEMBERS, key, lambda: self.client.smembers(key)),
+        )
+
+    def invalidate(self, key: TEncodable) -> None:
+        """
+        Removes the cached values of `key`. A fetch of `key` that is in flight isn't cached when it completes, so
+        the next call fetches the key again.
+
+        Args:
+            key (TEncodable): The key to invalidate.
+        """
+        key_bytes = _to_bytes(key)
+        for command in (_GET, _HGETALL, _SMEMBERS):
+            self._entries.pop((command, key_bytes), None)
+            self._in_flight.pop((command, key_bytes), None)
+
+    def clear(self) -> None:
+        """
+        Removes all the cached values. Fetches that are in flight aren't cached when they complete.
+        """
+        self._entries.clear()
+        self._in_flight.clear()
+
+    def _partition_mget(
+        self, keys: List[TEncodable], values: List[Optional[bytes]]
+    ) -> Tuple[_MGetFetches, List[int]]:
+        """
+        Sets the values of the cached keys in `values`, and returns the keys to fetch, and the positions of the keys
+        that are being fetched by other calls.
+        """
+        fetched: _MGetFetches = {}
+        waiting: List[int] = []
+        for index, key in enumerate(keys):
+            key_bytes = _to_bytes(key)
+            if key_bytes in fetched:
+                fetched[key_bytes][0].append(index)
+                continue
+            ttl = self._ttl(key_bytes)
+            if ttl is None:
+                fetched[key_bytes] = ([index], None, 0.0)
+                continue
+            entry_key = (_GET, key_bytes)
+            found, value = self._lookup(entry_key)
+            if found:
+                values[index] = value
+            elif entry_key in self._in_flight:
+                waiting.append(index)
+            else:
+                self.stats.misses += 1
+                fetched[key_bytes] = ([index], self._start_fetch(entry_key), ttl)
+        return fetched, waiting
+
+    async def _fetch_mget(
+        self, fetched: _MGetFetches, values: List[Optional[bytes]]
+    ) -> None:
+        fetched_keys: List[TEncodable] = list(fetched)
+        try:
+            results = await self.client.mget(fetched_keys)
+        except BaseException as e:
+            for key_bytes, (_, future, _) in fetched.items():
+                if future is not None:
+                    self._fail_fetch((_GET, key_bytes), future, e)
+            raise
+        for (key_bytes, (indices, future, ttl)), result in zip(
+            fetched.items(), results
+        ):
+            if future is not None:
+                self._finish_fetch((_GET, key_bytes), future, result, ttl)
+            for index in indices:
+                values[index] = result
+
+    def _ttl(self, key: bytes) -> Optional[float]:
+        for prefix, ttl in self._policies:
+            if key.startswith(prefix):
+                return ttl
+        return None
+
+    def _lookup(self, entry_key: _EntryKey) -> Tuple[bool, Any]:
+        entry = self._entries.get(entry_key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[entry_key]
+            return False, None
+        self._entries.move_to_end(entry_key)
+        self.stats.hits += 1
+        return True, _copy(value)
+
+    async def _load(
+        self,
+        command: str,
+        key: TEncodable,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        key_bytes = _to_bytes(key)
+        ttl = self._ttl(key_bytes)
+        if ttl is None:
+            return await fetch()
+
+        entry_key = (command, key_bytes)
+        while True:
+            found, value = self._lookup(entry_key)
+            if found:
+                return value
+            future = self._in_flight.get(entry_key)
+            if future is None:
+                break
+            try:
+                # Shielded, so that a cancelled waiter doesn't cancel the fetch of the other callers
+                value = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The caller that fetched the value was cancelled, so the value is fetched again
+                continue
+            self.stats.coalesced += 1
+            return _copy(value)
+
+        self.stats.misses += 1
+        future = self._start_fetch(entry_key)
+        try:
+            value = await fetch()
+        except BaseException as e:
+            self._fail_fetch(entry_key, future, e)
+            raise
+        self._finish_fetch(entry_key, future, value, ttl)
+        return _copy(value)
+
+    def _start_fetch(self, entry_key: _EntryKey) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[entry_key] = future
+        return future
+
+    def _finish_fetch(
+        self, entry_key: _EntryKey, future: asyncio.Future, value: Any, ttl: float
+    ) -> None:
+        # The value isn't cached if the key was invalidated while it was fetched
+        if self._in_flight.get(entry_key) is future:
+            del self._in_flight[entry_key]
+            self._entries[entry_key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        future.set_result(value)
+
+    def _fail_fetch(
+        self, entry_key: _EntryKey, future: asyncio.Future, error: BaseException
+    ) -> None:
+        if self._in_flight.get(entry_key) is future:
+            del self._in_flight[entry_key]
+        if isinstance(error, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(error)
+            # Waiters get the error too, and there may be none, so the error is marked as retrieved
+            future.exception()
@@ -2,16 +2,20 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, IntEnum
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 from glide.async_commands.core import CoreCommands
 from glide.exceptions import ConfigurationError
+from glide.protobuf.connection_request_pb2 import (
+    CompressionBackend as ProtobufCompressionBackend,
+)
 from glide.protobuf.connection_request_pb2 import ConnectionRequest
 from glide.protobuf.connection_request_pb2 import ProtocolVersion as SentProtocolVersion
 from glide.protobuf.connection_request_pb2 import ReadFrom as ProtobufReadFrom
 from glide.protobuf.connection_request_pb2 import TlsMode
+from glide.serialization import Serializer
 
 
 class NodeAddress:
@@ -58,6 +62,52 @@ class ProtocolVersion(Enum):
     """
 
 
+class PubSubQueuePolicy(Enum):
+    """
+    Represents what the client does with incoming pubsub messages once its message queue is full.
+    """
+
+    DROP_NEWEST = 0
+    """
+    Drop the incoming message.
+    """
+    DROP_OLDEST = 1
+    """
+    Drop the oldest message in the queue to make room for the incoming message.
+    """
+    BLOCK = 2
+    """
+    Stop reading from the client's connection until a message is consumed.
+    Note that responses to other requests of the client are delayed as well, so this policy should only be used on
+    clients that are dedicated to pubsub.
+    """
+
+
+class PubSubCallbackDispatch(Enum):
+    """
+    Represents how the pubsub callback is invoked.
+    With the non-inline modes, messages wait for the callback in a queue that is bounded by the subscriptions'
+    `max_queue_size` and `queue_policy`, and messages of the same channel are always passed to the callback in the
+    order they were received.
+    """
+
+    INLINE = 0
+    """
+    Invoke the callback from the client's reader loop as messages arrive.
+    A slow callback delays the responses to other requests of the client.
+    """
+    ASYNCIO_TASK = 1
+    """
+    Invoke the callback from an asyncio task that handles all the messages received since the previous task.
+    The reader loop keeps handling responses between the batches.
+    """
+    THREAD_POOL = 2
+    """
+    Invoke the callback from a pool of `callback_workers` threads. Messages are assigned to the threads by channel.
+    The callback must be thread-safe, and must not use the client's event loop directly.
+    """
+
+
 class BackoffStrategy:
     def __init__(self, num_of_retries: int, factor: int, exponent_base: int):
         """
@@ -124,6 +174,59 @@ class PeriodicChecksStatus(Enum):
     """
 
 
+class CompressionBackend(Enum):
+    """
+    Represents the algorithm used to compress values.
+    """
+
+    ZLIB = ProtobufCompressionBackend.Zlib
+    """
+    Compress values with zlib (DEFLATE).
+    """
+    ZSTD = ProtobufCompressionBackend.Zstd
+    """
+    Compress values with Zstandard, which is usually faster than zlib for a similar compression ratio.
+    """
+
+
+class CompressionConfiguration:
+    def __init__(
+        self,
+        backend: CompressionBackend = CompressionBackend.ZLIB,
+        min_compression_size: int = 1024,
+        compression_level: Optional[int] = None,
+    ):
+        """
+        Represents the configuration of transparent value compression.
+
+        When configured, values larger than `min_compression_size` that are written by SET, SETEX, PSETEX, GETSET, MSET,
+        MSETNX, HSET, HSETNX, LPUSH, RPUSH, LPUSHX, RPUSHX and LSET are compressed by the client before being sent to the
+        server, and values returned by the matching reads (GET, GETDEL, GETEX, MGET, HGET, HMGET, HGETALL, HVALS,
+        HRANDFIELD, LPOP, RPOP, LRANGE, LINDEX, LMOVE and the blocking variants) are decompressed.
+        Compression runs in the client's core, outside of the Python interpreter.
+
+        Compressed values are prefixed with a header, so values that were written without compression are returned
+        unchanged and compression can be enabled on an existing dataset.
+        Values are only stored compressed when compression reduces their size.
+
+        Note:
+            Commands that operate on the stored bytes, such as APPEND, SETRANGE, GETRANGE, STRLEN or HSTRLEN, see the
+            compressed value. Mixing SET with SETRANGE or APPEND on the same key corrupts the value, since the raw bytes
+            are written next to the compressed ones. Commands that compare a value sent by the caller with the stored
+            elements, such as LREM, LPOS or the pivot of LINSERT, silently match nothing against compressed elements.
+            All clients that read compressed values must be configured with compression.
+
+        Args:
+            backend (CompressionBackend): The compression algorithm. Defaults to `CompressionBackend.ZLIB`.
+            min_compression_size (int): Values shorter than this number of bytes are not compressed. Defaults to 1024.
+            compression_level (Optional[int]): The compression level of the backend, 1-9 for zlib and 1-22 for zstd.
+                If not set, the default level of the backend is used.
+        """
+        self.backend = backend
+        self.min_compression_size = min_compression_size
+        self.compression_level = compression_level
+
+
 class BaseClientConfiguration:
     def __init__(
         self,
@@ -134,6 +237,9 @@ class BaseClientConfiguration:
         request_timeout: Optional[int] = None,
         client_name: Optional[str] = None,
         protocol: ProtocolVersion = ProtocolVersion.RESP3,
+        compression: Optional[CompressionConfiguration] = None,
+        serializer: Optional[Serializer] = None,
+        decode_responses: bool = False,
     ):
         """
         Represents the configuration settings for a Glide client.
@@ -158,6 +264,12 @@ class BaseClientConfiguration:
                 This duration encompasses sending the request, awaiting for a response from the server, and any required reconnections or retries.
                 If the specified timeout is exceeded for a pending request, it will result in a timeout error. If not set, a default value will be used.
             client_name (Optional[str]): Client name to be used for the client. Will be used with CLIENT SETNAME command during connection establishment.
+            compression (Optional[CompressionConfiguration]): Transparent compression of large values.
+                If not set, values are sent as-is.
+            serializer (Optional[Serializer]): The default serializer of the `glide.serialization.commands` functions.
+            decode_responses (bool): If `True`, strings in command responses are returned as `str` instead of `bytes`,
+                including map keys and set members. Strings that are not valid UTF-8 are still returned as `bytes`.
+                Responses are decoded once, while being converted to Python objects. Defaults to False.
         """
         self.addresses = addresses
         self.use_tls = use_tls
@@ -166,6 +278,9 @@ class BaseClientConfiguration:
         self.request_timeout = request_timeout
         self.client_name = client_name
         self.protocol = protocol
+        self.compression = compression
+        self.serializer = serializer
+        self.decode_responses = decode_responses
 
     def _create_a_protobuf_conn_request(
         self, cluster_mode: bool = False
@@ -196,6 +311,16 @@ class BaseClientConfiguration:
         if self.client_name:
             request.client_name = self.client_name
         request.protocol = self.protocol.value
+        if self.compression:
+            request.compression.SetInParent()
+            request.compression.backend = self.compression.backend.value
+            request.compression.min_compression_size = (
+                self.compression.min_compression_size
+            )
+            if self.compression.compression_level:
+                request.compression.compression_level = (
+                    self.compression.compression_level
+                )
 
         return request
 
@@ -207,6 +332,12 @@ class BaseClientConfiguration:
     ) -> Tuple[Optional[Callable[[CoreCommands.PubSubMsg, Any], None]], Any]:
         return None, None
 
+    def _get_pubsub_queue_options(self) -> Tuple[Optional[int], PubSubQueuePolicy]:
+        return None, PubSubQueuePolicy.DROP_OLDEST
+
+    def _get_pubsub_callback_dispatch(self) -> Tuple[PubSubCallbackDispatch, int]:
+        return PubSubCallbackDispatch.INLINE, 1
+
 
 class GlideClientConfiguration(BaseClientConfiguration):
     """
@@ -236,6 +367,11 @@ class GlideClientConfiguration(BaseClientConfiguration):
         protocol (ProtocolVersion): The version of the RESP protocol to communicate with the server.
         pubsub_subscriptions (Optional[GlideClientConfiguration.PubSubSubscriptions]): Pubsub subscriptions to be used for the client.
                 Will be applied via SUBSCRIBE/PSUBSCRIBE commands during connection establishment.
+        compression (Optional[CompressionConfiguration]): Transparent compression of large values.
+                If not set, values are sent as-is.
+        serializer (Optional[Serializer]): The default serializer of the `glide.serialization.commands` functions.
+        decode_responses (bool): If `True`, strings in command responses are returned as `str` instead of `bytes`.
+            Strings that are not valid UTF-8 are still returned as `bytes`. Defaults to False.
     """
 
     class PubSubChannelModes(IntEnum):
@@ -255,18 +391,33 @@ class GlideClientConfiguration(BaseClientConfiguration):
 
         Attributes:
             channels_and_patterns (Dict[GlideClientConfiguration.PubSubChannelModes, Set[str]]):
-                Channels and patterns by modes.
+                Channels and patterns by modes. May be empty, for a client that only subscribes at runtime with the
+                other options of this configuration.
             callback (Optional[Callable[[CoreCommands.PubSubMsg, Any], None]]):
                 Optional callback to accept the incomming messages.
             context (Any):
                 Arbitrary context to pass to the callback.
+            max_queue_size (Optional[int]):
+                The maximum number of messages that are kept until they are consumed with `get_pubsub_message`,
+                `get_pubsub_messages` or `pubsub_messages`, or until they are passed to a callback that isn't invoked
+                inline. Unbounded if not set.
+            queue_policy (PubSubQueuePolicy):
+                What to do with incoming messages once the queue is full. Defaults to `PubSubQueuePolicy.DROP_OLDEST`.
+            callback_dispatch (PubSubCallbackDispatch):
+                How the callback is invoked. Defaults to `PubSubCallbackDispatch.INLINE`.
+            callback_workers (int):
+                The number of threads that invoke the callback with `PubSubCallbackDispatch.THREAD_POOL`. Defaults to 4.
         """
 
         channels_and_patterns: Dict[
             GlideClientConfiguration.PubSubChannelModes, Set[str]
-        ]
-        callback: Optional[Callable[[CoreCommands.PubSubMsg, Any], None]]
-        context: Any
+        ] = field(default_factory=dict)
+        callback: Optional[Callable[[CoreCommands.PubSubMsg, Any], None]] = None
+        context: Any = None
+        max_queue_size: Optional[int] = None
+        queue_policy: PubSubQueuePolicy = PubSubQueuePolicy.DROP_OLDEST
+        callback_dispatch: PubSubCallbackDispatch = PubSubCallbackDispatch.INLINE
+        callback_workers: int = 4
 
     def __init__(
         self,
@@ -280,6 +431,9 @@ class GlideClientConfiguration(BaseClientConfiguration):
         client_name: Optional[str] = None,
         protocol: ProtocolVersion = ProtocolVersion.RESP3,
         pubsub_subscriptions: Optional[PubSubSubscriptions] = None,
+        compression: Optional[CompressionConfiguration] = None,
+        serializer: Optional[Serializer] = None,
+        decode_responses: bool = False,
     ):
         super().__init__(
             addresses=addresses,
@@ -289,6 +443,9 @@ class GlideClientConfiguration(BaseClientConfiguration):
             request_timeout=request_timeout,
             client_name=client_name,
             protocol=protocol,
+            compression=compression,
+            serializer=serializer,
+            decode_responses=decode_responses,
         )
         self.reconnect_strategy = reconnect_strategy
         self.database_id = database_id
@@ -322,6 +479,25 @@ class GlideClientConfiguration(BaseClientConfiguration):
                 raise ConfigurationError(
                     "PubSub subscriptions with a context require a callback function to be configured."
                 )
+            if (
+                self.pubsub_subscriptions.max_queue_size is not None
+                and self.pubsub_subscriptions.max_queue_size <= 0
+            ):
+                raise ConfigurationError(
+                    "PubSub subscriptions max_queue_size must be a positive number."
+                )
+            if (
+                self.pubsub_subscriptions.callback_dispatch
+                != PubSubCallbackDispatch.INLINE
+                and not self.pubsub_subscriptions.callback
+            ):
+                raise ConfigurationError(
+                    "PubSub subscriptions with a callback dispatch mode require a callback function to be configured."
+                )
+            if self.pubsub_subscriptions.callback_workers <= 0:
+                raise ConfigurationError(
+                    "PubSub subscriptions callback_workers must be a positive number."
+                )
             for (
                 channel_type,
                 channels_patterns,
@@ -335,7 +511,9 @@ class GlideClientConfiguration(BaseClientConfiguration):
         return request
 
     def _is_pubsub_configured(self) -> bool:
-        return self.pubsub_subscriptions is not None
+        return self.pubsub_subscriptions is not None and any(
+            self.pubsub_subscriptions.channels_and_patterns.values()
+        )
 
     def _get_pubsub_callback_and_context(
         self,
@@ -344,6 +522,22 @@ class GlideClientConfiguration(BaseClientConfiguration):
             return self.pubsub_subscriptions.callback, self.pubsub_subscriptions.context
         return None, None
 
+    def _get_pubsub_queue_options(self) -> Tuple[Optional[int], PubSubQueuePolicy]:
+        if self.pubsub_subscriptions:
+            return (
+                self.pubsub_subscriptions.max_queue_size,
+                self.pubsub_subscriptions.queue_policy,
+            )
+        return None, PubSubQueuePolicy.DROP_OLDEST
+
+    def _get_pubsub_callback_dispatch(self) -> Tuple[PubSubCallbackDispatch, int]:
+        if self.pubsub_subscriptions:
+            return (
+                self.pubsub_subscriptions.callback_dispatch,
+                self.pubsub_subscriptions.callback_workers,
+            )
+        return PubSubCallbackDispatch.INLINE, 1
+
 
 class GlideClusterClientConfiguration(BaseClientConfiguration):
     """
@@ -371,6 +565,11 @@ class GlideClusterClientConfiguration(BaseClientConfiguration):
             Defaults to PeriodicChecksStatus.ENABLED_DEFAULT_CONFIGS.
         pubsub_subscriptions (Optional[GlideClusterClientConfiguration.PubSubSubscriptions]): Pubsub subscriptions to be used for the client.
             Will be applied via SUBSCRIBE/PSUBSCRIBE/SSUBSCRIBE commands during connection establishment.
+        compression (Optional[CompressionConfiguration]): Transparent compression of large values.
+            If not set, values are sent as-is.
+        serializer (Optional[Serializer]): The default serializer of the `glide.serialization.commands` functions.
+        decode_responses (bool): If `True`, strings in command responses are returned as `str` instead of `bytes`.
+            Strings that are not valid UTF-8 are still returned as `bytes`. Defaults to False.
 
     Notes:
         Currently, the reconnection strategy in cluster mode is not configurable, and exponential backoff
@@ -396,18 +595,33 @@ class GlideClusterClientConfiguration(BaseClientConfiguration):
 
         Attributes:
             channels_and_patterns (Dict[GlideClusterClientConfiguration.PubSubChannelModes, Set[str]]):
-                Channels and patterns by modes.
+                Channels and patterns by modes. May be empty, for a client that only subscribes at runtime with the
+                other options of this configuration.
             callback (Optional[Callable[[CoreCommands.PubSubMsg, Any], None]]):
                 Optional callback to accept the incoming messages.
             context (Any):
                 Arbitrary context to pass to the callback.
+            max_queue_size (Optional[int]):
+                The maximum number of messages that are kept until they are consumed with `get_pubsub_message`,
+                `get_pubsub_messages` or `pubsub_messages`, or until they are passed to a callback that isn't invoked
+                inline. Unbounded if not set.
+            queue_policy (PubSubQueuePolicy):
+                What to do with incoming messages once the queue is full. Defaults to `PubSubQueuePolicy.DROP_OLDEST`.
+            callback_dispatch (PubSubCallbackDispatch):
+                How the callback is invoked. Defaults to `PubSubCallbackDispatch.INLINE`.
+            callback_workers (int):
+                The number of threads that invoke the callback with `PubSubCallbackDispatch.THREAD_POOL`. Defaults to 4.
         """
 
         channels_and_patterns: Dict[
             GlideClusterClientConfiguration.PubSubChannelModes, Set[str]
-        ]
-        callback: Optional[Callable[[CoreCommands.PubSubMsg, Any], None]]
-        context: Any
+        ] = field(default_factory=dict)
+        callback: Optional[Callable[[CoreCommands.PubSubMsg, Any], None]] = None
+        context: Any = None
+        max_queue_size: Optional[int] = None
+        queue_policy: PubSubQueuePolicy = PubSubQueuePolicy.DROP_OLDEST
+        callback_dispatch: PubSubCallbackDispatch = PubSubCallbackDispatch.INLINE
+        callback_workers: int = 4
 
     def __init__(
         self,
@@ -422,6 +636,9 @@ class GlideClusterClientConfiguration(BaseClientConfiguration):
             PeriodicChecksStatus, PeriodicChecksManualInterval
         ] = PeriodicChecksStatus.ENABLED_DEFAULT_CONFIGS,
         pubsub_subscriptions: Optional[PubSubSubscriptions] = None,
+        compression: Optional[CompressionConfiguration] = None,
+        serializer: Optional[Serializer] = None,
+        decode_responses: bool = False,
     ):
         super().__init__(
             addresses=addresses,
@@ -431,6 +648,9 @@ class GlideClusterClientConfiguration(BaseClientConfiguration):
             request_timeout=request_timeout,
             client_name=client_name,
             protocol=protocol,
+            compression=compression,
+            serializer=serializer,
+            decode_responses=decode_responses,
         )
         self.periodic_checks = periodic_checks
         self.pubsub_subscriptions = pubsub_subscriptions
@@ -459,6 +679,25 @@ class GlideClusterClientConfiguration(BaseClientConfiguration):
                 raise ConfigurationError(
                     "PubSub subscriptions with a context require a callback function to be configured."
                 )
+            if (
+                self.pubsub_subscriptions.max_queue_size is not None
+                and self.pubsub_subscriptions.max_queue_size <= 0
+            ):
+                raise ConfigurationError(
+                    "PubSub subscriptions max_queue_size must be a positive number."
+                )
+            if (
+                self.pubsub_subscriptions.callback_dispatch
+                != PubSubCallbackDispatch.INLINE
+                and not self.pubsub_subscriptions.callback
+            ):
+                raise ConfigurationError(
+                    "PubSub subscriptions with a callback dispatch mode require a callback function to be configured."
+                )
+            if self.pubsub_subscriptions.callback_workers <= 0:
+                raise ConfigurationError(
+                    "PubSub subscriptions callback_workers must be a positive number."
+                )
             for (
                 channel_type,
                 channels_patterns,
@@ -472,7 +711,9 @@ class GlideClusterClientConfiguration(BaseClientConfiguration):
         return request
 
     def _is_pubsub_configured(self) -> bool:
-        return self.pubsub_subscriptions is not None
+        return self.pubsub_subscriptions is not None and any(
+            self.pubsub_subscriptions.channels_and_patterns.values()
+        )
 
     def _get_pubsub_callback_and_context(
         self,
@@ -480,3 +721,19 @@ class GlideClusterClientConfiguration(BaseClientConfiguration):
         if self.pubsub_subscriptions:
             return self.pubsub_subscriptions.callback, self.pubsub_subscriptions.context
         return None, None
+
+    def _get_pubsub_queue_options(self) -> Tuple[Optional[int], PubSubQueuePolicy]:
+        if self.pubsub_subscriptions:
+            return (
+                self.pubsub_subscriptions.max_queue_size,
+                self.pubsub_subscriptions.queue_policy,
+            )
+        return None, PubSubQueuePolicy.DROP_OLDEST
+
+    def _get_pubsub_callback_dispatch(self) -> Tuple[PubSubCallbackDispatch, int]:
+        if self.pubsub_subscriptions:
+            return (
+                self.pubsub_subscriptions.callback_dispatch,
+                self.pubsub_subscriptions.callback_workers,
+            )
+        return PubSubCallbackDispatch.INLINE, 1
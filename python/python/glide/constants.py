@@ -8,6 +8,14 @@ from glide.routes import ByAddressRoute, RandomNode, SlotIdRoute, SlotKeyRoute
 
 OK: str = "OK"
 DEFAULT_READ_BYTES_SIZE: int = pow(2, 16)
+# The maximum number of messages sent in a single request by `publish_many`
+PUBLISH_BATCH_SIZE: int = 1000
+# The maximum number of entries added to a stream in a single pipeline by `xadd_many`
+STREAM_ADD_BATCH_SIZE: int = 1000
+# The maximum number of members added by a single `ZADD` command of `zadd_arrays`
+SORTED_SET_ADD_BATCH_SIZE: int = 1000
+# The maximum number of `ZADD` commands sent in a single pipeline by `zadd_arrays`
+SORTED_SET_ADD_PIPELINE_SIZE: int = 100
 # Typing
 T = TypeVar("T")
 TOK = Literal["OK"]
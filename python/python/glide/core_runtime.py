@@ -0,0 +1,83 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+"""Configuration and metrics of the worker threads of the core, which serve the requests of the clients.
+
+Examples:
+
+    >>> from glide import core_runtime
+    >>> core_runtime.configure(worker_threads=4)  # Before the first client is created
+    >>> client = await GlideClient.create(config)
+    >>> core_runtime.stats()
+        [CoreWorkerStats(active_clients=1, received_requests=3), CoreWorkerStats(active_clients=0, received_requests=0), ...]
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from glide.exceptions import ConfigurationError
+
+from .glide import core_worker_stats, start_socket_listener_external
+
+_worker_threads: Optional[int] = None
+_started = False
+
+
+@dataclass(frozen=True)
+class CoreWorkerStats:
+    """
+    Metrics of a worker thread of the core.
+
+    Attributes:
+        active_clients (int): Number of clients that the worker serves.
+        received_requests (int): Number of requests that the worker received from its clients.
+    """
+
+    active_clients: int
+    received_requests: int
+
+
+def configure(worker_threads: Optional[int] = None) -> None:
+    """
+    Sets the number of worker threads of the core. The core is started by the first client that is created in the
+    process, so it must be configured before that.
+
+    Every client is served by a single worker thread: the one that serves the fewest clients when the client is
+    created. More worker threads let more clients send requests in parallel, at the cost of a thread each.
+
+    Args:
+        worker_threads (Optional[int]): The number of worker threads. Defaults to the number of CPUs.
+
+    Raises:
+        ConfigurationError: If the core was already started.
+    """
+    global _worker_threads
+    if worker_threads is not None and worker_threads < 1:
+        raise ValueError("`worker_threads` must be a positive number.")
+    if _started:
+        raise ConfigurationError(
+            "The core was already started, so its worker threads can't be configured."
+        )
+    _worker_threads = worker_threads
+
+
+def stats() -> List[CoreWorkerStats]:
+    """
+    Returns the metrics of every worker thread of the core, which show how the clients of the process are split
+    between the threads.
+
+    Returns:
+        List[CoreWorkerStats]: The metrics of every worker thread, or an empty list if the core wasn't started.
+    """
+    return [
+        CoreWorkerStats(active_clients, received_requests)
+        for active_clients, received_requests in core_worker_stats()
+    ]
+
+
+def start_socket_listener(init_callback: Callable) -> None:
+    global _started
+    _started = True
+    start_socket_listener_external(
+        init_callback=init_callback, worker_threads=_worker_threads
+    )
@@ -0,0 +1,5 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+
+from glide.counters.aggregator import CounterAggregator, CounterAggregatorStats
+
+__all__ = ["CounterAggregator", "CounterAggregatorStats"]
@@ -0,0 +1,316 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+"""Write-behind aggregation of counter increments.
+
+Examples:
+
+    >>> from glide.counters import CounterAggregator
+    >>> async with CounterAggregator(client) as counters:
+    ...     for request in requests:
+    ...         await counters.incrby("requests:total", 1)
+    ...         await counters.hincrby("requests:by_path", request.path, 1)
+    ...         await counters.zincrby("latency:by_path", request.latency, request.path)
+    >>> counters.stats.sent_commands
+        3  # The increments of every counter were merged into a single command.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from glide.constants import TEncodable
+from glide.exceptions import ClosingError, ConnectionError, TimeoutError
+from glide.glide_client import TGlideClient
+from glide.logger import Level as LogLevel
+from glide.logger import Logger
+from glide.protobuf.command_request_pb2 import RequestType
+
+DEFAULT_FLUSH_INTERVAL_MS = 100
+DEFAULT_MAX_PENDING_COUNTERS = 10000
+DEFAULT_BATCH_SIZE = 1000
+
+_Commands = List[Tuple[RequestType.ValueType, List[TEncodable]]]
+
+# Errors after which it's unknown whether the commands reached the server, so they are sent again
+_RETRIED_ERRORS = (ConnectionError, TimeoutError, ClosingError)
+
+
+@dataclass
+class CounterAggregatorStats:
+    """
+    Metrics of a `CounterAggregator`.
+
+    Attributes:
+        added_increments (int): Number of increments added to the aggregator.
+        sent_commands (int): Number of INCRBY, HINCRBY and ZINCRBY commands that were sent, each with the merged
+            increments of a counter.
+        flushes (int): Number of flushes that sent commands.
+        failed_batches (int): Number of batches of commands that failed to be sent, and were merged back into the
+            pending increments.
+        dropped_commands (int): Number of commands in batches that failed with a server error. They aren't sent
+            again, since the server applied all of them except the ones that failed.
+        start_time (float): `time.monotonic()` value when the aggregator was created.
+    """
+
+    added_increments: int = 0
+    sent_commands: int = 0
+    flushes: int = 0
+    failed_batches: int = 0
+    dropped_commands: int = 0
+    start_time: float = field(default_factory=time.monotonic)
+
+
+class CounterAggregator:
+    """
+    Aggregates increments of counters in-process, and writes them behind with pipelined INCRBY, HINCRBY and ZINCRBY
+    commands, so that a counter that is incremented many times between flushes costs a single command.
+
+    - Increments of the same counter (a key, a field of a hash, or a member of a sorted set) are merged as they are
+      added.
+    - Once started, the pending increments are flushed every `flush_interval_ms`, and as soon as `max_pending_counters`
+      distinct counters are pending.
+    - Commands are sent in pipelines of up to `batch_size` commands. In cluster mode, the commands of every pipeline
+      are grouped by slot and sent to their nodes concurrently.
+    - The number of pending counters is bounded by `max_pending_counters`: adding an increment to a new counter when
+      the bound is reached waits for a flush.
+
+    Increments are delivered at least once. A batch that fails with a connection error or a timeout is merged back
+    into the pending increments and sent again by the next flush, so a batch that failed after some of its commands
+    were applied increments their counters twice. A batch that fails with a server error, such as a counter that
+    isn't a number, is dropped: the server applied every other command of the pipeline, so only the commands that
+    failed are lost. `flush` and `close` raise the error of a failed batch.
+
+    Args:
+        client (TGlideClient): The client used to send the commands.
+        flush_interval_ms (int): The interval between flushes, in milliseconds. Defaults to 100.
+        max_pending_counters (int): The maximum number of distinct counters with pending increments. Defaults to 10000.
+        batch_size (int): The maximum number of commands in a single pipeline. Defaults to 1000.
+    """
+
+    def __init__(
+        self,
+        client: TGlideClient,
+        flush_interval_ms: int = DEFAULT_FLUSH_INTERVAL_MS,
+        max_pending_counters: int = DEFAULT_MAX_PENDING_COUNTERS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        if flush_interval_ms < 1:
+            raise ValueError("`flush_interval_ms` must be a positive number.")
+        if max_pending_counters < 1:
+            raise ValueError("`max_pending_counters` must be a positive number.")
+        if batch_size < 1:
+            raise ValueError("`batch_size` must be a positive number.")
+
+        self.client = client
+        self.stats = CounterAggregatorStats()
+        self._flush_interval = flush_interval_ms / 1000
+        self._max_pending_counters = max_pending_counters
+        self._batch_size = batch_size
+        self._increments: Dict[TEncodable, int] = {}
+        self._hash_increments: Dict[Tuple[TEncodable, TEncodable], int] = {}
+        self._sorted_set_increments: Dict[Tuple[TEncodable, TEncodable], float] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_needed = asyncio.Event()
+        self._closing = False
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> CounterAggregator:
+        self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    @property
+    def pending_counters(self) -> int:
+        """
+        The number of distinct counters with pending increments.
+        """
+        return (
+            len(self._increments)
+            + len(self._hash_increments)
+            + len(self._sorted_set_increments)
+        )
+
+    def start(self) -> None:
+        """
+        Starts flushing the pending increments periodically in a background task.
+        """
+        if self._closing:
+            raise RuntimeError("The aggregator was closed.")
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def incrby(self, key: TEncodable, amount: int) -> None:
+        """
+        Adds an increment of the integer stored at `key`, to be sent with INCRBY.
+
+        Args:
+            key (TEncodable): The key to increment.
+            amount (int): The amount to increment by.
+        """
+        await self._reserve(key in self._increments)
+        self._increments[key] = self._increments.get(key, 0) + amount
+        self._added()
+
+    async def hincrby(self, key: TEncodable, field: TEncodable, amount: int) -> None:
+        """
+        Adds an increment of the integer stored at `field` in the hash stored at `key`, to be sent with HINCRBY.
+
+        Args:
+            key (TEncodable): The key of the hash.
+            field (TEncodable): The field in the hash to increment.
+            amount (int): The amount to increment by.
+        """
+        counter = (key, field)
+        await self._reserve(counter in self._hash_increments)
+        self._hash_increments[counter] = self._hash_increments.get(counter, 0) + amount
+        self._added()
+
+    async def zincrby(
+        self, key: TEncodable, increment: float, member: TEncodable
+    ) -> None:
+        """
+        Adds an increment of the score of `member` in the sorted set stored at `key`, to be sent with ZINCRBY.
+
+        Args:
+            key (TEncodable): The key of the sorted set.
+            increment (float): The amount to increment the score by.
+            member (TEncodable): The member to increment the score of.
+        """
+        counter = (key, member)
+        await self._reserve(counter in self._sorted_set_increments)
+        self._sorted_set_increments[counter] = (
+            self._sorted_set_increments.get(counter, 0.0) + increment
+        )
+        self._added()
+
+    async def flush(self) -> int:
+        """
+        Sends all the pending increments, and waits for them to be applied.
+
+        Returns:
+            int: The number of commands that were sent.
+
+        Raises:
+            Exception: The error of the first batch of commands that failed. The increments of the batches that failed
+                with a connection error or a timeout are pending again, and will be sent by the next flush.
+        """
+        async with self._flush_lock:
+            commands = self._take_commands()
+            if not commands:
+                return 0
+            batches = [
+                commands[start : start + self._batch_size]
+                for start in range(0, len(commands), self._batch_size)
+            ]
+            results = await asyncio.gather(
+                *(self.client._execute_pipeline(batch) for batch in batches),
+                return_exceptions=True,
+            )
+            self.stats.flushes += 1
+            error: Optional[BaseException] = None
+            for batch, result in zip(batches, results):
+                if isinstance(result, _RETRIED_ERRORS):
+                    self.stats.failed_batches += 1
+                    self._restore(batch)
+                    error = error or result
+                elif isinstance(result, BaseException):
+                    # The pipeline isn't atomic, so its other commands were applied, and sending them again would
+                    # count them twice
+                    self.stats.dropped_commands += len(batch)
+                    Logger.log(
+                        LogLevel.WARN,
+                        "counter aggregator",
+                        f"Dropped a batch of {len(batch)} counter increments after a server error: {result}",
+                    )
+                    error = error or result
+                else:
+                    self.stats.sent_commands += len(batch)
+            if error is not None:
+                raise error
+            return len(commands)
+
+    async def close(self) -> None:
+        """
+        Stops the periodic flushes, and flushes the pending increments.
+
+        Raises:
+            Exception: The error of the final flush. The increments that failed with a connection error or a timeout
+                are still pending, and `flush` can be called again to retry them.
+        """
+        self._closing = True
+        if self._flush_task is not None:
+            # The task isn't cancelled, so that a flush in progress isn't interrupted after its increments were taken
+            self._flush_needed.set()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        await self.flush()
+
+    async def _reserve(self, existing_counter: bool) -> None:
+        # A new counter waits until there is room for it, so the number of pending counters stays bounded
+        while (
+            not existing_counter and self.pending_counters >= self._max_pending_counters
+        ):
+            await self.flush()
+
+    def _added(self) -> None:
+        self.stats.added_increments += 1
+        if self.pending_counters >= self._max_pending_counters:
+            self._flush_needed.set()
+
+    def _take_commands(self) -> _Commands:
+        commands: _Commands = []
+        for key, amount in self._increments.items():
+            if amount:
+                commands.append((RequestType.IncrBy, [key, str(amount)]))
+        for (key, hash_field), amount in self._hash_increments.items():
+            if amount:
+                commands.append((RequestType.HIncrBy, [key, hash_field, str(amount)]))
+        for (key, member), increment in self._sorted_set_increments.items():
+            if increment:
+                commands.append((RequestType.ZIncrBy, [key, repr(increment), member]))
+        self._increments = {}
+        self._hash_increments = {}
+        self._sorted_set_increments = {}
+        return commands
+
+    def _restore(self, commands: _Commands) -> None:
+        for request_type, args in commands:
+            if request_type == RequestType.IncrBy:
+                key, amount = args
+                self._increments[key] = self._increments.get(key, 0) + int(amount)
+            elif request_type == RequestType.HIncrBy:
+                key, hash_field, amount = args
+                counter = (key, hash_field)
+                self._hash_increments[counter] = self._hash_increments.get(
+                    counter, 0
+                ) + int(amount)
+            else:
+                key, increment, member = args
+                counter = (key, member)
+                self._sorted_set_increments[counter] = self._sorted_set_increments.get(
+                    counter, 0.0
+                ) + float(increment)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._flush_needed.wait(), timeout=self._flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_needed.clear()
+            if self._closing:
+                return
+            try:
+                await self.flush()
+            except Exception as e:
+                Logger.log(
+                    LogLevel.WARN,
+                    "counter aggregator",
+                    f"Failed to flush counter increments, they will be retried: {e}",
+                )
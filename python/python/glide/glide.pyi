@@ -1,11 +1,12 @@
 from collections.abc import Callable
 from enum import Enum
-from typing import List, Optional, Union
+from typing import Any, List, Optional, Tuple, Union
 
-from glide.constants import TResult
+from glide.constants import TEncodable, TResult
 
 DEFAULT_TIMEOUT_IN_MILLISECONDS: int = ...
 MAX_REQUEST_ARGS_LEN: int = ...
+MAX_INLINE_RESPONSE_LEN: int = ...
 
 class Level(Enum):
     Error = 0
@@ -26,8 +27,48 @@ class ClusterScanCursor:
     def get_cursor(self) -> str: ...
     def is_finished(self) -> bool: ...
 
-def start_socket_listener_external(init_callback: Callable) -> None: ...
-def value_from_pointer(pointer: int) -> TResult: ...
+class PubSubMsg:
+    message: TEncodable
+    channel: TEncodable
+    pattern: Optional[TEncodable]
+    def __init__(
+        self,
+        message: TEncodable,
+        channel: TEncodable,
+        pattern: Optional[TEncodable] = None,
+    ) -> None: ...
+
+class PubSubMessageDecoder:
+    def __init__(self) -> None: ...
+    def decode(self, pointer: int) -> Optional[PubSubMsg]: ...
+
+class HyperLogLog:
+    def __init__(self) -> None: ...
+    def merge(self, data: bytes) -> None: ...
+    def merge_hll(self, other: HyperLogLog) -> None: ...
+    def count(self) -> int: ...
+    def to_bytes(self) -> bytes: ...
+
+class HashDecoder:
+    def __init__(self, factory: Callable, fields: List[Tuple[str, str]]) -> None: ...
+    def decode_pointer(self, pointer: int, hmget: bool = False) -> Any: ...
+    def decode_pipeline_pointer(
+        self, pointer: int, hmget: bool = False
+    ) -> List[Any]: ...
+
+def start_socket_listener_external(
+    init_callback: Callable, worker_threads: Optional[int] = None
+) -> None: ...
+def core_worker_stats() -> List[Tuple[int, int]]: ...
+def value_from_pointer(pointer: int, decode_responses: bool = False) -> TResult: ...
+def drop_pointer(pointer: int) -> None: ...
+def stream_columns_from_pointer(
+    pointer: int, multiple_streams: bool = False, decode_responses: bool = False
+) -> Any: ...
+def sorted_set_arrays_from_pointer(
+    pointer: int, decode_responses: bool = False
+) -> Tuple[List[TEncodable], bytes]: ...
+def get_slot(key: bytes) -> int: ...
 def create_leaked_value(message: str) -> int: ...
 def create_leaked_bytes_vec(args_vec: List[bytes]) -> int: ...
 def py_init(level: Optional[Level], file_name: Optional[str]) -> Level: ...
@@ -3,15 +3,43 @@
 import asyncio
 import sys
 import threading
-from typing import Any, Dict, List, Optional, Tuple, Type, Union, cast
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
 import async_timeout
 from glide.async_commands.cluster_commands import ClusterCommands
 from glide.async_commands.command_args import ObjectType
 from glide.async_commands.core import CoreCommands
 from glide.async_commands.standalone_commands import StandaloneCommands
-from glide.config import BaseClientConfiguration
-from glide.constants import DEFAULT_READ_BYTES_SIZE, OK, TEncodable, TRequest, TResult
+from glide.config import (
+    BaseClientConfiguration,
+    ProtocolVersion,
+    PubSubCallbackDispatch,
+    PubSubQueuePolicy,
+)
+from glide.constants import (
+    DEFAULT_READ_BYTES_SIZE,
+    OK,
+    PUBLISH_BATCH_SIZE,
+    TOK,
+    TEncodable,
+    TRequest,
+    TResult,
+)
+from glide.core_runtime import start_socket_listener
 from glide.exceptions import (
     ClosingError,
     ConfigurationError,
@@ -26,15 +54,23 @@ from glide.protobuf.command_request_pb2 import Command, CommandRequest, RequestT
 from glide.protobuf.connection_request_pb2 import ConnectionRequest
 from glide.protobuf.response_pb2 import RequestErrorType, Response
 from glide.protobuf_codec import PartialMessageException, ProtobufCodec
+from glide.pubsub_dispatch import PubSubCallbackDispatcher
 from glide.routes import Route, set_protobuf_route
+from glide.timeouts import (
+    set_protobuf_deadline,
+    set_protobuf_timeout,
+    validate_timeout,
+)
 from typing_extensions import Self
 
 from .glide import (
     DEFAULT_TIMEOUT_IN_MILLISECONDS,
+    MAX_INLINE_RESPONSE_LEN,
     MAX_REQUEST_ARGS_LEN,
     ClusterScanCursor,
+    PubSubMessageDecoder,
     create_leaked_bytes_vec,
-    start_socket_listener_external,
+    drop_pointer,
     value_from_pointer,
 )
 
@@ -60,15 +96,38 @@ class BaseClient(CoreCommands):
         """
         self.config: BaseClientConfiguration = config
         self._available_futures: Dict[int, asyncio.Future] = {}
+        # Converters of response pointers, for requests whose responses aren't converted with `value_from_pointer`
+        self._response_converters: Dict[int, Callable[[int, bool], Any]] = {}
         self._available_callback_indexes: List[int] = list()
+        # Callback indexes of cancelled requests, whose cancellations were queued and whose responses weren't received
+        self._cancelling_callback_indexes: Set[int] = set()
+        # Callback indexes of cancelled requests, whose responses were received before their cancellations were queued
+        self._answered_cancelled_callback_indexes: Set[int] = set()
         self._buffered_requests: List[TRequest] = list()
+        # Deadlines of the buffered requests, which set their timeouts when they are written to the socket
+        self._request_deadlines: Dict[int, float] = {}
         self._writer_lock = threading.Lock()
         self.socket_path: Optional[str] = None
         self._reader_task: Optional[asyncio.Task] = None
         self._is_closed: bool = False
-        self._pubsub_futures: List[asyncio.Future] = []
+        self._pubsub_futures: Deque[asyncio.Future] = deque()
         self._pubsub_lock = threading.Lock()
-        self._pending_push_notifications: List[Response] = list()
+        self._pending_pubsub_messages: Deque[CoreCommands.PubSubMsg] = deque()
+        self._pubsub_queue_has_space = asyncio.Event()
+        self._dropped_pubsub_messages = 0
+        self._pubsub_message_decoder = PubSubMessageDecoder()
+        self._pubsub_callback_dispatcher = self._create_pubsub_callback_dispatcher()
+        self._has_runtime_subscriptions = False
+
+    def _create_pubsub_callback_dispatcher(self) -> Optional[PubSubCallbackDispatcher]:
+        callback, context = self.config._get_pubsub_callback_and_context()
+        dispatch, workers = self.config._get_pubsub_callback_dispatch()
+        if callback is None or dispatch == PubSubCallbackDispatch.INLINE:
+            return None
+        max_queue_size, queue_policy = self.config._get_pubsub_queue_options()
+        return PubSubCallbackDispatcher(
+            callback, context, dispatch, workers, max_queue_size, queue_policy
+        )
 
     @classmethod
     async def create(cls, config: BaseClientConfiguration) -> Self:
@@ -98,7 +157,7 @@ class BaseClient(CoreCommands):
                 self.socket_path = socket_path
                 loop.call_soon_threadsafe(init_future.set_result, True)
 
-        start_socket_listener_external(init_callback=init_callback)
+        start_socket_listener(init_callback=init_callback)
 
         # will log if the logger was created (wrapper or costumer) on info
         # level or higher
@@ -156,6 +215,10 @@ class BaseClient(CoreCommands):
                     pubsub_future.set_exception(ClosingError(""))
         finally:
             self._pubsub_lock.release()
+        # Release the reader loop if it is blocked on a full pubsub queue
+        self._pubsub_queue_has_space.set()
+        if self._pubsub_callback_dispatcher is not None:
+            self._pubsub_callback_dispatcher.close()
 
         self._writer.close()
         await self._writer.wait_closed()
@@ -171,6 +234,8 @@ class BaseClient(CoreCommands):
 
     async def _set_connection_configurations(self) -> None:
         conn_request = self._get_protobuf_conn_request()
+        # Small scalar replies are sent inline in the response, saving the FFI round trip of a leaked pointer
+        conn_request.inline_response_max_size = MAX_INLINE_RESPONSE_LEN
         response_future: asyncio.Future = self._get_future(0)
         await self._write_or_buffer_request(conn_request)
         await response_future
@@ -195,6 +260,12 @@ class BaseClient(CoreCommands):
         self._buffered_requests = list()
         b_arr = bytearray()
         for request in requests:
+            if isinstance(request, CommandRequest):
+                request_deadline = self._request_deadlines.pop(
+                    request.callback_idx, None
+                )
+                if request_deadline is not None:
+                    set_protobuf_deadline(request, request_deadline)
             ProtobufCodec.encode_delimited(b_arr, request)
         self._writer.write(b_arr)
         await self._writer.drain()
@@ -243,6 +314,7 @@ class BaseClient(CoreCommands):
         request_type: RequestType.ValueType,
         args: List[TEncodable],
         route: Optional[Route] = None,
+        response_converter: Optional[Callable[[int, bool], Any]] = None,
     ) -> TResult:
         if self._is_closed:
             raise ClosingError(
@@ -250,6 +322,8 @@ class BaseClient(CoreCommands):
             )
         request = CommandRequest()
         request.callback_idx = self._get_callback_index()
+        if response_converter is not None:
+            self._response_converters[request.callback_idx] = response_converter
         request.single_command.request_type = request_type
         request.single_command.args_array.args[:] = [
             bytes(elem, encoding="utf8") if isinstance(elem, str) else elem
@@ -269,14 +343,40 @@ class BaseClient(CoreCommands):
         self,
         commands: List[Tuple[RequestType.ValueType, List[TEncodable]]],
         route: Optional[Route] = None,
+        timeout: Optional[int] = None,
     ) -> List[TResult]:
         if self._is_closed:
             raise ClosingError(
                 "Unable to execute requests; the client is closed. Please create a new client."
             )
+        if timeout is not None:
+            validate_timeout(timeout)
         request = CommandRequest()
         request.callback_idx = self._get_callback_index()
-        transaction_commands = []
+        request.transaction.commands.extend(self._create_commands(commands))
+        set_protobuf_route(request, route)
+        return await self._write_request_await_response(request, timeout)
+
+    async def _execute_pipeline(
+        self,
+        commands: List[Tuple[RequestType.ValueType, List[TEncodable]]],
+        response_converter: Optional[Callable[[int, bool], Any]] = None,
+    ) -> List[TResult]:
+        if self._is_closed:
+            raise ClosingError(
+                "Unable to execute requests; the client is closed. Please create a new client."
+            )
+        request = CommandRequest()
+        request.callback_idx = self._get_callback_index()
+        if response_converter is not None:
+            self._response_converters[request.callback_idx] = response_converter
+        request.pipeline.commands.extend(self._create_commands(commands))
+        return await self._write_request_await_response(request)
+
+    def _create_commands(
+        self, commands: List[Tuple[RequestType.ValueType, List[TEncodable]]]
+    ) -> List[Command]:
+        protobuf_commands = []
         for requst_type, args in commands:
             command = Command()
             command.request_type = requst_type
@@ -287,10 +387,36 @@ class BaseClient(CoreCommands):
                 command.args_array.args[:] = encoded_args
             else:
                 command.args_vec_pointer = create_leaked_bytes_vec(encoded_args)
-            transaction_commands.append(command)
-        request.transaction.commands.extend(transaction_commands)
-        set_protobuf_route(request, route)
-        return await self._write_request_await_response(request)
+            protobuf_commands.append(command)
+        return protobuf_commands
+
+    async def _execute_publish_batch(
+        self,
+        channels_and_messages: List[Tuple[TEncodable, TEncodable]],
+        sharded: bool,
+    ) -> List[int]:
+        if self._is_closed:
+            raise ClosingError(
+                "Unable to execute requests; the client is closed. Please create a new client."
+            )
+        requests = []
+        for start in range(0, len(channels_and_messages), PUBLISH_BATCH_SIZE):
+            request = CommandRequest()
+            request.callback_idx = self._get_callback_index()
+            batch = channels_and_messages[start : start + PUBLISH_BATCH_SIZE]
+            request.publish_batch.channels[:] = [
+                self._encode_arg(channel) for channel, _ in batch
+            ]
+            request.publish_batch.messages[:] = [
+                self._encode_arg(message) for _, message in batch
+            ]
+            request.publish_batch.sharded = sharded
+            # The batch is sent right away, so that its callback index is taken before the next batch gets one
+            response_future = self._send_request(request)
+            requests.append(self._await_response(request, response_future))
+        # The batches are written to the socket together, and sent concurrently by the core
+        results = await asyncio.gather(*requests)
+        return [count for batch_counts in results for count in batch_counts]
 
     async def _execute_script(
         self,
@@ -323,13 +449,37 @@ class BaseClient(CoreCommands):
         set_protobuf_route(request, route)
         return await self._write_request_await_response(request)
 
-    async def get_pubsub_message(self) -> CoreCommands.PubSubMsg:
+    async def _execute_subscription_command(
+        self,
+        request_type: RequestType.ValueType,
+        channels_or_patterns: Optional[Set[TEncodable]],
+    ) -> TOK:
+        if self.config.protocol == ProtocolVersion.RESP2:
+            raise ConfigurationError(
+                "PubSub subscriptions require RESP3 protocol, but RESP2 was configured."
+            )
+        if request_type in (
+            RequestType.Subscribe,
+            RequestType.PSubscribe,
+            RequestType.SSubscribe,
+        ):
+            # Set before the subscription completes, since messages may arrive before its response
+            self._has_runtime_subscriptions = True
+        return cast(
+            TOK,
+            await self._execute_command(request_type, list(channels_or_patterns or [])),
+        )
+
+    def _is_pubsub_subscribed(self) -> bool:
+        return self.config._is_pubsub_configured() or self._has_runtime_subscriptions
+
+    def _check_pubsub_queue_consumable(self) -> None:
         if self._is_closed:
             raise ClosingError(
                 "Unable to execute requests; the client is closed. Please create a new client."
             )
 
-        if not self.config._is_pubsub_configured():
+        if not self._is_pubsub_subscribed():
             raise ConfigurationError(
                 "The operation will never complete since there was no pubsub subscriptions applied to the client."
             )
@@ -339,6 +489,9 @@ class BaseClient(CoreCommands):
                 "The operation will never complete since messages will be passed to the configured callback."
             )
 
+    async def get_pubsub_message(self) -> CoreCommands.PubSubMsg:
+        self._check_pubsub_queue_consumable()
+
         # locking might not be required
         response_future: asyncio.Future = asyncio.Future()
         try:
@@ -349,13 +502,56 @@ class BaseClient(CoreCommands):
             self._pubsub_lock.release()
         return await response_future
 
+    async def get_pubsub_messages(self, max_count: int) -> List[CoreCommands.PubSubMsg]:
+        if max_count <= 0:
+            raise ValueError("max_count must be a positive number.")
+        self._check_pubsub_queue_consumable()
+
+        with self._pubsub_lock:
+            messages = self._pop_pubsub_messages_safe(max_count)
+        if not messages:
+            messages.append(await self.get_pubsub_message())
+            with self._pubsub_lock:
+                messages.extend(self._pop_pubsub_messages_safe(max_count - 1))
+        return messages
+
+    async def pubsub_messages(
+        self, batch_size: int = 128
+    ) -> AsyncIterator[CoreCommands.PubSubMsg]:
+        while True:
+            try:
+                messages = deque(await self.get_pubsub_messages(batch_size))
+            except ClosingError:
+                if self._is_closed:
+                    return
+                raise
+            try:
+                while messages:
+                    yield messages.popleft()
+            finally:
+                # Messages of the batch that weren't handed out when the iteration stopped go back to the queue
+                if messages:
+                    with self._pubsub_lock:
+                        self._pending_pubsub_messages.extendleft(reversed(messages))
+                        self._complete_pubsub_futures_safe()
+
+    def get_dropped_pubsub_messages_count(self) -> int:
+        if self._pubsub_callback_dispatcher is not None:
+            return self._pubsub_callback_dispatcher.dropped_count
+        return self._dropped_pubsub_messages
+
+    def get_queued_pubsub_messages_count(self) -> int:
+        if self._pubsub_callback_dispatcher is not None:
+            return self._pubsub_callback_dispatcher.pending_count
+        return len(self._pending_pubsub_messages)
+
     def try_get_pubsub_message(self) -> Optional[CoreCommands.PubSubMsg]:
         if self._is_closed:
             raise ClosingError(
                 "Unable to execute requests; the client is closed. Please create a new client."
             )
 
-        if not self.config._is_pubsub_configured():
+        if not self._is_pubsub_subscribed():
             raise ConfigurationError(
                 "The operation will never succeed since there was no pubsbub subscriptions applied to the client."
             )
@@ -370,91 +566,111 @@ class BaseClient(CoreCommands):
         try:
             self._pubsub_lock.acquire()
             self._complete_pubsub_futures_safe()
-            while len(self._pending_push_notifications) and not msg:
-                push_notification = self._pending_push_notifications.pop(0)
-                msg = self._notification_to_pubsub_message_safe(push_notification)
+            if self._pending_pubsub_messages:
+                msg = self._pending_pubsub_messages.popleft()
+                self._pubsub_queue_has_space.set()
         finally:
             self._pubsub_lock.release()
         return msg
 
     def _cancel_pubsub_futures_with_exception_safe(self, exception: ConnectionError):
-        while len(self._pubsub_futures):
-            next_future = self._pubsub_futures.pop(0)
-            if not next_future.cancelled():
+        while self._pubsub_futures:
+            next_future = self._pubsub_futures.popleft()
+            if not next_future.done():
                 next_future.set_exception(exception)
 
-    def _notification_to_pubsub_message_safe(
-        self, response: Response
-    ) -> Optional[CoreCommands.PubSubMsg]:
-        pubsub_message = None
-        push_notification = cast(
-            Dict[str, Any], value_from_pointer(response.resp_pointer)
-        )
-        message_kind = push_notification["kind"]
-        if message_kind == "Disconnection":
-            ClientLogger.log(
-                LogLevel.WARN,
-                "disconnect notification",
-                "Transport disconnected, messages might be lost",
-            )
-        elif (
-            message_kind == "Message"
-            or message_kind == "PMessage"
-            or message_kind == "SMessage"
-        ):
-            values: List = push_notification["values"]
-            if message_kind == "PMessage":
-                pubsub_message = BaseClient.PubSubMsg(
-                    message=values[2], channel=values[1], pattern=values[0]
-                )
-            else:
-                pubsub_message = BaseClient.PubSubMsg(
-                    message=values[1], channel=values[0], pattern=None
-                )
-        elif (
-            message_kind == "PSubscribe"
-            or message_kind == "Subscribe"
-            or message_kind == "SSubscribe"
-            or message_kind == "Unsubscribe"
-            or message_kind == "PUnsubscribe"
-            or message_kind == "SUnsubscribe"
-        ):
-            pass
-        else:
-            ClientLogger.log(
-                LogLevel.WARN,
-                "unknown notification",
-                f"Unknown notification message: '{message_kind}'",
-            )
-
-        return pubsub_message
+    def _pop_pubsub_messages_safe(self, max_count: int) -> List[CoreCommands.PubSubMsg]:
+        pending_messages = self._pending_pubsub_messages
+        count = min(max_count, len(pending_messages))
+        messages = [pending_messages.popleft() for _ in range(count)]
+        if messages:
+            self._pubsub_queue_has_space.set()
+        return messages
 
     def _complete_pubsub_futures_safe(self):
-        while len(self._pending_push_notifications) and len(self._pubsub_futures):
-            next_push_notification = self._pending_push_notifications.pop(0)
-            pubsub_message = self._notification_to_pubsub_message_safe(
-                next_push_notification
-            )
-            if pubsub_message:
-                self._pubsub_futures.pop(0).set_result(pubsub_message)
-
-    async def _write_request_await_response(self, request: CommandRequest):
+        pending_messages = self._pending_pubsub_messages
+        pubsub_futures = self._pubsub_futures
+        while pending_messages and pubsub_futures:
+            next_future = pubsub_futures.popleft()
+            # Futures of consumers that were cancelled or timed out are skipped
+            if not next_future.done():
+                next_future.set_result(pending_messages.popleft())
+                self._pubsub_queue_has_space.set()
+
+    def _enqueue_pubsub_message_safe(
+        self,
+        pubsub_message: CoreCommands.PubSubMsg,
+        max_queue_size: Optional[int],
+        queue_policy: PubSubQueuePolicy,
+    ):
+        pending_messages = self._pending_pubsub_messages
+        if max_queue_size is not None and len(pending_messages) >= max_queue_size:
+            self._dropped_pubsub_messages += 1
+            if queue_policy == PubSubQueuePolicy.DROP_NEWEST:
+                return
+            # PubSubQueuePolicy.DROP_OLDEST, or PubSubQueuePolicy.BLOCK while the client is closing
+            pending_messages.popleft()
+        pending_messages.append(pubsub_message)
+        self._complete_pubsub_futures_safe()
+
+    async def _write_request_await_response(
+        self, request: CommandRequest, timeout: Optional[int] = None
+    ):
+        response_future = self._send_request(request, timeout)
+        return await self._await_response(request, response_future)
+
+    def _send_request(
+        self, request: CommandRequest, timeout: Optional[int] = None
+    ) -> asyncio.Future:
+        request_deadline = set_protobuf_timeout(request, timeout)
+        if request_deadline is not None:
+            self._request_deadlines[request.callback_idx] = request_deadline
         # Create a response future for this request and add it to the available
         # futures map
         response_future = self._get_future(request.callback_idx)
         self._create_write_task(request)
-        await response_future
+        return response_future
+
+    async def _await_response(
+        self, request: CommandRequest, response_future: asyncio.Future
+    ):
+        try:
+            await response_future
+        except asyncio.CancelledError:
+            if response_future.cancelled():
+                self._cancel_request(request.callback_idx)
+            raise
         return response_future.result()
 
+    def _cancel_request(self, callback_idx: int) -> None:
+        # The core drops the request if it's still being sent, and answers it either way. The callback index is reused
+        # only after both the answer was received and the cancellation was queued, so the cancellation can't reach a
+        # later request with the same index.
+        if callback_idx in self._answered_cancelled_callback_indexes:
+            # The response arrived after the future was cancelled, but before this cancellation
+            self._answered_cancelled_callback_indexes.discard(callback_idx)
+            self._available_callback_indexes.append(callback_idx)
+            return
+        if self._is_closed:
+            return
+        self._cancelling_callback_indexes.add(callback_idx)
+        request = CommandRequest()
+        request.callback_idx = callback_idx
+        request.cancel_request.SetInParent()
+        self._create_write_task(request)
+
     def _get_callback_index(self) -> int:
         try:
             return self._available_callback_indexes.pop()
         except IndexError:
-            # The list is empty
-            return len(self._available_futures)
+            # The list is empty, so every index is either in use or waiting for the cancellation of its request
+            return len(self._available_futures) + len(
+                self._answered_cancelled_callback_indexes
+            )
 
     async def _process_response(self, response: Response) -> None:
         res_future = self._available_futures.pop(response.callback_idx, None)
+        response_converter = self._response_converters.pop(response.callback_idx, None)
         if not res_future or response.HasField("closing_error"):
             err_msg = (
                 response.closing_error
@@ -465,17 +681,69 @@ class BaseClient(CoreCommands):
                 res_future.set_exception(ClosingError(err_msg))
             await self.close(err_msg)
             raise ClosingError(err_msg)
+        elif res_future.cancelled():
+            self._process_cancelled_response(response)
         else:
             self._available_callback_indexes.append(response.callback_idx)
-            if response.HasField("request_error"):
-                error_type = get_request_error_class(response.request_error.type)
-                res_future.set_exception(error_type(response.request_error.message))
-            elif response.HasField("resp_pointer"):
-                res_future.set_result(value_from_pointer(response.resp_pointer))
-            elif response.HasField("constant_response"):
-                res_future.set_result(OK)
+            self._set_response_result(res_future, response, response_converter)
+
+    def _process_cancelled_response(self, response: Response) -> None:
+        # Nobody awaits the response, so its value is freed without being converted
+        if response.HasField("resp_pointer"):
+            drop_pointer(response.resp_pointer)
+        if response.callback_idx in self._cancelling_callback_indexes:
+            self._cancelling_callback_indexes.discard(response.callback_idx)
+            self._available_callback_indexes.append(response.callback_idx)
+        else:
+            # The cancellation of the request wasn't queued yet, so the index is reused only after it is
+            self._answered_cancelled_callback_indexes.add(response.callback_idx)
+
+    def _set_response_result(
+        self,
+        res_future: asyncio.Future,
+        response: Response,
+        response_converter: Optional[Callable[[int, bool], Any]],
+    ) -> None:
+        if response.HasField("request_error"):
+            error_type = get_request_error_class(response.request_error.type)
+            res_future.set_exception(error_type(response.request_error.message))
+        elif response.HasField("resp_pointer"):
+            if response_converter is not None:
+                try:
+                    res_future.set_result(
+                        response_converter(
+                            response.resp_pointer, self.config.decode_responses
+                        )
+                    )
+                except Exception as e:
+                    res_future.set_exception(e)
             else:
-                res_future.set_result(None)
+                res_future.set_result(
+                    value_from_pointer(
+                        response.resp_pointer, self.config.decode_responses
+                    )
+                )
+        elif response.HasField("constant_response"):
+            res_future.set_result(OK)
+        elif response.HasField("int_response"):
+            res_future.set_result(response.int_response)
+        elif response.HasField("bytes_response"):
+            res_future.set_result(self._decode_bytes_response(response))
+        elif response.HasField("double_response"):
+            res_future.set_result(response.double_response)
+        elif response.HasField("bool_response"):
+            res_future.set_result(response.bool_response)
+        else:
+            res_future.set_result(None)
+
+    def _decode_bytes_response(self, response: Response) -> Union[bytes, str]:
+        value = response.bytes_response
+        if self.config.decode_responses:
+            try:
+                return value.decode()
+            except UnicodeDecodeError:
+                pass
+        return value
 
     async def _process_push(self, response: Response) -> None:
         if response.HasField("closing_error") or not response.HasField("resp_pointer"):
@@ -487,18 +755,30 @@ class BaseClient(CoreCommands):
             await self.close(err_msg)
             raise ClosingError(err_msg)
 
-        try:
-            self._pubsub_lock.acquire()
-            callback, context = self.config._get_pubsub_callback_and_context()
-            if callback:
-                pubsub_message = self._notification_to_pubsub_message_safe(response)
-                if pubsub_message:
-                    callback(pubsub_message, context)
+        # Notifications are converted as they arrive, so the queue only holds messages and no leaked values
+        pubsub_message = self._pubsub_message_decoder.decode(response.resp_pointer)
+        if pubsub_message is None:
+            return
+        callback, context = self.config._get_pubsub_callback_and_context()
+        if callback:
+            if self._pubsub_callback_dispatcher is not None:
+                await self._pubsub_callback_dispatcher.dispatch(pubsub_message)
             else:
-                self._pending_push_notifications.append(response)
-                self._complete_pubsub_futures_safe()
-        finally:
-            self._pubsub_lock.release()
+                callback(pubsub_message, context)
+            return
+
+        max_queue_size, queue_policy = self.config._get_pubsub_queue_options()
+        if max_queue_size is not None and queue_policy == PubSubQueuePolicy.BLOCK:
+            while (
+                len(self._pending_pubsub_messages) >= max_queue_size
+                and not self._is_closed
+            ):
+                self._pubsub_queue_has_space.clear()
+                await self._pubsub_queue_has_space.wait()
+        with self._pubsub_lock:
+            self._enqueue_pubsub_message_safe(
+                pubsub_message, max_queue_size, queue_policy
+            )
 
     async def _reader_loop(self) -> None:
         # Socket reader loop
@@ -560,7 +840,13 @@ class GlideClusterClient(BaseClient, ClusterCommands):
         if type is not None:
             request.cluster_scan.object_type = type.value
         response = await self._write_request_await_response(request)
-        return [ClusterScanCursor(bytes(response[0]).decode()), response[1]]
+        next_cursor = cast(Union[str, bytes], response[0])
+        return [
+            ClusterScanCursor(
+                next_cursor if isinstance(next_cursor, str) else next_cursor.decode()
+            ),
+            response[1],
+        ]
 
     def _get_protobuf_conn_request(self) -> ConnectionRequest:
         return self.config._create_a_protobuf_conn_request(cluster_mode=True)
@@ -0,0 +1,5 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+
+from glide.mapping.codec import HashCodec, codec_for
+
+__all__ = ["HashCodec", "codec_for"]
@@ -0,0 +1,163 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import dataclasses
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+from glide.constants import TEncodable
+
+from ..glide import HashDecoder
+
+T = TypeVar("T")
+
+_FIELD_ENCODERS: Dict[type, Tuple[str, Callable[[Any], TEncodable]]] = {
+    int: ("int", str),
+    # `repr` of a float round-trips exactly, and is also used for infinity and NaN
+    float: ("float", repr),
+    bool: ("bool", lambda value: "1" if value else "0"),
+    bytes: ("bytes", lambda value: value),
+    str: ("str", lambda value: value),
+}
+
+
+def _field_type(cls: type, name: str, annotation: Any) -> type:
+    # `Optional[X]` fields are omitted from the hash when they are `None`
+    if get_origin(annotation) is Union:
+        types = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(types) == 1:
+            annotation = types[0]
+    if annotation not in _FIELD_ENCODERS:
+        raise TypeError(
+            f"The field `{name}` of {cls.__name__} has the unsupported type {annotation!r}. "
+            "Supported types are int, float, bool, bytes and str, and Optional versions of them."
+        )
+    return annotation
+
+
+class HashCodec(Generic[T]):
+    """
+    Maps the instances of a dataclass or a `TypedDict` to hashes, with a field in the hash for every field of the
+    class. Use `codec_for` to get the codec of a class, which is compiled once from its type hints and cached.
+
+    Fields can be of the types int, float, bool, bytes and str, or `Optional` versions of them. Fields that are `None`
+    aren't written to the hash, and fields that are missing from a hash aren't passed to the class, so they get their
+    default values. Bools are stored as "1" and "0", and ints must fit in 64 bits.
+
+    Encoding builds the arguments of `HSET` directly from the fields, and decoding converts the replies of `HGETALL`
+    and `HMGET` to instances of the class in the Rust extension, without intermediate dicts of bytes.
+
+    Args:
+        cls (Type[T]): A dataclass or a `TypedDict`.
+
+    Examples:
+        >>> @dataclass
+        ... class User:
+        ...     name: str
+        ...     age: int
+        ...     email: Optional[str] = None
+        >>> codec_for(User).encode(User("Ann", 31))
+            [b'name', 'Ann', b'age', '31']
+    """
+
+    def __init__(self, cls: Type[T]):
+        hints = get_type_hints(cls)
+        if dataclasses.is_dataclass(cls):
+            names = [field.name for field in dataclasses.fields(cls)]
+            factory: Callable[..., Any] = cls
+            self._get_value: Callable[[Any, str], Any] = getattr
+        elif isinstance(cls, type) and issubclass(cls, dict):
+            names = list(hints)
+            factory = dict
+            self._get_value = dict.get
+        else:
+            raise TypeError(f"{cls!r} is neither a dataclass nor a TypedDict.")
+
+        self.cls = cls
+        self.fields = names
+        self._encoders: List[Tuple[str, bytes, Callable[[Any], TEncodable]]] = []
+        native_fields: List[Tuple[str, str]] = []
+        for name in names:
+            type_name, encoder = _FIELD_ENCODERS[_field_type(cls, name, hints[name])]
+            self._encoders.append((name, name.encode(), encoder))
+            native_fields.append((name, type_name))
+        self._decoder = HashDecoder(factory, native_fields)
+
+    def encode(self, value: T) -> List[TEncodable]:
+        """
+        Encodes the fields of `value` to the field-value pairs of `HSET`.
+
+        Args:
+            value (T): The instance to encode.
+
+        Returns:
+            List[TEncodable]: The names and values of the fields that aren't `None`, one after the other.
+        """
+        args: List[TEncodable] = []
+        for name, field, encoder in self._encoders:
+            field_value = self._get_value(value, name)
+            if field_value is not None:
+                args.append(field)
+                args.append(encoder(field_value))
+        return args
+
+    def hgetall_converter(self, pointer: int, decode_responses: bool) -> Any:
+        """
+        A response converter of `HGETALL`, which returns an instance of the class, or `None` if the hash doesn't
+        exist.
+        """
+        return self._decoder.decode_pointer(pointer)
+
+    def hmget_converter(self, pointer: int, decode_responses: bool) -> Any:
+        """
+        A response converter of `HMGET` of `fields`, which returns an instance of the class, or `None` if the hash
+        has none of the fields.
+        """
+        return self._decoder.decode_pointer(pointer, hmget=True)
+
+    def hgetall_pipeline_converter(self, pointer: int, decode_responses: bool) -> Any:
+        """
+        A response converter of a pipeline of `HGETALL` commands, which returns a list of the results.
+        """
+        return self._decoder.decode_pipeline_pointer(pointer)
+
+    def hmget_pipeline_converter(self, pointer: int, decode_responses: bool) -> Any:
+        """
+        A response converter of a pipeline of `HMGET` commands of `fields`, which returns a list of the results.
+        """
+        return self._decoder.decode_pipeline_pointer(pointer, hmget=True)
+
+
+_CODECS: Dict[type, HashCodec] = {}
+
+
+def codec_for(cls: Type[T]) -> HashCodec[T]:
+    """
+    Returns the `HashCodec` of `cls`, which is compiled on the first call for every class.
+
+    Args:
+        cls (Type[T]): A dataclass or a `TypedDict`.
+
+    Returns:
+        HashCodec[T]: The codec of `cls`.
+
+    Raises:
+        TypeError: If `cls` isn't a dataclass or a `TypedDict`, or one of its fields has an unsupported type.
+    """
+    codec = _CODECS.get(cls)
+    if codec is None:
+        codec = _CODECS[cls] = HashCodec(cls)
+    return codec
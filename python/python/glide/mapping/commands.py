@@ -0,0 +1,214 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+"""Commands that store instances of dataclasses and `TypedDict`s as hashes, and load them back.
+
+The fields of the classes are converted with their `HashCodec`, see `glide.mapping.HashCodec` for the supported
+types.
+
+    Examples:
+
+        >>> from glide.mapping import commands as mapped
+        >>> @dataclass
+        ... class User:
+        ...     name: str
+        ...     age: int
+        >>> await mapped.hset(client, "user:1", User("Ann", 31))
+            2
+        >>> await mapped.hmget(client, "user:1", User)
+            User(name='Ann', age=31)
+        >>> await mapped.hmget_many(client, ["user:1", "user:2"], User)
+            [User(name='Ann', age=31), None]
+"""
+
+from typing import Any, List, Mapping, Optional, Tuple, Type, TypeVar, cast
+
+from glide.constants import TEncodable
+from glide.glide_client import TGlideClient
+from glide.mapping.codec import codec_for
+from glide.protobuf.command_request_pb2 import RequestType
+
+T = TypeVar("T")
+
+
+async def hset(
+    client: TGlideClient,
+    key: TEncodable,
+    value: Any,
+    cls: Optional[Type[Any]] = None,
+) -> int:
+    """
+    Sets the fields of `value` in the hash stored at `key`. Fields of `value` that are `None` are left unchanged.
+
+    See https://valkey.io/commands/hset/ for more details.
+
+    Args:
+        client (TGlideClient): The client to execute the command.
+        key (TEncodable): The key of the hash.
+        value (Any): The instance to store.
+        cls (Optional[Type[Any]]): The class of `value`. Required for `TypedDict`s, whose instances are plain dicts.
+            Defaults to the type of `value`.
+
+    Returns:
+        int: The number of fields that were added to the hash.
+
+    Examples:
+        >>> await mapped.hset(client, "user:1", User("Ann", 31))
+            2
+    """
+    args = codec_for(cls or type(value)).encode(value)
+    return cast(int, await client._execute_command(RequestType.HSet, [key, *args]))
+
+
+async def hset_many(
+    client: TGlideClient,
+    values: Mapping[TEncodable, Any],
+    cls: Optional[Type[Any]] = None,
+) -> int:
+    """
+    Sets the fields of every value of `values` in the hash stored at its key, with pipelined `HSET` commands. In
+    cluster mode, the keys may map to different hash slots.
+
+    See `hset` for more details.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        values (Mapping[TEncodable, Any]): The instances to store, by the keys of their hashes.
+        cls (Optional[Type[Any]]): The class of the values. Defaults to the type of every value.
+
+    Returns:
+        int: The total number of fields that were added to the hashes.
+
+    Examples:
+        >>> await mapped.hset_many(client, {"user:1": User("Ann", 31), "user:2": User("Bob", 27)})
+            4
+    """
+    commands: List[Tuple[RequestType.ValueType, List[TEncodable]]] = [
+        (RequestType.HSet, [key, *codec_for(cls or type(value)).encode(value)])
+        for key, value in values.items()
+    ]
+    if not commands:
+        return 0
+    return sum(cast(List[int], await client._execute_pipeline(commands)))
+
+
+async def hgetall(client: TGlideClient, key: TEncodable, cls: Type[T]) -> Optional[T]:
+    """
+    Loads the hash stored at `key` as an instance of `cls`, with `HGETALL`. Fields of the hash that `cls` doesn't
+    have are ignored.
+
+    See https://valkey.io/commands/hgetall/ for more details.
+
+    Args:
+        client (TGlideClient): The client to execute the command.
+        key (TEncodable): The key of the hash.
+        cls (Type[T]): The dataclass or `TypedDict` to load the hash as.
+
+    Returns:
+        Optional[T]: The loaded instance, or `None` if `key` doesn't exist.
+
+    Examples:
+        >>> await mapped.hgetall(client, "user:1", User)
+            User(name='Ann', age=31)
+    """
+    return cast(
+        Optional[T],
+        await client._execute_command(
+            RequestType.HGetAll,
+            [key],
+            response_converter=codec_for(cls).hgetall_converter,
+        ),
+    )
+
+
+async def hmget(client: TGlideClient, key: TEncodable, cls: Type[T]) -> Optional[T]:
+    """
+    Loads the fields of `cls` from the hash stored at `key` as an instance of `cls`, with `HMGET`. Unlike `hgetall`,
+    only the fields of `cls` are fetched.
+
+    See https://valkey.io/commands/hmget/ for more details.
+
+    Args:
+        client (TGlideClient): The client to execute the command.
+        key (TEncodable): The key of the hash.
+        cls (Type[T]): The dataclass or `TypedDict` to load the hash as.
+
+    Returns:
+        Optional[T]: The loaded instance, or `None` if `key` doesn't exist or has none of the fields.
+
+    Examples:
+        >>> await mapped.hmget(client, "user:1", User)
+            User(name='Ann', age=31)
+    """
+    codec = codec_for(cls)
+    return cast(
+        Optional[T],
+        await client._execute_command(
+            RequestType.HMGet,
+            [key, *codec.fields],
+            response_converter=codec.hmget_converter,
+        ),
+    )
+
+
+async def hgetall_many(
+    client: TGlideClient, keys: List[TEncodable], cls: Type[T]
+) -> List[Optional[T]]:
+    """
+    Loads the hashes stored at `keys` as instances of `cls`, with pipelined `HGETALL` commands. In cluster mode, the
+    keys may map to different hash slots.
+
+    See `hgetall` for more details.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        keys (List[TEncodable]): The keys of the hashes.
+        cls (Type[T]): The dataclass or `TypedDict` to load the hashes as.
+
+    Returns:
+        List[Optional[T]]: The loaded instances, in the same order as `keys`, with `None` for missing keys.
+
+    Examples:
+        >>> await mapped.hgetall_many(client, ["user:1", "user:2"], User)
+            [User(name='Ann', age=31), None]
+    """
+    if not keys:
+        return []
+    return cast(
+        List[Optional[T]],
+        await client._execute_pipeline(
+            [(RequestType.HGetAll, [key]) for key in keys],
+            response_converter=codec_for(cls).hgetall_pipeline_converter,
+        ),
+    )
+
+
+async def hmget_many(
+    client: TGlideClient, keys: List[TEncodable], cls: Type[T]
+) -> List[Optional[T]]:
+    """
+    Loads the fields of `cls` from the hashes stored at `keys` as instances of `cls`, with pipelined `HMGET`
+    commands. In cluster mode, the keys may map to different hash slots.
+
+    See `hmget` for more details.
+
+    Args:
+        client (TGlideClient): The client to execute the commands.
+        keys (List[TEncodable]): The keys of the hashes.
+        cls (Type[T]): The dataclass or `TypedDict` to load the hashes as.
+
+    Returns:
+        List[Optional[T]]: The loaded instances, in the same order as `keys`, with `None` for missing keys.
+
+    Examples:
+        >>> await mapped.hmget_many(client, ["user:1", "user:2"], User)
+            [User(name='Ann', age=31), None]
+    """
+    if not keys:
+        return []
+    codec = codec_for(cls)
+    return cast(
+        List[Optional[T]],
+        await client._execute_pipeline(
+            [(RequestType.HMGet, [key, *codec.fields]) for key in keys],
+            response_converter=codec.hmget_pipeline_converter,
+        ),
+    )
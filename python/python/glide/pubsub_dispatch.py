@@ -0,0 +1,146 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, List, Optional, Set
+
+from glide.async_commands.core import CoreCommands
+from glide.config import PubSubCallbackDispatch, PubSubQueuePolicy
+from glide.logger import Level as LogLevel
+from glide.logger import Logger as ClientLogger
+
+
+class PubSubCallbackDispatcher:
+    """
+    Invokes the pubsub callback outside of the client's reader loop, see `PubSubCallbackDispatch`.
+
+    Messages are split into lanes by channel. The messages of a lane are passed to the callback one at a time, in the
+    order they were received, so the order of messages is kept per channel.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[CoreCommands.PubSubMsg, Any], None],
+        context: Any,
+        dispatch: PubSubCallbackDispatch,
+        workers: int,
+        max_queue_size: Optional[int],
+        queue_policy: PubSubQueuePolicy,
+    ):
+        self._callback = callback
+        self._context = context
+        self._max_queue_size = max_queue_size
+        self._queue_policy = queue_policy
+        lanes_count = workers if dispatch == PubSubCallbackDispatch.THREAD_POOL else 1
+        self._lanes: List[Deque[CoreCommands.PubSubMsg]] = [
+            deque() for _ in range(lanes_count)
+        ]
+        self._running_lanes = [False] * lanes_count
+        # Guards the lanes and the counters, which are shared with the worker threads
+        self._lock = threading.Lock()
+        self._loop = asyncio.get_running_loop()
+        self._has_space = asyncio.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if dispatch == PubSubCallbackDispatch.THREAD_POOL:
+            self._executor = ThreadPoolExecutor(
+                max_workers=lanes_count, thread_name_prefix="glide-pubsub"
+            )
+        self._tasks: Set[asyncio.Task] = set()
+        self._is_closed = False
+        self.pending_count = 0
+        self.dropped_count = 0
+
+    def _is_full(self) -> bool:
+        return (
+            self._max_queue_size is not None
+            and self.pending_count >= self._max_queue_size
+        )
+
+    async def dispatch(self, message: CoreCommands.PubSubMsg) -> None:
+        """
+        Queues `message` for the callback, waiting for space in the queue with `PubSubQueuePolicy.BLOCK`.
+        """
+        if self._queue_policy == PubSubQueuePolicy.BLOCK:
+            while self._is_full() and not self._is_closed:
+                self._has_space.clear()
+                await self._has_space.wait()
+        if self._is_closed:
+            return
+
+        lane_index = hash(message.channel) % len(self._lanes)
+        with self._lock:
+            lane = self._lanes[lane_index]
+            if self._is_full():
+                self.dropped_count += 1
+                if self._queue_policy == PubSubQueuePolicy.DROP_NEWEST:
+                    return
+                # PubSubQueuePolicy.DROP_OLDEST, or PubSubQueuePolicy.BLOCK while the client is closing
+                oldest_lane = lane if lane else max(self._lanes, key=len)
+                oldest_lane.popleft()
+                self.pending_count -= 1
+            lane.append(message)
+            self.pending_count += 1
+            if self._running_lanes[lane_index]:
+                return
+            self._running_lanes[lane_index] = True
+
+        if self._executor is not None:
+            self._executor.submit(self._drain_lane, lane_index)
+        else:
+            task = asyncio.create_task(self._run_batch())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self) -> None:
+        with self._lock:
+            batch = list(self._lanes[0])
+            self._lanes[0].clear()
+            self.pending_count -= len(batch)
+            # No message can be queued while the batch runs, since the callback doesn't yield to the event loop
+            self._running_lanes[0] = False
+        self._has_space.set()
+        for message in batch:
+            self._invoke_callback(message)
+
+    def _drain_lane(self, lane_index: int) -> None:
+        lane = self._lanes[lane_index]
+        while True:
+            with self._lock:
+                if not lane:
+                    self._running_lanes[lane_index] = False
+                    return
+                message = lane.popleft()
+                self.pending_count -= 1
+            if self._queue_policy == PubSubQueuePolicy.BLOCK:
+                self._notify_space_threadsafe()
+            self._invoke_callback(message)
+
+    def _notify_space_threadsafe(self) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._has_space.set)
+        except RuntimeError:
+            # The event loop was closed together with the client
+            pass
+
+    def _invoke_callback(self, message: CoreCommands.PubSubMsg) -> None:
+        try:
+            self._callback(message, self._context)
+        except Exception as e:
+            ClientLogger.log(
+                LogLevel.ERROR,
+                "pubsub callback",
+                f"The pubsub callback raised an exception: {e}",
+            )
+
+    def close(self) -> None:
+        """
+        Stops accepting messages. Messages that were already queued are still passed to the callback.
+        """
+        self._is_closed = True
+        self._has_space.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
@@ -0,0 +1,10 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+
+from glide.serialization.serializers import (
+    JsonSerializer,
+    MsgpackSerializer,
+    PickleSerializer,
+    Serializer,
+)
+
+__all__ = ["JsonSerializer", "MsgpackSerializer", "PickleSerializer", "Serializer"]
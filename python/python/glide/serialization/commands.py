@@ -0,0 +1,246 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+"""Commands that serialize values before they are written and deserialize them when they are read.
+
+The serializer of every function defaults to the `serializer` set on the client's configuration.
+
+    Examples:
+
+        >>> from glide.serialization import JsonSerializer
+        >>> from glide.serialization import commands as serialized
+        >>> config = GlideClientConfiguration(addresses, serializer=JsonSerializer())
+        >>> client = await GlideClient.create(config)
+        >>> await serialized.mset(client, {"user:1": {"name": "Ann"}, "user:2": {"name": "Bob"}})
+            'OK'
+        >>> await serialized.mget(client, ["user:1", "user:2", "user:3"])
+            [{'name': 'Ann'}, {'name': 'Bob'}, None]
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, cast
+
+from glide.async_commands.core import ExpirySet
+from glide.constants import TOK, TEncodable
+from glide.exceptions import ConfigurationError
+from glide.glide_client import TGlideClient
+from glide.serialization.serializers import Serializer, _to_bytes
+
+
+def _get_serializer(
+    client: TGlideClient, serializer: Optional[Serializer]
+) -> Serializer:
+    serializer = serializer or client.config.serializer
+    if serializer is None:
+        raise ConfigurationError(
+            "No serializer was given and the client is not configured with one."
+        )
+    return serializer
+
+
+async def set(
+    client: TGlideClient,
+    key: TEncodable,
+    value: Any,
+    expiry: Optional[ExpirySet] = None,
+    serializer: Optional[Serializer] = None,
+) -> Optional[TOK]:
+    """
+    Serializes `value` and sets it at `key`.
+
+    See https://valkey.io/commands/set/ for more details.
+
+    Args:
+        client (TGlideClient): The client to execute the command.
+        key (TEncodable): The key to store.
+        value (Any): The value to serialize and store.
+        expiry (Optional[ExpirySet]): Set expiry to the given key. See `GlideClient.set` for more details.
+        serializer (Optional[Serializer]): The serializer to use instead of the client's one.
+
+    Returns:
+        Optional[TOK]: OK if the value was set.
+
+    Examples:
+        >>> await serialized.set(client, "key", {"a": [1, 2]})
+            'OK'
+    """
+    return cast(
+        Optional[TOK],
+        await client.set(
+            key, _get_serializer(client, serializer).dumps(value), expiry=expiry
+        ),
+    )
+
+
+async def get(
+    client: TGlideClient,
+    key: TEncodable,
+    serializer: Optional[Serializer] = None,
+) -> Optional[Any]:
+    """
+    Gets the value at `key` and deserializes it.
+
+    See https://valkey.io/commands/get/ for more details.
+
+    Args:
+        client (TGlideClient): The client to execute the command.
+        key (TEncodable): The key to retrieve.
+        serializer (Optional[Serializer]): The serializer to use instead of the client's one.
+
+    Returns:
+        Optional[Any]: The deserialized value, or None if `key` doesn't exist.
+
+    Examples:
+        >>> await serialized.get(client, "key")
+            {'a': [1, 2]}
+    """
+    serializer = _get_serializer(client, serializer)
+    value = await client.get(key)
+    return None if value is None else serializer.loads(_to_bytes(value))
+
+
+async def mset(
+    client: TGlideClient,
+    key_value_map: Mapping[TEncodable, Any],
+    serializer: Optional[Serializer] = None,
+) -> TOK:
+    """
+    Serializes the values of `key_value_map` and sets them at their keys.
+
+    See https://valkey.io/commands/mset/ for more details.
+
+    Note:
+        In cluster mode, if keys in `key_value_map` map to different hash slots,
+        the command will be split across these slots and executed separately for each.
+
+    Args:
+        client (TGlideClient): The client to execute the command.
+        key_value_map (Mapping[TEncodable, Any]): A map of keys to the values to serialize and store.
+        serializer (Optional[Serializer]): The serializer to use instead of the client's one.
+
+    Returns:
+        TOK: A simple OK response.
+
+    Examples:
+        >>> await serialized.mset(client, {"key1": [1], "key2": {"a": 2}})
+            'OK'
+    """
+    encoded_values = _get_serializer(client, serializer).dumps_many(
+        key_value_map.values()
+    )
+    return await client.mset(dict(zip(key_value_map.keys(), encoded_values)))
+
+
+async def mget(
+    client: TGlideClient,
+    keys: List[TEncodable],
+    serializer: Optional[Serializer] = None,
+) -> List[Optional[Any]]:
+    """
+    Gets the values of all the given keys and deserializes them.
+
+    See https://valkey.io/commands/mget/ for more details.
+
+    Note:
+        In cluster mode, if keys in `keys` map to different hash slots,
+        the command will be split across these slots and executed separately for each.
+
+    Args:
+        client (TGlideClient): The client to execute the command.
+        keys (List[TEncodable]): A list of keys.
+        serializer (Optional[Serializer]): The serializer to use instead of the client's one.
+
+    Returns:
+        List[Optional[Any]]: The deserialized values, in the same order as `keys`. None is returned for keys that
+            don't exist.
+
+    Examples:
+        >>> await serialized.mget(client, ["key1", "key2", "missing"])
+            [[1], {'a': 2}, None]
+    """
+    serializer = _get_serializer(client, serializer)
+    return serializer.loads_many(await client.mget(keys))
+
+
+async def hset(
+    client: TGlideClient,
+    key: TEncodable,
+    field_value_map: Mapping[TEncodable, Any],
+    serializer: Optional[Serializer] = None,
+) -> int:
+    """
+    Serializes the values of `field_value_map` and sets them at their fields in the hash stored at `key`.
+
+    See https://valkey.io/commands/hset/ for more details.
+
+    Args:
+        client (TGlideClient): The client to execute the command.
+        key (TEncodable): The key of the hash.
+        field_value_map (Mapping[TEncodable, Any]): A map of fields to the values to serialize and store.
+        serializer (Optional[Serializer]): The serializer to use instead of the client's one.
+
+    Returns:
+        int: The number of fields that were added to the hash.
+
+    Examples:
+        >>> await serialized.hset(client, "my_hash", {"field": {"a": 1}, "field2": [1, 2]})
+            2
+    """
+    encoded_values = _get_serializer(client, serializer).dumps_many(
+        field_value_map.values()
+    )
+    return await client.hset(key, dict(zip(field_value_map.keys(), encoded_values)))
+
+
+async def hget(
+    client: TGlideClient,
+    key: TEncodable,
+    field: TEncodable,
+    serializer: Optional[Serializer] = None,
+) -> Optional[Any]:
+    """
+    Gets the value of `field` in the hash stored at `key` and deserializes it.
+
+    See https://valkey.io/commands/hget/ for more details.
+
+    Args:
+        client (TGlideClient): The client to execute the command.
+        key (TEncodable): The key of the hash.
+        field (TEncodable): The field in the hash.
+        serializer (Optional[Serializer]): The serializer to use instead of the client's one.
+
+    Returns:
+        Optional[Any]: The deserialized value, or None if `field` or `key` doesn't exist.
+
+    Examples:
+        >>> await serialized.hget(client, "my_hash", "field")
+            {'a': 1}
+    """
+    serializer = _get_serializer(client, serializer)
+    value = await client.hget(key, field)
+    return None if value is None else serializer.loads(_to_bytes(value))
+
+
+async def hgetall(
+    client: TGlideClient,
+    key: TEncodable,
+    serializer: Optional[Serializer] = None,
+) -> Dict[bytes, Any]:
+    """
+    Gets all the fields of the hash stored at `key` and deserializes their values.
+
+    See https://valkey.io/commands/hgetall/ for more details.
+
+    Args:
+        client (TGlideClient): The client to execute the command.
+        key (TEncodable): The key of the hash.
+        serializer (Optional[Serializer]): The serializer to use instead of the client's one.
+
+    Returns:
+        Dict[bytes, Any]: A map of the fields of the hash to their deserialized values.
+            If `key` doesn't exist, an empty map is returned.
+
+    Examples:
+        >>> await serialized.hgetall(client, "my_hash")
+            {b'field': {'a': 1}, b'field2': [1, 2]}
+    """
+    serializer = _get_serializer(client, serializer)
+    fields = cast(Dict[bytes, bytes], await client.hgetall(key))
+    return dict(zip(fields.keys(), serializer.loads_many(fields.values())))
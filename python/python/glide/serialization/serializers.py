@@ -0,0 +1,215 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import json
+import pickle
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+
+def _to_bytes(data: Union[str, bytes]) -> bytes:
+    # Clients configured with `decode_responses` return the encoded values that are valid UTF-8 as `str`
+    return data.encode() if isinstance(data, str) else data
+
+
+class Serializer(ABC):
+    """
+    Base class of the value serializers used by the `glide.serialization.commands` functions.
+
+    Serializers encode values with a per-type dispatch table that is resolved once per type and cached, so encoding
+    builtin types skips the generic code path. Converters for additional types can be added with `register`.
+
+    To implement a custom codec, subclass `Serializer` and implement `_encode` and `loads`.
+    """
+
+    def __init__(self) -> None:
+        self._converters: Dict[type, Callable[[Any], Any]] = {}
+        self._fast_paths: Dict[type, Callable[[Any], bytes]] = {}
+        self._dispatch_cache: Dict[type, Callable[[Any], bytes]] = {}
+
+    def register(self, value_type: type, converter: Callable[[Any], Any]) -> None:
+        """
+        Registers a converter for values of `value_type` and its subclasses.
+
+        Args:
+            value_type (type): The type of the values to convert.
+            converter (Callable[[Any], Any]): Converts a value to an object that the serializer can encode natively,
+                e.g. `str` for `decimal.Decimal` when serializing to JSON.
+
+        Examples:
+            >>> serializer = JsonSerializer()
+            >>> serializer.register(datetime, datetime.isoformat)
+        """
+        self._converters[value_type] = converter
+        self._dispatch_cache.clear()
+
+    @abstractmethod
+    def _encode(self, value: Any) -> bytes:
+        """
+        Encodes a value that has no fast path or registered converter.
+        """
+        ...
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        """
+        Decodes a value that was encoded with `dumps`.
+
+        Args:
+            data (bytes): The encoded value.
+
+        Returns:
+            Any: The decoded value.
+        """
+        ...
+
+    def _converting_encoder(
+        self, converter: Callable[[Any], Any]
+    ) -> Callable[[Any], bytes]:
+        encode = self._encode
+        return lambda value: encode(converter(value))
+
+    def _resolve_encoder(self, value_type: type) -> Callable[[Any], bytes]:
+        encoder: Callable[[Any], bytes] = self._encode
+        for base in value_type.__mro__:
+            converter = self._converters.get(base)
+            if converter is not None:
+                encoder = self._converting_encoder(converter)
+                break
+            fast_path = self._fast_paths.get(base)
+            if fast_path is not None:
+                encoder = fast_path
+                break
+        self._dispatch_cache[value_type] = encoder
+        return encoder
+
+    def dumps(self, value: Any) -> bytes:
+        """
+        Encodes a value.
+
+        Args:
+            value (Any): The value to encode.
+
+        Returns:
+            bytes: The encoded value.
+        """
+        encoder = self._dispatch_cache.get(type(value))
+        if encoder is None:
+            encoder = self._resolve_encoder(type(value))
+        return encoder(value)
+
+    def dumps_many(self, values: Iterable[Any]) -> List[bytes]:
+        """
+        Encodes multiple values.
+
+        Args:
+            values (Iterable[Any]): The values to encode.
+
+        Returns:
+            List[bytes]: The encoded values, in the same order as `values`.
+        """
+        dispatch_cache = self._dispatch_cache
+        resolve_encoder = self._resolve_encoder
+        encoded = []
+        for value in values:
+            value_type = type(value)
+            encoder = dispatch_cache.get(value_type)
+            if encoder is None:
+                encoder = resolve_encoder(value_type)
+            encoded.append(encoder(value))
+        return encoded
+
+    def loads_many(
+        self, values: Iterable[Optional[Union[str, bytes]]]
+    ) -> List[Optional[Any]]:
+        """
+        Decodes multiple values. `None` values, returned for missing keys or fields, are kept as-is. `str` values,
+        returned by clients configured with `decode_responses`, are encoded to UTF-8 before they are decoded.
+
+        Args:
+            values (Iterable[Optional[Union[str, bytes]]]): The encoded values.
+
+        Returns:
+            List[Optional[Any]]: The decoded values, in the same order as `values`.
+        """
+        loads = self.loads
+        return [None if value is None else loads(_to_bytes(value)) for value in values]
+
+
+class JsonSerializer(Serializer):
+    """
+    Serializes values to compact UTF-8 JSON.
+
+    Strings, numbers, booleans and `None` are encoded without going through the generic JSON encoder.
+
+    Args:
+        default (Optional[Callable[[Any], Any]]): Called for objects that can't otherwise be serialized, see `json.dumps`.
+            Prefer `register` for known types, as its result is cached per type.
+    """
+
+    def __init__(self, default: Optional[Callable[[Any], Any]] = None) -> None:
+        super().__init__()
+        self._encoder = json.JSONEncoder(
+            ensure_ascii=False, separators=(",", ":"), default=default
+        )
+        self._decoder = json.JSONDecoder()
+        encode = self._encoder.encode
+        self._fast_paths = {
+            str: lambda value: encode(value).encode(),
+            bool: lambda value: b"true" if value else b"false",
+            int: lambda value: int.__repr__(value).encode(),
+            type(None): lambda value: b"null",
+        }
+
+    def _encode(self, value: Any) -> bytes:
+        return self._encoder.encode(value).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return self._decoder.decode(data.decode())
+
+
+class PickleSerializer(Serializer):
+    """
+    Serializes values with `pickle`.
+
+    Warning:
+        Unpickling data from an untrusted source can execute arbitrary code. Only use this serializer when all the
+        clients that write to the keys are trusted.
+
+    Args:
+        protocol (int): The pickle protocol. Defaults to `pickle.HIGHEST_PROTOCOL`.
+    """
+
+    def __init__(self, protocol: int = pickle.HIGHEST_PROTOCOL) -> None:
+        super().__init__()
+        self._protocol = protocol
+
+    def _encode(self, value: Any) -> bytes:
+        return pickle.dumps(value, protocol=self._protocol)
+
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+class MsgpackSerializer(Serializer):
+    """
+    Serializes values with MessagePack. Requires the `msgpack` package.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        try:
+            import msgpack  # type: ignore
+        except ImportError as e:
+            raise ImportError(
+                "MsgpackSerializer requires the `msgpack` package. Install it with `pip install msgpack`."
+            ) from e
+        self._packer = msgpack.Packer(use_bin_type=True)
+        self._unpackb = msgpack.unpackb
+
+    def _encode(self, value: Any) -> bytes:
+        return self._packer.pack(value)
+
+    def loads(self, data: bytes) -> Any:
+        return self._unpackb(data, raw=False)
@@ -0,0 +1,9 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+
+from glide.streams.worker import (
+    ConsumerGroupWorker,
+    ConsumerGroupWorkerStats,
+    StreamEntry,
+)
+
+__all__ = ["ConsumerGroupWorker", "ConsumerGroupWorkerStats", "StreamEntry"]
@@ -0,0 +1,382 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+"""A worker that consumes a stream as a member of a consumer group.
+
+Examples:
+
+    >>> from glide.streams import ConsumerGroupWorker
+    >>> async def handle(entry):
+    ...     await process(entry.fields)
+    >>> async with ConsumerGroupWorker(client, "orders", "billing", "worker-1", handle) as worker:
+    ...     await asyncio.sleep(60)
+    >>> worker.stats.acked_entries
+        12000
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Mapping, Optional, Set, Union, cast
+
+from glide.async_commands.stream import StreamReadGroupOptions
+from glide.config import GlideClientConfiguration, GlideClusterClientConfiguration
+from glide.constants import TEncodable
+from glide.glide_client import TGlideClient
+from glide.logger import Level as LogLevel
+from glide.logger import Logger
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_BLOCK_MS = 1000
+DEFAULT_MAX_CONCURRENCY = 64
+DEFAULT_ACK_INTERVAL_MS = 50
+DEFAULT_CLAIM_IDLE_TIME_MS = 60000
+DEFAULT_CLAIM_INTERVAL_MS = 30000
+
+# The delay before reading again after a failed read, so that a lost connection isn't retried in a busy loop
+READ_ERROR_BACKOFF_SECONDS = 1.0
+
+
+@dataclass
+class StreamEntry:
+    """
+    An entry of the stream, passed to the handler of a `ConsumerGroupWorker`.
+
+    Attributes:
+        id (bytes): The ID of the entry.
+        fields (List[List[bytes]]): The field-value pairs of the entry, in the format `[[field, value], ...]`.
+        claimed (bool): True if the entry was claimed from another consumer of the group after it was idle for too
+            long, meaning a previous attempt to process it may have been partially completed.
+    """
+
+    id: bytes
+    fields: List[List[bytes]]
+    claimed: bool = False
+
+
+@dataclass
+class ConsumerGroupWorkerStats:
+    """
+    Progress metrics of a `ConsumerGroupWorker`.
+
+    Attributes:
+        read_entries (int): Number of new entries read with XREADGROUP.
+        claimed_entries (int): Number of stale pending entries claimed with XAUTOCLAIM.
+        processed_entries (int): Number of entries the handler completed successfully.
+        failed_entries (int): Number of entries the handler raised an exception for. These entries stay pending, and
+            are claimed again once they are idle for longer than `claim_idle_time_ms`.
+        acked_entries (int): Number of entries acknowledged with XACK.
+        ack_calls (int): Number of XACK calls sent.
+        start_time (float): `time.monotonic()` value when the worker was started.
+    """
+
+    read_entries: int = 0
+    claimed_entries: int = 0
+    processed_entries: int = 0
+    failed_entries: int = 0
+    acked_entries: int = 0
+    ack_calls: int = 0
+    start_time: float = field(default_factory=time.monotonic)
+
+    def entries_per_second(self) -> float:
+        """
+        Returns the average number of entries acknowledged per second.
+        """
+        elapsed = time.monotonic() - self.start_time
+        return self.acked_entries / elapsed if elapsed > 0 else 0.0
+
+
+class ConsumerGroupWorker:
+    """
+    Consumes a stream as the consumer `consumer_name` of the consumer group `group_name`, passing every entry to an
+    async handler.
+
+    - New entries are read in batches with `XREADGROUP COUNT batch_size BLOCK block_ms`. Blocking commands hold the
+      connection they are sent on, so the reads are sent through a dedicated client, leaving `client` free for other
+      requests.
+    - Up to `max_concurrency` entries are handled at a time.
+    - Entries are acknowledged once their handler completes. The acknowledgements are coalesced, and sent with a single
+      XACK call at most every `ack_interval_ms`, or as soon as `batch_size` entries are waiting.
+    - Every `claim_interval_ms`, entries of the group that were pending for longer than `claim_idle_time_ms`, e.g.
+      because their consumer crashed or their handler failed, are claimed with XAUTOCLAIM and handled again.
+
+    Entries are handled at least once: an entry whose handler completed may be handled again if the worker stops
+    before its acknowledgement was sent.
+
+    The consumer group must exist before the worker is started, see `xgroup_create`.
+
+    Args:
+        client (TGlideClient): The client used to acknowledge and claim entries.
+        stream (TEncodable): The key of the stream.
+        group_name (TEncodable): The consumer group name.
+        consumer_name (TEncodable): The consumer name. It is created in the group if it doesn't exist.
+        handler (Callable[[StreamEntry], Awaitable[None]]): Handles an entry. The entry is acknowledged if the handler
+            returns, and stays pending if it raises an exception.
+        batch_size (int): The maximum number of entries read, claimed or acknowledged by a single call. Defaults to 100.
+        block_ms (int): How long a read waits for new entries, in milliseconds. Also bounds how long `stop` waits
+            for the current read. Defaults to 1000.
+        max_concurrency (int): The maximum number of entries handled at a time. Defaults to 64.
+        ack_interval_ms (int): The maximum time an acknowledgement is delayed in order to be coalesced with others,
+            in milliseconds. Defaults to 50.
+        claim_idle_time_ms (Optional[int]): The time after which a pending entry is considered stale and claimed, in
+            milliseconds. If None, stale entries are not claimed. Defaults to 60000.
+        claim_interval_ms (int): The interval between sweeps for stale entries, in milliseconds. Defaults to 30000.
+        blocking_client (Optional[TGlideClient]): The client used for the blocking reads. It must not be used for other
+            requests while the worker is running. If not set, a client with the configuration of `client` is created
+            when the worker is started, and closed when it is stopped.
+    """
+
+    def __init__(
+        self,
+        client: TGlideClient,
+        stream: TEncodable,
+        group_name: TEncodable,
+        consumer_name: TEncodable,
+        handler: Callable[[StreamEntry], Awaitable[None]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        block_ms: int = DEFAULT_BLOCK_MS,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        ack_interval_ms: int = DEFAULT_ACK_INTERVAL_MS,
+        claim_idle_time_ms: Optional[int] = DEFAULT_CLAIM_IDLE_TIME_MS,
+        claim_interval_ms: int = DEFAULT_CLAIM_INTERVAL_MS,
+        blocking_client: Optional[TGlideClient] = None,
+    ):
+        if batch_size < 1:
+            raise ValueError("`batch_size` must be a positive number.")
+        if block_ms < 1:
+            raise ValueError("`block_ms` must be a positive number.")
+        if max_concurrency < 1:
+            raise ValueError("`max_concurrency` must be a positive number.")
+        if ack_interval_ms < 1:
+            raise ValueError("`ack_interval_ms` must be a positive number.")
+        if claim_idle_time_ms is not None and claim_idle_time_ms < 1:
+            raise ValueError("`claim_idle_time_ms` must be a positive number.")
+        if claim_interval_ms < 1:
+            raise ValueError("`claim_interval_ms` must be a positive number.")
+
+        self.client = client
+        self.stream = stream
+        self.group_name = group_name
+        self.consumer_name = consumer_name
+        self.stats = ConsumerGroupWorkerStats()
+        self._handler = handler
+        self._batch_size = batch_size
+        self._block_ms = block_ms
+        self._ack_interval = ack_interval_ms / 1000
+        self._claim_idle_time_ms = claim_idle_time_ms
+        self._claim_interval = claim_interval_ms / 1000
+        self._blocking_client = blocking_client
+        self._owns_blocking_client = blocking_client is None
+        self._handler_slots = asyncio.Semaphore(max_concurrency)
+        self._handler_tasks: Set[asyncio.Task] = set()
+        self._pending_acks: List[bytes] = []
+        self._ack_batch_ready = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._handlers_drained = False
+        self._read_task: Optional[asyncio.Task] = None
+        self._claim_task: Optional[asyncio.Task] = None
+        self._ack_task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> ConsumerGroupWorker:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.stop()
+
+    @property
+    def is_running(self) -> bool:
+        """
+        True if the worker was started and wasn't stopped.
+        """
+        return self._read_task is not None and not self._stopping.is_set()
+
+    async def start(self) -> None:
+        """
+        Starts reading, handling, acknowledging and claiming entries in background tasks.
+        """
+        if self._read_task is not None:
+            raise RuntimeError("The worker was already started.")
+        if self._blocking_client is None:
+            self._blocking_client = await type(self.client).create(
+                _get_blocking_client_config(self.client)
+            )
+        self.stats = ConsumerGroupWorkerStats()
+        self._stopping.clear()
+        self._handlers_drained = False
+        self._read_task = asyncio.create_task(self._read_loop())
+        self._ack_task = asyncio.create_task(self._ack_loop())
+        if self._claim_idle_time_ms is not None:
+            self._claim_task = asyncio.create_task(self._claim_loop())
+
+    async def stop(self) -> None:
+        """
+        Stops the worker. Waits for the current read to return, for the handlers of the entries that were already read
+        or claimed to complete, and for their acknowledgements to be sent.
+        """
+        if self._read_task is None:
+            return
+        self._stopping.set()
+        await asyncio.gather(
+            *[task for task in (self._read_task, self._claim_task) if task],
+            return_exceptions=True,
+        )
+        while self._handler_tasks:
+            await asyncio.gather(*self._handler_tasks, return_exceptions=True)
+        self._handlers_drained = True
+        self._ack_batch_ready.set()
+        await asyncio.gather(cast(asyncio.Task, self._ack_task), return_exceptions=True)
+        self._read_task = self._claim_task = self._ack_task = None
+        if self._owns_blocking_client and self._blocking_client is not None:
+            await self._blocking_client.close()
+            self._blocking_client = None
+
+    async def _read_loop(self) -> None:
+        blocking_client = cast(TGlideClient, self._blocking_client)
+        options = StreamReadGroupOptions(
+            block_ms=self._block_ms, count=self._batch_size
+        )
+        while not self._stopping.is_set():
+            try:
+                result = await blocking_client.xreadgroup(
+                    {self.stream: ">"}, self.group_name, self.consumer_name, options
+                )
+            except Exception as e:
+                Logger.log(
+                    LogLevel.WARN,
+                    "stream worker",
+                    f"Failed to read from the consumer group: {e}",
+                )
+                await self._wait_unless_stopping(READ_ERROR_BACKOFF_SECONDS)
+                continue
+            if not result:
+                continue
+            entries = _to_stream_entries(next(iter(result.values())), claimed=False)
+            self.stats.read_entries += len(entries)
+            await self._dispatch(entries)
+
+    async def _claim_loop(self) -> None:
+        while not self._stopping.is_set():
+            await self._wait_unless_stopping(self._claim_interval)
+            if self._stopping.is_set():
+                return
+            try:
+                await self._claim_stale_entries()
+            except Exception as e:
+                Logger.log(
+                    LogLevel.WARN,
+                    "stream worker",
+                    f"Failed to claim stale entries: {e}",
+                )
+
+    async def _claim_stale_entries(self) -> None:
+        start: TEncodable = "0-0"
+        while not self._stopping.is_set():
+            result = await self.client.xautoclaim(
+                self.stream,
+                self.group_name,
+                self.consumer_name,
+                cast(int, self._claim_idle_time_ms),
+                start,
+                self._batch_size,
+            )
+            entries = _to_stream_entries(
+                cast(Mapping[bytes, Optional[List[List[bytes]]]], result[1]),
+                claimed=True,
+            )
+            self.stats.claimed_entries += len(entries)
+            await self._dispatch(entries)
+            start = cast(bytes, result[0])
+            if start in (b"0-0", "0-0"):
+                return
+
+    async def _dispatch(self, entries: List[StreamEntry]) -> None:
+        for entry in entries:
+            await self._handler_slots.acquire()
+            task = asyncio.create_task(self._handle(entry))
+            self._handler_tasks.add(task)
+            task.add_done_callback(self._handler_tasks.discard)
+
+    async def _handle(self, entry: StreamEntry) -> None:
+        try:
+            await self._handler(entry)
+        except Exception as e:
+            self.stats.failed_entries += 1
+            Logger.log(
+                LogLevel.WARN,
+                "stream worker",
+                f"The handler failed on entry {entry.id!r}, it will be claimed again after it is idle: {e}",
+            )
+            return
+        finally:
+            self._handler_slots.release()
+        self.stats.processed_entries += 1
+        self._pending_acks.append(entry.id)
+        if len(self._pending_acks) >= self._batch_size:
+            self._ack_batch_ready.set()
+
+    async def _ack_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._ack_batch_ready.wait(), timeout=self._ack_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._ack_batch_ready.clear()
+            if self._handlers_drained:
+                while self._pending_acks:
+                    await self._send_acks()
+                return
+            await self._send_acks()
+
+    async def _send_acks(self) -> None:
+        if not self._pending_acks:
+            return
+        ids = self._pending_acks[: self._batch_size]
+        del self._pending_acks[: self._batch_size]
+        try:
+            acked = await self.client.xack(
+                self.stream, self.group_name, cast(List[TEncodable], ids)
+            )
+        except Exception as e:
+            Logger.log(
+                LogLevel.WARN,
+                "stream worker",
+                f"Failed to acknowledge {len(ids)} entries, they will be claimed again after they are idle: {e}",
+            )
+            return
+        self.stats.ack_calls += 1
+        self.stats.acked_entries += acked
+
+    async def _wait_unless_stopping(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+
+def _get_blocking_client_config(
+    client: TGlideClient,
+) -> Union[GlideClientConfiguration, GlideClusterClientConfiguration]:
+    config = copy.copy(
+        cast(
+            Union[GlideClientConfiguration, GlideClusterClientConfiguration],
+            client.config,
+        )
+    )
+    # The blocking client only reads from the stream, so it doesn't subscribe to the channels of `client`
+    config.pubsub_subscriptions = None
+    return config
+
+
+def _to_stream_entries(
+    entries: Mapping[bytes, Optional[List[List[bytes]]]], claimed: bool
+) -> List[StreamEntry]:
+    # Entries that were deleted from the stream while they were pending have no fields
+    return [
+        StreamEntry(entry_id, fields, claimed)
+        for entry_id, fields in entries.items()
+        if fields is not None
+    ]
@@ -0,0 +1,129 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+"""Per-request timeouts, which override the `request_timeout` of the client configuration.
+
+Examples:
+
+    >>> from glide import deadline, request_timeout
+    >>> with request_timeout(20):
+    ...     # Every request sent in this block times out after 20 milliseconds
+    ...     await client.get("flags:checkout")
+    >>> with deadline(500):
+    ...     # The requests sent in this block share a budget of 500 milliseconds
+    ...     user = await client.hgetall("user:1")
+    ...     orders = await client.lrange("orders:1", 0, -1)
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from glide.protobuf.command_request_pb2 import CommandRequest
+
+
+@dataclass(frozen=True)
+class _TimeoutScope:
+    timeout_ms: Optional[int] = None
+    # A `time.monotonic()` value
+    deadline: Optional[float] = None
+
+
+_current_scope: ContextVar[_TimeoutScope] = ContextVar(
+    "glide_timeout_scope", default=_TimeoutScope()
+)
+
+
+def validate_timeout(timeout_ms: int) -> None:
+    if timeout_ms < 1:
+        raise ValueError("`timeout_ms` must be a positive number.")
+
+
+@contextmanager
+def request_timeout(timeout_ms: int) -> Iterator[None]:
+    """
+    Sets the timeout of every request sent in the block, instead of the `request_timeout` of the client. Unlike the
+    client's timeout, it also applies to blocking commands, such as `BLPOP`, which otherwise wait for their own
+    timeout.
+
+    The timeout is scoped to the current task and to the tasks that it creates in the block, so concurrent tasks
+    can use different timeouts with the same client.
+
+    Args:
+        timeout_ms (int): The timeout of every request, in milliseconds.
+
+    Examples:
+        >>> with request_timeout(20):
+        ...     await client.get("flags:checkout")
+    """
+    validate_timeout(timeout_ms)
+    scope = _current_scope.get()
+    token = _current_scope.set(_TimeoutScope(timeout_ms, scope.deadline))
+    try:
+        yield
+    finally:
+        _current_scope.reset(token)
+
+
+@contextmanager
+def deadline(timeout_ms: int) -> Iterator[None]:
+    """
+    Sets a deadline `timeout_ms` milliseconds from now for all the requests sent in the block. Every request times out
+    at the deadline: the time that it spent queued in the client before it was sent to the core, and the time of the
+    requests before it, are subtracted from its timeout. A request whose deadline passed before it reached the core
+    fails with a `TimeoutError` without being sent to the server.
+
+    A deadline inside the block of another deadline can't extend it. Inside the block of a `request_timeout`, every
+    request times out at the earlier of the two.
+
+    Args:
+        timeout_ms (int): The time until the deadline, in milliseconds.
+
+    Examples:
+        >>> with deadline(500):
+        ...     user = await client.hgetall("user:1")
+        ...     orders = await client.lrange("orders:1", 0, -1)
+    """
+    validate_timeout(timeout_ms)
+    scope = _current_scope.get()
+    request_deadline = time.monotonic() + timeout_ms / 1000
+    if scope.deadline is not None:
+        request_deadline = min(request_deadline, scope.deadline)
+    token = _current_scope.set(_TimeoutScope(scope.timeout_ms, request_deadline))
+    try:
+        yield
+    finally:
+        _current_scope.reset(token)
+
+
+def set_protobuf_timeout(
+    request: CommandRequest, timeout_ms: Optional[int] = None
+) -> Optional[float]:
+    """
+    Sets the timeout of `request` to `timeout_ms`, which must be valid, or to the timeout of the current
+    `request_timeout` block.
+
+    Returns:
+        Optional[float]: The deadline of the request in the current `deadline` block, to be applied with
+            `set_protobuf_deadline` when the request is written to the socket.
+    """
+    scope = _current_scope.get()
+    if timeout_ms is None:
+        timeout_ms = scope.timeout_ms
+    if timeout_ms is not None:
+        request.timeout_ms = timeout_ms
+    return scope.deadline
+
+
+def set_protobuf_deadline(request: CommandRequest, request_deadline: float) -> None:
+    """
+    Sets the timeout of `request` to the time remaining until `request_deadline`, or to 0 if it passed, in which case
+    the core fails the request without sending it.
+    """
+    remaining_ms = max(0, math.ceil((request_deadline - time.monotonic()) * 1000))
+    if request.HasField("timeout_ms"):
+        remaining_ms = min(remaining_ms, request.timeout_ms)
+    request.timeout_ms = remaining_ms
@@ -0,0 +1,5 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+
+from glide.tools.migration import MigrationCheckpoint, MigrationStats, migrate
+
+__all__ = ["MigrationCheckpoint", "MigrationStats", "migrate"]
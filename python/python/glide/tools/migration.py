@@ -0,0 +1,304 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+"""Live key migration between two deployments.
+
+Examples:
+
+    >>> from glide.tools import migrate
+    >>> stats = await migrate(source_client, target_client, "user:*", max_inflight=512, rate_limit=20000)
+    >>> print(stats.migrated_keys, stats.keys_per_second())
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union, cast
+
+from glide.constants import TEncodable
+from glide.exceptions import RequestError
+from glide.glide_client import GlideClient, GlideClusterClient, TGlideClient
+from glide.logger import Level as LogLevel
+from glide.logger import Logger
+from glide.routes import ByAddressRoute, RandomNode
+
+STANDALONE_NODE = "standalone"
+"""The checkpoint node name used when the source is a standalone client."""
+
+DEFAULT_SCAN_COUNT = 1000
+DEFAULT_MAX_INFLIGHT = 256
+
+
+@dataclass
+class MigrationCheckpoint:
+    """
+    Resumable position of a migration.
+
+    Attributes:
+        cursors (Dict[str, str]): The next SCAN cursor of every source node that was started but not completed,
+            keyed by node address (`host:port`, or `STANDALONE_NODE` for standalone sources).
+        completed_nodes (Set[str]): Source nodes whose keyspace was fully migrated.
+
+    A cursor is advanced only after every key returned by the matching SCAN call was restored on the target,
+    so resuming from a checkpoint may migrate a key twice but never skips one.
+    """
+
+    cursors: Dict[str, str] = field(default_factory=dict)
+    completed_nodes: Set[str] = field(default_factory=set)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns a JSON serializable representation of the checkpoint, to be persisted between runs.
+        """
+        return {
+            "cursors": dict(self.cursors),
+            "completed_nodes": sorted(self.completed_nodes),
+        }
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> MigrationCheckpoint:
+        """
+        Creates a checkpoint from the output of `to_dict`.
+        """
+        return MigrationCheckpoint(
+            cursors=dict(data.get("cursors", {})),
+            completed_nodes=set(data.get("completed_nodes", [])),
+        )
+
+
+@dataclass
+class MigrationStats:
+    """
+    Progress metrics of a migration.
+
+    Attributes:
+        scanned_keys (int): Number of keys returned by SCAN on the source.
+        migrated_keys (int): Number of keys restored on the target.
+        skipped_keys (int): Number of scanned keys that expired or were deleted before they were dumped.
+        failed_keys (int): Number of keys that could not be dumped or restored.
+        migrated_bytes (int): Total size of the serialized payloads restored on the target.
+        start_time (float): `time.monotonic()` value at the start of the migration.
+    """
+
+    scanned_keys: int = 0
+    migrated_keys: int = 0
+    skipped_keys: int = 0
+    failed_keys: int = 0
+    migrated_bytes: int = 0
+    start_time: float = field(default_factory=time.monotonic)
+
+    def elapsed(self) -> float:
+        """
+        Returns the number of seconds since the migration started.
+        """
+        return time.monotonic() - self.start_time
+
+    def keys_per_second(self) -> float:
+        """
+        Returns the average number of keys restored per second.
+        """
+        elapsed = self.elapsed()
+        return self.migrated_keys / elapsed if elapsed > 0 else 0.0
+
+
+class _RateLimiter:
+    """
+    Token bucket limiting the number of keys migrated per second.
+    """
+
+    def __init__(self, rate: float):
+        self._rate = rate
+        self._tokens = rate
+        self._last_refill = time.monotonic()
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                self._rate, self._tokens + (now - self._last_refill) * self._rate
+            )
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+def _to_str(value: TEncodable) -> str:
+    # Clients configured with `decode_responses` return `str` instead of `bytes`
+    return value if isinstance(value, str) else value.decode()
+
+
+def _to_bytes(value: TEncodable) -> bytes:
+    return value.encode() if isinstance(value, str) else value
+
+
+async def _get_primary_addresses(client: GlideClusterClient) -> List[str]:
+    nodes = cast(
+        TEncodable, await client.custom_command(["CLUSTER", "NODES"], RandomNode())
+    )
+    addresses = []
+    for line in _to_str(nodes).splitlines():
+        parts = line.split()
+        if len(parts) < 3:
+            continue
+        flags = parts[2].split(",")
+        if "master" not in flags or "fail" in flags or "noaddr" in flags:
+            continue
+        # The address is formatted as `ip:port@cport[,hostname]`
+        addresses.append(parts[1].split("@")[0])
+    return sorted(addresses)
+
+
+async def _scan_node(
+    client: TGlideClient,
+    node: str,
+    cursor: str,
+    pattern: TEncodable,
+    count: int,
+) -> Tuple[str, List[bytes]]:
+    if isinstance(client, GlideClusterClient):
+        result = await client.custom_command(
+            ["SCAN", cursor, "MATCH", pattern, "COUNT", str(count)],
+            ByAddressRoute(node),
+        )
+    else:
+        result = await cast(GlideClient, client).scan(cursor, pattern, count)
+    result = cast(List[Union[TEncodable, List[TEncodable]]], result)
+    keys = [_to_bytes(key) for key in cast(List[TEncodable], result[1])]
+    return _to_str(cast(TEncodable, result[0])), keys
+
+
+async def _migrate_key(
+    source_client: TGlideClient,
+    target_client: TGlideClient,
+    key: bytes,
+    replace: bool,
+    stats: MigrationStats,
+) -> None:
+    try:
+        # DUMP and PTTL are sent together, so they share the same round trip on the source.
+        payload, ttl = await asyncio.gather(
+            source_client.dump(key), source_client.pttl(key)
+        )
+        if payload is None or ttl == -2:
+            stats.skipped_keys += 1
+            return
+        payload = _to_bytes(payload)
+        await target_client.restore(key, max(ttl, 0), payload, replace=replace)
+    except RequestError as e:
+        stats.failed_keys += 1
+        Logger.log(
+            LogLevel.WARN,
+            "migration",
+            f"Failed to migrate key {key!r}: {e}",
+        )
+        return
+    stats.migrated_keys += 1
+    stats.migrated_bytes += len(payload)
+
+
+async def migrate(
+    source_client: TGlideClient,
+    target_client: TGlideClient,
+    pattern: TEncodable = "*",
+    scan_count: int = DEFAULT_SCAN_COUNT,
+    max_inflight: int = DEFAULT_MAX_INFLIGHT,
+    rate_limit: Optional[float] = None,
+    replace: bool = True,
+    checkpoint: Optional[MigrationCheckpoint] = None,
+    on_progress: Optional[Callable[[MigrationStats, MigrationCheckpoint], None]] = None,
+) -> MigrationStats:
+    """
+    Copies all keys matching `pattern` from `source_client` to `target_client`, preserving their TTL.
+
+    When the source is a cluster, every primary node is scanned in parallel with its own SCAN cursor. Keys are copied
+    with DUMP and PTTL on the source and RESTORE on the target; all requests are multiplexed over the clients'
+    connections, so every batch of keys is pipelined instead of paying one round trip per key.
+    Source and target can be any combination of standalone and cluster clients.
+
+    Note:
+        Keys that are written to the source after they were migrated are not copied again. Resharding the source while
+        a migration is running may cause keys that moved between nodes to be missed.
+
+    Args:
+        source_client (TGlideClient): The client to read keys from.
+        target_client (TGlideClient): The client to write keys to.
+        pattern (TEncodable): A glob-style pattern of the keys to migrate. Defaults to all keys.
+        scan_count (int): The `COUNT` hint of each SCAN call, which is also the size of the key batches.
+        max_inflight (int): The maximum number of keys being copied at any time. Bounds the memory used to hold dumped
+            payloads.
+        rate_limit (Optional[float]): The maximum number of keys to copy per second. If not set, keys are copied as fast
+            as possible.
+        replace (bool): If `True`, existing keys on the target are overwritten. Otherwise, they are counted in
+            `MigrationStats.failed_keys`. Defaults to True.
+        checkpoint (Optional[MigrationCheckpoint]): A checkpoint to resume from. It is updated in place as the migration
+            progresses. If not set, the migration starts from the beginning.
+        on_progress (Optional[Callable[[MigrationStats, MigrationCheckpoint], None]]): Called after every migrated batch
+            with the current stats and checkpoint, e.g. to report progress or persist the checkpoint.
+
+    Returns:
+        MigrationStats: The final metrics of the migration.
+
+    Examples:
+        >>> checkpoint = MigrationCheckpoint.from_dict(json.load(open("checkpoint.json")))
+        >>> def save(stats, checkpoint):
+        ...     json.dump(checkpoint.to_dict(), open("checkpoint.json", "w"))
+        >>> stats = await migrate(source, target, "user:*", rate_limit=10000, checkpoint=checkpoint, on_progress=save)
+        >>> stats.migrated_keys
+            200000
+    """
+    if max_inflight < 1:
+        raise ValueError("`max_inflight` must be a positive number.")
+    if rate_limit is not None and rate_limit <= 0:
+        raise ValueError("`rate_limit` must be a positive number.")
+
+    checkpoint = checkpoint if checkpoint is not None else MigrationCheckpoint()
+    stats = MigrationStats()
+    window = asyncio.Semaphore(max_inflight)
+    rate_limiter = _RateLimiter(rate_limit) if rate_limit is not None else None
+
+    async def migrate_with_window(key: bytes) -> None:
+        try:
+            await _migrate_key(source_client, target_client, key, replace, stats)
+        finally:
+            window.release()
+
+    async def migrate_node(node: str) -> None:
+        cursor = checkpoint.cursors.get(node, "0")
+        while True:
+            cursor, keys = await _scan_node(
+                source_client, node, cursor, pattern, scan_count
+            )
+            stats.scanned_keys += len(keys)
+            tasks = []
+            for key in keys:
+                if rate_limiter:
+                    await rate_limiter.acquire()
+                await window.acquire()
+                tasks.append(asyncio.create_task(migrate_with_window(key)))
+            await asyncio.gather(*tasks)
+
+            if cursor == "0":
+                checkpoint.cursors.pop(node, None)
+                checkpoint.completed_nodes.add(node)
+            else:
+                checkpoint.cursors[node] = cursor
+            if on_progress:
+                on_progress(stats, checkpoint)
+            if cursor == "0":
+                return
+
+    nodes = (
+        await _get_primary_addresses(source_client)
+        if isinstance(source_client, GlideClusterClient)
+        else [STANDALONE_NODE]
+    )
+    await asyncio.gather(
+        *[
+            migrate_node(node)
+            for node in nodes
+            if node not in checkpoint.completed_nodes
+        ]
+    )
+    return stats
@@ -5,6 +5,7 @@ from typing import AsyncGenerator, List, Optional, Union
 
 import pytest
 from glide.config import (
+    CompressionConfiguration,
     GlideClientConfiguration,
     GlideClusterClientConfiguration,
     NodeAddress,
@@ -229,6 +230,8 @@ async def create_client(
     standalone_mode_pubsub: Optional[
         GlideClientConfiguration.PubSubSubscriptions
     ] = None,
+    compression: Optional[CompressionConfiguration] = None,
+    decode_responses: bool = False,
 ) -> Union[GlideClient, GlideClusterClient]:
     # Create async socket client
     use_tls = request.config.getoption("--tls")
@@ -245,6 +248,8 @@ async def create_client(
             protocol=protocol,
             request_timeout=timeout,
             pubsub_subscriptions=cluster_mode_pubsub,
+            compression=compression,
+            decode_responses=decode_responses,
         )
         return await GlideClusterClient.create(cluster_config)
     else:
@@ -260,6 +265,8 @@ async def create_client(
             protocol=protocol,
             request_timeout=timeout,
             pubsub_subscriptions=standalone_mode_pubsub,
+            compression=compression,
+            decode_responses=decode_responses,
         )
         return await GlideClient.create(config)
 
@@ -0,0 +1,336 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from typing import Dict, List
+
+import pytest
+from glide.analytics import hyperloglog, sets
+from glide.async_commands.bitmap import BitwiseOperation
+from glide.async_commands.sorted_set import AggregationType, RangeByIndex
+from glide.config import CompressionConfiguration, ProtocolVersion
+from glide.constants import TEncodable
+from glide.glide import HyperLogLog
+from glide.glide_client import TGlideClient
+from tests.conftest import create_client
+from tests.utils.utils import get_random_string
+
+try:
+    import numpy
+    from glide.analytics import bitmaps, sorted_sets
+except ImportError:
+    numpy = None  # type: ignore
+
+requires_numpy = pytest.mark.skipif(numpy is None, reason="numpy is not installed")
+
+
+@requires_numpy
+class TestBitmapOperations:
+    def test_bitop_pads_shorter_bitmaps_with_zeros(self):
+        short = numpy.array([0b1100], numpy.uint8)
+        long = numpy.array([0b1010, 0xFF], numpy.uint8)
+
+        assert bitmaps.bitop(BitwiseOperation.AND, [short, long]).tolist() == [
+            0b1000,
+            0,
+        ]
+        assert bitmaps.bitop(BitwiseOperation.OR, [short, long]).tolist() == [
+            0b1110,
+            0xFF,
+        ]
+        assert bitmaps.bitop(BitwiseOperation.XOR, [short, long]).tolist() == [
+            0b0110,
+            0xFF,
+        ]
+        assert bitmaps.bitop(BitwiseOperation.NOT, [long]).tolist() == [0xF5, 0]
+        # The inputs are left unchanged
+        assert short.tolist() == [0b1100]
+
+        with pytest.raises(ValueError):
+            bitmaps.bitop(BitwiseOperation.NOT, [short, long])
+        with pytest.raises(ValueError):
+            bitmaps.bitop(BitwiseOperation.OR, [])
+
+    def test_popcount(self):
+        assert bitmaps.popcount(numpy.array([], numpy.uint8)) == 0
+        assert bitmaps.popcount(numpy.array([0xFF, 1, 0], numpy.uint8)) == 9
+        assert bitmaps.popcount(numpy.full(1000, 0x0F, numpy.uint8)) == 4000
+
+
+@requires_numpy
+@pytest.mark.asyncio
+class TestBitmapAnalytics:
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP3])
+    async def test_bitmaps_across_slots(self, glide_client: TGlideClient):
+        # The keys don't share a hash tag, so in cluster mode they may map to different slots
+        key1, key2, destination = (get_random_string(10) for _ in range(3))
+        missing_key = get_random_string(10)
+        value1 = bytes(range(256)) * 5
+        value2 = b"\x0f" * 300
+        assert await glide_client.set(key1, value1) == "OK"
+        assert await glide_client.set(key2, value2) == "OK"
+
+        # Bitmaps longer than the chunk size are fetched with multiple GETRANGE commands
+        fetched1, fetched2, missing = await bitmaps.fetch(
+            glide_client, [key1, key2, missing_key], chunk_size=100
+        )
+        assert fetched1.dtype == numpy.uint8
+        assert fetched1.tobytes() == value1
+        assert fetched2.tobytes() == value2
+        assert len(missing) == 0
+        assert (await bitmaps.fetch(glide_client, [key2]))[0].tobytes() == value2
+
+        expected = bytes(a & b for a, b in zip(value1, value2)) + bytes(
+            len(value1) - len(value2)
+        )
+        assert await bitmaps.bitop_store(
+            glide_client,
+            BitwiseOperation.AND,
+            destination,
+            [key1, key2],
+            chunk_size=100,
+        ) == len(expected)
+        assert await glide_client.get(destination) == expected
+        assert await glide_client.bitcount(destination) == bitmaps.popcount(
+            numpy.frombuffer(expected, numpy.uint8)
+        )
+
+        # Storing replaces the current value
+        assert await bitmaps.store(glide_client, destination, fetched2[:10]) == 10
+        assert await glide_client.get(destination) == value2[:10]
+        assert await bitmaps.store(glide_client, destination, missing) == 0
+        assert await glide_client.exists([destination]) == 0
+
+        with pytest.raises(ValueError):
+            await bitmaps.fetch(glide_client, [key1], chunk_size=0)
+
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    async def test_store_with_compression(self, request, cluster_mode):
+        compressed_client = await create_client(
+            request,
+            cluster_mode,
+            compression=CompressionConfiguration(min_compression_size=64),
+        )
+        key = get_random_string(10)
+        # Compressible, and longer than the chunk size, so that it's written with multiple commands
+        bitmap = numpy.frombuffer(b"\x0f\xf0" * 500, numpy.uint8)
+        try:
+            assert await compressed_client.set(key, b"\xff" * 2000) == "OK"
+            assert await bitmaps.store(
+                compressed_client, key, bitmap, chunk_size=100
+            ) == len(bitmap)
+            # The bitmap is stored uncompressed, so the server sees its actual bits
+            assert await compressed_client.strlen(key) == len(bitmap)
+            assert await compressed_client.bitcount(key) == bitmaps.popcount(bitmap)
+            assert await compressed_client.get(key) == bitmap.tobytes()
+            fetched = await bitmaps.fetch(compressed_client, [key], chunk_size=100)
+            assert fetched[0].tobytes() == bitmap.tobytes()
+        finally:
+            await compressed_client.close()
+
+
+@pytest.mark.asyncio
+class TestHyperLogLogAnalytics:
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP2, ProtocolVersion.RESP3])
+    async def test_hyperloglog_count_matches_pfcount(self, glide_client: TGlideClient):
+        # Keys with a shared hash tag, so that the server can count them as well
+        sparse_key, dense_key, missing_key = (
+            f"{{hll}}-{get_random_string(10)}" for _ in range(3)
+        )
+        assert await glide_client.pfadd(sparse_key, ["a", "b", "c"]) == 1
+        # Enough elements for the server to convert the HyperLogLog to the dense encoding
+        assert await glide_client.pfadd(dense_key, [str(i) for i in range(5000)]) == 1
+
+        key_lists: List[List[TEncodable]] = [
+            [sparse_key],
+            [dense_key],
+            [sparse_key, dense_key, missing_key],
+        ]
+        for keys in key_lists:
+            assert await hyperloglog.count(glide_client, keys) == (
+                await glide_client.pfcount(keys)
+            )
+        assert await hyperloglog.count(glide_client, [missing_key]) == 0
+        assert await hyperloglog.count(glide_client, []) == 0
+
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP3])
+    async def test_hyperloglog_across_slots(self, glide_client: TGlideClient):
+        # The keys don't share a hash tag, so in cluster mode they may map to different slots
+        key1, key2, destination = (get_random_string(10) for _ in range(3))
+        assert await glide_client.pfadd(key1, [f"a{i}" for i in range(1000)]) == 1
+        assert await glide_client.pfadd(key2, [f"a{i}" for i in range(500, 1500)]) == 1
+
+        estimate = await hyperloglog.count(
+            glide_client, [key1, key2], destination=destination
+        )
+        assert abs(estimate - 1500) < 1500 * 0.05
+        # The stored HyperLogLog is a valid value for the server
+        assert await glide_client.pfcount([destination]) == estimate
+        assert await glide_client.pfadd(destination, ["a0"]) == 0
+
+        merged = HyperLogLog()
+        merged.merge_hll(await hyperloglog.fetch(glide_client, [key1]))
+        merged.merge_hll(await hyperloglog.fetch(glide_client, [key2]))
+        assert merged.count() == estimate
+
+        assert await glide_client.set(key2, "not a hyperloglog") == "OK"
+        with pytest.raises(ValueError):
+            await hyperloglog.count(glide_client, [key1, key2])
+
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    async def test_count_destination_with_compression(self, request, cluster_mode):
+        compressed_client = await create_client(
+            request,
+            cluster_mode,
+            compression=CompressionConfiguration(min_compression_size=64),
+        )
+        key, destination = (get_random_string(10) for _ in range(2))
+        try:
+            assert await compressed_client.pfadd(key, [str(i) for i in range(100)]) == 1
+            assert await compressed_client.set(destination, "x" * 1000) == "OK"
+            estimate = await hyperloglog.count(
+                compressed_client, [key], destination=destination
+            )
+            # The dense encoding is stored uncompressed, so the server can read it
+            assert await compressed_client.pfcount([destination]) == estimate
+            assert await compressed_client.pfadd(destination, ["0"]) == 0
+            assert await hyperloglog.count(compressed_client, [destination]) == estimate
+        finally:
+            await compressed_client.close()
+
+
+@pytest.mark.asyncio
+class TestSetAnalytics:
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP3])
+    async def test_set_algebra_across_slots(self, glide_client: TGlideClient):
+        # The keys don't share a hash tag, so in cluster mode they may map to different slots
+        key1, key2, key3, destination = (get_random_string(10) for _ in range(4))
+        missing_key = get_random_string(10)
+        # Large enough for the sets to be scanned with multiple `SSCAN` commands
+        members1 = {f"{i}".encode() for i in range(3000)}
+        members2 = {f"{i}".encode() for i in range(0, 6000, 2)}
+        members3 = {f"{i}".encode() for i in range(0, 6000, 3)}
+        assert await glide_client.sadd(key1, list(members1)) == len(members1)
+        assert await glide_client.sadd(key2, list(members2)) == len(members2)
+        assert await glide_client.sadd(key3, list(members3)) == len(members3)
+        keys: List[TEncodable] = [key1, key2, key3]
+
+        assert await sets.sunion(glide_client, keys) == members1 | members2 | members3
+        assert await sets.sinter(glide_client, keys) == members1 & members2 & members3
+        assert await sets.sdiff(glide_client, keys) == members1 - members2 - members3
+        assert await sets.sinter(glide_client, [key1, missing_key]) == set()
+        assert await sets.sdiff(glide_client, [missing_key, key1]) == set()
+
+        expected = members2 & members3
+        assert await sets.sinterstore(glide_client, destination, [key2, key3]) == len(
+            expected
+        )
+        assert await glide_client.smembers(destination) == expected
+        assert await sets.sunionstore(glide_client, destination, [key1]) == len(
+            members1
+        )
+        assert await glide_client.smembers(destination) == members1
+        assert await sets.sdiffstore(glide_client, destination, [key2, key2]) == 0
+        assert await glide_client.exists([destination]) == 0
+
+
+@requires_numpy
+class TestSortedSetAggregation:
+    def test_member_returned_by_two_chunks_is_counted_once(self):
+        aggregation = sorted_sets._Aggregation(AggregationType.SUM, 2)
+        aggregation.add(0, [b"a", b"b"], numpy.array([1.0, 2.0]), True)
+        aggregation.add(1, [b"b", b"c"], numpy.array([10.0, 20.0]), True)
+        # The set at index 0 changed between its chunks, so its next chunk returns "b" again
+        aggregation.add(0, [b"b", b"d"], numpy.array([2.0, 4.0]), True)
+
+        members, scores = aggregation.result(1)
+        assert dict(zip(members, scores.tolist())) == {
+            b"a": 1.0,
+            b"b": 12.0,
+            b"c": 20.0,
+            b"d": 4.0,
+        }
+        members, scores = aggregation.result(2)
+        assert members == [b"b"]
+        assert scores.tolist() == [12.0]
+
+
+@requires_numpy
+@pytest.mark.asyncio
+class TestSortedSetAnalytics:
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP2, ProtocolVersion.RESP3])
+    async def test_sorted_set_aggregation_across_slots(
+        self, glide_client: TGlideClient
+    ):
+        # The keys don't share a hash tag, so in cluster mode they may map to different slots
+        key1, key2, destination = (get_random_string(10) for _ in range(3))
+        scores1: Dict[TEncodable, float] = {
+            f"m{i}".encode(): float(i) for i in range(50)
+        }
+        scores2: Dict[TEncodable, float] = {
+            f"m{i}".encode(): float(100 - i) for i in range(25, 75)
+        }
+        assert await glide_client.zadd(key1, scores1) == len(scores1)
+        assert await glide_client.zadd(key2, scores2) == len(scores2)
+
+        def expected_scores(intersect: bool, aggregate, weights=(1.0, 1.0)):
+            members = (
+                scores1.keys() & scores2.keys()
+                if intersect
+                else scores1.keys() | scores2.keys()
+            )
+            result = {}
+            for member in members:
+                weighted = [
+                    source[member] * weight
+                    for source, weight in zip((scores1, scores2), weights)
+                    if member in source
+                ]
+                result[member] = float(aggregate(weighted))
+            return sorted(result.items(), key=lambda item: (item[1], item[0]))
+
+        async def check(function, keys, expected, **kwargs):
+            # Small chunks, so that every sorted set is fetched with multiple commands
+            members, scores = await function(glide_client, keys, chunk_size=7, **kwargs)
+            assert list(zip(members, scores.tolist())) == expected
+
+        await check(sorted_sets.zunion, [key1, key2], expected_scores(False, sum))
+        await check(
+            sorted_sets.zinter,
+            [(key1, 2.0), (key2, 0.5)],
+            expected_scores(True, max, (2.0, 0.5)),
+            aggregation_type=AggregationType.MAX,
+        )
+        await check(
+            sorted_sets.zunion,
+            [key1, key2],
+            expected_scores(False, min)[:5],
+            aggregation_type=AggregationType.MIN,
+            limit=5,
+        )
+        await check(
+            sorted_sets.zinter,
+            [key1, key2],
+            expected_scores(True, sum)[::-1][:3],
+            limit=3,
+            reverse=True,
+        )
+
+        assert await sorted_sets.zunionstore(
+            glide_client, destination, [key1, key2], chunk_size=7
+        ) == len(scores1.keys() | scores2.keys())
+        assert await glide_client.zrange_withscores(
+            destination, RangeByIndex(0, -1)
+        ) == dict(expected_scores(False, sum))
+        assert (
+            await sorted_sets.zinterstore(
+                glide_client, destination, [key1, get_random_string(10)]
+            )
+            == 0
+        )
+        assert await glide_client.exists([destination]) == 0
@@ -10,7 +10,7 @@ from datetime import date, datetime, timedelta, timezone
 from typing import Any, Dict, List, Mapping, Tuple, Union, cast
 
 import pytest
-from glide import ClosingError, RequestError, Script
+from glide import ClosingError, RequestError, Script, core_runtime
 from glide.async_commands.bitmap import (
     BitFieldGet,
     BitFieldIncrBy,
@@ -71,14 +71,25 @@ from glide.async_commands.stream import (
 )
 from glide.async_commands.transaction import ClusterTransaction, Transaction
 from glide.config import (
+    CompressionBackend,
+    CompressionConfiguration,
     GlideClientConfiguration,
     GlideClusterClientConfiguration,
     ProtocolVersion,
     ServerCredentials,
 )
-from glide.constants import OK, TEncodable, TFunctionStatsResponse, TResult
+from glide.constants import (
+    OK,
+    SORTED_SET_ADD_BATCH_SIZE,
+    STREAM_ADD_BATCH_SIZE,
+    TEncodable,
+    TFunctionStatsResponse,
+    TResult,
+)
+from glide.exceptions import ConfigurationError
 from glide.exceptions import TimeoutError as GlideTimeoutError
 from glide.glide_client import GlideClient, GlideClusterClient, TGlideClient
+from glide.protobuf.response_pb2 import ConstantResponse, Response
 from glide.routes import (
     AllNodes,
     AllPrimaries,
@@ -89,6 +100,7 @@ from glide.routes import (
     SlotKeyRoute,
     SlotType,
 )
+from glide.timeouts import deadline, request_timeout
 from tests.conftest import create_client
 from tests.utils.utils import (
     check_function_list_response,
@@ -135,6 +147,25 @@ class TestGlideClients:
         await glide_client.set(key, value)
         assert await glide_client.get(key) == value.encode()
 
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP3])
+    async def test_core_worker_stats(self, glide_client: TGlideClient):
+        # The core was started by the first client, so it can't be reconfigured
+        with pytest.raises(ConfigurationError):
+            core_runtime.configure(worker_threads=2)
+        with pytest.raises(ValueError):
+            core_runtime.configure(worker_threads=0)
+        before = core_runtime.stats()
+        assert len(before) >= 1
+        assert sum(worker.active_clients for worker in before) >= 1
+        for _ in range(10):
+            await glide_client.ping()
+        after = core_runtime.stats()
+        assert (
+            sum(worker.received_requests for worker in after)
+            >= sum(worker.received_requests for worker in before) + 10
+        )
+
     @pytest.mark.parametrize("cluster_mode", [True, False])
     @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP2, ProtocolVersion.RESP3])
     async def test_send_and_receive_non_ascii_unicode(self, glide_client: TGlideClient):
@@ -283,6 +314,132 @@ class TestGlideClients:
             await glide_client.set("foo", "bar")
         assert "the client is closed" in str(e)
 
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize(
+        "backend", [CompressionBackend.ZLIB, CompressionBackend.ZSTD]
+    )
+    async def test_transparent_compression(
+        self, glide_client: TGlideClient, request, cluster_mode, backend
+    ):
+        compressed_client = await create_client(
+            request,
+            cluster_mode,
+            compression=CompressionConfiguration(backend, min_compression_size=64),
+        )
+        key = get_random_string(10)
+        hash_key = f"{{{key}}}hash"
+        list_key = f"{{{key}}}list"
+        value = ('{"name": "glide", "tags": ["a", "b", "c"]}' * 100).encode()
+        try:
+            assert await compressed_client.set(key, value) == OK
+            assert await compressed_client.hset(hash_key, {"field": value}) == 1
+            assert await compressed_client.rpush(list_key, [value, "small"]) == 2
+
+            # Values are stored compressed
+            stored = await glide_client.get(key)
+            assert stored is not None and len(stored) < len(value)
+            assert await glide_client.hget(hash_key, "field") == stored
+
+            assert await compressed_client.get(key) == value
+            assert await compressed_client.hgetall(hash_key) == {b"field": value}
+            assert await compressed_client.lrange(list_key, 0, -1) == [value, b"small"]
+            assert await compressed_client.mget([key, hash_key]) == [value, None]
+
+            # Uncompressed values are returned as-is
+            assert await glide_client.set(key, value) == OK
+            assert await compressed_client.get(key) == value
+        finally:
+            await compressed_client.close()
+
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP2, ProtocolVersion.RESP3])
+    async def test_decode_responses(self, request, cluster_mode, protocol):
+        glide_client = await create_client(
+            request, cluster_mode, protocol=protocol, decode_responses=True
+        )
+        key = get_random_string(10)
+        hash_key = f"{{{key}}}hash"
+        try:
+            assert await glide_client.set(key, "שלום") == OK
+            assert await glide_client.get(key) == "שלום"
+            assert await glide_client.hset(hash_key, {"a": "1", "b": "2"}) == 2
+            assert await glide_client.hgetall(hash_key) == {"a": "1", "b": "2"}
+            assert await glide_client.mget([key, hash_key]) == ["שלום", None]
+
+            # Invalid UTF-8 values are returned as bytes
+            assert await glide_client.set(key, b"\xff\xfe") == OK
+            assert await glide_client.get(key) == b"\xff\xfe"
+        finally:
+            await glide_client.close()
+
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP2, ProtocolVersion.RESP3])
+    async def test_cancelled_requests(self, glide_client: TGlideClient):
+        key = get_random_string(10)
+        value = get_random_string(2**16)
+        assert await glide_client.set(key, value) == OK
+        tasks = [asyncio.create_task(glide_client.get(key)) for _ in range(100)]
+        # Let the requests be sent before they're cancelled
+        await asyncio.sleep(0)
+        for task in tasks[::2]:
+            task.cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert all(
+            isinstance(result, asyncio.CancelledError) for result in results[::2]
+        )
+        assert results[1::2] == [value.encode()] * 50
+
+        # The cancelled requests are still answered by the core, so their callback indices are reused safely
+        results = await asyncio.gather(*(glide_client.get(key) for _ in range(100)))
+        assert results == [value.encode()] * 100
+
+        # A response that arrives after its future was cancelled, but before the cancellation was queued, doesn't free
+        # its callback index until the cancellation is queued, so the cancellation can't reach a later request
+        callback_idx = glide_client._get_callback_index()
+        glide_client._get_future(callback_idx).cancel()
+        await glide_client._process_response(
+            Response(callback_idx=callback_idx, constant_response=ConstantResponse.OK)
+        )
+        assert callback_idx not in glide_client._available_callback_indexes
+        glide_client._cancel_request(callback_idx)
+        assert callback_idx in glide_client._available_callback_indexes
+        assert await glide_client.get(key) == value.encode()
+
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP3])
+    async def test_request_timeout_and_deadline(self, glide_client: TGlideClient):
+        key = get_random_string(10)
+        # A request timeout applies to blocking commands too, which otherwise wait for their own timeout
+        with request_timeout(100):
+            with pytest.raises(GlideTimeoutError):
+                await glide_client.blpop([key], 0.5)
+        # The connection is blocked until the server times the command out
+        await asyncio.sleep(0.5)
+        assert await glide_client.blpop([key], 0.3) is None
+
+        # The requests of a deadline share its budget, and requests are not sent after it passed
+        with deadline(300):
+            assert await glide_client.blpop([key], 0.1) is None
+            with pytest.raises(GlideTimeoutError):
+                await glide_client.blpop([key], 0.5)
+            with pytest.raises(GlideTimeoutError):
+                await glide_client.set(key, "value")
+        await asyncio.sleep(0.5)
+        assert await glide_client.get(key) is None
+
+        transaction = (
+            ClusterTransaction()
+            if isinstance(glide_client, GlideClusterClient)
+            else Transaction()
+        )
+        transaction.set(key, "value")
+        with pytest.raises(ValueError):
+            await glide_client.exec(transaction, timeout=0)  # type: ignore[arg-type]
+        assert await glide_client.exec(transaction, timeout=1000) == [OK]  # type: ignore[arg-type]
+        with pytest.raises(ValueError):
+            with request_timeout(0):
+                pass
+
 
 @pytest.mark.asyncio
 class TestCommands:
@@ -2624,6 +2781,82 @@ class TestCommands:
                 GeoSearchByBox(10, 10, GeoUnit.MILES),
             )
 
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP2, ProtocolVersion.RESP3])
+    async def test_geosearch_many(self, glide_client: TGlideClient):
+        # The keys don't share a hash tag, so in cluster mode they may map to different slots
+        key1, key2 = get_random_string(10), get_random_string(10)
+        assert (
+            await glide_client.geoadd(
+                key1,
+                {
+                    "Palermo": GeospatialData(13.361389, 38.115556),
+                    "edge1": GeospatialData(12.758489, 38.788135),
+                },
+            )
+            == 2
+        )
+        assert (
+            await glide_client.geoadd(
+                key2,
+                {
+                    "Catania": GeospatialData(15.087269, 37.502669),
+                    "edge2": GeospatialData(17.241510, 38.788135),
+                },
+            )
+            == 2
+        )
+        keys: List[TEncodable] = [key1, key2, get_random_string(10)]
+        center = GeospatialData(15, 37)
+        radius = GeoSearchByRadius(400, GeoUnit.KILOMETERS)
+        nearest = [b"Catania", b"Palermo", b"edge2", b"edge1"]
+
+        assert (
+            await glide_client.geosearch_many(keys, center, radius, OrderBy.ASC)
+            == nearest
+        )
+        assert (
+            await glide_client.geosearch_many(keys, center, radius, OrderBy.DESC)
+            == nearest[::-1]
+        )
+        unordered = await glide_client.geosearch_many(keys, center, radius)
+        assert sorted(cast(List[bytes], unordered)) == sorted(nearest)
+
+        # The count applies to the merged results, which are ordered by distance
+        assert (
+            await glide_client.geosearch_many(
+                keys, center, radius, count=GeoSearchCount(3)
+            )
+            == nearest[:3]
+        )
+        assert await glide_client.geosearch_many(
+            keys, center, radius, count=GeoSearchCount(2), with_dist=True
+        ) == [[b"Catania", [56.4413]], [b"Palermo", [190.4424]]]
+        assert await glide_client.geosearch_many(
+            keys,
+            center,
+            radius,
+            OrderBy.DESC,
+            count=GeoSearchCount(1),
+            with_coord=True,
+        ) == [[b"edge1", [[12.75848776102066, 38.78813451624225]]]]
+        assert (
+            len(
+                await glide_client.geosearch_many(
+                    keys, center, radius, count=GeoSearchCount(1, True)
+                )
+            )
+            == 1
+        )
+
+        # A member is searched from its position in the key that contains it
+        assert await glide_client.geosearch_many(
+            keys, "Catania", GeoSearchByRadius(200, GeoUnit.KILOMETERS), OrderBy.ASC
+        ) == [b"Catania", b"Palermo"]
+        with pytest.raises(RequestError):
+            await glide_client.geosearch_many(keys, "non_existing_member", radius)
+        assert await glide_client.geosearch_many([], center, radius) == []
+
     @pytest.mark.parametrize("cluster_mode", [True, False])
     @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP2, ProtocolVersion.RESP3])
     async def test_geosearchstore_by_box(self, glide_client: TGlideClient):
@@ -3083,6 +3316,77 @@ class TestCommands:
             == 6.0
         )
 
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP2, ProtocolVersion.RESP3])
+    async def test_zadd_arrays_and_zrange_withscores_arrays(
+        self, glide_client: TGlideClient
+    ):
+        numpy = pytest.importorskip("numpy")
+        key = get_random_string(10)
+        string_key = get_random_string(10)
+        non_existing_key = get_random_string(10)
+        count = SORTED_SET_ADD_BATCH_SIZE * 2 + 1
+        members = [f"member{i}" for i in range(count)]
+        scores = numpy.arange(count, dtype=numpy.float64) / 2
+
+        assert await glide_client.zadd_arrays(key, members, scores) == count
+        assert await glide_client.zcard(key) == count
+        assert await glide_client.zscore(key, "member3") == 1.5
+
+        result_members, result_scores = await glide_client.zrange_withscores_arrays(
+            key, RangeByIndex(0, -1)
+        )
+        assert result_members == [member.encode() for member in members]
+        assert result_scores.dtype == numpy.float64
+        assert numpy.array_equal(result_scores, scores)
+
+        result_members, result_scores = await glide_client.zrange_withscores_arrays(
+            key, RangeByScore(InfBound.NEG_INF, ScoreBoundary(1)), reverse=True
+        )
+        assert result_members == [b"member2", b"member1", b"member0"]
+        assert result_scores.tolist() == [1.0, 0.5, 0.0]
+
+        # Plain sequences are accepted as well
+        assert (
+            await glide_client.zadd_arrays(
+                key,
+                ["member0", "new"],
+                [float("inf"), 2],
+                update_condition=UpdateOptions.GREATER_THAN,
+                changed=True,
+            )
+            == 2
+        )
+        assert await glide_client.zscore(key, "member0") == float("inf")
+        # The last score of a repeated member is kept
+        assert await glide_client.zadd_arrays(key, ["dup", "dup"], [1, 2]) == 1
+        assert await glide_client.zscore(key, "dup") == 2.0
+
+        assert await glide_client.zadd_arrays(key, [], []) == 0
+        with pytest.raises(ValueError):
+            await glide_client.zadd_arrays(key, ["a", "b"], [1.0])
+        with pytest.raises(ValueError):
+            await glide_client.zadd_arrays(
+                key,
+                ["a"],
+                [1.0],
+                existing_options=ConditionalChange.ONLY_IF_DOES_NOT_EXIST,
+                update_condition=UpdateOptions.GREATER_THAN,
+            )
+
+        result_members, result_scores = await glide_client.zrange_withscores_arrays(
+            non_existing_key, RangeByIndex(0, -1)
+        )
+        assert result_members == []
+        assert len(result_scores) == 0
+
+        # key exists, but it is not a sorted set
+        assert await glide_client.set(string_key, "foo") == OK
+        with pytest.raises(RequestError):
+            await glide_client.zadd_arrays(string_key, ["a"], [1.0])
+        with pytest.raises(RequestError):
+            await glide_client.zrange_withscores_arrays(string_key, RangeByIndex(0, -1))
+
     @pytest.mark.parametrize("cluster_mode", [True, False])
     @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP2, ProtocolVersion.RESP3])
     async def test_zadd_gt_lt(self, glide_client: TGlideClient):
@@ -5126,6 +5430,63 @@ class TestCommands:
         with pytest.raises(RequestError):
             await glide_client.xlen(string_key)
 
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP2, ProtocolVersion.RESP3])
+    async def test_xadd_many(self, glide_client: TGlideClient):
+        key = get_random_string(10)
+        key2 = get_random_string(10)
+        string_key = get_random_string(10)
+        non_existing_key = get_random_string(10)
+        entries: List[List[Tuple[TEncodable, TEncodable]]] = [
+            [("index", str(i)), ("field", "value")]
+            for i in range(STREAM_ADD_BATCH_SIZE * 2 + 1)
+        ]
+
+        ids = await glide_client.xadd_many(key, entries)
+        assert len(ids) == len(entries)
+        stream_entries = await glide_client.xrange(key, MinId(), MaxId())
+        assert stream_entries is not None
+        assert list(stream_entries.keys()) == ids
+        assert [fields[0][1] for fields in stream_entries.values()] == [
+            str(i).encode() for i in range(len(entries))
+        ]
+
+        # The stream is trimmed by the last entry of every pipeline
+        ids = await glide_client.xadd_many(
+            key,
+            entries[:10],
+            StreamAddOptions(trim=TrimByMaxLen(exact=True, threshold=5)),
+        )
+        assert await glide_client.xlen(key) == 5
+        stream_entries = await glide_client.xrange(key, MinId(), MaxId())
+        assert stream_entries is not None
+        assert list(stream_entries.keys()) == ids[5:]
+
+        assert await glide_client.xadd_many(
+            non_existing_key, entries[:2], StreamAddOptions(make_stream=False)
+        ) == [None, None]
+        assert await glide_client.exists([non_existing_key]) == 0
+        assert await glide_client.xadd_many(key, []) == []
+
+        # The streams may map to different slots
+        ids_by_stream = await glide_client.xadd_many_streams(
+            {key: entries[:3], key2: entries[: STREAM_ADD_BATCH_SIZE + 1]}
+        )
+        assert len(ids_by_stream[key]) == 3
+        assert len(ids_by_stream[key2]) == STREAM_ADD_BATCH_SIZE + 1
+        assert await glide_client.xlen(key2) == STREAM_ADD_BATCH_SIZE + 1
+        stream_entries = await glide_client.xrange(key2, MinId(), MaxId())
+        assert stream_entries is not None
+        assert list(stream_entries.keys()) == ids_by_stream[key2]
+
+        with pytest.raises(ValueError):
+            await glide_client.xadd_many(key, entries, StreamAddOptions(id="0-1"))
+
+        # key exists, but it is not a stream
+        assert await glide_client.set(string_key, "foo") == OK
+        with pytest.raises(RequestError):
+            await glide_client.xadd_many(string_key, entries[:2])
+
     @pytest.mark.parametrize("cluster_mode", [True, False])
     @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP2, ProtocolVersion.RESP3])
     async def test_xdel(self, glide_client: TGlideClient):
@@ -5163,6 +5524,62 @@ class TestCommands:
         with pytest.raises(RequestError):
             await glide_client.xdel(string_key, [stream_id3])
 
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP2, ProtocolVersion.RESP3])
+    async def test_stream_columns(self, glide_client: TGlideClient):
+        numpy = pytest.importorskip("numpy")
+        key = f"{{{get_random_string(10)}}}"
+        key2 = f"{key}2"
+        non_existing_key = f"{key}3"
+        string_key = f"{key}4"
+
+        await glide_client.xadd(
+            key,
+            [("int", "1"), ("float", "1.5"), ("text", "a")],
+            StreamAddOptions(id="1-1"),
+        )
+        await glide_client.xadd(
+            key,
+            [("int", "-2"), ("float", "3"), ("text", "5")],
+            StreamAddOptions(id="2-0"),
+        )
+        await glide_client.xadd(key, [("int", "3")], StreamAddOptions(id="3-5"))
+
+        entries = await glide_client.xrange_columns(key, MinId(), MaxId())
+        assert entries is not None
+        assert len(entries) == 3
+        assert entries.ids.dtype == numpy.int64
+        assert entries.ids.tolist() == [[1, 1], [2, 0], [3, 5]]
+        assert entries.columns[b"int"].dtype == numpy.int64
+        assert entries.columns[b"int"].tolist() == [1, -2, 3]
+        assert entries.columns[b"float"].dtype == numpy.float64
+        assert entries.columns[b"float"][:2].tolist() == [1.5, 3.0]
+        assert math.isnan(entries.columns[b"float"][2])
+        assert entries.columns[b"text"].tolist() == [b"a", b"5", None]
+
+        entries = await glide_client.xrevrange_columns(key, MaxId(), MinId(), count=2)
+        assert entries is not None
+        assert entries.ids.tolist() == [[3, 5], [2, 0]]
+        assert entries.columns[b"int"].tolist() == [3, -2]
+
+        entries = await glide_client.xrange_columns(non_existing_key, MinId(), MaxId())
+        assert entries is not None
+        assert len(entries) == 0
+        assert entries.ids.shape == (0, 2)
+        assert entries.columns == {}
+
+        await glide_client.xadd(key2, [("int", "10")], StreamAddOptions(id="1-0"))
+        result = await glide_client.xread_columns({key: "1-1", key2: "0-0"})
+        assert result is not None
+        assert result[key.encode()].ids.tolist() == [[2, 0], [3, 5]]
+        assert result[key2.encode()].columns[b"int"].tolist() == [10]
+        assert await glide_client.xread_columns({key: "3-5"}) is None
+
+        # key exists, but it is not a stream
+        assert await glide_client.set(string_key, "foo") == OK
+        with pytest.raises(RequestError):
+            await glide_client.xrange_columns(string_key, MinId(), MaxId())
+
     @pytest.mark.parametrize("cluster_mode", [True, False])
     @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP2, ProtocolVersion.RESP3])
     async def test_xrange_and_xrevrange(self, glide_client: TGlideClient):
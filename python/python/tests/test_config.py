@@ -1,13 +1,23 @@
 # Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
 
+import pytest
 from glide.config import (
     BaseClientConfiguration,
+    CompressionBackend,
+    CompressionConfiguration,
+    GlideClientConfiguration,
     GlideClusterClientConfiguration,
     NodeAddress,
     PeriodicChecksManualInterval,
     PeriodicChecksStatus,
+    PubSubCallbackDispatch,
+    PubSubQueuePolicy,
     ReadFrom,
 )
+from glide.exceptions import ConfigurationError
+from glide.protobuf.connection_request_pb2 import (
+    CompressionBackend as ProtobufCompressionBackend,
+)
 from glide.protobuf.connection_request_pb2 import ConnectionRequest
 from glide.protobuf.connection_request_pb2 import ReadFrom as ProtobufReadFrom
 from glide.protobuf.connection_request_pb2 import TlsMode
@@ -52,3 +62,64 @@ def test_periodic_checks_interval_to_protobuf():
     config.periodic_checks = PeriodicChecksManualInterval(30)
     request = config._create_a_protobuf_conn_request(cluster_mode=True)
     assert request.periodic_checks_manual_interval.duration_in_sec == 30
+
+
+def test_compression_to_protobuf():
+    config = BaseClientConfiguration([NodeAddress("127.0.0.1")])
+    request = config._create_a_protobuf_conn_request()
+    assert not request.HasField("compression")
+
+    config.compression = CompressionConfiguration(
+        CompressionBackend.ZSTD, min_compression_size=0, compression_level=5
+    )
+    request = config._create_a_protobuf_conn_request()
+    assert request.HasField("compression")
+    assert request.compression.backend == ProtobufCompressionBackend.Zstd
+    assert request.compression.min_compression_size == 0
+    assert request.compression.compression_level == 5
+
+
+def test_pubsub_queue_size_must_be_positive():
+    config = GlideClientConfiguration(
+        [NodeAddress("127.0.0.1")],
+        pubsub_subscriptions=GlideClientConfiguration.PubSubSubscriptions(
+            channels_and_patterns={
+                GlideClientConfiguration.PubSubChannelModes.Exact: {"channel"}
+            },
+            callback=None,
+            context=None,
+            max_queue_size=0,
+        ),
+    )
+    with pytest.raises(ConfigurationError):
+        config._create_a_protobuf_conn_request()
+
+
+def test_pubsub_callback_dispatch_requires_callback():
+    config = GlideClientConfiguration(
+        [NodeAddress("127.0.0.1")],
+        pubsub_subscriptions=GlideClientConfiguration.PubSubSubscriptions(
+            channels_and_patterns={
+                GlideClientConfiguration.PubSubChannelModes.Exact: {"channel"}
+            },
+            callback=None,
+            context=None,
+            callback_dispatch=PubSubCallbackDispatch.THREAD_POOL,
+        ),
+    )
+    with pytest.raises(ConfigurationError):
+        config._create_a_protobuf_conn_request()
+
+
+def test_pubsub_options_without_channels():
+    config = GlideClusterClientConfiguration(
+        [NodeAddress("127.0.0.1")],
+        pubsub_subscriptions=GlideClusterClientConfiguration.PubSubSubscriptions(
+            max_queue_size=10,
+            queue_policy=PubSubQueuePolicy.BLOCK,
+        ),
+    )
+    request = config._create_a_protobuf_conn_request(cluster_mode=True)
+    assert not request.HasField("pubsub_subscriptions")
+    assert not config._is_pubsub_configured()
+    assert config._get_pubsub_queue_options() == (10, PubSubQueuePolicy.BLOCK)
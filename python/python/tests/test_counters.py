@@ -0,0 +1,83 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from glide.config import ProtocolVersion
+from glide.counters import CounterAggregator
+from glide.exceptions import RequestError
+from glide.glide_client import TGlideClient
+from tests.utils.utils import get_random_string
+
+
+@pytest.mark.asyncio
+class TestCounterAggregator:
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP3])
+    async def test_increments_are_merged(self, glide_client: TGlideClient):
+        # The keys don't share a hash tag, so in cluster mode they may map to different slots
+        counter, hash_key, sorted_set = (get_random_string(10) for _ in range(3))
+        # No periodic flushes, so that all the increments are merged
+        counters = CounterAggregator(glide_client, batch_size=2)
+        for i in range(100):
+            await counters.incrby(counter, 2)
+            await counters.hincrby(hash_key, f"field{i % 3}", 1)
+            await counters.zincrby(sorted_set, 0.5, "member")
+        await counters.incrby(get_random_string(10), 0)
+        assert counters.pending_counters == 6
+
+        # The increments of every counter are sent with a single command, and counters that sum to 0 are skipped
+        assert await counters.flush() == 5
+        assert counters.pending_counters == 0
+        assert counters.stats.added_increments == 301
+        assert counters.stats.sent_commands == 5
+        assert await glide_client.get(counter) == b"200"
+        assert await glide_client.hgetall(hash_key) == {
+            b"field0": b"34",
+            b"field1": b"33",
+            b"field2": b"33",
+        }
+        assert await glide_client.zscore(sorted_set, "member") == 50.0
+        assert await counters.flush() == 0
+
+        # Close flushes the pending increments
+        await counters.incrby(counter, -50)
+        await counters.close()
+        assert await glide_client.get(counter) == b"150"
+        with pytest.raises(RuntimeError):
+            counters.start()
+
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP3])
+    async def test_flushes_on_interval_and_size(self, glide_client: TGlideClient):
+        keys = [get_random_string(10) for _ in range(5)]
+        async with CounterAggregator(
+            glide_client, flush_interval_ms=50, max_pending_counters=2
+        ) as counters:
+            for key in keys:
+                await counters.incrby(key, 1)
+                # The number of pending counters never exceeds the bound
+                assert counters.pending_counters <= 2
+            await asyncio.sleep(0.5)
+            assert counters.pending_counters == 0
+            assert await glide_client.mget(keys) == [b"1"] * 5
+            assert counters.stats.flushes >= 2
+
+        # A batch that failed with a server error is dropped, since its other commands were applied. The keys share a
+        # hash tag, so that they are sent in the same pipeline in cluster mode.
+        tag = get_random_string(10)
+        invalid, valid = f"{{{tag}}}invalid", f"{{{tag}}}valid"
+        counters = CounterAggregator(glide_client)
+        assert await glide_client.set(invalid, "not a number") == "OK"
+        await counters.incrby(invalid, 3)
+        await counters.incrby(valid, 3)
+        with pytest.raises(RequestError):
+            await counters.flush()
+        assert counters.pending_counters == 0
+        assert counters.stats.failed_batches == 0
+        assert counters.stats.dropped_commands == 2
+        assert await counters.flush() == 0
+        await counters.close()
+        assert await glide_client.mget([invalid, valid]) == [b"not a number", b"3"]
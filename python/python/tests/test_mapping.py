@@ -0,0 +1,97 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import pytest
+from glide.config import ProtocolVersion
+from glide.constants import TEncodable
+from glide.glide_client import TGlideClient
+from glide.mapping import HashCodec, codec_for
+from glide.mapping import commands as mapped
+from tests.utils.utils import get_random_string
+from typing_extensions import TypedDict
+
+
+@dataclass
+class User:
+    name: str
+    age: int
+    score: float = 0.0
+    active: bool = False
+    avatar: Optional[bytes] = None
+
+
+class Point(TypedDict, total=False):
+    x: float
+    y: float
+    label: str
+
+
+@dataclass
+class Unsupported:
+    tags: List[str]
+
+
+class TestHashCodec:
+    def test_encode(self):
+        codec = codec_for(User)
+        assert codec is codec_for(User)
+        assert codec.fields == ["name", "age", "score", "active", "avatar"]
+        assert codec.encode(User("Ann", 31, 1.5, True)) == [
+            b"name",
+            "Ann",
+            b"age",
+            "31",
+            b"score",
+            "1.5",
+            b"active",
+            "1",
+        ]
+        assert codec_for(Point).encode({"x": 0.1, "label": "a"}) == [
+            b"x",
+            "0.1",
+            b"label",
+            "a",
+        ]
+
+    def test_unsupported_classes(self):
+        with pytest.raises(TypeError):
+            HashCodec(Unsupported)
+        with pytest.raises(TypeError):
+            HashCodec(int)
+
+
+@pytest.mark.asyncio
+class TestMappedCommands:
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP2, ProtocolVersion.RESP3])
+    async def test_mapped_commands(self, glide_client: TGlideClient):
+        # The keys don't share a hash tag, so in cluster mode they may map to different slots
+        key1, key2, missing_key = (get_random_string(10) for _ in range(3))
+        ann = User("Ann", 31, -2.25, True, b"\x00\xff")
+        bob = User("Bob", 27)
+
+        assert await mapped.hset(glide_client, key1, ann) == 5
+        assert await mapped.hgetall(glide_client, key1, User) == ann
+        assert await mapped.hmget(glide_client, key1, User) == ann
+        assert await mapped.hgetall(glide_client, missing_key, User) is None
+        assert await mapped.hmget(glide_client, missing_key, User) is None
+
+        assert await mapped.hset_many(glide_client, {key1: bob, key2: ann}) == 5
+        keys: List[TEncodable] = [key1, missing_key, key2]
+        # Fields that are None are left unchanged, and fields that the class doesn't have are ignored
+        assert await glide_client.hset(key1, {"unknown": "value"}) == 1
+        expected = [User("Bob", 27, 0.0, False, b"\x00\xff"), None, ann]
+        assert await mapped.hgetall_many(glide_client, keys, User) == expected
+        assert await mapped.hmget_many(glide_client, keys, User) == expected
+
+        point: Point = {"x": 1.5, "y": -3.0}
+        assert await mapped.hset(glide_client, key2, point, Point) == 2
+        assert await mapped.hmget(glide_client, key2, Point) == point
+
+        assert await glide_client.hset(key1, {"age": "not a number"}) == 0
+        with pytest.raises(ValueError):
+            await mapped.hgetall(glide_client, key1, User)
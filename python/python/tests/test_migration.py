@@ -0,0 +1,128 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from typing import List, cast
+
+import pytest
+from glide.config import ProtocolVersion
+from glide.constants import TEncodable
+from glide.tools import MigrationCheckpoint, MigrationStats, migrate
+from glide.tools.migration import STANDALONE_NODE
+from tests.conftest import create_client, test_teardown
+from tests.utils.utils import get_random_string
+
+
+@pytest.mark.asyncio
+class TestMigration:
+    @pytest.mark.parametrize("source_cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP3])
+    async def test_migrate_all_types_with_ttl(
+        self, request, source_cluster_mode: bool, protocol: ProtocolVersion
+    ):
+        source = await create_client(request, source_cluster_mode, protocol=protocol)
+        target = await create_client(
+            request, not source_cluster_mode, protocol=protocol
+        )
+        try:
+            prefix = get_random_string(10)
+            string_keys: List[TEncodable] = [f"{prefix}:string:{i}" for i in range(200)]
+            await source.mset({key: key for key in string_keys})
+            await source.hset(f"{prefix}:hash", {"field": "value"})
+            await source.sadd(f"{prefix}:set", ["a", "b"])
+            await source.set(f"{prefix}:ttl", "value")
+            await source.pexpire(f"{prefix}:ttl", 100000)
+            await source.set("not_matching", "value")
+
+            progress: List[MigrationStats] = []
+            stats = await migrate(
+                source,
+                target,
+                f"{prefix}:*",
+                scan_count=50,
+                max_inflight=16,
+                on_progress=lambda stats, _: progress.append(stats),
+            )
+
+            assert stats.migrated_keys == len(string_keys) + 3
+            assert stats.failed_keys == 0
+            assert stats.migrated_bytes > 0
+            assert len(progress) > 0
+            assert await target.mget(string_keys) == [
+                cast(str, key).encode() for key in string_keys
+            ]
+            assert await target.hgetall(f"{prefix}:hash") == {b"field": b"value"}
+            assert await target.smembers(f"{prefix}:set") == {b"a", b"b"}
+            assert 0 < await target.pttl(f"{prefix}:ttl") <= 100000
+            assert await target.pttl(f"{prefix}:string:0") == -1
+            assert await target.exists(["not_matching"]) == 0
+        finally:
+            await test_teardown(request, source_cluster_mode, protocol)
+            await test_teardown(request, not source_cluster_mode, protocol)
+            await source.close()
+            await target.close()
+
+    @pytest.mark.parametrize("source_cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP3])
+    async def test_migrate_with_decoded_responses(
+        self, request, source_cluster_mode: bool, protocol: ProtocolVersion
+    ):
+        # The keys, cursors and payloads are returned as `str` when they are valid UTF-8
+        source = await create_client(
+            request, source_cluster_mode, protocol=protocol, decode_responses=True
+        )
+        target = await create_client(
+            request, not source_cluster_mode, protocol=protocol, decode_responses=True
+        )
+        try:
+            prefix = get_random_string(10)
+            keys: List[TEncodable] = [f"{prefix}:{i}" for i in range(20)]
+            await source.mset({key: "value" for key in keys})
+            stats = await migrate(source, target, f"{prefix}:*", scan_count=5)
+            assert stats.migrated_keys == len(keys)
+            assert stats.failed_keys == 0
+            assert await target.mget(keys) == ["value"] * len(keys)
+        finally:
+            await test_teardown(request, source_cluster_mode, protocol)
+            await test_teardown(request, not source_cluster_mode, protocol)
+            await source.close()
+            await target.close()
+
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP3])
+    async def test_migrate_resumes_from_checkpoint(
+        self, request, protocol: ProtocolVersion
+    ):
+        source = await create_client(request, False, protocol=protocol)
+        target = await create_client(request, True, protocol=protocol)
+        try:
+            prefix = get_random_string(10)
+            await source.mset({f"{prefix}:{i}": "value" for i in range(20)})
+
+            checkpoint = MigrationCheckpoint(completed_nodes={STANDALONE_NODE})
+            stats = await migrate(source, target, f"{prefix}:*", checkpoint=checkpoint)
+            assert stats.scanned_keys == 0
+            assert stats.migrated_keys == 0
+
+            checkpoint = MigrationCheckpoint.from_dict(MigrationCheckpoint().to_dict())
+            stats = await migrate(
+                source, target, f"{prefix}:*", rate_limit=1000, checkpoint=checkpoint
+            )
+            assert stats.migrated_keys == 20
+            assert checkpoint.completed_nodes == {STANDALONE_NODE}
+            assert checkpoint.cursors == {}
+
+            # Existing keys are not overwritten when `replace` is disabled
+            stats = await migrate(source, target, f"{prefix}:*", replace=False)
+            assert stats.migrated_keys == 0
+            assert stats.failed_keys == 20
+        finally:
+            await test_teardown(request, False, protocol)
+            await test_teardown(request, True, protocol)
+            await source.close()
+            await target.close()
+
+    async def test_migrate_invalid_arguments(self, request):
+        with pytest.raises(ValueError):
+            await migrate(None, None, max_inflight=0)  # type: ignore
+        with pytest.raises(ValueError):
+            await migrate(None, None, rate_limit=0)  # type: ignore
@@ -0,0 +1,102 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+import pytest
+from glide.caching import CachePolicy, NearCache
+from glide.config import ProtocolVersion
+from glide.constants import TEncodable
+from glide.glide_client import TGlideClient
+from tests.utils.utils import get_random_string
+
+
+class TestCachePolicy:
+    def test_invalid_config(self):
+        with pytest.raises(ValueError):
+            CachePolicy("config:", ttl_ms=0)
+
+
+@pytest.mark.asyncio
+class TestNearCache:
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP2, ProtocolVersion.RESP3])
+    async def test_cached_commands(self, glide_client: TGlideClient):
+        prefix = get_random_string(10)
+        config, flags, members, other = (
+            f"{prefix}:config:{get_random_string(5)}",
+            f"{prefix}:flags",
+            f"{prefix}:members",
+            get_random_string(10),
+        )
+        cache = NearCache(
+            glide_client,
+            [CachePolicy(f"{prefix}:", 60000), CachePolicy(f"{prefix}:config:", 100)],
+        )
+        assert await glide_client.set(config, "v1") == "OK"
+        assert await glide_client.set(other, "v1") == "OK"
+        assert await glide_client.hset(flags, {"beta": "1"}) == 1
+        assert await glide_client.sadd(members, ["a", "b"]) == 2
+
+        assert await cache.get(config) == b"v1"
+        assert await cache.get(other) == b"v1"
+        assert await cache.hgetall(flags) == {b"beta": b"1"}
+        assert await cache.smembers(members) == {b"a", b"b"}
+        assert len(cache) == 3
+
+        # Cached values aren't refreshed until they expire, and keys without a policy aren't cached
+        assert await glide_client.set(config, "v2") == "OK"
+        assert await glide_client.set(other, "v2") == "OK"
+        assert await glide_client.hset(flags, {"beta": "0"}) == 0
+        assert await cache.get(config) == b"v1"
+        assert await cache.get(other) == b"v2"
+        # Callers get copies of the cached hashes and sets
+        (await cache.smembers(members)).add(b"c")
+        assert await cache.smembers(members) == {b"a", b"b"}
+        assert cache.stats.hits == 3
+        assert cache.stats.misses == 3
+
+        # The most specific policy applies to the config keys
+        await asyncio.sleep(0.2)
+        assert await cache.get(config) == b"v2"
+        assert await cache.hgetall(flags) == {b"beta": b"1"}
+        cache.invalidate(flags)
+        assert await cache.hgetall(flags) == {b"beta": b"0"}
+
+        # Only the keys that aren't cached are fetched by MGET, and missing keys are cached too
+        missing = f"{prefix}:missing"
+        keys: List[TEncodable] = [config, missing, other, config]
+        assert await cache.mget(keys) == [b"v2", None, b"v2", b"v2"]
+        assert await glide_client.set(missing, "v1") == "OK"
+        assert await cache.mget([missing]) == [None]
+        cache.clear()
+        assert len(cache) == 0
+        assert await cache.mget([missing]) == [b"v1"]
+
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP3])
+    async def test_eviction_and_stampede_protection(self, glide_client: TGlideClient):
+        prefix = get_random_string(10)
+        keys = [f"{prefix}:{i}" for i in range(3)]
+        cache = NearCache(glide_client, [CachePolicy(prefix, 60000)], max_entries=2)
+        for key in keys:
+            assert await cache.get(key) is None
+        assert len(cache) == 2
+        assert cache.stats.evictions == 1
+
+        # Concurrent requests of a key that isn't cached are served by a single fetch
+        assert await glide_client.set(keys[0], "value") == "OK"
+        results = await asyncio.gather(
+            *(cache.get(keys[0]) for _ in range(10)), cache.mget([keys[0]])
+        )
+        assert results == [b"value"] * 10 + [[b"value"]]
+        assert cache.stats.misses == 4
+        assert cache.stats.coalesced == 10
+        # Caching the fetched value evicted the least recently used key
+        assert cache.stats.evictions == 2
+        assert await cache.get(keys[2]) is None
+        assert cache.stats.hits == 1
+        assert await cache.get(keys[1]) is None
+        assert cache.stats.misses == 5
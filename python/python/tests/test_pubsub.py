@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import asyncio
+import threading
+import time
 from enum import IntEnum
 from typing import Any, Dict, List, Optional, Set, Tuple, Union, cast
 
@@ -12,6 +14,8 @@ from glide.config import (
     GlideClientConfiguration,
     GlideClusterClientConfiguration,
     ProtocolVersion,
+    PubSubCallbackDispatch,
+    PubSubQueuePolicy,
 )
 from glide.constants import OK, TEncodable
 from glide.exceptions import ConfigurationError
@@ -135,17 +139,26 @@ def create_pubsub_subscription(
     ],
     callback=None,
     context=None,
+    max_queue_size: Optional[int] = None,
+    queue_policy: PubSubQueuePolicy = PubSubQueuePolicy.DROP_OLDEST,
+    callback_dispatch: PubSubCallbackDispatch = PubSubCallbackDispatch.INLINE,
 ):
     if cluster_mode:
         return GlideClusterClientConfiguration.PubSubSubscriptions(
             channels_and_patterns=cluster_channels_and_patterns,
             callback=callback,
             context=context,
+            max_queue_size=max_queue_size,
+            queue_policy=queue_policy,
+            callback_dispatch=callback_dispatch,
         )
     return GlideClientConfiguration.PubSubSubscriptions(
         channels_and_patterns=standalone_channels_and_patterns,
         callback=callback,
         context=context,
+        max_queue_size=max_queue_size,
+        queue_policy=queue_policy,
+        callback_dispatch=callback_dispatch,
     )
 
 
@@ -2258,6 +2271,472 @@ class TestPubSub:
         with pytest.raises(ConfigurationError):
             await create_two_clients_with_pubsub(request, cluster_mode, pub_sub_exact)
 
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    async def test_pubsub_get_messages_batch_and_iterator(
+        self, request, cluster_mode: bool
+    ):
+        """Tests consuming messages in batches with get_pubsub_messages and with the pubsub_messages iterator"""
+        listening_client, publishing_client = None, None
+        channel = get_random_string(10)
+        messages = [get_random_string(5) for _ in range(10)]
+        pub_sub = create_pubsub_subscription(
+            cluster_mode,
+            {GlideClusterClientConfiguration.PubSubChannelModes.Exact: {channel}},
+            {GlideClientConfiguration.PubSubChannelModes.Exact: {channel}},
+        )
+        try:
+            listening_client, publishing_client = await create_two_clients_with_pubsub(
+                request, cluster_mode, pub_sub
+            )
+            with pytest.raises(ValueError):
+                await listening_client.get_pubsub_messages(0)
+
+            for message in messages:
+                await publishing_client.publish(message, channel)
+            # allow the messages to propagate
+            await asyncio.sleep(1)
+
+            batch = await listening_client.get_pubsub_messages(4)
+            assert [decode_pubsub_msg(msg).message for msg in batch] == messages[:4]
+
+            received = []
+            async for msg in listening_client.pubsub_messages(batch_size=4):
+                received.append(decode_pubsub_msg(msg).message)
+                if len(received) == 3:
+                    break
+            # the rest of the batch that was taken by the iterator is returned to the queue
+            received.extend(
+                decode_pubsub_msg(msg).message
+                for msg in await listening_client.get_pubsub_messages(10)
+            )
+            assert received == messages[4:]
+            assert listening_client.get_dropped_pubsub_messages_count() == 0
+            await check_no_messages_left(MethodTesting.Async, listening_client)
+        finally:
+            await client_cleanup(listening_client, pub_sub if cluster_mode else None)
+            await client_cleanup(publishing_client, None)
+
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize(
+        "queue_policy", [PubSubQueuePolicy.DROP_NEWEST, PubSubQueuePolicy.DROP_OLDEST]
+    )
+    async def test_pubsub_bounded_queue(
+        self, request, cluster_mode: bool, queue_policy: PubSubQueuePolicy
+    ):
+        """Tests that messages are dropped according to the policy once the queue is full"""
+        listening_client, publishing_client = None, None
+        channel = get_random_string(10)
+        messages = [get_random_string(5) for _ in range(5)]
+        pub_sub = create_pubsub_subscription(
+            cluster_mode,
+            {GlideClusterClientConfiguration.PubSubChannelModes.Exact: {channel}},
+            {GlideClientConfiguration.PubSubChannelModes.Exact: {channel}},
+            max_queue_size=2,
+            queue_policy=queue_policy,
+        )
+        try:
+            listening_client, publishing_client = await create_two_clients_with_pubsub(
+                request, cluster_mode, pub_sub
+            )
+            for message in messages:
+                await publishing_client.publish(message, channel)
+            # allow the messages to propagate
+            await asyncio.sleep(1)
+
+            received = [
+                decode_pubsub_msg(msg).message
+                for msg in await listening_client.get_pubsub_messages(10)
+            ]
+            if queue_policy == PubSubQueuePolicy.DROP_NEWEST:
+                assert received == messages[:2]
+            else:
+                assert received == messages[-2:]
+            assert listening_client.get_dropped_pubsub_messages_count() == 3
+        finally:
+            await client_cleanup(listening_client, pub_sub if cluster_mode else None)
+            await client_cleanup(publishing_client, None)
+
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    async def test_pubsub_blocking_queue(self, request, cluster_mode: bool):
+        """Tests that no messages are dropped with the blocking policy, the client stops reading until messages are consumed"""
+        listening_client, publishing_client = None, None
+        channel = get_random_string(10)
+        messages = [get_random_string(5) for _ in range(5)]
+        pub_sub = create_pubsub_subscription(
+            cluster_mode,
+            {GlideClusterClientConfiguration.PubSubChannelModes.Exact: {channel}},
+            {GlideClientConfiguration.PubSubChannelModes.Exact: {channel}},
+            max_queue_size=2,
+            queue_policy=PubSubQueuePolicy.BLOCK,
+        )
+        try:
+            listening_client, publishing_client = await create_two_clients_with_pubsub(
+                request, cluster_mode, pub_sub
+            )
+            for message in messages:
+                await publishing_client.publish(message, channel)
+            # allow the messages to propagate
+            await asyncio.sleep(1)
+
+            received = []
+            async for msg in listening_client.pubsub_messages(batch_size=1):
+                received.append(decode_pubsub_msg(msg).message)
+                if len(received) == len(messages):
+                    break
+            assert received == messages
+            assert listening_client.get_dropped_pubsub_messages_count() == 0
+        finally:
+            await client_cleanup(listening_client, pub_sub if cluster_mode else None)
+            await client_cleanup(publishing_client, None)
+
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize(
+        "callback_dispatch",
+        [PubSubCallbackDispatch.ASYNCIO_TASK, PubSubCallbackDispatch.THREAD_POOL],
+    )
+    async def test_pubsub_callback_dispatch(
+        self,
+        request,
+        cluster_mode: bool,
+        callback_dispatch: PubSubCallbackDispatch,
+    ):
+        """Tests that callbacks that aren't invoked inline get the messages of every channel in order"""
+        listening_client, publishing_client = None, None
+        channels = [get_random_string(10) for _ in range(3)]
+        messages = {
+            channel: [get_random_string(5) for _ in range(10)] for channel in channels
+        }
+        callback_messages: List[CoreCommands.PubSubMsg] = []
+        callback_threads: List[threading.Thread] = []
+
+        def callback(msg: CoreCommands.PubSubMsg, context: Any):
+            callback_threads.append(threading.current_thread())
+            new_message(msg, context)
+
+        pub_sub = create_pubsub_subscription(
+            cluster_mode,
+            {GlideClusterClientConfiguration.PubSubChannelModes.Exact: set(channels)},
+            {GlideClientConfiguration.PubSubChannelModes.Exact: set(channels)},
+            callback=callback,
+            context=callback_messages,
+            callback_dispatch=callback_dispatch,
+        )
+        try:
+            listening_client, publishing_client = await create_two_clients_with_pubsub(
+                request, cluster_mode, pub_sub
+            )
+            for index in range(10):
+                for channel in channels:
+                    await publishing_client.publish(messages[channel][index], channel)
+            # allow the messages to propagate
+            await asyncio.sleep(1)
+
+            assert len(callback_messages) == 30
+            for channel in channels:
+                received = [
+                    decode_pubsub_msg(msg).message
+                    for msg in callback_messages
+                    if decode_pubsub_msg(msg).channel == channel
+                ]
+                assert received == messages[channel]
+            assert listening_client.get_queued_pubsub_messages_count() == 0
+            if callback_dispatch == PubSubCallbackDispatch.THREAD_POOL:
+                assert threading.main_thread() not in callback_threads
+        finally:
+            await client_cleanup(listening_client, pub_sub if cluster_mode else None)
+            await client_cleanup(publishing_client, None)
+
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    async def test_pubsub_slow_callback_in_thread_pool(
+        self, request, cluster_mode: bool
+    ):
+        """Tests that a slow callback in a thread pool doesn't delay the responses to other requests of the client"""
+        listening_client, publishing_client = None, None
+        channel = get_random_string(10)
+        callback_messages: List[CoreCommands.PubSubMsg] = []
+
+        def slow_callback(msg: CoreCommands.PubSubMsg, context: Any):
+            time.sleep(0.5)
+            new_message(msg, context)
+
+        pub_sub = create_pubsub_subscription(
+            cluster_mode,
+            {GlideClusterClientConfiguration.PubSubChannelModes.Exact: {channel}},
+            {GlideClientConfiguration.PubSubChannelModes.Exact: {channel}},
+            callback=slow_callback,
+            context=callback_messages,
+            callback_dispatch=PubSubCallbackDispatch.THREAD_POOL,
+        )
+        try:
+            listening_client, publishing_client = await create_two_clients_with_pubsub(
+                request, cluster_mode, pub_sub
+            )
+            for _ in range(6):
+                await publishing_client.publish(get_random_string(5), channel)
+            # allow the messages to reach the listening client
+            await asyncio.sleep(0.2)
+
+            assert await asyncio.wait_for(listening_client.ping(), timeout=1) == b"PONG"
+            assert listening_client.get_queued_pubsub_messages_count() > 0
+            await asyncio.sleep(3.5)
+            assert len(callback_messages) == 6
+        finally:
+            await client_cleanup(listening_client, pub_sub if cluster_mode else None)
+            await client_cleanup(publishing_client, None)
+
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    async def test_pubsub_publish_many(self, request, cluster_mode: bool):
+        """Tests publishing batches of messages, larger than a single request, on several channels"""
+        listening_client, publishing_client = None, None
+        channels = [get_random_string(10) for _ in range(3)]
+        unsubscribed_channel = get_random_string(10)
+        channels_and_messages: List[Tuple[TEncodable, TEncodable]] = [
+            (channels[i % len(channels)], str(i)) for i in range(2500)
+        ]
+        channels_and_messages.append((unsubscribed_channel, "lost"))
+        pub_sub = create_pubsub_subscription(
+            cluster_mode,
+            {GlideClusterClientConfiguration.PubSubChannelModes.Exact: set(channels)},
+            {GlideClientConfiguration.PubSubChannelModes.Exact: set(channels)},
+        )
+        try:
+            listening_client, publishing_client = await create_two_clients_with_pubsub(
+                request, cluster_mode, pub_sub
+            )
+            assert await publishing_client.publish_many([]) == []
+            counts = await publishing_client.publish_many(channels_and_messages)
+            assert counts == [1] * (len(channels_and_messages) - 1) + [0]
+            # allow the messages to propagate
+            await asyncio.sleep(1)
+
+            received: Dict[str, List[str]] = {channel: [] for channel in channels}
+            for msg in await listening_client.get_pubsub_messages(
+                len(channels_and_messages)
+            ):
+                decoded = decode_pubsub_msg(msg)
+                received[cast(str, decoded.channel)].append(cast(str, decoded.message))
+            for channel in channels:
+                assert received[channel] == [
+                    message
+                    for message_channel, message in channels_and_messages
+                    if message_channel == channel
+                ]
+            await check_no_messages_left(MethodTesting.Async, listening_client)
+        finally:
+            await client_cleanup(listening_client, pub_sub if cluster_mode else None)
+            await client_cleanup(publishing_client, None)
+
+    async def test_sharded_pubsub_publish_many(self, request):
+        """Tests publishing a batch of sharded messages on channels of different slots"""
+        listening_client, publishing_client = None, None
+        channels = [f"{{{get_random_string(5)}}}{i}" for i in range(5)]
+        channels_and_messages: List[Tuple[TEncodable, TEncodable]] = [
+            (channels[i % len(channels)], str(i)) for i in range(50)
+        ]
+        pub_sub = create_pubsub_subscription(
+            True,
+            {GlideClusterClientConfiguration.PubSubChannelModes.Sharded: set(channels)},
+            {},
+        )
+        try:
+            listening_client, publishing_client = await create_two_clients_with_pubsub(
+                request, True, pub_sub
+            )
+            min_version = "7.0.0"
+            if await check_if_server_version_lt(publishing_client, min_version):
+                pytest.skip(reason=f"Valkey version required >= {min_version}")
+            assert isinstance(publishing_client, GlideClusterClient)
+
+            counts = await publishing_client.publish_many(
+                channels_and_messages, sharded=True
+            )
+            assert counts == [1] * len(channels_and_messages)
+            # allow the messages to propagate
+            await asyncio.sleep(1)
+
+            received = [
+                decode_pubsub_msg(msg)
+                for msg in await listening_client.get_pubsub_messages(
+                    len(channels_and_messages)
+                )
+            ]
+            for channel in channels:
+                assert [msg.message for msg in received if msg.channel == channel] == [
+                    message
+                    for message_channel, message in channels_and_messages
+                    if message_channel == channel
+                ]
+        finally:
+            await client_cleanup(listening_client, pub_sub)
+            await client_cleanup(publishing_client, None)
+
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    async def test_pubsub_runtime_subscriptions(self, request, cluster_mode: bool):
+        """Tests subscribing and unsubscribing at runtime, on a client that was created without subscriptions"""
+        listening_client, publishing_client = None, None
+        channel = get_random_string(10)
+        pattern_prefix = get_random_string(5)
+        pattern = f"{pattern_prefix}.*"
+        pattern_channel = f"{pattern_prefix}.news"
+        try:
+            listening_client, publishing_client = await create_two_clients_with_pubsub(
+                request, cluster_mode
+            )
+            with pytest.raises(ConfigurationError):
+                listening_client.try_get_pubsub_message()
+
+            assert await listening_client.subscribe({channel}) == OK
+            assert await listening_client.psubscribe({pattern}) == OK
+            # subscribing to an already subscribed channel is a no-op
+            assert await listening_client.subscribe({channel}) == OK
+
+            await publishing_client.publish("exact", channel)
+            await publishing_client.publish("pattern", pattern_channel)
+            # allow the messages to propagate
+            await asyncio.sleep(1)
+
+            assert decode_pubsub_msg(
+                await listening_client.get_pubsub_message()
+            ) == CoreCommands.PubSubMsg("exact", channel, None)
+            assert decode_pubsub_msg(
+                await listening_client.get_pubsub_message()
+            ) == CoreCommands.PubSubMsg("pattern", pattern_channel, pattern)
+            await check_no_messages_left(MethodTesting.Async, listening_client)
+
+            assert await listening_client.unsubscribe({channel}) == OK
+            assert await listening_client.punsubscribe() == OK
+            await publishing_client.publish("exact", channel)
+            await publishing_client.publish("pattern", pattern_channel)
+            await asyncio.sleep(1)
+            await check_no_messages_left(MethodTesting.Async, listening_client)
+        finally:
+            await client_cleanup(listening_client, None)
+            await client_cleanup(publishing_client, None)
+
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    async def test_pubsub_runtime_subscriptions_with_options(
+        self, request, cluster_mode: bool
+    ):
+        """Tests that the queue options of a configuration without channels apply to the subscriptions made at runtime"""
+        listening_client, publishing_client = None, None
+        channel = get_random_string(10)
+        messages = [get_random_string(5) for _ in range(5)]
+        pub_sub = create_pubsub_subscription(
+            cluster_mode,
+            {},
+            {},
+            max_queue_size=2,
+            queue_policy=PubSubQueuePolicy.DROP_NEWEST,
+        )
+        try:
+            listening_client, publishing_client = await create_two_clients_with_pubsub(
+                request, cluster_mode, pub_sub
+            )
+            # Nothing was subscribed to yet
+            with pytest.raises(ConfigurationError):
+                listening_client.try_get_pubsub_message()
+
+            assert await listening_client.subscribe({channel}) == OK
+            for message in messages:
+                await publishing_client.publish(message, channel)
+            # allow the messages to propagate
+            await asyncio.sleep(1)
+
+            received = [
+                decode_pubsub_msg(msg).message
+                for msg in await listening_client.get_pubsub_messages(10)
+            ]
+            assert received == messages[:2]
+            assert listening_client.get_dropped_pubsub_messages_count() == 3
+        finally:
+            await client_cleanup(listening_client, None)
+            await client_cleanup(publishing_client, None)
+
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    async def test_pubsub_runtime_subscriptions_with_callback(
+        self, request, cluster_mode: bool
+    ):
+        """Tests that the callback of a configuration without channels gets the messages of runtime subscriptions"""
+        listening_client, publishing_client = None, None
+        channel = get_random_string(10)
+        callback_messages: List[CoreCommands.PubSubMsg] = []
+        pub_sub = create_pubsub_subscription(
+            cluster_mode,
+            {},
+            {},
+            callback=new_message,
+            context=callback_messages,
+            callback_dispatch=PubSubCallbackDispatch.ASYNCIO_TASK,
+        )
+        try:
+            listening_client, publishing_client = await create_two_clients_with_pubsub(
+                request, cluster_mode, pub_sub
+            )
+            assert await listening_client.subscribe({channel}) == OK
+            await publishing_client.publish("message", channel)
+            # allow the messages to propagate
+            await asyncio.sleep(1)
+
+            assert [decode_pubsub_msg(msg) for msg in callback_messages] == [
+                CoreCommands.PubSubMsg("message", channel, None)
+            ]
+            with pytest.raises(ConfigurationError):
+                await listening_client.get_pubsub_message()
+        finally:
+            await client_cleanup(listening_client, None)
+            await client_cleanup(publishing_client, None)
+
+    async def test_pubsub_runtime_sharded_subscriptions(self, request):
+        """Tests subscribing to sharded channels that map to different slots at runtime"""
+        listening_client, publishing_client = None, None
+        channels = {f"{{{get_random_string(5)}}}{i}" for i in range(3)}
+        try:
+            listening_client, publishing_client = await create_two_clients_with_pubsub(
+                request, cluster_mode=True
+            )
+            min_version = "7.0.0"
+            if await check_if_server_version_lt(publishing_client, min_version):
+                pytest.skip(reason=f"Valkey version required >= {min_version}")
+            assert isinstance(listening_client, GlideClusterClient)
+            assert isinstance(publishing_client, GlideClusterClient)
+
+            assert await listening_client.ssubscribe(channels) == OK
+            for channel in channels:
+                assert (
+                    await publishing_client.publish(channel, channel, sharded=True) == 1
+                )
+            # allow the messages to propagate
+            await asyncio.sleep(1)
+
+            received = {
+                decode_pubsub_msg(msg).channel
+                for msg in await listening_client.get_pubsub_messages(len(channels))
+            }
+            assert received == channels
+
+            assert await listening_client.sunsubscribe() == OK
+            for channel in channels:
+                assert (
+                    await publishing_client.publish(channel, channel, sharded=True) == 0
+                )
+        finally:
+            await client_cleanup(listening_client, None)
+            await client_cleanup(publishing_client, None)
+
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    async def test_pubsub_runtime_subscriptions_resp2_raise_an_error(
+        self, request, cluster_mode: bool
+    ):
+        """Tests that subscribing at runtime with a resp2 client raises an error"""
+        client = await create_client(
+            request, cluster_mode=cluster_mode, protocol=ProtocolVersion.RESP2
+        )
+        try:
+            with pytest.raises(ConfigurationError):
+                await client.subscribe({get_random_string(5)})
+        finally:
+            await client.close()
+
     @pytest.mark.parametrize("cluster_mode", [True, False])
     async def test_pubsub_channels(self, request, cluster_mode: bool):
         """
@@ -0,0 +1,124 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from glide.config import ProtocolVersion
+from glide.exceptions import ConfigurationError
+from glide.glide_client import TGlideClient
+from glide.serialization import JsonSerializer, PickleSerializer, Serializer
+from glide.serialization import commands as serialized
+from tests.conftest import create_client
+from tests.utils.utils import get_random_string
+
+
+class TestSerializers:
+    @pytest.mark.parametrize("serializer", [JsonSerializer(), PickleSerializer()])
+    def test_roundtrip(self, serializer: Serializer):
+        values = [
+            "text",
+            "שלום",
+            1,
+            -(2**70),
+            1.5,
+            True,
+            False,
+            None,
+            [1, "a"],
+            {"a": {"b": [None]}},
+        ]
+        for value in values:
+            assert serializer.loads(serializer.dumps(value)) == value
+        assert serializer.loads_many(
+            serializer.dumps_many(values) + [None]
+        ) == values + [None]
+
+    def test_json_fast_paths_match_json_module(self):
+        serializer = JsonSerializer()
+        assert serializer.dumps('a"b') == b'"a\\"b"'
+        assert serializer.dumps(True) == b"true"
+        assert serializer.dumps(12) == b"12"
+        assert serializer.dumps(None) == b"null"
+        assert serializer.dumps({"a": [1, 2]}) == b'{"a":[1,2]}'
+
+    def test_register_converter(self):
+        serializer = JsonSerializer()
+        with pytest.raises(TypeError):
+            serializer.dumps(Decimal("1.5"))
+        serializer.register(Decimal, str)
+        serializer.register(date, date.isoformat)
+        assert serializer.dumps(Decimal("1.5")) == b'"1.5"'
+        assert serializer.dumps_many([date(2024, 1, 2), 3]) == [b'"2024-01-02"', b"3"]
+
+
+@pytest.mark.asyncio
+class TestSerializedCommands:
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP3])
+    async def test_serialized_commands(self, glide_client: TGlideClient):
+        key = get_random_string(10)
+        key2 = f"{{{key}}}2"
+        hash_key = f"{{{key}}}hash"
+        value = {"name": "glide", "tags": ["a", "b"], "count": 3}
+
+        with pytest.raises(ConfigurationError):
+            await serialized.get(glide_client, key)
+
+        glide_client.config.serializer = JsonSerializer()
+        assert await serialized.set(glide_client, key, value) == "OK"
+        assert await serialized.get(glide_client, key) == value
+        assert (
+            await glide_client.get(key)
+            == b'{"name":"glide","tags":["a","b"],"count":3}'
+        )
+
+        assert await serialized.mset(glide_client, {key: [1, 2], key2: None}) == "OK"
+        assert await serialized.mget(glide_client, [key, key2, f"{{{key}}}3"]) == [
+            [1, 2],
+            None,
+            None,
+        ]
+
+        assert await serialized.hset(glide_client, hash_key, {"a": value, "b": 1}) == 2
+        assert await serialized.hget(glide_client, hash_key, "a") == value
+        assert await serialized.hgetall(glide_client, hash_key) == {
+            b"a": value,
+            b"b": 1,
+        }
+
+        pickle_serializer = PickleSerializer()
+        await serialized.set(glide_client, key, {1, 2}, serializer=pickle_serializer)
+        assert await serialized.get(glide_client, key, pickle_serializer) == {1, 2}
+
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP3])
+    async def test_serialized_commands_with_decoded_responses(
+        self, request, cluster_mode, protocol
+    ):
+        glide_client = await create_client(
+            request, cluster_mode, protocol=protocol, decode_responses=True
+        )
+        key = get_random_string(10)
+        hash_key = f"{{{key}}}hash"
+        # The values that are valid UTF-8 are returned as `str`, and are encoded again before they are deserialized
+        pickle_serializer = PickleSerializer(protocol=0)
+        glide_client.config.serializer = JsonSerializer()
+        try:
+            assert await serialized.set(glide_client, key, {"a": [1, 2]}) == "OK"
+            assert await serialized.get(glide_client, key) == {"a": [1, 2]}
+            assert await serialized.mget(glide_client, [key, f"{{{key}}}2"]) == [
+                {"a": [1, 2]},
+                None,
+            ]
+            assert await serialized.hset(glide_client, hash_key, {"a": 1}) == 1
+            assert await serialized.hget(glide_client, hash_key, "a") == 1
+            assert await serialized.hgetall(glide_client, hash_key) == {"a": 1}
+
+            await serialized.set(glide_client, key, 42, serializer=pickle_serializer)
+            assert await glide_client.get(key) == "I42\n."
+            assert await serialized.get(glide_client, key, pickle_serializer) == 42
+        finally:
+            await glide_client.close()
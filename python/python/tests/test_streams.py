@@ -0,0 +1,82 @@
+# Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import asyncio
+from typing import List, Set
+
+import pytest
+from glide.async_commands.stream import StreamGroupOptions, StreamReadGroupOptions
+from glide.config import ProtocolVersion
+from glide.glide_client import TGlideClient
+from glide.streams import ConsumerGroupWorker, StreamEntry
+from tests.utils.utils import get_random_string
+
+
+@pytest.mark.asyncio
+class TestConsumerGroupWorker:
+    @pytest.mark.parametrize("cluster_mode", [True, False])
+    @pytest.mark.parametrize("protocol", [ProtocolVersion.RESP3])
+    async def test_worker_handles_and_acks_entries(self, glide_client: TGlideClient):
+        stream = get_random_string(10)
+        group = get_random_string(10)
+        await glide_client.xgroup_create(
+            stream, group, "0", StreamGroupOptions(make_stream=True)
+        )
+        for i in range(250):
+            await glide_client.xadd(stream, [("index", str(i))])
+
+        handled: List[bytes] = []
+        failed_once: Set[bytes] = set()
+
+        async def handler(entry: StreamEntry) -> None:
+            index = entry.fields[0][1]
+            # Every 50th entry fails once, and is handled again after it is claimed
+            if int(index) % 50 == 0 and index not in failed_once:
+                failed_once.add(index)
+                raise ValueError("failure")
+            await asyncio.sleep(0.001)
+            handled.append(index)
+
+        worker = ConsumerGroupWorker(
+            glide_client,
+            stream,
+            group,
+            "consumer",
+            handler,
+            batch_size=40,
+            block_ms=100,
+            max_concurrency=8,
+            claim_idle_time_ms=200,
+            claim_interval_ms=300,
+        )
+        async with worker:
+            assert worker.is_running
+            for _ in range(50):
+                if len(handled) == 250:
+                    break
+                await asyncio.sleep(0.1)
+        assert not worker.is_running
+
+        assert sorted(handled, key=int) == [str(i).encode() for i in range(250)]
+        assert worker.stats.read_entries == 250
+        assert worker.stats.failed_entries == 5
+        assert worker.stats.claimed_entries >= 5
+        assert worker.stats.acked_entries == 250
+        # The acknowledgements were coalesced
+        assert worker.stats.ack_calls < 250
+        # No entry is left pending
+        assert (
+            await glide_client.xreadgroup(
+                {stream: "0"}, group, "consumer", StreamReadGroupOptions(count=10)
+            )
+        ) == {stream.encode(): {}}
+
+    async def test_worker_invalid_arguments(self):
+        async def handler(entry: StreamEntry) -> None:
+            pass
+
+        with pytest.raises(ValueError):
+            ConsumerGroupWorker(None, "stream", "group", "consumer", handler, batch_size=0)  # type: ignore
+        with pytest.raises(ValueError):
+            ConsumerGroupWorker(None, "stream", "group", "consumer", handler, max_concurrency=0)  # type: ignore
@@ -0,0 +1,238 @@
+/**
+ * Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+ */
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use pyo3::types::{PyBytes, PyDict, PyList, PyString};
+use redis::Value;
+use std::collections::HashMap;
+
+/// The type of a field of a class that is mapped to a hash.
+#[derive(Clone, Copy, Debug, PartialEq)]
+enum FieldType {
+    Int,
+    Float,
+    Bool,
+    Bytes,
+    Str,
+}
+
+/// A value of a hash field, converted to the type of its class field.
+#[derive(Debug, PartialEq)]
+enum FieldValue {
+    Int(i64),
+    Float(f64),
+    Bool(bool),
+    Bytes(Vec<u8>),
+    Str(String),
+}
+
+impl FieldType {
+    fn from_name(name: &str) -> Option<Self> {
+        match name {
+            "int" => Some(FieldType::Int),
+            "float" => Some(FieldType::Float),
+            "bool" => Some(FieldType::Bool),
+            "bytes" => Some(FieldType::Bytes),
+            "str" => Some(FieldType::Str),
+            _ => None,
+        }
+    }
+
+    fn convert(self, data: Vec<u8>) -> Option<FieldValue> {
+        let parse = |data: &[u8]| std::str::from_utf8(data).ok().map(str::trim);
+        match self {
+            FieldType::Int => parse(&data)?.parse().ok().map(FieldValue::Int),
+            FieldType::Float => parse(&data)?.parse().ok().map(FieldValue::Float),
+            FieldType::Bool => match parse(&data)?.to_ascii_lowercase().as_str() {
+                "1" | "true" => Some(FieldValue::Bool(true)),
+                "0" | "false" => Some(FieldValue::Bool(false)),
+                _ => None,
+            },
+            FieldType::Bytes => Some(FieldValue::Bytes(data)),
+            FieldType::Str => String::from_utf8(data).ok().map(FieldValue::Str),
+        }
+    }
+}
+
+impl FieldValue {
+    fn into_py(self, py: Python) -> PyObject {
+        match self {
+            FieldValue::Int(value) => value.into_py(py),
+            FieldValue::Float(value) => value.into_py(py),
+            FieldValue::Bool(value) => value.into_py(py),
+            FieldValue::Bytes(value) => PyBytes::new(py, &value).into_py(py),
+            FieldValue::Str(value) => value.into_py(py),
+        }
+    }
+}
+
+/// Decodes replies of `HGETALL` and `HMGET` directly into instances of a class, with the types of its fields.
+#[pyclass]
+pub struct HashDecoder {
+    factory: PyObject,
+    names: Vec<Py<PyString>>,
+    types: Vec<FieldType>,
+    positions: HashMap<Vec<u8>, usize>,
+}
+
+impl HashDecoder {
+    fn set_field(
+        &self,
+        py: Python,
+        kwargs: &PyDict,
+        position: usize,
+        data: Vec<u8>,
+    ) -> PyResult<()> {
+        let name = self.names[position].as_ref(py);
+        let value = self.types[position].convert(data).ok_or_else(|| {
+            PyValueError::new_err(format!(
+                "The value of the field `{name}` can't be converted to {:?}",
+                self.types[position]
+            ))
+        })?;
+        kwargs.set_item(name, value.into_py(py))
+    }
+
+    /// Decodes the reply of `HGETALL`. Fields that the class doesn't have are ignored.
+    fn decode_hgetall(&self, py: Python, value: Value) -> PyResult<PyObject> {
+        let Value::Map(pairs) = value else {
+            return Err(PyValueError::new_err("Unexpected HGETALL reply"));
+        };
+        if pairs.is_empty() {
+            return Ok(py.None());
+        }
+        let kwargs = PyDict::new(py);
+        for (field, data) in pairs {
+            let (Value::BulkString(field), Value::BulkString(data)) = (field, data) else {
+                return Err(PyValueError::new_err("Unexpected HGETALL reply"));
+            };
+            if let Some(position) = self.positions.get(&field) {
+                self.set_field(py, kwargs, *position, data)?;
+            }
+        }
+        self.factory.call(py, (), Some(kwargs))
+    }
+
+    /// Decodes the reply of `HMGET` for all the fields of the class, in order.
+    fn decode_hmget(&self, py: Python, value: Value) -> PyResult<PyObject> {
+        let values = match value {
+            Value::Array(values) if values.len() == self.names.len() => values,
+            _ => return Err(PyValueError::new_err("Unexpected HMGET reply")),
+        };
+        let kwargs = PyDict::new(py);
+        for (position, data) in values.into_iter().enumerate() {
+            match data {
+                Value::BulkString(data) => self.set_field(py, kwargs, position, data)?,
+                Value::Nil => {}
+                _ => return Err(PyValueError::new_err("Unexpected HMGET reply")),
+            }
+        }
+        if kwargs.is_empty() {
+            return Ok(py.None());
+        }
+        self.factory.call(py, (), Some(kwargs))
+    }
+
+    fn decode(&self, py: Python, value: Value, hmget: bool) -> PyResult<PyObject> {
+        if hmget {
+            self.decode_hmget(py, value)
+        } else {
+            self.decode_hgetall(py, value)
+        }
+    }
+}
+
+#[pymethods]
+impl HashDecoder {
+    /// Creates a decoder that calls `factory` with the fields of a hash as keyword arguments. `fields` are the names
+    /// of the fields with the names of their types: "int", "float", "bool", "bytes" or "str".
+    #[new]
+    fn new(py: Python, factory: PyObject, fields: Vec<(String, String)>) -> PyResult<Self> {
+        let mut names = Vec::with_capacity(fields.len());
+        let mut types = Vec::with_capacity(fields.len());
+        let mut positions = HashMap::with_capacity(fields.len());
+        for (position, (name, type_name)) in fields.into_iter().enumerate() {
+            let field_type = FieldType::from_name(&type_name).ok_or_else(|| {
+                PyValueError::new_err(format!(
+                    "Unsupported type of the field `{name}`: {type_name}"
+                ))
+            })?;
+            positions.insert(name.as_bytes().to_vec(), position);
+            names.push(PyString::new(py, &name).into());
+            types.push(field_type);
+        }
+        Ok(Self {
+            factory,
+            names,
+            types,
+            positions,
+        })
+    }
+
+    /// Decodes the reply of `HGETALL`, or of `HMGET` of all the fields if `hmget` is set. Returns `None` if the hash
+    /// doesn't exist, or has none of the fields.
+    #[pyo3(signature = (pointer, hmget = false))]
+    fn decode_pointer(&self, py: Python, pointer: u64, hmget: bool) -> PyResult<PyObject> {
+        let value = unsafe { Box::from_raw(pointer as *mut Value) };
+        self.decode(py, *value, hmget)
+    }
+
+    /// Decodes the replies of a pipeline of `HGETALL` commands, or of `HMGET` commands if `hmget` is set, to a list.
+    #[pyo3(signature = (pointer, hmget = false))]
+    fn decode_pipeline_pointer(&self, py: Python, pointer: u64, hmget: bool) -> PyResult<PyObject> {
+        let value = unsafe { Box::from_raw(pointer as *mut Value) };
+        let Value::Array(replies) = *value else {
+            return Err(PyValueError::new_err("Unexpected pipeline reply"));
+        };
+        let objects = replies
+            .into_iter()
+            .map(|reply| self.decode(py, reply, hmget))
+            .collect::<PyResult<Vec<_>>>()?;
+        Ok(PyList::new(py, objects).into_py(py))
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_field_conversions() {
+        let convert =
+            |field_type: FieldType, data: &str| field_type.convert(data.as_bytes().to_vec());
+
+        assert_eq!(convert(FieldType::Int, "-42"), Some(FieldValue::Int(-42)));
+        assert_eq!(convert(FieldType::Int, "4.2"), None);
+        assert_eq!(
+            convert(FieldType::Float, "4.5"),
+            Some(FieldValue::Float(4.5))
+        );
+        assert_eq!(
+            convert(FieldType::Float, "inf"),
+            Some(FieldValue::Float(f64::INFINITY))
+        );
+        assert_eq!(convert(FieldType::Float, "x"), None);
+        assert_eq!(convert(FieldType::Bool, "1"), Some(FieldValue::Bool(true)));
+        assert_eq!(
+            convert(FieldType::Bool, "False"),
+            Some(FieldValue::Bool(false))
+        );
+        assert_eq!(convert(FieldType::Bool, "2"), None);
+        assert_eq!(
+            convert(FieldType::Bytes, "value"),
+            Some(FieldValue::Bytes(b"value".to_vec()))
+        );
+        assert_eq!(
+            convert(FieldType::Str, "value"),
+            Some(FieldValue::Str("value".to_string()))
+        );
+        assert_eq!(FieldType::Str.convert(vec![0xff]), None);
+    }
+
+    #[test]
+    fn test_field_type_names() {
+        assert_eq!(FieldType::from_name("float"), Some(FieldType::Float));
+        assert_eq!(FieldType::from_name("list"), None);
+    }
+}
@@ -0,0 +1,282 @@
+/**
+ * Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+ */
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use pyo3::types::PyBytes;
+
+// The HyperLogLog representation of the server, see hyperloglog.c.
+const MAGIC: &[u8] = b"HYLL";
+const HEADER_SIZE: usize = 16;
+const ENCODING_OFFSET: usize = 4;
+const DENSE_ENCODING: u8 = 0;
+const SPARSE_ENCODING: u8 = 1;
+const CARDINALITY_OFFSET: usize = 8;
+/// Set in the last byte of the cached cardinality when the cache is stale.
+const INVALID_CARDINALITY_FLAG: u8 = 1 << 7;
+const PRECISION: u32 = 14;
+const REGISTERS_COUNT: usize = 1 << PRECISION;
+const REGISTER_BITS: usize = 6;
+const REGISTER_MAX: u8 = (1 << REGISTER_BITS) - 1;
+const DENSE_SIZE: usize = HEADER_SIZE + (REGISTERS_COUNT * REGISTER_BITS + 7) / 8;
+/// The number of bits of the hash that are counted by the registers.
+const Q: usize = 64 - PRECISION as usize;
+const ALPHA_INF: f64 = 0.721_347_520_444_481_7;
+
+const INVALID_HLL: &str = "Value is not a valid HyperLogLog string";
+
+/// A HyperLogLog with the registers of the server's representation, which merges the representations stored on the
+/// server and estimates their cardinality in-process.
+#[pyclass]
+#[derive(Clone)]
+pub struct HyperLogLog {
+    registers: Box<[u8; REGISTERS_COUNT]>,
+}
+
+impl Default for HyperLogLog {
+    fn default() -> Self {
+        Self {
+            registers: Box::new([0; REGISTERS_COUNT]),
+        }
+    }
+}
+
+impl HyperLogLog {
+    fn merge_bytes(&mut self, data: &[u8]) -> Result<(), &'static str> {
+        if data.len() < HEADER_SIZE || !data.starts_with(MAGIC) {
+            return Err(INVALID_HLL);
+        }
+        match data[ENCODING_OFFSET] {
+            DENSE_ENCODING if data.len() == DENSE_SIZE => {
+                self.merge_dense(&data[HEADER_SIZE..]);
+                Ok(())
+            }
+            SPARSE_ENCODING => self.merge_sparse(&data[HEADER_SIZE..]),
+            _ => Err(INVALID_HLL),
+        }
+    }
+
+    fn merge_dense(&mut self, registers: &[u8]) {
+        for (index, register) in self.registers.iter_mut().enumerate() {
+            *register = (*register).max(get_dense_register(registers, index));
+        }
+    }
+
+    fn merge_sparse(&mut self, opcodes: &[u8]) -> Result<(), &'static str> {
+        // The runs of non-empty registers are merged only after the whole value was validated
+        let mut runs = Vec::new();
+        let mut index = 0;
+        let mut position = 0;
+        while position < opcodes.len() {
+            let opcode = opcodes[position];
+            if opcode & 0xc0 == 0 {
+                // ZERO: 00xxxxxx, a run of up to 64 empty registers
+                index += (opcode & 0x3f) as usize + 1;
+                position += 1;
+            } else if opcode & 0xc0 == 0x40 {
+                // XZERO: 01xxxxxx yyyyyyyy, a run of up to 16384 empty registers
+                let next = *opcodes.get(position + 1).ok_or(INVALID_HLL)?;
+                index += (((opcode & 0x3f) as usize) << 8 | next as usize) + 1;
+                position += 2;
+            } else {
+                // VAL: 1vvvvvxx, a run of up to 4 registers with the value vvvvv + 1
+                let value = ((opcode >> 2) & 0x1f) + 1;
+                let run_length = (opcode & 0x3) as usize + 1;
+                runs.push((index..index + run_length, value));
+                index += run_length;
+                position += 1;
+            }
+        }
+        if index != REGISTERS_COUNT {
+            return Err(INVALID_HLL);
+        }
+        for (run, value) in runs {
+            for register in &mut self.registers[run] {
+                *register = (*register).max(value);
+            }
+        }
+        Ok(())
+    }
+
+    /// Returns the estimated cardinality, with the estimator of the server.
+    fn cardinality(&self) -> u64 {
+        let mut histogram = [0u32; 64];
+        for register in self.registers.iter() {
+            histogram[*register as usize] += 1;
+        }
+        let m = REGISTERS_COUNT as f64;
+        let mut z = m * tau((m - histogram[Q + 1] as f64) / m);
+        for j in (1..=Q).rev() {
+            z += histogram[j] as f64;
+            z *= 0.5;
+        }
+        z += m * sigma(histogram[0] as f64 / m);
+        (ALPHA_INF * m * m / z).round() as u64
+    }
+
+    /// Returns the dense representation of the registers, with the cached cardinality marked as stale.
+    fn to_dense_bytes(&self) -> Vec<u8> {
+        let mut data = vec![0; DENSE_SIZE];
+        data[..MAGIC.len()].copy_from_slice(MAGIC);
+        data[ENCODING_OFFSET] = DENSE_ENCODING;
+        data[CARDINALITY_OFFSET + 7] = INVALID_CARDINALITY_FLAG;
+        let registers = &mut data[HEADER_SIZE..];
+        for (index, value) in self.registers.iter().enumerate() {
+            set_dense_register(registers, index, *value);
+        }
+        data
+    }
+}
+
+fn get_dense_register(registers: &[u8], index: usize) -> u8 {
+    let byte = index * REGISTER_BITS / 8;
+    let shift = index * REGISTER_BITS % 8;
+    let low = registers[byte] as u16;
+    let high = registers.get(byte + 1).copied().unwrap_or(0) as u16;
+    (((low | high << 8) >> shift) as u8) & REGISTER_MAX
+}
+
+fn set_dense_register(registers: &mut [u8], index: usize, value: u8) {
+    let byte = index * REGISTER_BITS / 8;
+    let shift = index * REGISTER_BITS % 8;
+    registers[byte] &= !(REGISTER_MAX << shift);
+    registers[byte] |= value << shift;
+    if shift + REGISTER_BITS > 8 {
+        registers[byte + 1] &= !(REGISTER_MAX >> (8 - shift));
+        registers[byte + 1] |= value >> (8 - shift);
+    }
+}
+
+fn sigma(mut x: f64) -> f64 {
+    if x == 1.0 {
+        return f64::INFINITY;
+    }
+    let mut y = 1.0;
+    let mut z = x;
+    loop {
+        x *= x;
+        let previous_z = z;
+        z += x * y;
+        y += y;
+        if previous_z == z {
+            return z;
+        }
+    }
+}
+
+fn tau(mut x: f64) -> f64 {
+    if x == 0.0 || x == 1.0 {
+        return 0.0;
+    }
+    let mut y = 1.0;
+    let mut z = 1.0 - x;
+    loop {
+        x = x.sqrt();
+        let previous_z = z;
+        y *= 0.5;
+        z -= (1.0 - x).powi(2) * y;
+        if previous_z == z {
+            return z / 3.0;
+        }
+    }
+}
+
+#[pymethods]
+impl HyperLogLog {
+    #[new]
+    fn new() -> Self {
+        Self::default()
+    }
+
+    /// Merges the registers of a HyperLogLog value stored on the server, in either encoding.
+    fn merge(&mut self, data: &[u8]) -> PyResult<()> {
+        self.merge_bytes(data).map_err(PyValueError::new_err)
+    }
+
+    /// Merges the registers of another `HyperLogLog`.
+    fn merge_hll(&mut self, other: PyRef<HyperLogLog>) {
+        for (register, other) in self.registers.iter_mut().zip(other.registers.iter()) {
+            *register = (*register).max(*other);
+        }
+    }
+
+    fn count(&self) -> u64 {
+        self.cardinality()
+    }
+
+    /// Returns the dense representation of the registers, which can be stored on the server.
+    fn to_bytes<'py>(&self, py: Python<'py>) -> &'py PyBytes {
+        PyBytes::new(py, &self.to_dense_bytes())
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn sparse(opcodes: &[u8]) -> Vec<u8> {
+        let mut data = vec![0; HEADER_SIZE];
+        data[..4].copy_from_slice(MAGIC);
+        data[ENCODING_OFFSET] = SPARSE_ENCODING;
+        data.extend_from_slice(opcodes);
+        data
+    }
+
+    #[test]
+    fn test_empty_sparse_hll() {
+        let mut hll = HyperLogLog::default();
+        // XZERO of all the registers
+        hll.merge_bytes(&sparse(&[0x7f, 0xff])).unwrap();
+        assert_eq!(hll.cardinality(), 0);
+    }
+
+    #[test]
+    fn test_sparse_opcodes() {
+        let mut hll = HyperLogLog::default();
+        // ZERO of 3 registers, VAL of 2 registers with the value 3, and XZERO of the rest
+        let rest = REGISTERS_COUNT - 5 - 1;
+        hll.merge_bytes(&sparse(&[
+            0x02,
+            0x80 | (2 << 2) | 1,
+            0x40 | (rest >> 8) as u8,
+            rest as u8,
+        ]))
+        .unwrap();
+        assert_eq!(&hll.registers[..6], &[0, 0, 0, 3, 3, 0]);
+        assert_eq!(hll.cardinality(), 2);
+
+        // The runs must cover exactly all the registers, and invalid values are not merged
+        assert!(hll.merge_bytes(&sparse(&[0x02])).is_err());
+        assert!(hll.merge_bytes(&sparse(&[0xff, 0x7f, 0xff])).is_err());
+        assert_eq!(hll.registers[0], 0);
+    }
+
+    #[test]
+    fn test_dense_roundtrip_and_merge() {
+        let mut hll = HyperLogLog::default();
+        for (index, register) in hll.registers.iter_mut().enumerate() {
+            *register = (index % (REGISTER_MAX as usize + 1)) as u8;
+        }
+        let data = hll.to_dense_bytes();
+        assert_eq!(data.len(), DENSE_SIZE);
+
+        let mut merged = HyperLogLog::default();
+        merged.merge_bytes(&data).unwrap();
+        assert_eq!(merged.registers, hll.registers);
+
+        let mut other = HyperLogLog::default();
+        other.registers[0] = 10;
+        other.merge_bytes(&data).unwrap();
+        assert_eq!(other.registers[0], 10);
+        assert_eq!(other.registers[1..], hll.registers[1..]);
+    }
+
+    #[test]
+    fn test_invalid_values() {
+        let mut hll = HyperLogLog::default();
+        assert!(hll.merge_bytes(b"not a hll").is_err());
+        let mut data = HyperLogLog::default().to_dense_bytes();
+        data.pop();
+        assert!(hll.merge_bytes(&data).is_err());
+    }
+}
@@ -3,17 +3,30 @@ use glide_core::client::FINISHED_SCAN_CURSOR;
 /**
  * Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
  */
-use glide_core::start_socket_listener;
+use glide_core::start_socket_listener_with_worker_threads;
+use glide_core::worker_stats;
+use glide_core::MAX_INLINE_RESPONSE_LENGTH;
 use glide_core::MAX_REQUEST_ARGS_LENGTH;
+use pyo3::basic::CompareOp;
 use pyo3::exceptions::PyTypeError;
 use pyo3::prelude::*;
 use pyo3::types::{PyAny, PyBool, PyBytes, PyDict, PyFloat, PyList, PySet};
 use pyo3::Python;
-use redis::Value;
+use redis::{PushKind, Value};
+use std::collections::HashMap;
+use std::os::raw::c_char;
+use stream_columns::stream_value_to_py_columns;
+
+mod hash_decoder;
+mod hyperloglog;
+mod stream_columns;
 
 pub const DEFAULT_TIMEOUT_IN_MILLISECONDS: u32 =
     glide_core::client::DEFAULT_RESPONSE_TIMEOUT.as_millis() as u32;
 pub const MAX_REQUEST_ARGS_LEN: u32 = MAX_REQUEST_ARGS_LENGTH as u32;
+pub const MAX_INLINE_RESPONSE_LEN: u32 = MAX_INLINE_RESPONSE_LENGTH as u32;
+/// The maximum number of channel and pattern names that a `PubSubMessageDecoder` keeps interned.
+const MAX_INTERNED_PUBSUB_NAMES: usize = 1024;
 
 #[pyclass]
 #[derive(PartialEq, Eq, PartialOrd, Clone)]
@@ -100,17 +113,303 @@ impl Script {
     }
 }
 
+/// Describes the incoming pubsub message
+///
+/// Attributes:
+///     message (TEncodable): Incoming message.
+///     channel (TEncodable): Name of an channel that triggered the message.
+///     pattern (Optional[TEncodable]): Pattern that triggered the message.
+#[pyclass(get_all, set_all)]
+pub struct PubSubMsg {
+    message: PyObject,
+    channel: PyObject,
+    pattern: Option<PyObject>,
+}
+
+#[pymethods]
+impl PubSubMsg {
+    #[new]
+    #[pyo3(signature = (message, channel, pattern = None))]
+    fn new(message: PyObject, channel: PyObject, pattern: Option<PyObject>) -> Self {
+        PubSubMsg {
+            message,
+            channel,
+            pattern,
+        }
+    }
+
+    fn __richcmp__(&self, py: Python, other: &PyAny, op: CompareOp) -> PyResult<PyObject> {
+        let Ok(other) = other.extract::<PyRef<PubSubMsg>>() else {
+            return Ok(py.NotImplemented());
+        };
+        let equal = self.message.as_ref(py).eq(other.message.as_ref(py))?
+            && self.channel.as_ref(py).eq(other.channel.as_ref(py))?
+            && match (&self.pattern, &other.pattern) {
+                (Some(pattern), Some(other_pattern)) => {
+                    pattern.as_ref(py).eq(other_pattern.as_ref(py))?
+                }
+                (None, None) => true,
+                _ => false,
+            };
+        match op {
+            CompareOp::Eq => Ok(equal.into_py(py)),
+            CompareOp::Ne => Ok((!equal).into_py(py)),
+            _ => Ok(py.NotImplemented()),
+        }
+    }
+
+    fn __repr__(&self, py: Python) -> PyResult<String> {
+        let pattern = match &self.pattern {
+            Some(pattern) => pattern.as_ref(py).repr()?.to_string(),
+            None => "None".to_string(),
+        };
+        Ok(format!(
+            "PubSubMsg(message={}, channel={}, pattern={})",
+            self.message.as_ref(py).repr()?,
+            self.channel.as_ref(py).repr()?,
+            pattern
+        ))
+    }
+}
+
+/// Converts push notifications to `PubSubMsg` objects in a single call.
+/// Channel and pattern names usually repeat between messages, so their Python objects are interned and reused.
+#[pyclass]
+#[derive(Default)]
+pub struct PubSubMessageDecoder {
+    interned_names: HashMap<Vec<u8>, PyObject>,
+}
+
+impl PubSubMessageDecoder {
+    fn intern_name(&mut self, py: Python, name: Option<Value>) -> PyResult<PyObject> {
+        match name {
+            Some(Value::BulkString(bytes)) => {
+                if let Some(name) = self.interned_names.get(&bytes) {
+                    return Ok(name.clone_ref(py));
+                }
+                let name: PyObject = PyBytes::new(py, &bytes).into_py(py);
+                if self.interned_names.len() >= MAX_INTERNED_PUBSUB_NAMES {
+                    self.interned_names.clear();
+                }
+                self.interned_names.insert(bytes, name.clone_ref(py));
+                Ok(name)
+            }
+            Some(value) => redis_value_to_py(py, value, false),
+            None => Err(PyTypeError::new_err(
+                "Received an incomplete pubsub message",
+            )),
+        }
+    }
+}
+
+#[pymethods]
+impl PubSubMessageDecoder {
+    #[new]
+    fn new() -> Self {
+        PubSubMessageDecoder::default()
+    }
+
+    /// Converts the push notification at `pointer` to a `PubSubMsg`.
+    /// Returns None for notifications that aren't messages, such as subscription confirmations.
+    fn decode(&mut self, py: Python, pointer: u64) -> PyResult<Option<PubSubMsg>> {
+        let value = unsafe { Box::from_raw(pointer as *mut Value) };
+        let Value::Push { kind, data } = *value else {
+            return Err(PyTypeError::new_err(
+                "Push notification must be a push value",
+            ));
+        };
+        let mut data = data.into_iter();
+        // Ordered by frequency, messages are far more common than the other notifications
+        let pattern = match kind {
+            PushKind::Message | PushKind::SMessage => None,
+            PushKind::PMessage => Some(self.intern_name(py, data.next())?),
+            PushKind::Subscribe
+            | PushKind::PSubscribe
+            | PushKind::SSubscribe
+            | PushKind::Unsubscribe
+            | PushKind::PUnsubscribe
+            | PushKind::SUnsubscribe => return Ok(None),
+            PushKind::Disconnection => {
+                log(
+                    Level::Warn,
+                    "disconnect notification".to_string(),
+                    "Transport disconnected, messages might be lost".to_string(),
+                );
+                return Ok(None);
+            }
+            kind => {
+                log(
+                    Level::Warn,
+                    "unknown notification".to_string(),
+                    format!("Unknown notification message: '{kind:?}'"),
+                );
+                return Ok(None);
+            }
+        };
+        let channel = self.intern_name(py, data.next())?;
+        let message = match data.next() {
+            Some(message) => redis_value_to_py(py, message, false)?,
+            None => {
+                return Err(PyTypeError::new_err(
+                    "Received an incomplete pubsub message",
+                ))
+            }
+        };
+        Ok(Some(PubSubMsg {
+            message,
+            channel,
+            pattern,
+        }))
+    }
+}
+
+fn iter_to_value<TIterator>(
+    py: Python,
+    iter: impl IntoIterator<Item = Value, IntoIter = TIterator>,
+    decode: bool,
+) -> PyResult<Vec<PyObject>>
+where
+    TIterator: ExactSizeIterator<Item = Value>,
+{
+    let mut iterator = iter.into_iter();
+    let len = iterator.len();
+
+    iterator.try_fold(Vec::with_capacity(len), |mut acc, val| {
+        acc.push(redis_value_to_py(py, val, decode)?);
+        Ok(acc)
+    })
+}
+
+/// Converts `data` to `str` if `decode` is set and `data` is valid UTF-8, otherwise to `bytes`.
+fn bytes_to_py(py: Python, data: &[u8], decode: bool) -> PyObject {
+    if decode {
+        // Decoding with the interpreter validates and copies the data in a single pass.
+        let decoded = unsafe {
+            pyo3::ffi::PyUnicode_DecodeUTF8(
+                data.as_ptr() as *const c_char,
+                data.len() as pyo3::ffi::Py_ssize_t,
+                b"strict\0".as_ptr() as *const c_char,
+            )
+        };
+        if !decoded.is_null() {
+            return unsafe { PyObject::from_owned_ptr(py, decoded) };
+        }
+        // Invalid UTF-8, clear the decoding error and fall back to bytes.
+        let _ = PyErr::take(py);
+    }
+    PyBytes::new(py, data).into_py(py)
+}
+
+/// Returns `values` as `bytes` of their native-endian representations, to be wrapped by NumPy arrays without copying.
+fn numbers_to_py_bytes<T: Copy, const N: usize>(
+    py: Python,
+    values: &[T],
+    to_bytes: fn(T) -> [u8; N],
+) -> PyResult<PyObject> {
+    let bytes = PyBytes::new_with(py, values.len() * N, |buffer| {
+        for (chunk, value) in buffer.chunks_exact_mut(N).zip(values) {
+            chunk.copy_from_slice(&to_bytes(*value));
+        }
+        Ok(())
+    })?;
+    Ok(bytes.into_py(py))
+}
+
+fn redis_value_to_py(py: Python, val: Value, decode: bool) -> PyResult<PyObject> {
+    match val {
+        Value::Nil => Ok(py.None()),
+        Value::SimpleString(str) => Ok(bytes_to_py(py, str.as_bytes(), decode)),
+        Value::Okay => Ok("OK".into_py(py)),
+        Value::Int(num) => Ok(num.into_py(py)),
+        Value::BulkString(data) => Ok(bytes_to_py(py, &data, decode)),
+        Value::Array(bulk) => {
+            let elements: &PyList = PyList::new(py, iter_to_value(py, bulk, decode)?);
+            Ok(elements.into_py(py))
+        }
+        Value::Map(map) => {
+            let dict = PyDict::new(py);
+            for (key, value) in map {
+                dict.set_item(
+                    redis_value_to_py(py, key, decode)?,
+                    redis_value_to_py(py, value, decode)?,
+                )?;
+            }
+            Ok(dict.into_py(py))
+        }
+        Value::Attribute { data, attributes } => {
+            let dict = PyDict::new(py);
+            let value = redis_value_to_py(py, *data, decode)?;
+            let attributes = redis_value_to_py(py, Value::Map(attributes), decode)?;
+            dict.set_item("value", value)?;
+            dict.set_item("attributes", attributes)?;
+            Ok(dict.into_py(py))
+        }
+        Value::Set(set) => {
+            let set = iter_to_value(py, set, decode)?;
+            let set = PySet::new(py, set.iter())?;
+            Ok(set.into_py(py))
+        }
+        Value::Double(double) => Ok(PyFloat::new(py, double).into_py(py)),
+        Value::Boolean(boolean) => Ok(PyBool::new(py, boolean).into_py(py)),
+        Value::VerbatimString { format: _, text } => {
+            // TODO create MATCH on the format
+            Ok(bytes_to_py(py, text.as_bytes(), decode))
+        }
+        Value::BigNumber(bigint) => Ok(bigint.into_py(py)),
+        Value::Push { kind, data } => {
+            let dict = PyDict::new(py);
+            dict.set_item("kind", format!("{kind:?}"))?;
+            let values: &PyList = PyList::new(py, iter_to_value(py, data, decode)?);
+            dict.set_item("values", values)?;
+            Ok(dict.into_py(py))
+        }
+    }
+}
+
+/// Converts a map of members to scores, as returned for `ZRANGE WITHSCORES`, to a tuple of the list of the members and
+/// the `bytes` of their native-endian float64 scores.
+fn sorted_set_value_to_py_arrays(py: Python, val: Value, decode: bool) -> PyResult<PyObject> {
+    let entries = match val {
+        Value::Map(entries) => entries,
+        Value::Nil => Vec::new(),
+        _ => {
+            return Err(PyTypeError::new_err(
+                "Expected a map of sorted set members to scores",
+            ))
+        }
+    };
+    let mut members = Vec::with_capacity(entries.len());
+    let mut scores = Vec::with_capacity(entries.len());
+    for (member, score) in entries {
+        let (Value::BulkString(member), Value::Double(score)) = (member, score) else {
+            return Err(PyTypeError::new_err(
+                "Expected a map of sorted set members to scores",
+            ));
+        };
+        members.push(bytes_to_py(py, &member, decode));
+        scores.push(score);
+    }
+    let members: PyObject = PyList::new(py, members).into_py(py);
+    let scores = numbers_to_py_bytes(py, &scores, f64::to_ne_bytes)?;
+    Ok((members, scores).into_py(py))
+}
+
 /// A Python module implemented in Rust.
 #[pymodule]
 fn glide(_py: Python, m: &PyModule) -> PyResult<()> {
     m.add_class::<Level>()?;
     m.add_class::<Script>()?;
     m.add_class::<ClusterScanCursor>()?;
+    m.add_class::<PubSubMsg>()?;
+    m.add_class::<PubSubMessageDecoder>()?;
+    m.add_class::<hyperloglog::HyperLogLog>()?;
+    m.add_class::<hash_decoder::HashDecoder>()?;
     m.add(
         "DEFAULT_TIMEOUT_IN_MILLISECONDS",
         DEFAULT_TIMEOUT_IN_MILLISECONDS,
     )?;
     m.add("MAX_REQUEST_ARGS_LEN", MAX_REQUEST_ARGS_LEN)?;
+    m.add("MAX_INLINE_RESPONSE_LEN", MAX_INLINE_RESPONSE_LEN)?;
 
     #[pyfn(m)]
     fn py_log(log_level: Level, log_identifier: String, message: String) {
@@ -123,97 +422,84 @@ fn glide(_py: Python, m: &PyModule) -> PyResult<()> {
     }
 
     #[pyfn(m)]
-    fn start_socket_listener_external(init_callback: PyObject) -> PyResult<PyObject> {
-        start_socket_listener(move |socket_path| {
-            Python::with_gil(|py| {
-                match socket_path {
-                    Ok(path) => {
-                        let _ = init_callback.call(py, (path, py.None()), None);
-                    }
-                    Err(error_message) => {
-                        let _ = init_callback.call(py, (py.None(), error_message), None);
-                    }
-                };
-            });
-        });
+    #[pyo3(signature = (init_callback, worker_threads = None))]
+    fn start_socket_listener_external(
+        init_callback: PyObject,
+        worker_threads: Option<usize>,
+    ) -> PyResult<PyObject> {
+        start_socket_listener_with_worker_threads(
+            move |socket_path| {
+                Python::with_gil(|py| {
+                    match socket_path {
+                        Ok(path) => {
+                            let _ = init_callback.call(py, (path, py.None()), None);
+                        }
+                        Err(error_message) => {
+                            let _ = init_callback.call(py, (py.None(), error_message), None);
+                        }
+                    };
+                });
+            },
+            worker_threads,
+        );
         Ok(Python::with_gil(|py| "OK".into_py(py)))
     }
 
-    fn iter_to_value<TIterator>(
+    /// Returns the number of active clients and received requests of every worker thread of the core.
+    #[pyfn(m)]
+    fn core_worker_stats() -> Vec<(usize, u64)> {
+        worker_stats()
+            .into_iter()
+            .map(|stats| (stats.active_clients, stats.received_requests))
+            .collect()
+    }
+
+    #[pyfn(m)]
+    #[pyo3(signature = (pointer, decode_responses = false))]
+    pub fn value_from_pointer(
         py: Python,
-        iter: impl IntoIterator<Item = Value, IntoIter = TIterator>,
-    ) -> PyResult<Vec<PyObject>>
-    where
-        TIterator: ExactSizeIterator<Item = Value>,
-    {
-        let mut iterator = iter.into_iter();
-        let len = iterator.len();
-
-        iterator.try_fold(Vec::with_capacity(len), |mut acc, val| {
-            acc.push(redis_value_to_py(py, val)?);
-            Ok(acc)
-        })
+        pointer: u64,
+        decode_responses: bool,
+    ) -> PyResult<PyObject> {
+        let value = unsafe { Box::from_raw(pointer as *mut Value) };
+        redis_value_to_py(py, *value, decode_responses)
     }
 
-    fn redis_value_to_py(py: Python, val: Value) -> PyResult<PyObject> {
-        match val {
-            Value::Nil => Ok(py.None()),
-            Value::SimpleString(str) => {
-                let data_bytes = PyBytes::new(py, str.as_bytes());
-                Ok(data_bytes.into_py(py))
-            }
-            Value::Okay => Ok("OK".into_py(py)),
-            Value::Int(num) => Ok(num.into_py(py)),
-            Value::BulkString(data) => {
-                let data_bytes = PyBytes::new(py, &data);
-                Ok(data_bytes.into_py(py))
-            }
-            Value::Array(bulk) => {
-                let elements: &PyList = PyList::new(py, iter_to_value(py, bulk)?);
-                Ok(elements.into_py(py))
-            }
-            Value::Map(map) => {
-                let dict = PyDict::new(py);
-                for (key, value) in map {
-                    dict.set_item(redis_value_to_py(py, key)?, redis_value_to_py(py, value)?)?;
-                }
-                Ok(dict.into_py(py))
-            }
-            Value::Attribute { data, attributes } => {
-                let dict = PyDict::new(py);
-                let value = redis_value_to_py(py, *data)?;
-                let attributes = redis_value_to_py(py, Value::Map(attributes))?;
-                dict.set_item("value", value)?;
-                dict.set_item("attributes", attributes)?;
-                Ok(dict.into_py(py))
-            }
-            Value::Set(set) => {
-                let set = iter_to_value(py, set)?;
-                let set = PySet::new(py, set.iter())?;
-                Ok(set.into_py(py))
-            }
-            Value::Double(double) => Ok(PyFloat::new(py, double).into_py(py)),
-            Value::Boolean(boolean) => Ok(PyBool::new(py, boolean).into_py(py)),
-            Value::VerbatimString { format: _, text } => {
-                // TODO create MATCH on the format
-                let data_bytes = PyBytes::new(py, text.as_bytes());
-                Ok(data_bytes.into_py(py))
-            }
-            Value::BigNumber(bigint) => Ok(bigint.into_py(py)),
-            Value::Push { kind, data } => {
-                let dict = PyDict::new(py);
-                dict.set_item("kind", format!("{kind:?}"))?;
-                let values: &PyList = PyList::new(py, iter_to_value(py, data)?);
-                dict.set_item("values", values)?;
-                Ok(dict.into_py(py))
-            }
-        }
+    /// Frees the value behind a response pointer without converting it, for responses that are no longer awaited.
+    #[pyfn(m)]
+    pub fn drop_pointer(py: Python, pointer: u64) {
+        let value = unsafe { Box::from_raw(pointer as *mut Value) };
+        // Large replies are freed without holding the GIL
+        py.allow_threads(move || drop(value));
+    }
+
+    #[pyfn(m)]
+    #[pyo3(signature = (pointer, multiple_streams = false, decode_responses = false))]
+    pub fn stream_columns_from_pointer(
+        py: Python,
+        pointer: u64,
+        multiple_streams: bool,
+        decode_responses: bool,
+    ) -> PyResult<PyObject> {
+        let value = unsafe { Box::from_raw(pointer as *mut Value) };
+        stream_value_to_py_columns(py, *value, multiple_streams, decode_responses)
     }
 
     #[pyfn(m)]
-    pub fn value_from_pointer(py: Python, pointer: u64) -> PyResult<PyObject> {
+    #[pyo3(signature = (pointer, decode_responses = false))]
+    pub fn sorted_set_arrays_from_pointer(
+        py: Python,
+        pointer: u64,
+        decode_responses: bool,
+    ) -> PyResult<PyObject> {
         let value = unsafe { Box::from_raw(pointer as *mut Value) };
-        redis_value_to_py(py, *value)
+        sorted_set_value_to_py_arrays(py, *value, decode_responses)
+    }
+
+    #[pyfn(m)]
+    /// Returns the hash slot that `key` maps to in cluster mode.
+    pub fn get_slot(key: &[u8]) -> u16 {
+        redis::cluster_topology::get_slot(key)
     }
 
     #[pyfn(m)]
@@ -0,0 +1,255 @@
+/**
+ * Copyright Valkey GLIDE Project Contributors - SPDX Identifier: Apache-2.0
+ */
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use pyo3::types::{PyDict, PyList, PyTuple};
+use redis::Value;
+use std::collections::HashMap;
+
+use crate::{bytes_to_py, numbers_to_py_bytes};
+
+/// A column of the fields of stream entries that share a name.
+#[derive(Debug, PartialEq)]
+enum Column {
+    /// All the entries have the field, and all of its values are integers.
+    Int64(Vec<i64>),
+    /// All the values of the field are numbers. Entries without the field are NaN.
+    Float64(Vec<f64>),
+    /// The values of the field, for fields with non-numeric values. Entries without the field are `None`.
+    Bytes(Vec<Option<Vec<u8>>>),
+}
+
+impl Column {
+    fn from_values(values: Vec<Option<Vec<u8>>>) -> Self {
+        if let Some(ints) = values
+            .iter()
+            .map(|value| value.as_deref().and_then(parse_number::<i64>))
+            .collect::<Option<Vec<_>>>()
+        {
+            return Column::Int64(ints);
+        }
+        let floats = values
+            .iter()
+            .map(|value| match value {
+                Some(value) => parse_number::<f64>(value),
+                None => Some(f64::NAN),
+            })
+            .collect::<Option<Vec<_>>>();
+        match floats {
+            Some(floats) => Column::Float64(floats),
+            None => Column::Bytes(values),
+        }
+    }
+
+    /// Returns the name of the type of the column, and its values.
+    fn into_py_column(self, py: Python, decode: bool) -> PyResult<(&'static str, PyObject)> {
+        Ok(match self {
+            Column::Int64(values) => ("int64", numbers_to_py_bytes(py, &values, i64::to_ne_bytes)?),
+            Column::Float64(values) => (
+                "float64",
+                numbers_to_py_bytes(py, &values, f64::to_ne_bytes)?,
+            ),
+            Column::Bytes(values) => {
+                let values = values.into_iter().map(|value| match value {
+                    Some(value) => bytes_to_py(py, &value, decode),
+                    None => py.None(),
+                });
+                ("bytes", PyList::new(py, values).into_py(py))
+            }
+        })
+    }
+}
+
+fn parse_number<T: std::str::FromStr>(value: &[u8]) -> Option<T> {
+    std::str::from_utf8(value).ok()?.parse().ok()
+}
+
+/// The entries of a stream, with their IDs split to (milliseconds, sequence number) pairs, and their fields as columns.
+#[derive(Debug, Default, PartialEq)]
+struct StreamColumns {
+    ids: Vec<i64>,
+    columns: Vec<(Vec<u8>, Column)>,
+}
+
+fn invalid_reply(reason: &str) -> PyErr {
+    PyValueError::new_err(format!("Unexpected stream entries reply: {reason}"))
+}
+
+fn parse_entry_id(id: &[u8]) -> Option<(i64, i64)> {
+    let id = std::str::from_utf8(id).ok()?;
+    let (ms, seq) = id.split_once('-')?;
+    Some((ms.parse().ok()?, seq.parse().ok()?))
+}
+
+/// Splits the entries of a stream, in the form returned for `XRANGE`, into columns.
+fn stream_entries_to_columns(entries: Value) -> PyResult<StreamColumns> {
+    let Value::Map(entries) = entries else {
+        return Err(invalid_reply("expected a map of entries"));
+    };
+    let mut ids = Vec::with_capacity(entries.len() * 2);
+    let mut column_indices: HashMap<Vec<u8>, usize> = HashMap::new();
+    let mut columns: Vec<(Vec<u8>, Vec<Option<Vec<u8>>>)> = Vec::new();
+    for (row, (id, fields)) in entries.into_iter().enumerate() {
+        let (ms, seq) = match id {
+            Value::BulkString(id) => parse_entry_id(&id),
+            _ => None,
+        }
+        .ok_or_else(|| invalid_reply("expected an entry ID"))?;
+        ids.extend([ms, seq]);
+
+        // Entries that were deleted before they were read by a consumer group have no fields
+        let Value::Array(fields) = fields else {
+            continue;
+        };
+        for pair in fields {
+            let Value::Array(pair) = pair else {
+                return Err(invalid_reply("expected a field-value pair"));
+            };
+            let mut pair = pair.into_iter();
+            let (Some(Value::BulkString(field)), Some(Value::BulkString(value))) =
+                (pair.next(), pair.next())
+            else {
+                return Err(invalid_reply("expected a field-value pair"));
+            };
+            let index = *column_indices.entry(field).or_insert_with_key(|field| {
+                columns.push((field.clone(), Vec::with_capacity(row + 1)));
+                columns.len() - 1
+            });
+            let values = &mut columns[index].1;
+            if values.len() > row {
+                // A field that appears more than once in an entry keeps its last value
+                values[row] = Some(value);
+            } else {
+                values.resize(row, None);
+                values.push(Some(value));
+            }
+        }
+    }
+
+    let row_count = ids.len() / 2;
+    let columns = columns
+        .into_iter()
+        .map(|(field, mut values)| {
+            values.resize(row_count, None);
+            (field, Column::from_values(values))
+        })
+        .collect();
+    Ok(StreamColumns { ids, columns })
+}
+
+fn stream_columns_to_py(py: Python, stream: StreamColumns, decode: bool) -> PyResult<PyObject> {
+    let ids = numbers_to_py_bytes(py, &stream.ids, i64::to_ne_bytes)?;
+    let columns = PyDict::new(py);
+    for (field, column) in stream.columns {
+        columns.set_item(
+            bytes_to_py(py, &field, decode),
+            column.into_py_column(py, decode)?,
+        )?;
+    }
+    Ok(PyTuple::new(py, [ids, columns.into_py(py)]).into_py(py))
+}
+
+/// Converts the reply of `XRANGE` or `XREVRANGE` to a tuple of the IDs and the columns of the entries. If
+/// `multiple_streams` is set, the reply is of `XREAD` or `XREADGROUP`, and it's converted to a dict of stream keys
+/// to their tuples.
+///
+/// The IDs are returned as `bytes` of native-endian int64 (milliseconds, sequence number) pairs. Every column is a
+/// tuple of its type and values: "int64" and "float64" columns are `bytes` of native-endian numbers, and "bytes"
+/// columns are lists of the values. Stream keys, field names and "bytes" values are decoded if `decode` is set.
+pub(crate) fn stream_value_to_py_columns(
+    py: Python,
+    value: Value,
+    multiple_streams: bool,
+    decode: bool,
+) -> PyResult<PyObject> {
+    match value {
+        Value::Nil => Ok(py.None()),
+        Value::Map(streams) if multiple_streams => {
+            let result = PyDict::new(py);
+            for (key, entries) in streams {
+                let Value::BulkString(key) = key else {
+                    return Err(invalid_reply("expected a stream key"));
+                };
+                let stream = stream_entries_to_columns(entries)?;
+                result.set_item(
+                    bytes_to_py(py, &key, decode),
+                    stream_columns_to_py(py, stream, decode)?,
+                )?;
+            }
+            Ok(result.into_py(py))
+        }
+        entries => stream_columns_to_py(py, stream_entries_to_columns(entries)?, decode),
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn entry(id: &str, fields: &[(&str, &str)]) -> (Value, Value) {
+        let fields = fields
+            .iter()
+            .map(|(field, value)| {
+                Value::Array(vec![
+                    Value::BulkString(field.as_bytes().to_vec()),
+                    Value::BulkString(value.as_bytes().to_vec()),
+                ])
+            })
+            .collect();
+        (
+            Value::BulkString(id.as_bytes().to_vec()),
+            Value::Array(fields),
+        )
+    }
+
+    #[test]
+    fn test_entries_are_split_to_typed_columns() {
+        let entries = Value::Map(vec![
+            entry("1-0", &[("int", "1"), ("float", "1.5"), ("text", "a")]),
+            entry("1-1", &[("int", "-2"), ("float", "2"), ("text", "3")]),
+            entry("2-0", &[("int", "3"), ("sparse", "4")]),
+        ]);
+        let stream = stream_entries_to_columns(entries).unwrap();
+
+        assert_eq!(stream.ids, vec![1, 0, 1, 1, 2, 0]);
+        let columns: HashMap<_, _> = stream.columns.into_iter().collect();
+        assert_eq!(columns[&b"int".to_vec()], Column::Int64(vec![1, -2, 3]));
+        let Column::Float64(floats) = &columns[&b"float".to_vec()] else {
+            panic!("expected a float column");
+        };
+        assert_eq!(floats[..2], [1.5, 2.0]);
+        assert!(floats[2].is_nan());
+        assert_eq!(
+            columns[&b"text".to_vec()],
+            Column::Bytes(vec![Some(b"a".to_vec()), Some(b"3".to_vec()), None])
+        );
+        let Column::Float64(sparse) = &columns[&b"sparse".to_vec()] else {
+            panic!("expected a float column");
+        };
+        assert!(sparse[0].is_nan() && sparse[1].is_nan());
+        assert_eq!(sparse[2], 4.0);
+    }
+
+    #[test]
+    fn test_deleted_entries_have_no_fields() {
+        let entries = Value::Map(vec![
+            (Value::BulkString(b"1-0".to_vec()), Value::Nil),
+            entry("1-1", &[("int", "1")]),
+        ]);
+        let stream = stream_entries_to_columns(entries).unwrap();
+
+        assert_eq!(stream.ids, vec![1, 0, 1, 1]);
+        let Column::Float64(values) = &stream.columns[0].1 else {
+            panic!("expected a float column");
+        };
+        assert!(values[0].is_nan());
+        assert_eq!(values[1], 1.0);
+    }
+
+    #[test]
+    fn test_invalid_entry_id() {
+        let entries = Value::Map(vec![entry("not-an-id", &[])]);
+        assert!(stream_entries_to_columns(entries).is_err());
+    }
+}